@@ -0,0 +1,311 @@
+"""
+账户状态缓存模块 - 拦截页面自身的 REST 响应
+页面在下单、撤单、成交后会重新请求资产和当前委托接口，
+这里通过 page.on("response") 解析这些 JSON 响应，维护带版本号的账户状态，
+交易逻辑直接查询余额、持仓和挂单，不再切换买卖 Tab 读取 DOM
+"""
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Pattern
+
+from logger import info, warning
+
+
+# 资产/余额接口与当前委托接口的 URL 特征（按需在构造时覆盖）
+# 资产接口只认 /bapi/.../private/ 下以 user-asset / asset-balance / wallet-balance 结尾的路径，
+# 不再匹配 account/info、埋点和配置等恰好带 asset/account 字样的接口
+BALANCE_URL_PATTERN = r"/bapi/.+/private/.*(user-?asset|asset-?balance|wallet[-/]?balance)[^/?]*(\?|$)"
+ORDERS_URL_PATTERN = r"open-?orders?|get-open-order|order/(list|query)"
+
+# 各接口常见的字段别名
+_ASSET_KEYS = ("asset", "coin", "currency", "tokenSymbol", "symbol")
+_FREE_KEYS = ("free", "available", "availableBalance", "amount", "balance")
+_ORDER_ID_KEYS = ("orderId", "id", "clientOrderId")
+_LIST_KEYS = ("rows", "list", "items", "orders", "balances", "assets", "records")
+
+
+@dataclass
+class OpenOrder:
+    """当前委托"""
+    order_id: str
+    symbol: str = ""
+    side: str = ""
+    price: float = 0.0
+    quantity: float = 0.0
+    status: str = ""
+
+
+@dataclass
+class AccountState:
+    """账户状态（资产余额 + 当前委托）"""
+    version: int = 0
+    balances: Dict[str, float] = field(default_factory=dict)
+    open_orders: List[OpenOrder] = field(default_factory=list)
+    balances_at: float = 0.0
+    orders_at: float = 0.0
+    balances_version: int = 0
+    orders_version: int = 0
+
+    def balance(self, asset: str) -> Optional[float]:
+        """资产可用余额（响应中未出现该资产时返回 None）"""
+        return self.balances.get(asset.upper())
+
+    def orders_by_side(self, side: str) -> List[OpenOrder]:
+        """指定方向（BUY/SELL）的挂单"""
+        return [order for order in self.open_orders if order.side == side]
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(str(value).replace(",", ""))
+    except (TypeError, ValueError):
+        return None
+
+
+def _first(item: Dict[str, Any], keys) -> Any:
+    for key in keys:
+        if item.get(key) not in (None, ""):
+            return item[key]
+    return None
+
+
+def _unwrap(payload: Any) -> Any:
+    """剥离 {"code": ..., "data": ...} 外壳和分页包装，取出列表主体"""
+    if isinstance(payload, dict) and "data" in payload:
+        payload = payload["data"]
+    if isinstance(payload, dict):
+        for key in _LIST_KEYS:
+            if isinstance(payload.get(key), list):
+                return payload[key]
+    return payload
+
+
+def parse_balances(payload: Any) -> Optional[Dict[str, float]]:
+    """
+    解析资产接口响应
+
+    Returns:
+        {资产: 可用余额}，无法识别时返回 None
+    """
+    items = _unwrap(payload)
+    if not isinstance(items, list):
+        return None
+    balances = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        asset = _first(item, _ASSET_KEYS)
+        free = _to_float(_first(item, _FREE_KEYS))
+        if asset and free is not None:
+            balances[str(asset).upper()] = free
+    return balances if balances or not items else None
+
+
+def parse_open_orders(payload: Any) -> Optional[List[OpenOrder]]:
+    """
+    解析当前委托接口响应
+
+    Returns:
+        OpenOrder 列表，无法识别时返回 None
+    """
+    items = _unwrap(payload)
+    if not isinstance(items, list):
+        return None
+    orders = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        order_id = _first(item, _ORDER_ID_KEYS)
+        if order_id is None:
+            continue
+        orders.append(OpenOrder(
+            order_id=str(order_id),
+            symbol=str(item.get("symbol", "")),
+            side=str(item.get("side", "")).upper(),
+            price=_to_float(item.get("price")) or 0.0,
+            quantity=_to_float(_first(item, ("origQty", "quantity", "qty"))) or 0.0,
+            status=str(item.get("status", "")),
+        ))
+    return orders if orders or not items else None
+
+
+class AccountStateCache:
+    """
+    基于页面 REST 响应的账户状态缓存
+
+    每次解析到资产或委托响应，版本号加 1；调用方记录下单前的版本号，
+    之后只信任更新版本的数据，避免读到下单前的旧状态。
+    当前委托接口会返回账户全部交易对的挂单，open_orders() 只返回交易对 symbol 的挂单。
+    """
+
+    def __init__(
+        self,
+        page,
+        quote_asset: str = "USDT",
+        base_asset: Optional[str] = None,
+        symbol: Optional[str] = None,
+        max_age: float = 15.0,
+        pump_ms: int = 50,
+        balance_pattern: str = BALANCE_URL_PATTERN,
+        orders_pattern: str = ORDERS_URL_PATTERN
+    ):
+        """
+        Args:
+            page: Playwright Page
+            quote_asset: 计价资产
+            base_asset: 交易资产（None 则从 symbol 或挂单的交易对推断）
+            symbol: 交易对（None 则在挂单只有一个交易对时推断，或由 set_symbol 设置）
+            max_age: 数据超过该秒数视为过期
+            pump_ms: 等待时驱动事件分发的步长（毫秒）
+            balance_pattern: 资产接口 URL 正则
+            orders_pattern: 当前委托接口 URL 正则
+        """
+        self.page = page
+        self.quote_asset = quote_asset.upper()
+        self.base_asset = base_asset.upper() if base_asset else None
+        self.symbol: Optional[str] = None
+        self.max_age = max_age
+        self.pump_ms = pump_ms
+        self._balance_re: Pattern = re.compile(balance_pattern, re.IGNORECASE)
+        self._orders_re: Pattern = re.compile(orders_pattern, re.IGNORECASE)
+        self.state = AccountState()
+        self.attached: bool = False
+        self.responses: int = 0
+        if symbol:
+            self.set_symbol(symbol)
+
+    def attach(self) -> bool:
+        """订阅页面响应"""
+        try:
+            self.page.on("response", self._on_response)
+            self.attached = True
+            info("REST 响应拦截已启用（账户状态缓存）")
+            return True
+        except Exception as e:
+            warning(f"订阅页面响应失败: {e}")
+            return False
+
+    def _on_response(self, response) -> None:
+        """page.on("response") 回调：只解析命中 URL 特征的 JSON 响应"""
+        url = response.url
+        is_orders = bool(self._orders_re.search(url))
+        is_balance = not is_orders and bool(self._balance_re.search(url))
+        if not (is_orders or is_balance):
+            return
+        if response.request.resource_type not in ("xhr", "fetch") or not response.ok:
+            return
+        try:
+            payload = response.json()
+        except Exception:
+            return
+        self.ingest(url, payload, is_orders=is_orders)
+
+    def ingest(self, url: str, payload: Any, is_orders: Optional[bool] = None) -> bool:
+        """
+        解析一条响应并更新状态
+
+        Args:
+            url: 响应 URL
+            payload: 响应 JSON
+            is_orders: 是否委托接口（None 按 URL 判断）
+
+        Returns:
+            状态是否更新
+        """
+        if is_orders is None:
+            is_orders = bool(self._orders_re.search(url))
+        now = time.time()
+
+        if is_orders:
+            orders = parse_open_orders(payload)
+            if orders is None:
+                return False
+            self.state.version += 1
+            self.state.open_orders = orders
+            self.state.orders_at = now
+            self.state.orders_version = self.state.version
+            if not self.symbol:
+                self._infer_symbol(orders)
+        else:
+            balances = parse_balances(payload)
+            if balances is None:
+                return False
+            # 资产接口可能分多次只返回部分资产，合并而不是覆盖
+            self.state.version += 1
+            self.state.balances.update(balances)
+            self.state.balances_at = now
+            self.state.balances_version = self.state.version
+
+        self.responses += 1
+        return True
+
+    def set_symbol(self, symbol: str) -> None:
+        """
+        设置交易对（如行情推送锁定的交易对），并推断交易资产（如 ALPHA_123USDT → ALPHA_123）
+        """
+        symbol = symbol.upper()
+        if symbol == self.symbol:
+            return
+        self.symbol = symbol
+        if symbol.endswith(self.quote_asset) and len(symbol) > len(self.quote_asset):
+            self.base_asset = symbol[:-len(self.quote_asset)]
+        info(f"账户状态交易对: {self.symbol}（交易资产 {self.base_asset}）")
+
+    def _infer_symbol(self, orders: List[OpenOrder]) -> None:
+        """挂单只涉及一个以计价资产结尾的交易对时，以其为交易对（多个交易对时无法判断）"""
+        symbols = {
+            order.symbol.upper() for order in orders
+            if order.symbol.upper().endswith(self.quote_asset) and len(order.symbol) > len(self.quote_asset)
+        }
+        if len(symbols) == 1:
+            self.set_symbol(symbols.pop())
+
+    @property
+    def version(self) -> int:
+        """当前状态版本号"""
+        return self.state.version
+
+    def _fresh(self, updated_at: float, section_version: int, since_version: int) -> bool:
+        """数据存在、晚于 since_version 且未过期"""
+        return (
+            updated_at > 0
+            and section_version > since_version
+            and time.time() - updated_at <= self.max_age
+        )
+
+    def quote_balance(self, since_version: int = -1) -> Optional[float]:
+        """计价资产可用余额（数据过期或不够新时返回 None）"""
+        if not self._fresh(self.state.balances_at, self.state.balances_version, since_version):
+            return None
+        return self.state.balance(self.quote_asset)
+
+    def holding(self, since_version: int = -1) -> Optional[float]:
+        """交易资产可用持仓（资产未知、响应中没有该资产、数据过期或不够新时返回 None）"""
+        if not self.base_asset or not self._fresh(self.state.balances_at, self.state.balances_version, since_version):
+            return None
+        return self.state.balance(self.base_asset)
+
+    def open_orders(self, since_version: int = -1) -> Optional[List[OpenOrder]]:
+        """当前交易对的挂单（交易对未知时为全部挂单；数据过期或不够新时返回 None）"""
+        if not self._fresh(self.state.orders_at, self.state.orders_version, since_version):
+            return None
+        return [
+            order for order in self.state.open_orders
+            if not self.symbol or not order.symbol or order.symbol.upper() == self.symbol
+        ]
+
+    def wait_for_update(self, since_version: int, timeout: float = 2) -> bool:
+        """
+        等待资产和委托都有晚于 since_version 的响应
+
+        Returns:
+            是否等到新版本
+        """
+        deadline = time.time() + timeout
+        while min(self.state.balances_version, self.state.orders_version) <= since_version:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return False
+            self.page.wait_for_timeout(min(self.pump_ms, remaining * 1000))
+        return True
@@ -0,0 +1,507 @@
+"""
+异步浏览器管理模块 - 基于 playwright.async_api
+与 BrowserManager 提供相同的页面操作，可在一个事件循环、一个 Playwright 驱动中
+同时驱动多个账号的 Chrome（每个账号一个 CDP 连接）
+"""
+import asyncio
+import json
+import time
+from functools import wraps
+from typing import Optional, Callable, Dict, Any
+
+from playwright.async_api import (
+    async_playwright, Page, Browser, Playwright, TimeoutError as PlaywrightTimeout
+)
+
+from browser_manager import (
+    MFA_POPUP_SELECTOR, MFA_FLAG_MAX_AGE, _SNAPSHOT_JS, _SELECTOR_REGISTRY_JS, _MFA_WATCH_JS,
+    _SCROLL_JS, _SCROLL_INTO_VIEW_JS, _PAGE_READY_JS,
+    PageSnapshot, snapshot_args, build_snapshot, select_page, generate_totp,
+    page_ready_args
+)
+from logger import info, error, warning, success
+
+
+def async_with_verification(func: Callable) -> Callable:
+    """
+    自动处理验证器弹窗的装饰器（异步版）
+    在执行操作前检查并处理验证器
+    """
+    @wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        if self.needs_verification_check():
+            await self.check_verification()
+        return await func(self, *args, **kwargs)
+    return wrapper
+
+
+class AsyncBrowserManager:
+    """
+    异步浏览器管理器
+
+    可传入共享的 Playwright 实例：多个账号共用一个 Node 驱动进程，
+    各自持有独立的 CDP 连接和页面。
+    """
+
+    def __init__(
+        self,
+        port: int = 9222,
+        secret: str = "",
+        xpaths: Optional[Dict[str, str]] = None,
+        css: Optional[Dict[str, str]] = None
+    ):
+        """
+        初始化浏览器管理器
+
+        Args:
+            port: Chrome 调试端口
+            secret: 谷歌验证器密钥
+            xpaths: 命名 XPath 表（snapshot 使用）
+            css: 命名 CSS 选择器表（snapshot 使用）
+        """
+        self.port = port
+        self.secret = secret
+        self.xpaths: Dict[str, str] = dict(xpaths or {})
+        self.css: Dict[str, str] = dict(css or {})
+        self.playwright: Optional[Playwright] = None
+        self.browser: Optional[Browser] = None
+        self.page: Optional[Page] = None
+        self._owns_playwright = False
+        self._connected = False
+        self._balance_cache: Dict[int, float] = {}
+        self._mfa_visible: Optional[bool] = None
+        self._mfa_updated_at: float = 0.0
+        self._perf_session = None
+
+    async def connect(
+        self,
+        target_url: Optional[str] = None,
+        playwright: Optional[Playwright] = None
+    ) -> bool:
+        """
+        连接到 Chrome CDP
+
+        Args:
+            target_url: 目标页面 URL（可选，用于定位特定页面）
+            playwright: 共享的 Playwright 实例（None 则自行启动驱动）
+
+        Returns:
+            连接是否成功
+        """
+        try:
+            if playwright is None:
+                self.playwright = await async_playwright().start()
+                self._owns_playwright = True
+            else:
+                self.playwright = playwright
+
+            self.browser = await self.playwright.chromium.connect_over_cdp(
+                f"http://127.0.0.1:{self.port}"
+            )
+
+            pages = [pg for context in self.browser.contexts for pg in context.pages]
+            self.page = select_page(pages, target_url)
+            if not self.page:
+                error("没找到可用页面")
+                return False
+
+            self.page.set_default_timeout(5000)
+            self._connected = True
+            success(f"已连接到页面: {self.page.url[:50]}...")
+
+            if self.xpaths:
+                await self.install_selector_registry()
+            await self.install_mfa_watch()
+            return True
+
+        except Exception as e:
+            error(f"连接失败: {e}")
+            return False
+
+    async def performance_metrics(self) -> Optional[Dict[str, float]]:
+        """
+        渲染进程性能指标（与 BrowserManager.performance_metrics 一致）
+
+        Returns:
+            {指标名: 值}，获取失败返回 None
+        """
+        try:
+            if self._perf_session is None:
+                self._perf_session = await self.page.context.new_cdp_session(self.page)
+                await self._perf_session.send("Performance.enable")
+            result = await self._perf_session.send("Performance.getMetrics")
+            return {m["name"]: m["value"] for m in result["metrics"]}
+        except Exception as e:
+            warning(f"获取页面性能指标失败: {e}")
+            self._perf_session = None
+            return None
+
+    async def disconnect(self) -> None:
+        """断开连接（共享驱动只断开本账号的 CDP 连接）"""
+        try:
+            if self.browser:
+                await self.browser.close()
+            if self.playwright and self._owns_playwright:
+                await self.playwright.stop()
+        except Exception as e:
+            warning(f"断开连接异常: {e}")
+        self._connected = False
+        info("已断开浏览器连接")
+
+    @property
+    def is_connected(self) -> bool:
+        """检查是否已连接"""
+        return self._connected and self.page is not None
+
+    def get_current_url(self) -> Optional[str]:
+        """获取当前页面 URL"""
+        return self.page.url if self.page else None
+
+    async def install_selector_registry(self) -> bool:
+        """在页面内安装命名选择器注册表（同 BrowserManager.install_selector_registry）"""
+        try:
+            script = f"({_SELECTOR_REGISTRY_JS})({json.dumps(self.xpaths)})"
+            await self.page.add_init_script(script=script)
+            count = await self.page.evaluate(_SELECTOR_REGISTRY_JS, self.xpaths)
+            info(f"选择器注册表已安装 ({count} 个)")
+            return True
+        except Exception as e:
+            warning(f"安装选择器注册表失败: {e}")
+            return False
+
+    # ============================================
+    # 验证器处理
+    # ============================================
+
+    async def install_mfa_watch(self) -> bool:
+        """在页面内安装验证器观察器（同 BrowserManager.install_mfa_watch）"""
+        try:
+            script = f"({_MFA_WATCH_JS})({json.dumps(MFA_POPUP_SELECTOR)})"
+            await self.page.add_init_script(script=script)
+            self._set_mfa_flag(await self.page.evaluate(_MFA_WATCH_JS, MFA_POPUP_SELECTOR))
+            return True
+        except Exception as e:
+            warning(f"安装验证器观察器失败: {e}")
+            return False
+
+    def needs_verification_check(self) -> bool:
+        """操作前是否需要实际检测验证器弹窗（标志可见/未知/过期时）"""
+        if not self.secret:
+            return False
+        if self._mfa_visible is None or self._mfa_visible:
+            return True
+        return time.time() - self._mfa_updated_at > MFA_FLAG_MAX_AGE
+
+    def _set_mfa_flag(self, visible: Optional[bool]) -> None:
+        """更新验证器标志"""
+        if visible is None:
+            return
+        self._mfa_visible = bool(visible)
+        self._mfa_updated_at = time.time()
+
+    async def _evaluate(self, js: str, arg: Any = None) -> Any:
+        """执行 page.evaluate，并顺带带回页面内验证器标志"""
+        wrapped = (
+            f"async (arg) => [await ({js})(arg), "
+            f"window.__alphaMfa ? window.__alphaMfa.visible : null]"
+        )
+        result, mfa_visible = await self.page.evaluate(wrapped, arg)
+        self._set_mfa_flag(mfa_visible)
+        return result
+
+    async def check_verification(self, check_interval: float = 5) -> None:
+        """检查并处理验证器弹窗"""
+        if not self.secret:
+            return
+
+        try:
+            found = await self._detect_verification_popup()
+            if found:
+                warning("检测到币安身份验证器弹窗 → 等待消失...")
+                while found:
+                    await asyncio.sleep(check_interval)
+                    await self._input_verification_code(generate_totp(self.secret))
+                    found = await self._detect_verification_popup()
+                    if found:
+                        info("验证器仍存在，继续等待...")
+                success("验证器已消失，继续执行程序")
+            self._set_mfa_flag(False)
+        except Exception as e:
+            warning(f"验证器检测异常: {e}")
+
+    async def _detect_verification_popup(self) -> bool:
+        """检测验证器弹窗是否存在"""
+        return await self.page.evaluate("""
+            (selector) => {
+                try {
+                    const shadowHost = document.querySelector("#mfa-shadow-host");
+                    if (!shadowHost || !shadowHost.shadowRoot) return false;
+                    return shadowHost.shadowRoot.querySelector(selector) !== null;
+                } catch (err) {
+                    return false;
+                }
+            }
+        """, MFA_POPUP_SELECTOR)
+
+    async def _input_verification_code(self, code: str) -> bool:
+        """输入验证码"""
+        try:
+            await self.page.evaluate("""
+                () => {
+                    const shadowHost = document.querySelector("#mfa-shadow-host");
+                    const inputEl = shadowHost.shadowRoot.querySelector(
+                        'input[data-e2e="input-mfa"]'
+                    );
+                    if (inputEl) {
+                        inputEl.focus();
+                        inputEl.value = '';
+                    }
+                }
+            """)
+            await asyncio.sleep(0.3)
+            await self.page.keyboard.press("Control+A")
+            await asyncio.sleep(0.05)
+            await self.page.keyboard.press("Backspace")
+            await asyncio.sleep(0.1)
+            await self.page.keyboard.type(code, delay=0.08)
+            info(f"已输入验证码: {code[:2]}****")
+            return True
+        except Exception as e:
+            warning(f"输入验证码失败: {e}")
+            return False
+
+    # ============================================
+    # 页面状态快照
+    # ============================================
+
+    async def snapshot(self, handle_verification: bool = True) -> Optional[PageSnapshot]:
+        """一次 evaluate 读取页面状态（同 BrowserManager.snapshot）"""
+        try:
+            raw = await self.page.evaluate(_SNAPSHOT_JS, snapshot_args(self.xpaths, self.css))
+        except Exception as e:
+            warning(f"读取页面快照失败: {e}")
+            return None
+
+        self._set_mfa_flag(raw["mfaVisible"])
+        if raw["mfaVisible"] and handle_verification and self.secret:
+            await self.check_verification()
+            return await self.snapshot(handle_verification=False)
+
+        return build_snapshot(raw, self._balance_cache)
+
+    # ============================================
+    # 元素操作
+    # ============================================
+
+    @async_with_verification
+    async def scroll_to(self, direction: str = "bottom", xpath: Optional[str] = None) -> None:
+        """滚动页面或元素（单次 evaluate，同 BrowserManager.scroll_to 的 fast 模式）"""
+        target = "元素" if xpath else "页面"
+        info(f"滚动{target}到 {direction}")
+
+        try:
+            await self._evaluate(_SCROLL_JS, {"xpath": xpath, "key": None, "direction": direction})
+        except Exception as e:
+            warning(f"滚动失败: {e}")
+
+    @async_with_verification
+    async def scroll_into_view(self, xpath: str) -> Optional[bool]:
+        """将元素滚动到视口内（已可见时不做任何操作）"""
+        try:
+            return await self._evaluate(_SCROLL_INTO_VIEW_JS, {"xpath": xpath, "key": None})
+        except Exception as e:
+            warning(f"滚动到元素失败: {e}")
+            return None
+
+    @async_with_verification
+    async def get_text(self, xpath: str) -> Optional[str]:
+        """获取元素文本"""
+        try:
+            return await self._evaluate("""(xpath) => {
+                const el = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+                return el ? (el.innerText || el.textContent) : null;
+            }""", xpath)
+        except Exception as e:
+            warning(f"获取文本失败: {e}")
+            return None
+
+    @async_with_verification
+    async def fill_input(
+        self,
+        xpath: str,
+        value: Any,
+        timeout: int = 5000,
+        clear_first: bool = True
+    ) -> bool:
+        """填写输入框"""
+        try:
+            locator = self.page.locator(f"xpath={xpath}")
+            if await locator.count() == 0:
+                warning("未找到输入框元素")
+                return False
+
+            try:
+                await locator.wait_for(state="visible", timeout=timeout)
+            except PlaywrightTimeout:
+                warning("等待输入框可见超时")
+                return False
+
+            if clear_first:
+                await locator.clear()
+            await locator.fill(str(value))
+            info(f"已填写: {value}")
+            return True
+
+        except Exception as e:
+            warning(f"填写失败: {e}")
+            return False
+
+    @async_with_verification
+    async def click(self, xpath: str, timeout: float = 3, interval: float = 0.3) -> bool:
+        """点击元素"""
+        start = time.time()
+        last_error = None
+
+        while time.time() - start < timeout:
+            try:
+                locator = self.page.locator(f"xpath={xpath}")
+                if await locator.count() == 0:
+                    await asyncio.sleep(interval)
+                    continue
+
+                try:
+                    await locator.wait_for(state="visible", timeout=1000)
+                except PlaywrightTimeout:
+                    await asyncio.sleep(interval)
+                    continue
+
+                await locator.scroll_into_view_if_needed()
+                await locator.click(force=True)
+                info("已点击按钮")
+                return True
+
+            except Exception as e:
+                last_error = e
+                await asyncio.sleep(interval)
+
+        warning(f"点击超时: {last_error or '未找到按钮'}")
+        return False
+
+    @async_with_verification
+    async def click_tab(self, index: int, timeout: int = 3000) -> bool:
+        """点击 Tab 按钮"""
+        try:
+            result = await self._evaluate("""
+                async ({index, timeout}) => {
+                    let tabs = document.querySelectorAll(".bn-tab.bn-tab__buySell");
+                    if (!tabs.length || index < 0 || index >= tabs.length) return false;
+
+                    let el = tabs[index];
+                    el.dispatchEvent(new MouseEvent("click", {
+                        bubbles: true, cancelable: true, view: window
+                    }));
+
+                    let start = Date.now();
+                    while (Date.now() - start < timeout) {
+                        if (el.getAttribute("aria-selected") === "true") return true;
+                        await new Promise(r => setTimeout(r, 50));
+                    }
+                    return false;
+                }
+            """, {"index": index, "timeout": timeout})
+
+            info(f"切换到 Tab {index}: {'成功' if result else '失败'}")
+            return result
+        except Exception as e:
+            warning(f"切换 Tab 失败: {e}")
+            return False
+
+    @async_with_verification
+    async def toggle_checkbox(
+        self,
+        selector: str,
+        should_check: bool = True,
+        timeout: float = 10
+    ) -> bool:
+        """切换复选框状态"""
+        start = time.time()
+
+        while time.time() - start < timeout:
+            try:
+                checkbox = await self.page.query_selector(selector)
+                if not checkbox:
+                    await asyncio.sleep(0.5)
+                    continue
+
+                is_checked = await self._evaluate(
+                    "(el) => el.classList.contains('checked')",
+                    checkbox
+                )
+                if should_check == is_checked:
+                    info(f"复选框状态已符合预期: {should_check}")
+                    return True
+
+                await checkbox.click(force=True)
+                info(f"{'勾选' if should_check else '取消'}复选框")
+                await asyncio.sleep(0.5)
+
+            except Exception as e:
+                warning(f"复选框操作失败: {e}")
+                return False
+
+        warning("复选框操作超时")
+        return False
+
+    async def get_pending_order_count(self) -> int:
+        """获取当前委托数量"""
+        try:
+            count = await self.page.evaluate("""
+                () => {
+                    const orderPane = document.querySelector('#bn-tab-pane-orderOrder');
+                    const rows = (orderPane || document).querySelectorAll('tbody.bn-web-table-tbody > tr[aria-rowindex]');
+                    return rows ? rows.length : 0;
+                }
+            """)
+            return count if count else 0
+        except Exception as e:
+            warning(f"获取挂单数量失败: {e}")
+            return 0
+
+    # ============================================
+    # 页面操作
+    # ============================================
+
+    async def refresh_until_element(
+        self,
+        target_url: str,
+        xpath: str,
+        delay: float = 3,
+        timeout: float = 60
+    ) -> bool:
+        """刷新页面直到元素出现"""
+        start = time.time()
+
+        while time.time() - start < timeout:
+            try:
+                if self.page.url != target_url:
+                    info(f"跳转到: {target_url[:50]}...")
+                    await self.page.goto(target_url, wait_until="domcontentloaded", timeout=60000)
+                else:
+                    info("刷新页面...")
+                    await self.page.reload(wait_until="domcontentloaded", timeout=60000)
+
+                # 与同步版相同的可交易条件：加载标记、价格、买入/卖出 Tab
+                await self.page.wait_for_function(
+                    _PAGE_READY_JS, arg=page_ready_args(self.xpaths, xpath),
+                    timeout=max(1000, int((timeout - (time.time() - start)) * 1000)), polling=100
+                )
+                success(f"页面可交易 (刷新到就绪 {(time.time() - start) * 1000:.0f}ms)")
+                return True
+
+            except Exception as e:
+                warning(f"刷新失败: {e}")
+
+            await asyncio.sleep(delay)
+
+        error("刷新超时")
+        return False
@@ -0,0 +1,666 @@
+"""
+异步交易机器人 - AsyncAlphaTrader
+逐笔交易流程（买入+反向卖单 → 等待反向成交 → 超时市价卖出），按 total_runs 计数，
+基于 AsyncBrowserManager，所有等待都让出事件循环，便于单进程同时运行多个账号
+
+只支持逐笔模式：不支持成交量目标（volume_target / volume_deadline）、按完成时间调整节奏（finish_by）
+和流水线（max_inflight > 1），这些配置请用进程模式运行（见 unsupported_settings）
+
+单账号调试：
+    python async_trader.py --account "账号A"
+"""
+import argparse
+import asyncio
+import datetime
+import os
+import random
+import time
+from typing import List, Optional
+
+import pandas as pd
+from playwright.async_api import Playwright, async_playwright
+
+from config import Config, get_account_config
+from async_browser_manager import AsyncBrowserManager
+from browser_manager import ensure_chrome_running
+from main import AlphaTrader
+from logger import info, warning, error, success, step, use_account_context, reset_logger
+from trade_stats import TradeStats
+from page_health import PageHealthMonitor, HealthThresholds, RefreshMode
+
+
+class AsyncAlphaTrader:
+    """Alpha 交易机器人（asyncio 版）"""
+
+    XPATH = AlphaTrader.XPATH
+    CSS = AlphaTrader.CSS
+
+    def __init__(self, config: Config, playwright: Optional[Playwright] = None):
+        """
+        初始化交易机器人
+
+        Args:
+            config: 配置对象
+            playwright: 共享的 Playwright 实例（多账号共用一个驱动）
+        """
+        self.config = config
+        self.playwright = playwright
+        self.browser = AsyncBrowserManager(
+            port=config.browser.port,
+            secret=config.security.secret,
+            xpaths=self.XPATH,
+            css=self.CSS
+        )
+
+        # 交易状态
+        self.target_url: Optional[str] = None
+        self.buy_price: float = 0
+        self.complete_trades: int = 0
+        self.loop_count: int = 0
+        self.start_time: float = 0
+
+        # 交易统计
+        self.stats = TradeStats()
+
+        # 页面健康监控（与 AlphaTrader 一致）
+        self.health = PageHealthMonitor(HealthThresholds(
+            max_heap_mb=config.interval.max_heap_mb,
+            max_nodes=config.interval.max_dom_nodes,
+            max_page_age=config.interval.max_page_age,
+        ))
+
+        # 余额不足连续失败计数
+        self.insufficient_balance_count: int = 0
+
+        # 上次刷新后页面仍不可交易时记下原因，下一轮先重试刷新
+        self.refresh_pending: Optional[str] = None
+
+        # 买单等待时间配置
+        self.buy_order_timeout: int = 5
+        self.buy_order_check_interval: int = 1
+
+    async def run(self) -> None:
+        """运行交易机器人"""
+        use_account_context(self.config.trade.username)
+        self.start_time = time.time()
+
+        step("启动 Alpha 交易机器人（异步）")
+        self.config.print_config()
+
+        unsupported = unsupported_settings(self.config)
+        if unsupported:
+            error(f"异步模式不支持以下配置: {'、'.join(unsupported)}，请改用进程模式运行")
+            return
+
+        if not await self._connect():
+            return
+
+        try:
+            await self._main_loop()
+        except asyncio.CancelledError:
+            warning("任务已取消")
+            self._print_interrupt_summary()
+            raise
+        except Exception as e:
+            error(f"运行异常: {e}")
+            self._print_interrupt_summary()
+        finally:
+            await self.browser.disconnect()
+
+    def _print_interrupt_summary(self) -> None:
+        """中断时打印统计摘要"""
+        if self.stats.start_balance > 0:
+            self.stats.print_summary()
+        else:
+            warning("无有效统计数据（未开始交易）")
+
+    async def _connect(self) -> bool:
+        """确保 Chrome 运行并连接"""
+        port = self.config.browser.port
+        user_data_dir = self.config.browser.user_data_dir  # 未指定时由 start_chrome 按系统生成默认目录
+
+        # Chrome 启动/探测是阻塞调用，放到线程中执行
+        ok = await asyncio.to_thread(
+            ensure_chrome_running, port, self.config.browser.chrome_path, user_data_dir,
+            self.config.browser.effective_launch_profile,
+            self.config.browser.window_size,
+            self.config.browser.target_url if self.config.browser.headless else ""
+        )
+        if not ok:
+            error("无法启动 Chrome，请检查配置")
+            return False
+
+        desired_url = (self.config.browser.target_url or "").strip() or None
+        for attempt in range(10):
+            if await self.browser.connect(desired_url, playwright=self.playwright):
+                break
+            warning(f"尝试连接页面 ({attempt + 1}/10)...")
+            await asyncio.sleep(10)
+        else:
+            error("无法获取有效页面，程序退出")
+            return False
+
+        self.target_url = self.browser.get_current_url()
+        return True
+
+    async def _main_loop(self) -> None:
+        """主交易循环 - 纯反向订单模式，完成 total_runs 笔后结束"""
+        while True:
+            loop_start = time.time()
+            self.loop_count += 1
+
+            step(f"循环 {self.loop_count} - 已完成 {self.complete_trades}/{self.config.trade.total_runs} 笔交易")
+
+            refresh_reason = await self._refresh_reason()
+            if refresh_reason and not await self._refresh_page(refresh_reason):
+                await asyncio.sleep(10)
+                continue
+
+            if not await self._load_page_data():
+                continue
+
+            buy_result = await self._execute_buy_with_reverse()
+            if not buy_result["success"]:
+                await asyncio.sleep(2)
+                continue
+
+            if buy_result.get("complete_trade", False):
+                self.complete_trades += 1
+                success(f"🎉 完成第 {self.complete_trades} 笔完整交易！（买卖快速成交）")
+            else:
+                info("等待反向卖单成交...")
+                reverse_filled = await self._wait_for_reverse_order_filled(
+                    initial_holding=buy_result["holding"],
+                    max_wait=self.config.interval.reverse_order_timeout
+                )
+
+                if reverse_filled:
+                    self.complete_trades += 1
+                    success(f"🎉 完成第 {self.complete_trades} 笔完整交易！（反向卖单自动成交）")
+                else:
+                    warning("反向卖单超时，主动市价卖出")
+                    sell_success = await self._market_sell_with_retry()
+                    self.complete_trades += 1
+                    if sell_success:
+                        success(f"🎉 完成第 {self.complete_trades} 笔完整交易！（主动卖出成交）")
+                    else:
+                        warning(f"⚠️ 第 {self.complete_trades} 笔交易：卖出可能未完成，请手动检查！")
+
+            if self.complete_trades >= self.config.trade.total_runs:
+                await self._finalize()
+                break
+
+            info(f"📊 进度: {self.complete_trades}/{self.config.trade.total_runs}，本次耗时 {time.time() - loop_start:.1f}s")
+            await asyncio.sleep(random_interval(
+                self.config.interval.min_interval,
+                self.config.interval.max_interval
+            ))
+
+    async def _load_page_data(self) -> bool:
+        """加载页面数据（获取当前价格）"""
+        info("页面加载中...")
+        retry_count = 0
+        while True:
+            await self.browser.scroll_to("top")
+            await self.browser.scroll_to("top", xpath=self.XPATH["grid_scroll"])
+            await asyncio.sleep(1)
+
+            snap = await self.browser.snapshot()
+            if snap and snap.price and snap.price > 0:
+                self.buy_price = snap.price
+                success(f"价格数据加载完成: {self.buy_price}")
+                return True
+
+            retry_count += 1
+            warning(f"获取价格失败 (第{retry_count}次)，继续尝试...")
+            await asyncio.sleep(10)
+
+    async def _execute_buy_with_reverse(self) -> dict:
+        """
+        执行买入操作（带反向卖单），按余额变化判断结果
+
+        Returns:
+            {"success", "holding", "buy_price", "complete_trade"}：complete_trade 表示买卖都已成交，
+            否则 holding 为等待反向卖单的持仓
+        """
+        result = {"success": False, "holding": 0, "buy_price": 0, "complete_trade": False}
+        buy_start = time.time()
+        cost = self.config.trade.cost
+
+        def record(price: float, amount: float, ok: bool, reason: Optional[str] = None) -> None:
+            self.stats.record_buy(price, amount, ok, (time.time() - buy_start) * 1000, reason)
+
+        await self.browser.scroll_to("top")
+        await self.browser.scroll_to("top", xpath=self.XPATH["grid_scroll_alt"])
+
+        info("切换买入")
+        await self.browser.click_tab(0)
+
+        snap = await self.browser.snapshot()
+        if snap and snap.price:
+            self.buy_price = snap.price
+        info(f"当前成交价: {self.buy_price}")
+
+        balance_before = AlphaTrader._usdt_balance_from(snap) or 0
+        info(f"可用余额: {balance_before:.2f}")
+        if self.loop_count == 1 and balance_before > 0:
+            await self._save_balance(balance_before)
+            self.stats.set_start_balance(balance_before)
+
+        # ========== 余额检查 ==========
+        required_balance = cost * 1.01
+        if balance_before < required_balance:
+            warning(f"⚠️ 余额不足！需要: {required_balance:.2f}, 当前: {balance_before:.2f}")
+            self.insufficient_balance_count += 1
+
+            pending_count = snap.open_orders if snap else await self.browser.get_pending_order_count()
+            if pending_count > 0:
+                info(f"有 {pending_count} 个挂单等待成交")
+                if self.insufficient_balance_count >= 2:
+                    warning(f"⚠️ 连续 {self.insufficient_balance_count} 次余额不足，主动市价卖出")
+                    sell_success = await self._market_sell_with_retry()
+                    self.complete_trades += 1
+                    self.insufficient_balance_count = 0
+                    result["success"] = True
+                    result["complete_trade"] = True
+                    if sell_success:
+                        success(f"🎉 完成第 {self.complete_trades} 笔交易！（主动市价卖出）")
+                        record(self.buy_price, 0, True, "主动市价卖出")
+                    else:
+                        warning("⚠️ 市价卖出失败，强制跳过避免卡住")
+                    return result
+                info(f"等待挂单成交... ({self.insufficient_balance_count}/2)")
+                await asyncio.sleep(5)
+
+            if self.insufficient_balance_count >= 5:
+                await self._refresh_page("余额不足，刷新页面")
+                self.insufficient_balance_count = 0
+
+            record(self.buy_price, 0, False, f"余额不足: {balance_before:.2f}")
+            return result
+
+        self.insufficient_balance_count = 0
+
+        # ========== 勾选反向订单 ==========
+        info("勾选反向订单")
+        if not await self.browser.toggle_checkbox(self.CSS["checkbox"], should_check=True):
+            await self._refresh_page("复选框失败，刷新页面")
+            record(self.buy_price, 0, False, "复选框操作失败")
+            return result
+
+        # ========== 填写买入信息 ==========
+        buy_price = self.buy_price * self.config.price.buy_price_percent + self.config.price.buy_price_diff
+        reverse_sell_price = buy_price * self.config.price.sell_price_percent
+        info(f"输入买价: {buy_price:.6f}，成交额: {cost}，反向卖价: {reverse_sell_price:.6f}")
+        await self.browser.fill_input(self.XPATH["limit_price"], buy_price)
+        await self.browser.fill_input(self.XPATH["limit_total_buy"], cost)
+        await self.browser.fill_input(self.XPATH["limit_total_sell"], reverse_sell_price)
+
+        # ========== 提交订单 ==========
+        await self.browser.scroll_to("bottom", xpath=self.XPATH["trade_scroll"])
+        await self.browser.scroll_to("bottom")
+
+        info("点击购买")
+        if not await self.browser.click(self.XPATH["buy_button"], timeout=5):
+            warning("点击购买按钮失败")
+            record(buy_price, 0, False, "点击购买按钮失败")
+            return result
+
+        await asyncio.sleep(0.3)
+        confirm_clicked = await self.browser.click(self.XPATH["confirm_button"], timeout=1)
+        if not confirm_clicked:
+            if await self.browser.click(self.XPATH["cancel_slippage"], timeout=0.5):
+                warning("滑点过大，取消交易")
+                record(buy_price, 0, False, "滑点过大")
+                return result
+            if not await self.browser.click(self.XPATH["confirm_button"], timeout=1):
+                warning("未能点击确认按钮")
+                record(buy_price, 0, False, "未能点击确认按钮")
+                return result
+
+        await asyncio.sleep(0.8)
+
+        # ========== 验证交易结果（余额变化） ==========
+        info("验证交易结果...")
+        expected_amount = cost / buy_price if buy_price > 0 else 0
+        wait_start = time.time()
+        while True:
+            await self.browser.click_tab(0)
+            snap = await self.browser.snapshot()
+            current_balance = AlphaTrader._usdt_balance_from(snap)
+            if current_balance is not None:
+                balance_change = current_balance - balance_before
+
+                # 余额几乎不变：买卖都已成交
+                if abs(balance_change) < cost * 0.05:
+                    record(buy_price, expected_amount, True)
+                    success(f"🎉 完整交易已成交！（余额变化: {balance_change:+.2f}）")
+                    result.update(success=True, holding=0, buy_price=buy_price, complete_trade=True)
+                    return result
+
+                # 余额大幅减少：买单成交，等待反向卖单
+                if balance_change < -cost * 0.5:
+                    await self.browser.click_tab(1)
+                    await asyncio.sleep(0.3)
+                    holding = AlphaTrader._holding_from(await self.browser.snapshot())
+                    record(buy_price, expected_amount, True)
+                    success(f"✅ 买入成交！持仓: {holding:.4f}，等待反向卖单...")
+                    result.update(success=True, holding=holding, buy_price=buy_price)
+                    return result
+
+            if time.time() - wait_start >= self.buy_order_timeout:
+                break
+            info(f"订单可能在挂单中，等待成交... 挂单: {snap.open_orders if snap else '?'}")
+            await asyncio.sleep(self.buy_order_check_interval)
+
+        warning("买单超时未成交，取消买单")
+        await self._cancel_orders()
+        record(buy_price, 0, False, "买单超时未成交")
+        return result
+
+    async def _wait_for_reverse_order_filled(self, initial_holding: float, max_wait: int = 60) -> bool:
+        """等待反向卖单成交（挂单消失、余额恢复或持仓减半即视为成交）"""
+        info(f"等待反向卖单成交，初始持仓: {initial_holding:.4f}，最长等待 {max_wait} 秒")
+        start_time = time.time()
+        check_interval = 3
+        had_pending_orders = None
+
+        while time.time() - start_time < max_wait:
+            await asyncio.sleep(check_interval)
+            elapsed = int(time.time() - start_time)
+
+            snap = await self.browser.snapshot()
+            pending_count = snap.open_orders if snap else 0
+            if had_pending_orders is None:
+                had_pending_orders = pending_count > 0
+
+            if had_pending_orders and pending_count == 0:
+                success(f"✅ 反向卖单已成交！（挂单已消失，{elapsed}s）")
+                return True
+
+            await self.browser.click_tab(0)
+            await asyncio.sleep(0.2)
+            current_balance = AlphaTrader._usdt_balance_from(await self.browser.snapshot()) or 0
+            if current_balance >= self.config.trade.cost * 0.9:
+                success(f"✅ 反向卖单已成交！（余额已恢复: {current_balance:.2f}，{elapsed}s）")
+                return True
+
+            await self.browser.click_tab(1)
+            await asyncio.sleep(0.2)
+            current_holding = AlphaTrader._holding_from(await self.browser.snapshot())
+            if current_holding < initial_holding * 0.5:
+                success(f"✅ 反向卖单已成交！持仓: {initial_holding:.4f} → {current_holding:.4f}")
+                return True
+
+            info(f"等待中... {elapsed}s, 余额: {current_balance:.2f}, 挂单: {pending_count}")
+
+        warning(f"等待 {max_wait} 秒后反向卖单仍未成交")
+        return False
+
+    async def _market_sell_with_retry(self, attempts: int = 3) -> bool:
+        """市价卖出，失败最多重试 attempts 次"""
+        for attempt in range(attempts):
+            if await self._market_sell():
+                return True
+            warning(f"市价卖出失败，重试 ({attempt + 1}/{attempts})...")
+            await asyncio.sleep(2)
+        return False
+
+    async def _market_sell(self) -> bool:
+        """市价卖出当前持仓（先取消挂单释放锁定资产）"""
+        info("执行市价卖出...")
+
+        if await self.browser.get_pending_order_count() > 0:
+            await self.browser.scroll_to("bottom")
+            await self._cancel_orders()
+            await asyncio.sleep(1)
+
+        await self.browser.click_tab(1)
+        await asyncio.sleep(0.5)
+
+        snap = await self.browser.snapshot()
+        holding = AlphaTrader._holding_from(snap)
+        info(f"当前可卖持仓: {holding}")
+        if holding <= self.config.trade.min_sell_amount:
+            info(f"持仓 {holding} <= 最小卖出量，无需卖出")
+            return True
+
+        current_price = snap.price if snap and snap.price else self.buy_price
+        sell_price = current_price * 0.9995
+        sell_amount = holding - self.config.trade.reserved_amount
+        info(f"市价卖出价: {sell_price:.6f}，数量: {sell_amount:.4f}")
+        await self.browser.fill_input(self.XPATH["limit_price"], sell_price)
+        await self.browser.fill_input(self.XPATH["limit_amount"], sell_amount)
+
+        await self.browser.scroll_to("bottom", xpath=self.XPATH["trade_scroll"])
+        await self.browser.toggle_checkbox(self.CSS["checkbox"], should_check=False)
+        await self.browser.scroll_to("bottom")
+
+        info("点击卖出")
+        if not await self.browser.click(self.XPATH["sell_button"]):
+            warning("点击卖出按钮失败")
+            return False
+
+        await asyncio.sleep(0.3)
+        if await self.browser.click(self.XPATH["confirm_button"], timeout=1):
+            success("✅ 市价卖出已成交")
+            await self.browser.click(self.XPATH["continue_button"], timeout=1)
+            return True
+        if await self.browser.click(self.XPATH["confirm_slippage"], timeout=0.5):
+            success("✅ 市价卖出已成交")
+            return True
+
+        warning("卖出确认失败")
+        return False
+
+    async def _cancel_orders(self) -> None:
+        """取消未成交订单"""
+        initial_count = await self.browser.get_pending_order_count()
+        if initial_count == 0:
+            info("无挂单需要取消")
+            return
+
+        info(f"检查未成交挂单 (共 {initial_count} 个)...")
+        await self.browser.scroll_to("right", xpath=self.XPATH["order_table"])
+        await asyncio.sleep(0.5)
+
+        max_retries = 3
+        for i in range(max_retries):
+            cancelled = (
+                await self.browser.click(self.XPATH["cancel_all_btn"], timeout=2)
+                or await self.browser.click(self.XPATH["cancel_order_link"], timeout=1)
+                or await self.browser.click(self.XPATH["cancel_single_btn"], timeout=1)
+            )
+
+            if cancelled:
+                await asyncio.sleep(0.5)
+                confirm_clicked = (
+                    await self.browser.click(self.XPATH["cancel_confirm"], timeout=2)
+                    or await self.browser.click(self.XPATH["cancel_confirm_alt"], timeout=2)
+                )
+                if confirm_clicked:
+                    success("✅ 点击确认取消")
+                    self.stats.record_cancel(True)
+                    await asyncio.sleep(1)
+                else:
+                    warning("未找到确认取消按钮")
+
+            current_count = await self.browser.get_pending_order_count()
+            if current_count == 0:
+                success("✅ 所有挂单已取消")
+                break
+            if i < max_retries - 1:
+                warning(f"仍有 {current_count} 个挂单，重试取消 ({i + 1}/{max_retries})...")
+                await self.browser.scroll_to("bottom")
+                await self.browser.scroll_to("right", xpath=self.XPATH["order_table"])
+                await asyncio.sleep(1)
+
+    async def _finalize(self) -> None:
+        """完成交易后的清理和统计"""
+        step("完成交易，执行最终状态检查")
+
+        info("等待最后一笔交易结算 (10s)...")
+        await asyncio.sleep(10)
+
+        await self.browser.scroll_to("bottom")
+        if await self.browser.get_pending_order_count() > 0:
+            await self._cancel_orders()
+            await asyncio.sleep(3)
+
+        await self.browser.scroll_to("top")
+        await self.browser.click_tab(1)
+        await asyncio.sleep(0.5)
+        holding = AlphaTrader._holding_from(await self.browser.snapshot())
+        if holding > self.config.trade.min_sell_amount:
+            info(f"发现持仓 {holding:.4f}，执行清仓...")
+            await self._market_sell()
+            await asyncio.sleep(5)
+
+        info("等待余额稳定 (5s)...")
+        await asyncio.sleep(5)
+
+        final_balance = None
+        balance_samples = []
+        for retry in range(5):
+            await self.browser.click_tab(0)
+            await asyncio.sleep(1)
+            balance = AlphaTrader._usdt_balance_from(await self.browser.snapshot())
+            if balance:
+                balance_samples.append(balance)
+                if len(balance_samples) >= 2 and balance_samples[-1] == balance_samples[-2]:
+                    final_balance = balance
+                    break
+            if retry < 4:
+                await asyncio.sleep(2)
+
+        if final_balance is None and balance_samples:
+            final_balance = balance_samples[-1]
+
+        if final_balance:
+            success(f"✅ 最终余额: {final_balance:.4f} USDT")
+            await self._save_balance(final_balance)
+            self.stats.set_end_balance(final_balance)
+        else:
+            warning("⚠️ 无法获取最终余额，统计数据可能不准确")
+
+        self.stats.print_summary()
+        self.stats.save_to_file(
+            f"logs/stats_{self.config.trade.username}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        )
+
+    async def _refresh_reason(self) -> Optional[str]:
+        """判断本轮是否需要刷新页面（规则同 AlphaTrader._refresh_reason）"""
+        if self.refresh_pending:
+            return self.refresh_pending
+        if self.config.interval.refresh_mode == RefreshMode.INTERVAL:
+            if self.loop_count % self.config.interval.refresh_interval == 0:
+                return "定期刷新页面"
+            return None
+        reason = self.health.observe(await self.browser.performance_metrics())
+        return f"页面健康: {reason}，刷新页面" if reason else None
+
+    async def _refresh_page(self, reason: str) -> bool:
+        """
+        刷新页面直到可交易（未就绪时间隔 3 秒再刷新，最长 60 秒）
+
+        Returns:
+            页面是否可交易；失败时记下原因，下一轮先重试刷新
+        """
+        info(reason)
+        if not await self.browser.refresh_until_element(
+            self.target_url,
+            self.XPATH["page_loaded"],
+            delay=3,
+            timeout=60
+        ):
+            error(f"❌ 刷新后页面仍不可交易（{reason}），本轮中止，下一轮重试刷新")
+            self.refresh_pending = reason
+            return False
+        self.refresh_pending = None
+        self.health.reset()
+        return True
+
+    async def _save_balance(self, balance: float) -> None:
+        """保存余额记录（文件写入放到线程中）"""
+        filename = f"{self.config.trade.username}.csv"
+        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        def write() -> None:
+            data = pd.DataFrame([[timestamp, balance]], columns=["时间", "可用余额"])
+            file_exists = os.path.exists(filename)
+            data.to_csv(filename, mode="a", header=not file_exists, index=False, encoding="utf-8-sig")
+
+        await asyncio.to_thread(write)
+        info(f"余额已记录: {balance}")
+
+
+def unsupported_settings(config: Config) -> List[str]:
+    """
+    异步模式无法执行的配置项
+
+    Returns:
+        配置项说明列表（为空表示可以用异步模式运行）
+    """
+    unsupported = []
+    if config.trade.volume_target > 0:
+        unsupported.append(f"volume_target={config.trade.volume_target}")
+    if config.trade.volume_deadline:
+        unsupported.append(f"volume_deadline={config.trade.volume_deadline}")
+    if config.interval.finish_by:
+        unsupported.append(f"finish_by={config.interval.finish_by}")
+    if config.trade.max_inflight > 1:
+        unsupported.append(f"max_inflight={config.trade.max_inflight}")
+    return unsupported
+
+
+def random_interval(min_seconds: float, max_seconds: float) -> float:
+    """随机休眠时长（异步版 random_sleep 只计算时长，由调用方 await）"""
+    duration = random.uniform(min_seconds, max_seconds)
+    info(f"休眠 {int(duration)}s...")
+    return duration
+
+
+async def run_account_async(account_name: str, playwright: Optional[Playwright] = None) -> None:
+    """
+    运行指定账号（供单进程多账号调度）
+
+    Args:
+        account_name: 账号名称
+        playwright: 共享的 Playwright 实例
+    """
+    use_account_context(account_name)
+    try:
+        config = get_account_config(account_name)
+        if not config:
+            error(f"未找到账号配置: {account_name}")
+            return
+
+        step(f"启动账号: {account_name}")
+        await AsyncAlphaTrader(config, playwright=playwright).run()
+
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        error(f"账号 {account_name} 运行异常: {e}")
+    finally:
+        reset_logger()
+
+
+def main():
+    """单账号调试入口"""
+    parser = argparse.ArgumentParser(description="Alpha 自动化交易脚本（异步版）")
+    parser.add_argument("--account", "-a", type=str, required=True, help="账号名称（对应 accounts.yaml 中的 name）")
+    args = parser.parse_args()
+
+    async def runner() -> None:
+        async with async_playwright() as playwright:
+            await run_account_async(args.account, playwright)
+
+    try:
+        asyncio.run(runner())
+    except KeyboardInterrupt:
+        warning("\n⚠️ 用户中断 (Ctrl+C)")
+
+
+if __name__ == "__main__":
+    main()
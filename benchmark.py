@@ -0,0 +1,573 @@
+"""
+性能基准脚本 - 对比不同运行模式的资源占用
+
+使用方式:
+    python benchmark.py runner-modes -n 4
+        # 进程模式 vs 单进程模式：仅启动 Playwright 驱动，对比驱动本身的内存/CPU 开销
+    python benchmark.py runner-modes --ports 9222 9223 --duration 60
+        # 连接已运行的 Chrome，每个账号持续轮询页面快照，对比真实负载下的开销
+    python benchmark.py scroll --port 9222 -n 20
+        # 旧版 30 次鼠标滚轮 vs 单次 evaluate 滚动，输出单次耗时与每轮交易的节省
+    python benchmark.py routing -n 10
+        # 本地模拟交易页（图片/字体/埋点/营销组件），对比各路由配置的就绪时间与渲染进程内存
+    python benchmark.py launch-profiles -n 3 --duration 30
+        # 每种 Chrome 启动配置各启动 3 个实例，记录单实例内存/CPU 与后台标签页定时器抖动
+
+说明:
+    scroll 需要已运行并打开交易页面的 Chrome。
+    routing 默认启动 Playwright 自带的无头 Chromium，指定 --port 时在已运行的 Chrome 中新开标签页。
+    launch-profiles 使用 --chrome-path（默认取配置中的 CHROME_PATH）和临时用户数据目录，统计含 Chrome 进程树。
+    资源统计依赖 psutil（pip install psutil）。统计范围为 Python 进程及其 Playwright
+    Node 驱动子进程，不含 Chrome 本身（两种模式下 Chrome 实例数量相同）。
+"""
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+# ============================================
+# 资源采样
+# ============================================
+
+def sample_process_tree(
+    processes: List[subprocess.Popen],
+    interval: float = 0.5,
+    duration: Optional[float] = None
+) -> Dict[str, float]:
+    """
+    采样进程树（含子进程）的内存与 CPU，直到所有进程退出或达到 duration
+
+    Args:
+        processes: 被测进程
+        interval: 采样间隔（秒）
+        duration: 最长采样时间（秒，None 表示等待进程退出）
+
+    Returns:
+        {"peak_rss_mb", "avg_rss_mb", "cpu_seconds", "process_count"}
+    """
+    cpu_by_pid: Dict[int, float] = {}
+    rss_samples: List[float] = []
+    max_process_count = 0
+    deadline = time.time() + duration if duration is not None else None
+
+    while any(p.poll() is None for p in processes) and (deadline is None or time.time() < deadline):
+        total_rss = 0
+        seen = 0
+        for p in processes:
+            try:
+                root = psutil.Process(p.pid)
+                tree = [root] + root.children(recursive=True)
+            except psutil.NoSuchProcess:
+                continue
+            for proc in tree:
+                try:
+                    total_rss += proc.memory_info().rss
+                    times = proc.cpu_times()
+                    cpu_by_pid[proc.pid] = times.user + times.system
+                    seen += 1
+                except psutil.NoSuchProcess:
+                    pass
+        if seen:
+            rss_samples.append(total_rss / 1024 / 1024)
+            max_process_count = max(max_process_count, seen)
+        time.sleep(interval)
+
+    return {
+        "peak_rss_mb": max(rss_samples) if rss_samples else 0,
+        "avg_rss_mb": sum(rss_samples) / len(rss_samples) if rss_samples else 0,
+        "cpu_seconds": sum(cpu_by_pid.values()),
+        "process_count": max_process_count,
+    }
+
+
+def print_table(title: str, rows: Dict[str, Dict[str, float]]) -> None:
+    """打印对比表"""
+    print("\n" + "=" * 72)
+    print(f"📊 {title}")
+    print("=" * 72)
+    print(f"{'模式':<16}{'进程数':>8}{'峰值内存(MB)':>16}{'平均内存(MB)':>16}{'CPU(s)':>12}")
+    print("-" * 72)
+    for name, r in rows.items():
+        print(f"{name:<16}{r['process_count']:>8}{r['peak_rss_mb']:>16.1f}{r['avg_rss_mb']:>16.1f}{r['cpu_seconds']:>12.2f}")
+    print()
+
+
+# ============================================
+# 运行模式对比：进程模式 vs 单进程 asyncio 模式
+# ============================================
+
+def _worker_sync(port: Optional[int], duration: float) -> None:
+    """进程模式的单个账号：独立 Python 进程 + 独立 Node 驱动"""
+    from playwright.sync_api import sync_playwright
+    from browser_manager import BrowserManager
+    from main import AlphaTrader
+
+    if port is None:
+        with sync_playwright():
+            time.sleep(duration)
+        return
+
+    browser = BrowserManager(port=port, xpaths=AlphaTrader.XPATH, css=AlphaTrader.CSS)
+    if not browser.connect():
+        return
+    deadline = time.time() + duration
+    while time.time() < deadline:
+        browser.snapshot()
+        time.sleep(0.2)
+    browser.disconnect()
+
+
+async def _worker_async(count: int, ports: List[int], duration: float) -> None:
+    """单进程模式：一个事件循环、一个 Node 驱动，每个账号一个 Task"""
+    from playwright.async_api import async_playwright
+    from async_browser_manager import AsyncBrowserManager
+    from main import AlphaTrader
+
+    async def poll(port: int) -> None:
+        browser = AsyncBrowserManager(port=port, xpaths=AlphaTrader.XPATH, css=AlphaTrader.CSS)
+        if not await browser.connect(playwright=playwright):
+            return
+        deadline = time.time() + duration
+        while time.time() < deadline:
+            await browser.snapshot()
+            await asyncio.sleep(0.2)
+        await browser.disconnect()
+
+    async with async_playwright() as playwright:
+        if ports:
+            await asyncio.gather(*(poll(port) for port in ports))
+        else:
+            await asyncio.sleep(duration)
+
+
+def bench_runner_modes(args: argparse.Namespace) -> None:
+    """对比 multi_runner 的进程模式与 --async 单进程模式"""
+    ports = args.ports or []
+    count = len(ports) or args.count
+    worker = [sys.executable, __file__, "_worker", "--duration", str(args.duration)]
+
+    print(f"⏳ 进程模式: 启动 {count} 个进程，运行 {args.duration}s ...")
+    procs = [
+        subprocess.Popen(worker + ["--mode", "sync"] + (["--port", str(ports[i])] if ports else []))
+        for i in range(count)
+    ]
+    process_mode = sample_process_tree(procs)
+
+    print(f"⏳ 单进程模式: 1 个进程调度 {count} 个账号，运行 {args.duration}s ...")
+    proc = subprocess.Popen(
+        worker + ["--mode", "async", "--count", str(count)]
+        + (["--ports"] + [str(p) for p in ports] if ports else [])
+    )
+    async_mode = sample_process_tree([proc])
+
+    workload = "轮询页面快照" if ports else "仅驱动空载"
+    print_table(f"运行模式对比（{count} 个账号，{workload}）", {
+        "进程模式": process_mode,
+        "单进程 asyncio": async_mode,
+    })
+
+
+# ============================================
+# 滚动：30 次鼠标滚轮 vs 单次 evaluate
+# ============================================
+
+def _timed(fn, iterations: int) -> List[float]:
+    """执行 iterations 次，返回每次耗时（毫秒）"""
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def bench_scroll(args: argparse.Namespace) -> None:
+    """对比 scroll_to 的 wheel 模式与 fast 模式"""
+    from browser_manager import BrowserManager
+    from main import AlphaTrader
+    from trade_stats import percentile
+
+    browser = BrowserManager(port=args.port, xpaths=AlphaTrader.XPATH, css=AlphaTrader.CSS)
+    if not browser.connect():
+        print("❌ 连接 Chrome 失败")
+        return
+
+    directions = ["bottom", "top"]
+
+    def wheel(i: int) -> None:
+        browser.scroll_to(directions[i % 2], mode="wheel")
+
+    def fast(i: int) -> None:
+        browser.scroll_to(directions[i % 2], mode="fast")
+
+    def fast_in_place(i: int) -> None:
+        # 已在底部：页面内判断后直接返回，只付出一次 evaluate
+        browser.scroll_to("bottom", mode="fast")
+
+    try:
+        results = {
+            "30 次滚轮": _timed(wheel, args.iterations),
+            "单次 evaluate": _timed(fast, args.iterations),
+            "已在目标位置": _timed(fast_in_place, args.iterations),
+        }
+    finally:
+        browser.disconnect()
+
+    print("\n" + "=" * 72)
+    print(f"📊 页面滚动耗时（{args.iterations} 次，单位 ms）")
+    print("=" * 72)
+    print(f"{'方式':<16}{'平均':>12}{'P50':>12}{'P99':>12}")
+    print("-" * 72)
+    for name, samples in results.items():
+        mean = sum(samples) / len(samples)
+        print(f"{name:<16}{mean:>12.2f}{percentile(samples, 50):>12.2f}{percentile(samples, 99):>12.2f}")
+
+    wheel_mean = sum(results["30 次滚轮"]) / args.iterations
+    fast_mean = sum(results["单次 evaluate"]) / args.iterations
+    saved = (wheel_mean - fast_mean) * args.per_cycle
+    print(f"\n⏱️ 每轮交易约 {args.per_cycle} 次页面滚动，预计节省 {saved:.0f}ms / 轮\n")
+
+
+# ============================================
+# 请求路由：本地模拟交易页
+# ============================================
+
+_MOCK_PAGE = """<!doctype html>
+<html><head>
+<meta charset="utf-8">
+<style>
+  @font-face { font-family: f0; src: url(/fonts/f0.woff2); }
+  @font-face { font-family: f1; src: url(/fonts/f1.woff2); }
+  @font-face { font-family: f2; src: url(/fonts/f2.woff2); }
+  body { font-family: f0, f1, f2, sans-serif; }
+</style>
+<script src="/analytics/collect.js" async></script>
+<script src="/marketing/widget.js" async></script>
+</head><body>
+<div id="panel"><span id="price">--</span><button id="buy">买入</button></div>
+<div id="banners">%s</div>
+<script>
+  fetch("/api/account").then(r => r.json()).then(data => {
+    document.getElementById("price").textContent = data.price;
+    window.__tradeReady = performance.now();
+  });
+</script>
+</body></html>"""
+
+_MOCK_WIDGET_JS = """
+(() => {
+  const root = document.createElement("div");
+  for (let i = 0; i < 2000; i++) {
+    const item = document.createElement("div");
+    item.textContent = "promo " + i;
+    root.appendChild(item);
+  }
+  document.body.appendChild(root);
+  window.__promo = new Array(200000).fill(0).map((_, i) => ({ id: i }));
+})();
+"""
+
+
+def _noise_png(width: int, height: int) -> bytes:
+    """生成随机噪点 PNG（几乎不可压缩，解码后占用真实内存）"""
+    raw = b"".join(b"\x00" + os.urandom(width * 3) for _ in range(height))
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xffffffff)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw, 1)) + chunk(b"IEND", b"")
+
+
+def _start_mock_server(images: int, delay: float):
+    """
+    启动本地模拟交易页
+
+    Args:
+        images: 横幅图片数量
+        delay: 埋点/营销脚本的模拟延迟（秒）
+
+    Returns:
+        (server, url, served)，served 为按路径前缀统计的 {前缀: 字节数}
+    """
+    png = _noise_png(400, 300)
+    font = os.urandom(80 * 1024)
+    banners = "".join(f'<img src="/img/banner_{i}.png" width="400" height="300">' for i in range(images))
+    served: Dict[str, int] = {}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split("?")[0]
+            if path == "/":
+                body, ctype = (_MOCK_PAGE % banners).encode("utf-8"), "text/html; charset=utf-8"
+            elif path.startswith("/img/"):
+                body, ctype = png, "image/png"
+            elif path.startswith("/fonts/"):
+                body, ctype = font, "font/woff2"
+            elif path.startswith("/analytics/"):
+                time.sleep(delay)
+                body, ctype = b"window.__collected = true;", "application/javascript"
+            elif path.startswith("/marketing/"):
+                time.sleep(delay)
+                body, ctype = _MOCK_WIDGET_JS.encode("utf-8"), "application/javascript"
+            elif path == "/api/account":
+                time.sleep(0.05)
+                body, ctype = json.dumps({"price": "1.2345"}).encode("utf-8"), "application/json"
+            else:
+                self.send_error(404)
+                return
+            prefix = "/" + path.strip("/").split("/")[0]
+            with lock:
+                served[prefix] = served.get(prefix, 0) + len(body)
+            self.send_response(200)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/", served
+
+
+def bench_routing(args: argparse.Namespace) -> None:
+    """对比各路由配置的页面就绪时间、传输字节和渲染进程内存"""
+    from playwright.sync_api import sync_playwright
+    from routing import RequestRouter, get_profile
+    from trade_stats import percentile
+
+    server, url, served = _start_mock_server(args.images, args.delay)
+    playwright = sync_playwright().start()
+    if args.port:
+        browser = playwright.chromium.connect_over_cdp(f"http://127.0.0.1:{args.port}")
+        context = browser.contexts[0]
+    else:
+        browser = playwright.chromium.launch(headless=True)
+        context = browser.new_context()
+
+    results: Dict[str, Dict[str, List[float]]] = {}
+    blocked: Dict[str, int] = {}
+    try:
+        for name in args.profiles:
+            profile = get_profile(name)
+            rows = results.setdefault(name, {"ready": [], "load": [], "heap": [], "nodes": [], "kb": []})
+            for _ in range(args.iterations):
+                page = context.new_page()
+                session = context.new_cdp_session(page)
+                session.send("Network.setCacheDisabled", {"cacheDisabled": True})
+                session.send("Performance.enable")
+                router = RequestRouter(page, profile)
+                router.attach()
+                served.clear()
+
+                start = time.perf_counter()
+                page.goto(url, wait_until="load")
+                load_ms = (time.perf_counter() - start) * 1000
+                page.wait_for_function("window.__tradeReady !== undefined")
+                ready_ms = page.evaluate("window.__tradeReady")
+                # 给异步脚本留出执行时间，内存读数包含营销组件的影响
+                page.wait_for_timeout(args.delay * 1000 + 200)
+                metrics = {m["name"]: m["value"] for m in session.send("Performance.getMetrics")["metrics"]}
+
+                rows["ready"].append(ready_ms)
+                rows["load"].append(load_ms)
+                rows["heap"].append(metrics.get("JSHeapUsedSize", 0) / 1024 / 1024)
+                rows["nodes"].append(metrics.get("Nodes", 0))
+                rows["kb"].append(sum(served.values()) / 1024)
+                for rule, row in router.stats.items():
+                    blocked[f"{name} {rule}"] = blocked.get(f"{name} {rule}", 0) + row["requests"]
+                page.close()
+    finally:
+        if args.port:
+            playwright.stop()
+        else:
+            browser.close()
+            playwright.stop()
+        server.shutdown()
+
+    print("\n" + "=" * 88)
+    print(f"📊 请求路由对比（{args.iterations} 次，{args.images} 张图片，埋点/营销延迟 {args.delay * 1000:.0f}ms）")
+    print("=" * 88)
+    print(f"{'配置':<10}{'交易就绪P50':>14}{'交易就绪P99':>14}{'load P50':>12}{'JS堆(MB)':>12}{'DOM节点':>10}{'传输(KB)':>12}")
+    print("-" * 88)
+    for name, rows in results.items():
+        mean = lambda key: sum(rows[key]) / len(rows[key])
+        print(f"{name:<10}{percentile(rows['ready'], 50):>14.1f}{percentile(rows['ready'], 99):>14.1f}"
+              f"{percentile(rows['load'], 50):>12.1f}{mean('heap'):>12.1f}{mean('nodes'):>10.0f}{mean('kb'):>12.0f}")
+    if blocked:
+        print("\n🚫 拦截次数（累计）:")
+        for rule, count in blocked.items():
+            print(f"  {rule}: {count}")
+    print("\n说明: JS 堆与 DOM 节点取自 CDP Performance.getMetrics，不含图片解码内存；传输字节为模拟服务器实际发送量\n")
+
+
+# ============================================
+# Chrome 启动配置：单实例内存/CPU 与定时器抖动
+# ============================================
+
+# 每 50ms 记录一次定时器实际触发的延迟
+_TIMER_PROBE_JS = """
+() => {
+    window.__lateness = [];
+    let last = performance.now();
+    setInterval(() => {
+        const now = performance.now();
+        window.__lateness.push(now - last - 50);
+        last = now;
+    }, 50);
+}
+"""
+
+
+def bench_launch_profiles(args: argparse.Namespace) -> None:
+    """对比各启动配置的单实例资源占用与后台标签页定时器抖动"""
+    from playwright.sync_api import sync_playwright
+    from browser_manager import LAUNCH_PROFILES, chrome_launch_args
+    from config import BrowserConfig
+    from devtools_client import wait_until_ready
+    from trade_stats import percentile
+
+    chrome_path = args.chrome_path or BrowserConfig().chrome_path
+    rows: Dict[str, Dict[str, float]] = {}
+    jitter: Dict[str, List[float]] = {}
+
+    for offset, profile in enumerate(args.profiles):
+        if profile not in LAUNCH_PROFILES:
+            print(f"⚠️ 跳过未知配置: {profile}")
+            continue
+        print(f"⏳ {profile}: 启动 {args.count} 个实例，运行 {args.duration}s ...")
+        procs: List[subprocess.Popen] = []
+        dirs: List[str] = []
+        playwright = sync_playwright().start()
+        try:
+            probes = []
+            for i in range(args.count):
+                port = args.base_port + offset * args.count + i
+                user_data_dir = tempfile.mkdtemp(prefix=f"cdp_bench_{profile}_")
+                dirs.append(user_data_dir)
+                launch_time = time.time()
+                procs.append(subprocess.Popen(
+                    chrome_launch_args(port, chrome_path, user_data_dir, profile) + ["about:blank"],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                ))
+                if wait_until_ready(port, user_data_dir, timeout=30, since=launch_time) is None:
+                    print(f"❌ 端口 {port} 未就绪")
+                    continue
+                browser = playwright.chromium.connect_over_cdp(f"http://127.0.0.1:{port}")
+                context = browser.contexts[0]
+                probe = context.pages[0] if context.pages else context.new_page()
+                probe.evaluate(_TIMER_PROBE_JS)
+                # 打开第二个标签页并置前，被测页面转入后台
+                context.new_page().bring_to_front()
+                probes.append(probe)
+
+            rows[profile] = sample_process_tree(procs, duration=args.duration)
+            jitter[profile] = [ms for probe in probes for ms in probe.evaluate("window.__lateness")]
+        finally:
+            playwright.stop()
+            for proc in procs:
+                proc.terminate()
+                try:
+                    proc.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+            for user_data_dir in dirs:
+                shutil.rmtree(user_data_dir, ignore_errors=True)
+
+    print("\n" + "=" * 96)
+    print(f"📊 Chrome 启动配置对比（每种 {args.count} 个实例，{args.duration}s，后台标签页 50ms 定时器）")
+    print("=" * 96)
+    print(f"{'配置':<12}{'进程数':>8}{'单实例内存(MB)':>16}{'单实例峰值(MB)':>16}{'单实例CPU(s)':>14}"
+          f"{'延迟P50(ms)':>13}{'延迟P99(ms)':>13}")
+    print("-" * 96)
+    for profile, r in rows.items():
+        samples = jitter.get(profile) or [0.0]
+        print(f"{profile:<12}{r['process_count']:>8}{r['avg_rss_mb'] / args.count:>16.1f}"
+              f"{r['peak_rss_mb'] / args.count:>16.1f}{r['cpu_seconds'] / args.count:>14.2f}"
+              f"{percentile(samples, 50):>13.1f}{percentile(samples, 99):>13.1f}")
+    print("\n说明: 内存为进程树 RSS 之和（共享内存会重复计入）；延迟为定时器实际触发时间超出 50ms 的部分\n")
+
+
+def main():
+    """主入口"""
+    parser = argparse.ArgumentParser(
+        description="性能基准脚本",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("runner-modes", help="对比进程模式与单进程 asyncio 模式的内存/CPU")
+    p.add_argument("--count", "-n", type=int, default=2, help="账号数量（未指定 --ports 时使用）")
+    p.add_argument("--ports", type=int, nargs="*", help="已运行 Chrome 的调试端口（每个端口一个账号）")
+    p.add_argument("--duration", type=float, default=20, help="每种模式运行时长（秒）")
+    p.set_defaults(func=bench_runner_modes)
+
+    p = sub.add_parser("scroll", help="对比 30 次鼠标滚轮与单次 evaluate 滚动的耗时")
+    p.add_argument("--port", type=int, default=9222, help="Chrome 调试端口")
+    p.add_argument("--iterations", "-n", type=int, default=20, help="每种方式执行次数")
+    p.add_argument("--per-cycle", type=int, default=6, help="每轮交易的页面滚动次数（用于估算节省）")
+    p.set_defaults(func=bench_scroll, needs_psutil=False)
+
+    p = sub.add_parser("routing", help="本地模拟交易页上对比各路由配置的就绪时间与内存")
+    p.add_argument("--port", type=int, help="使用已运行 Chrome 的调试端口（默认启动无头 Chromium）")
+    p.add_argument("--iterations", "-n", type=int, default=10, help="每种配置加载次数")
+    p.add_argument("--profiles", nargs="*", default=["off", "lite", "strict"], help="对比的路由配置")
+    p.add_argument("--images", type=int, default=20, help="模拟页面的横幅图片数量")
+    p.add_argument("--delay", type=float, default=0.3, help="埋点/营销脚本的模拟延迟（秒）")
+    p.set_defaults(func=bench_routing, needs_psutil=False)
+
+    p = sub.add_parser("launch-profiles", help="对比 Chrome 启动配置的单实例内存/CPU 与定时器抖动")
+    p.add_argument("--chrome-path", help="Chrome 可执行文件路径（默认取 CHROME_PATH 配置）")
+    p.add_argument("--count", "-n", type=int, default=2, help="每种配置启动的实例数")
+    p.add_argument("--duration", type=float, default=20, help="每种配置的采样时长（秒）")
+    p.add_argument("--base-port", type=int, default=9400, help="起始调试端口")
+    p.add_argument("--profiles", nargs="*", default=["default", "lean", "headless"], help="对比的启动配置")
+    p.set_defaults(func=bench_launch_profiles)
+
+    # 内部使用：被测子进程
+    w = sub.add_parser("_worker")
+    w.add_argument("--mode", choices=["sync", "async"], required=True)
+    w.add_argument("--port", type=int)
+    w.add_argument("--ports", type=int, nargs="*", default=[])
+    w.add_argument("--count", type=int, default=1)
+    w.add_argument("--duration", type=float, default=20)
+
+    args = parser.parse_args()
+
+    if args.command == "_worker":
+        if args.mode == "sync":
+            _worker_sync(args.port, args.duration)
+        else:
+            asyncio.run(_worker_async(args.count, args.ports, args.duration))
+        return
+
+    if psutil is None and getattr(args, "needs_psutil", True):
+        print("❌ 需要 psutil: pip install psutil")
+        return
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,24 +2,775 @@
 浏览器管理模块 - 封装 Playwright 操作
 提供统一的浏览器连接、页面操作和错误处理
 """
+import json
 import random
+import re
 import time
 import os
+from dataclasses import dataclass, field
 from datetime import datetime
 from functools import wraps
-from typing import Optional, Callable, Any, Tuple
+from typing import Optional, Callable, Any, Tuple, Dict, Iterable, Union, List
 from contextlib import contextmanager
 
-import requests
 from playwright.sync_api import sync_playwright, Page, Browser, Playwright, TimeoutError as PlaywrightTimeout
 
+from config import default_user_data_dir
 from logger import log, info, error, warning, success
+from dom_feed import DomChangeFeed, DomEvent, DomEventKind
+from market_feed import MarketFeed
+from account_state import AccountStateCache, OpenOrder
+from trade_stats import LatencyStats
+from devtools_client import Discovery, get_devtools_client, wait_until_ready
+from capture_service import CaptureService, Frame
+from routing import RequestRouter, RoutingProfile
 
 
 # ============================================
 # 截图目录
 # ============================================
 SCREENSHOT_DIR = "logs/screenshots"
+# 失败现场视口 JPEG 质量（capture_mode 为 dom 时改存序列化 HTML）
+CAPTURE_JPEG_QUALITY = 50
+
+
+# ============================================
+# 页面状态快照
+# ============================================
+
+# 验证器弹窗在 Shadow DOM 内的定位路径
+MFA_POPUP_SELECTOR = "div > div > div > div > div > div.height-container > div > div > div.mfa-verify-page > div.bn-formItem.web > div"
+
+# ============================================
+# 页面内选择器注册表
+# ============================================
+
+# 命名选择器预编译为 XPathExpression，缓存解析到的节点，
+# 节点仍在文档中（isConnected）则直接命中，否则重新解析
+_SELECTOR_REGISTRY_JS = """
+(selectors) => {
+    let R = window.__alphaSelectors;
+    if (!R) {
+        R = window.__alphaSelectors = {
+            exprs: {}, cache: {}, counters: {},
+            has(key) { return key in this.exprs; },
+            register(map) {
+                for (const [key, xpath] of Object.entries(map)) {
+                    try {
+                        this.exprs[key] = document.createExpression(xpath);
+                        this.counters[key] = this.counters[key] || { hits: 0, misses: 0 };
+                        delete this.cache[key];
+                    } catch (err) {
+                        console.warn("selector compile failed", key, err);
+                    }
+                }
+                return Object.keys(this.exprs).length;
+            },
+            node(key) {
+                const expr = this.exprs[key];
+                if (!expr) return null;
+                const cached = this.cache[key];
+                if (cached && cached.isConnected) {
+                    this.counters[key].hits++;
+                    return cached;
+                }
+                this.counters[key].misses++;
+                const node = expr.evaluate(
+                    document, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+                ).singleNodeValue;
+                if (node) this.cache[key] = node; else delete this.cache[key];
+                return node;
+            },
+            nodes(key) {
+                const expr = this.exprs[key];
+                if (!expr) return [];
+                const result = expr.evaluate(
+                    document, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+                );
+                const list = [];
+                for (let i = 0; i < result.snapshotLength; i++) list.push(result.snapshotItem(i));
+                return list;
+            },
+            text(key) {
+                const el = this.node(key);
+                return el ? (el.innerText || el.textContent) : null;
+            },
+            value(key) {
+                const el = this.node(key);
+                return el ? el.value : null;
+            },
+            stats() { return this.counters; },
+        };
+    }
+    return R.register(selectors);
+}
+"""
+
+# 验证器标志在无推送时的有效期（秒），超过后操作前重新实际检测
+MFA_FLAG_MAX_AGE = 2.0
+
+# 页面内验证器观察器：维护 window.__alphaMfa.visible，
+# 由其他 evaluate 调用顺带带回，避免每次操作前单独检测
+_MFA_WATCH_JS = """
+(selector) => {
+    if (window.__alphaMfa) return window.__alphaMfa.visible;
+    const state = window.__alphaMfa = { visible: false, flips: 0 };
+    let observedHost = null;
+    let pending = false;
+
+    const update = () => {
+        pending = false;
+        let visible = false;
+        const host = document.getElementById("mfa-shadow-host");
+        if (host && host.shadowRoot) {
+            if (observedHost !== host) {
+                // Shadow DOM 内部的变化不会冒泡到 document 观察器，单独监听
+                observedHost = host;
+                new MutationObserver(schedule).observe(host.shadowRoot, { childList: true, subtree: true });
+            }
+            visible = host.shadowRoot.querySelector(selector) !== null;
+        }
+        if (visible !== state.visible) {
+            state.visible = visible;
+            state.flips++;
+        }
+    };
+
+    function schedule() {
+        if (pending) return;
+        pending = true;
+        queueMicrotask(update);
+    }
+
+    const start = () => {
+        new MutationObserver(schedule).observe(document.documentElement, { childList: true, subtree: true });
+        update();
+    };
+    if (document.documentElement) {
+        start();
+    } else {
+        document.addEventListener("DOMContentLoaded", start, { once: true });
+    }
+    return state.visible;
+}
+"""
+
+# 一次 evaluate 读取交易循环所需的全部页面状态
+_SNAPSHOT_JS = """
+({priceKeys, balanceKey, xpaths, checkboxSelector, mfaSelector}) => {
+    const R = window.__alphaSelectors;
+    const textOf = (el) => el ? (el.innerText || el.textContent || '').trim() : null;
+    // 优先走选择器注册表，未注册时回退到直接解析 XPath
+    const first = (key) => (R && R.has(key)) ? R.node(key) : (xpaths[key] ? document.evaluate(
+        xpaths[key], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+    ).singleNodeValue : null);
+    const all = (key) => {
+        if (R && R.has(key)) return R.nodes(key);
+        if (!xpaths[key]) return [];
+        const result = document.evaluate(
+            xpaths[key], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+        );
+        const list = [];
+        for (let i = 0; i < result.snapshotLength; i++) list.push(result.snapshotItem(i));
+        return list;
+    };
+
+    // 最新成交价（按优先级尝试多个选择器）
+    let priceText = null;
+    for (const key of priceKeys) {
+        const text = textOf(first(key));
+        if (text) { priceText = text; break; }
+    }
+
+    // 可用余额（如果买卖两个面板同时渲染，会匹配到两个节点）
+    const balanceTexts = all(balanceKey).map(textOf);
+
+    // 当前选中的买入/卖出 Tab
+    const tabs = document.querySelectorAll(".bn-tab.bn-tab__buySell");
+    let selectedTab = -1;
+    tabs.forEach((tab, i) => {
+        if (tab.getAttribute("aria-selected") === "true") selectedTab = i;
+    });
+
+    // 反向订单复选框
+    const checkbox = checkboxSelector ? document.querySelector(checkboxSelector) : null;
+    const reverseChecked = checkbox ? checkbox.classList.contains("checked") : null;
+
+    // 当前委托数量
+    const orderPane = document.querySelector('#bn-tab-pane-orderOrder');
+    const rows = (orderPane || document).querySelectorAll('tbody.bn-web-table-tbody > tr[aria-rowindex]');
+
+    // 验证器弹窗
+    let mfaVisible = false;
+    try {
+        const shadowHost = document.querySelector("#mfa-shadow-host");
+        mfaVisible = !!(shadowHost && shadowHost.shadowRoot &&
+            shadowHost.shadowRoot.querySelector(mfaSelector));
+    } catch (err) {}
+
+    return {
+        priceText, balanceTexts, selectedTab, tabCount: tabs.length,
+        reverseChecked, openOrders: rows.length, mfaVisible
+    };
+}
+"""
+
+# 逐行读取当前委托表：按表头定位方向、价格、数量列，行的 data-row-key 作为订单号
+_OPEN_ORDERS_JS = """
+() => {
+    const pane = document.querySelector('#bn-tab-pane-orderOrder');
+    if (!pane) return null;
+    const headers = Array.from(pane.querySelectorAll('thead th')).map(th => (th.innerText || '').trim());
+    const column = (...names) => headers.findIndex(h => names.some(name => h.includes(name)));
+    const sideCol = column('方向', 'Side');
+    const priceCol = column('价格', 'Price');
+    const amountCol = column('数量', 'Amount');
+    return Array.from(pane.querySelectorAll('tbody.bn-web-table-tbody > tr[aria-rowindex]')).map(tr => {
+        const cells = Array.from(tr.querySelectorAll('td')).map(td => (td.innerText || '').trim());
+        const sideText = sideCol >= 0 ? (cells[sideCol] || '') : (tr.innerText || '');
+        const side = /卖|sell/i.test(sideText) ? 'SELL' : (/买|buy/i.test(sideText) ? 'BUY' : '');
+        return {
+            id: tr.getAttribute('data-row-key') || '',
+            side,
+            price: priceCol >= 0 ? (cells[priceCol] || null) : null,
+            amount: amountCol >= 0 ? (cells[amountCol] || null) : null,
+        };
+    });
+}
+"""
+
+# 点击当前委托表中指定订单的取消链接：有订单号按 data-row-key 定位，
+# 否则取第一行指定方向（且给定价格时价格相差不超过 0.1%）的订单
+_CANCEL_ORDER_ROW_JS = """
+({side, id, price}) => {
+    const pane = document.querySelector('#bn-tab-pane-orderOrder');
+    if (!pane) return false;
+    const headers = Array.from(pane.querySelectorAll('thead th')).map(th => (th.innerText || '').trim());
+    const sideCol = headers.findIndex(h => h.includes('方向') || h.includes('Side'));
+    const priceCol = headers.findIndex(h => h.includes('价格') || h.includes('Price'));
+    const pattern = side === 'SELL' ? /卖|sell/i : /买|buy/i;
+    for (const tr of pane.querySelectorAll('tbody.bn-web-table-tbody > tr[aria-rowindex]')) {
+        const cells = tr.querySelectorAll('td');
+        if (id) {
+            if (tr.getAttribute('data-row-key') !== id) continue;
+        } else {
+            const sideText = sideCol >= 0 && cells[sideCol] ? cells[sideCol].innerText : tr.innerText;
+            if (!pattern.test(sideText || '')) continue;
+            if (price > 0 && priceCol >= 0 && cells[priceCol]) {
+                const rowPrice = parseFloat((cells[priceCol].innerText || '').replace(/,/g, ''));
+                if (!(Math.abs(rowPrice - price) <= price * 0.001)) continue;
+            }
+        }
+        const link = Array.from(tr.querySelectorAll('a')).find(a =>
+            /取消|撤单|cancel/i.test(a.innerText || '') || /cancel/i.test(a.className || '')
+        );
+        if (link) { link.click(); return true; }
+    }
+    return false;
+}
+"""
+
+
+def parse_number(text: Optional[str]) -> Optional[float]:
+    """
+    从页面文本中解析数字（兼容千分位、换行和单位后缀）
+    
+    Args:
+        text: 页面文本，例如 "1,234.56 USDT"
+    
+    Returns:
+        解析出的数字或 None
+    """
+    if not text:
+        return None
+    cleaned = text.strip().replace('\n', '').replace(' ', '')
+    match = re.search(r'[\d,]*\.?\d+', cleaned)
+    if not match:
+        return None
+    try:
+        return float(match.group(0).replace(',', ''))
+    except ValueError:
+        return None
+
+
+@dataclass
+class PageSnapshot:
+    """页面状态快照（单次 page.evaluate 的结果）"""
+    price: Optional[float] = None               # 最新成交价
+    price_text: Optional[str] = None            # 原始价格文本（调试用）
+    buy_balance: Optional[float] = None         # 买入 Tab 可用余额（USDT）
+    sell_balance: Optional[float] = None        # 卖出 Tab 可用持仓（代币数量）
+    fresh_tabs: Tuple[int, ...] = ()            # 本次实际读到余额的 Tab，其余为上次缓存值
+    selected_tab: int = -1                      # 当前选中 Tab（0=买入，1=卖出，-1=未知）
+    reverse_checked: Optional[bool] = None      # 反向订单复选框状态（None=未找到）
+    open_orders: int = 0                        # 当前委托数量
+    mfa_visible: bool = False                   # 验证器弹窗是否可见
+    timestamp: float = field(default_factory=time.time)
+    
+    def balance(self, tab: int) -> Optional[float]:
+        """获取指定 Tab 的可用余额"""
+        return self.buy_balance if tab == 0 else self.sell_balance
+
+
+def _fill_matches(expected: Any, actual: Optional[str], tolerance: float) -> bool:
+    """回读值是否与填写值一致（数值按相对偏差比较）"""
+    if actual is None:
+        return False
+    expected_number = parse_number(str(expected))
+    actual_number = parse_number(actual)
+    if expected_number is None or actual_number is None:
+        return str(expected) == actual
+    return abs(actual_number - expected_number) <= tolerance * abs(expected_number)
+
+
+def snapshot_args(xpaths: Dict[str, str], css: Dict[str, str]) -> Dict[str, Any]:
+    """构造 _SNAPSHOT_JS 的参数"""
+    return {
+        "priceKeys": [key for key in ("current_price", "current_price_alt") if key in xpaths],
+        "balanceKey": "available_balance",
+        "xpaths": xpaths,
+        "checkboxSelector": css.get("checkbox"),
+        "mfaSelector": MFA_POPUP_SELECTOR,
+    }
+
+
+def panel_balances(texts: Optional[List[Optional[str]]], selected_tab: Optional[int]) -> Dict[int, float]:
+    """
+    按面板下标解析可用余额节点（快照和 DOM 余额推送共用）
+    
+    Args:
+        texts: 全部可用余额节点的文本（DOM 顺序）
+        selected_tab: 当前选中 Tab（-1/None 表示未知）
+    
+    Returns:
+        {面板下标: 余额}，买卖两个面板同时渲染时依次为买入(0)、卖出(1)，
+        只有一个节点时属于当前选中 Tab；未解析出数字的面板不在结果中
+    """
+    balances = [parse_number(text) for text in texts or []]
+    panels = {}
+    if len(balances) >= 2:
+        panels = {0: balances[0], 1: balances[1]}
+    elif len(balances) == 1 and selected_tab in (0, 1):
+        panels = {selected_tab: balances[0]}
+    return {tab: value for tab, value in panels.items() if value is not None}
+
+
+def build_snapshot(raw: Dict[str, Any], balance_cache: Dict[int, float]) -> PageSnapshot:
+    """
+    将 _SNAPSHOT_JS 返回的原始数据解析为 PageSnapshot
+    
+    Args:
+        raw: evaluate 返回的字典
+        balance_cache: 各 Tab 最近一次读到的余额（会被更新）
+    
+    Returns:
+        PageSnapshot
+    """
+    selected_tab = raw.get("selectedTab", -1)
+    fresh = panel_balances(raw.get("balanceTexts"), selected_tab)
+    balance_cache.update(fresh)
+    
+    price_text = raw.get("priceText")
+    return PageSnapshot(
+        price=parse_number(price_text),
+        price_text=price_text,
+        buy_balance=balance_cache.get(0),
+        sell_balance=balance_cache.get(1),
+        fresh_tabs=tuple(fresh),
+        selected_tab=selected_tab,
+        reverse_checked=raw.get("reverseChecked"),
+        open_orders=raw.get("openOrders", 0) or 0,
+        mfa_visible=bool(raw.get("mfaVisible")),
+    )
+
+
+def parse_order_rows(raw: List[Dict[str, Any]]) -> List[OpenOrder]:
+    """
+    将 _OPEN_ORDERS_JS 返回的行解析为 OpenOrder（与接口缓存的当前委托同一结构）
+    
+    Args:
+        raw: evaluate 返回的行列表
+    
+    Returns:
+        OpenOrder 列表（价格/数量未读到时为 0）
+    """
+    return [
+        OpenOrder(
+            order_id=row.get("id") or "",
+            side=row.get("side") or "",
+            price=parse_number(row.get("price")) or 0.0,
+            quantity=parse_number(row.get("amount")) or 0.0,
+        )
+        for row in raw
+    ]
+
+
+def select_page(pages: list, target_url: Optional[str] = None):
+    """
+    从已打开的页面中挑选交易页面
+    
+    Args:
+        pages: 页面列表（同步/异步 Page 均可，只读取 url 属性）
+        target_url: 目标页面 URL（指定时严格匹配）
+    
+    Returns:
+        选中的页面或 None
+    """
+    best_candidate = None
+    
+    for pg in pages:
+        url = pg.url
+        # 跳过 devtools 页面
+        if url.startswith("devtools://"):
+            continue
+        
+        # 如果指定了 URL，严格匹配
+        if target_url and target_url in url:
+            return pg
+        
+        # 如果未指定 target_url，则智能查找
+        if not target_url:
+            # 优先找现货交易页面
+            if "binance.com" in url and ("spot" in url or "trade" in url):
+                return pg
+            
+            # 避开账号安全页面，作为备选
+            if "accounts.binance.com" not in url:
+                best_candidate = pg
+    
+    if best_candidate:
+        return best_candidate
+    
+    # 如果都没找到，且没有指定 target_url，返回任意一个非 devtools 页面
+    if not target_url:
+        for pg in pages:
+            if not pg.url.startswith("devtools://"):
+                return pg
+    
+    return None
+
+
+def generate_totp(secret: str) -> str:
+    """
+    生成 TOTP 验证码（谷歌验证器算法）
+    
+    Args:
+        secret: Base32 密钥
+    
+    Returns:
+        6 位验证码
+    """
+    import base64
+    import hmac
+    import hashlib
+    import struct
+    
+    t = int(time.time())
+    secret_padded = secret.strip().replace(" ", "").upper()
+    secret_padded += "=" * ((8 - len(secret_padded) % 8) % 8)
+    key = base64.b32decode(secret_padded)
+    counter = struct.pack(">Q", int(t // 30))
+    hmac_hash = hmac.new(key, counter, hashlib.sha1).digest()
+    offset = hmac_hash[-1] & 0x0F
+    code = (
+        ((hmac_hash[offset] & 0x7F) << 24)
+        | ((hmac_hash[offset + 1] & 0xFF) << 16)
+        | ((hmac_hash[offset + 2] & 0xFF) << 8)
+        | (hmac_hash[offset + 3] & 0xFF)
+    )
+    otp = code % (10 ** 6)
+    return str(otp).zfill(6)
+
+
+# ============================================
+# Tab 状态
+# ============================================
+
+# 没有 DOM 推送时，click_tab/快照记录的选中 Tab 在该秒数内视为可信
+TAB_STATE_MAX_AGE = 2.0
+
+
+# ============================================
+# 滚动
+# ============================================
+
+# 一次 evaluate 滚动到边缘，已在目标位置时不做任何操作；返回是否实际滚动（元素不存在返回 null）
+# 页面滚动等价于鼠标滚轮的滚动链：指针下元素的所有可滚动祖先 + 文档滚动元素
+_SCROLL_JS = """
+({xpath, key, direction}) => {
+    if (!window.__alphaPointerTracked) {
+        window.__alphaPointerTracked = true;
+        addEventListener("mousemove", (e) => { window.__alphaPointer = { x: e.clientX, y: e.clientY }; },
+            { capture: true, passive: true });
+    }
+    const horizontal = direction === "left" || direction === "right";
+    const toEnd = direction === "bottom" || direction === "down" || direction === "right";
+    const apply = (el) => {
+        const current = horizontal ? el.scrollLeft : el.scrollTop;
+        const max = horizontal ? el.scrollWidth - el.clientWidth : el.scrollHeight - el.clientHeight;
+        const target = toEnd ? Math.max(0, max) : 0;
+        if (Math.abs(current - target) < 1) return false;
+        if (horizontal) el.scrollLeft = target; else el.scrollTop = target;
+        return true;
+    };
+
+    if (xpath) {
+        const R = window.__alphaSelectors;
+        const el = (key && R && R.has(key)) ? R.node(key) : document.evaluate(
+            xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+        ).singleNodeValue;
+        return el ? apply(el) : null;
+    }
+
+    const scrollables = [];
+    const pointer = window.__alphaPointer || { x: innerWidth / 2, y: innerHeight / 2 };
+    for (let node = document.elementFromPoint(pointer.x, pointer.y);
+         node && node !== document.documentElement && node !== document.body;
+         node = node.parentElement) {
+        const style = getComputedStyle(node);
+        const overflow = horizontal ? style.overflowX : style.overflowY;
+        const overflowing = horizontal ? node.scrollWidth > node.clientWidth : node.scrollHeight > node.clientHeight;
+        if (overflowing && /(auto|scroll|overlay)/.test(overflow)) scrollables.push(node);
+    }
+    scrollables.push(document.scrollingElement || document.documentElement);
+
+    let moved = false;
+    for (const el of scrollables) moved = apply(el) || moved;
+    return moved;
+}
+"""
+
+# 元素不在视口内时 scrollIntoView，已可见时不做任何操作
+_SCROLL_INTO_VIEW_JS = """
+({xpath, key}) => {
+    const R = window.__alphaSelectors;
+    const el = (key && R && R.has(key)) ? R.node(key) : document.evaluate(
+        xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+    ).singleNodeValue;
+    if (!el) return null;
+    const r = el.getBoundingClientRect();
+    if (r.top >= 0 && r.left >= 0 && r.bottom <= innerHeight && r.right <= innerWidth) return false;
+    el.scrollIntoView({ block: "center", inline: "nearest" });
+    return true;
+}
+"""
+
+
+# ============================================
+# 点击
+# ============================================
+
+class ClickMode:
+    """点击方式"""
+    CDP = "cdp"            # 一次 evaluate 取坐标 + CDP Input.dispatchMouseEvent（可信事件）
+    JS = "js"              # 一次 evaluate 定位并调用 el.click()
+    LOCATOR = "locator"    # Playwright locator（原实现，也是快速路径失败时的回退）
+
+
+# 缓存坐标的最长有效期（秒），布局变化推送丢失时兜底
+CLICK_CACHE_TTL = 5.0
+
+# 页面内布局观察器：窗口尺寸、任意滚动、页面/已点击元素尺寸变化、body 直接子节点增删（弹窗）
+# 时通过 __alphaLayoutChanged binding 通知 Python，使缓存的点击坐标失效
+_LAYOUT_WATCH_JS = """
+() => {
+    if (window.__alphaLayout) return window.__alphaLayout.epoch;
+    const state = window.__alphaLayout = { epoch: 0 };
+    const sizes = new WeakMap();
+    let pending = false;
+
+    const bump = () => {
+        if (pending) return;
+        pending = true;
+        requestAnimationFrame(() => {
+            pending = false;
+            state.epoch++;
+            if (window.__alphaLayoutChanged) window.__alphaLayoutChanged(state.epoch);
+        });
+    };
+
+    // observe 时的首次回调只记录尺寸，之后尺寸变化（含 display:none 变为 0）才算布局变化
+    const resizeObserver = new ResizeObserver((entries) => {
+        let changed = false;
+        for (const entry of entries) {
+            const size = entry.contentRect.width + "x" + entry.contentRect.height;
+            const previous = sizes.get(entry.target);
+            sizes.set(entry.target, size);
+            if (previous !== undefined && previous !== size) changed = true;
+        }
+        if (changed) bump();
+    });
+    state.watch = (el) => { if (!sizes.has(el)) resizeObserver.observe(el); };
+
+    addEventListener("resize", bump, { passive: true });
+    addEventListener("scroll", bump, { capture: true, passive: true });
+
+    const start = () => {
+        resizeObserver.observe(document.documentElement);
+        if (document.body) {
+            resizeObserver.observe(document.body);
+            new MutationObserver(bump).observe(document.body, { childList: true });
+        }
+    };
+    if (document.body) {
+        start();
+    } else {
+        document.addEventListener("DOMContentLoaded", start, { once: true });
+    }
+    return state.epoch;
+}
+"""
+
+# 一次 evaluate 定位元素：不在视口内先 scrollIntoView，返回中心坐标及是否被遮挡（不存在/不可见返回 null）
+# click 为 true 时未遮挡直接调用 el.click()
+_CLICK_POINT_JS = """
+({xpath, key, click}) => {
+    const R = window.__alphaSelectors;
+    const el = (key && R && R.has(key)) ? R.node(key) : document.evaluate(
+        xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+    ).singleNodeValue;
+    if (!el || el.getClientRects().length === 0) return null;
+
+    let rect = el.getBoundingClientRect();
+    let scrolled = false;
+    if (rect.top < 0 || rect.left < 0 || rect.bottom > innerHeight || rect.right > innerWidth) {
+        el.scrollIntoView({ block: "center", inline: "nearest" });
+        rect = el.getBoundingClientRect();
+        scrolled = true;
+    }
+    const x = rect.left + rect.width / 2;
+    const y = rect.top + rect.height / 2;
+    const hit = document.elementFromPoint(x, y);
+    const covered = !hit || (hit !== el && !el.contains(hit));
+    if (window.__alphaLayout && window.__alphaLayout.watch) window.__alphaLayout.watch(el);
+    if (!covered) (window.__alphaClickTargets = window.__alphaClickTargets || new Map()).set(xpath, el);
+    if (click && !covered) el.click();
+    return { x, y, scrolled, covered };
+}
+"""
+
+# 缓存坐标点击前的命中检测：上次定位到的元素仍在文档中且位于该坐标最上层
+# （弹窗按钮可能已随弹窗移除，而布局变化通知要等下次调用 Playwright 才送达）
+_CLICK_HIT_JS = """
+({xpath, x, y}) => {
+    const el = window.__alphaClickTargets && window.__alphaClickTargets.get(xpath);
+    if (!el || !el.isConnected) return false;
+    const hit = document.elementFromPoint(x, y);
+    return !!hit && (hit === el || el.contains(hit));
+}
+"""
+
+
+# ============================================
+# 批量填写
+# ============================================
+
+# 回读值与期望值的最大相对偏差（页面会按最小变动单位截断价格/数量）
+FILL_TOLERANCE = 0.01
+
+# 一次 evaluate 按顺序填写多个 React 受控输入框，等 React 提交后回读全部值
+# 使用原型上的原生 value setter，绕过 React 对 value 属性的拦截，再派发 input/change 事件
+_FILL_FORM_JS = """
+async (fields) => {
+    const R = window.__alphaSelectors;
+    const find = ({xpath, key}) => (key && R && R.has(key)) ? R.node(key) : document.evaluate(
+        xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+    ).singleNodeValue;
+    const setters = {
+        INPUT: Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, "value").set,
+        TEXTAREA: Object.getOwnPropertyDescriptor(HTMLTextAreaElement.prototype, "value").set,
+    };
+
+    const elements = fields.map(find);
+    fields.forEach((field, i) => {
+        const el = elements[i];
+        const setter = el && setters[el.tagName];
+        if (!setter) return;
+        el.focus();
+        setter.call(el, field.value);
+        el.dispatchEvent(new Event("input", { bubbles: true }));
+        el.dispatchEvent(new Event("change", { bubbles: true }));
+    });
+
+    // 让出一轮事件循环，受控输入框被 React 重新渲染后再回读
+    await new Promise((resolve) => setTimeout(resolve, 0));
+    return elements.map((el) => el && el.isConnected ? el.value : null);
+}
+"""
+
+
+# ============================================
+# 等待条件
+# ============================================
+
+# wait_until 内置的页面内条件（参数均为 {xpath, key, ...}，key 存在时走选择器注册表）
+_WAIT_NODE_JS = """
+    const R = window.__alphaSelectors;
+    const node = (arg.key && R && R.has(arg.key)) ? R.node(arg.key) : (arg.xpath ? document.evaluate(
+        arg.xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+    ).singleNodeValue : null);
+"""
+
+WAIT_PREDICATES: Dict[str, str] = {
+    # 元素可见
+    "visible": "(arg) => {" + _WAIT_NODE_JS + """
+        return !!node && node.getClientRects().length > 0;
+    }""",
+    # 元素消失或不可见
+    "hidden": "(arg) => {" + _WAIT_NODE_JS + """
+        return !node || node.getClientRects().length === 0;
+    }""",
+    # 元素文本包含数字（如 Tab 切换后余额渲染完成）
+    "has_number": "(arg) => {" + _WAIT_NODE_JS + """
+        return !!node && /\\d/.test(node.innerText || node.textContent || '');
+    }""",
+    # 元素文本持续 stableMs 毫秒不变
+    "text_stable": "(arg) => {" + _WAIT_NODE_JS + """
+        const text = node ? (node.innerText || node.textContent || '') : null;
+        const memo = window.__alphaStable = window.__alphaStable || {};
+        const now = Date.now();
+        const last = memo[arg.xpath];
+        if (!last || last.text !== text) {
+            memo[arg.xpath] = { text, since: now };
+            return false;
+        }
+        return now - last.since >= (arg.stableMs || 800);
+    }""",
+    # 委托表已无挂单
+    "orders_cleared": """(arg) => {
+        const pane = document.querySelector('#bn-tab-pane-orderOrder');
+        return (pane || document).querySelectorAll('tbody.bn-web-table-tbody > tr[aria-rowindex]').length === 0;
+    }""",
+}
+
+# 页面可交易：加载标记可见、价格可解析为正数、买入/卖出 Tab 已渲染
+# explain 为 true 时返回缺失项列表（用于超时日志）
+_PAGE_READY_JS = """
+(arg) => {
+    const node = (xpath) => xpath ? document.evaluate(
+        xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+    ).singleNodeValue : null;
+    const number = (el) => {
+        const match = el ? String(el.innerText || el.textContent || "").replace(/[\\s,]/g, "").match(/\\d*\\.?\\d+/) : null;
+        return match ? parseFloat(match[0]) : 0;
+    };
+    const missing = [];
+    const loaded = node(arg.loaded);
+    if (!loaded || loaded.getClientRects().length === 0) missing.push("page_loaded");
+    if (!arg.prices.some((xpath) => number(node(xpath)) > 0)) missing.push("price");
+    if (document.querySelectorAll(".bn-tab.bn-tab__buySell").length < 2) missing.push("tabs");
+    return arg.explain ? missing : missing.length === 0;
+}
+"""
+
+
+def page_ready_args(xpaths: Dict[str, str], loaded_xpath: str) -> Dict[str, Any]:
+    """构造 _PAGE_READY_JS 的参数"""
+    return {
+        "loaded": loaded_xpath,
+        "prices": [xpaths[key] for key in ("current_price", "current_price_alt") if key in xpaths],
+        "explain": False,
+    }
 
 
 # ============================================
@@ -61,8 +812,11 @@ def with_verification(func: Callable) -> Callable:
     """
     @wraps(func)
     def wrapper(self, *args, **kwargs):
-        if hasattr(self, 'check_verification'):
-            self.check_verification()
+        # 页面内验证器标志有效时跳过实际检测
+        needs_check = getattr(self, 'needs_verification_check', None)
+        if needs_check is None or needs_check():
+            if hasattr(self, 'check_verification'):
+                self.check_verification()
         return func(self, *args, **kwargs)
     return wrapper
 
@@ -93,27 +847,79 @@ class BrowserManager:
     浏览器管理器 - 统一管理 Playwright 连接和页面操作
     """
     
-    def __init__(self, port: int = 9222, secret: str = ""):
+    def __init__(
+        self,
+        port: int = 9222,
+        secret: str = "",
+        xpaths: Optional[Dict[str, str]] = None,
+        css: Optional[Dict[str, str]] = None
+    ):
         """
         初始化浏览器管理器
         
         Args:
             port: Chrome 调试端口
             secret: 谷歌验证器密钥
+            xpaths: 命名 XPath 表（snapshot 使用 current_price / available_balance 等键）
+            css: 命名 CSS 选择器表（snapshot 使用 checkbox 键）
         """
         self.port = port
         self.secret = secret
+        self.xpaths: Dict[str, str] = dict(xpaths or {})
+        self.css: Dict[str, str] = dict(css or {})
+        # XPath → 注册表键（调用方传入完整 XPath 时也能命中注册表）
+        self._xpath_keys: Dict[str, str] = {xpath: key for key, xpath in self.xpaths.items()}
+        self._registry_installed = False
         self.playwright: Optional[Playwright] = None
         self.browser: Optional[Browser] = None
         self.page: Optional[Page] = None
         self._connected = False
+        # 各 Tab 最近一次读到的余额及读取时间（只渲染一个面板时，另一个 Tab 使用缓存值）
+        self._balance_cache: Dict[int, float] = {}
+        self._balance_seen_at: Dict[int, float] = {}
+        # 当前选中 Tab（None 表示未知）：由 click_tab、快照和 DOM 推送更新
+        self._tab: Optional[int] = None
+        self._tab_updated_at: float = 0.0
+        self.tab_stats: Dict[str, int] = {"switches": 0, "skipped": 0, "balance_reads": 0}
+        # DOM 变更推送（enable_dom_feed 后可用）
+        self.feed: Optional[DomChangeFeed] = None
+        self.market: Optional[MarketFeed] = None
+        self.account: Optional[AccountStateCache] = None
+        # 页面内验证器标志（None 表示未知）及最近一次更新时间
+        self._mfa_visible: Optional[bool] = None
+        self._mfa_updated_at: float = 0.0
+        self.mfa_stats: Dict[str, int] = {"checks": 0, "skipped": 0}
+        # 命名等待的耗时统计（可替换为 TradeStats.latency 以便汇总输出）
+        self.latency = LatencyStats()
+        self.scroll_stats: Dict[str, float] = {"calls": 0, "noop": 0, "total_ms": 0.0}
+        # 点击方式及坐标缓存：xpath -> (x, y, 缓存时间)，页面推送布局变化时清空
+        self.click_mode: str = ClickMode.CDP
+        self._click_points: Dict[str, Tuple[float, float, float]] = {}
+        self.click_cache_stats: Dict[str, int] = {"hits": 0, "misses": 0}
+        self._cdp_session = None
+        self._perf_session = None
+        self._layout_watched = False
+        # 失败现场采集（后台写盘、限频、去重、磁盘配额）
+        self.capture = CaptureService(SCREENSHOT_DIR)
+        self.capture_mode: str = "screenshot"
+        # 请求路由（拦截图片/字体/埋点等非交易资源）
+        self.router: Optional[RequestRouter] = None
+        # 固定视口尺寸（无头模式使用，保证桌面版交易布局）
+        self.viewport: Optional[Tuple[int, int]] = None
     
-    def connect(self, target_url: Optional[str] = None) -> bool:
+    def connect(
+        self,
+        target_url: Optional[str] = None,
+        discovery: Optional[Discovery] = None,
+        routing: Union[str, RoutingProfile, None] = None
+    ) -> bool:
         """
         连接到 Chrome CDP
         
         Args:
             target_url: 目标页面 URL（可选，用于定位特定页面）
+            discovery: DevToolsClient.discover 的结果（提供时直接连接其 WebSocket 地址）
+            routing: 请求路由配置或预置名称（off/lite/strict，None 不拦截）
             
         Returns:
             连接是否成功
@@ -121,24 +927,25 @@ class BrowserManager:
         try:
             self.playwright = sync_playwright().start()
             
-            # 尝试直接连接
-            try:
-                self.browser = self.playwright.chromium.connect_over_cdp(
-                    f"http://127.0.0.1:{self.port}"
-                )
-            except Exception:
-                # 回退：从 /json/version 获取 WebSocket URL
+            if discovery:
+                # 已通过 /json/version 拿到浏览器 WebSocket 地址，省去一次 HTTP 解析
+                target_url = target_url or discovery.page.url
+                self.browser = self.playwright.chromium.connect_over_cdp(discovery.browser_ws_url)
+            else:
+                # 尝试直接连接
                 try:
-                    resp = requests.get(
-                        f"http://127.0.0.1:{self.port}/json/version",
-                        timeout=3
+                    self.browser = self.playwright.chromium.connect_over_cdp(
+                        f"http://127.0.0.1:{self.port}"
                     )
-                    ws_url = resp.json().get("webSocketDebuggerUrl")
-                    if ws_url:
-                        self.browser = self.playwright.chromium.connect_over_cdp(ws_url)
-                except Exception as e:
-                    error(f"无法连接到 Chrome: {e}")
-                    return False
+                except Exception:
+                    # 回退：从 /json/version 获取 WebSocket URL
+                    try:
+                        ws_url = (get_devtools_client(self.port).version() or {}).get("webSocketDebuggerUrl")
+                        if ws_url:
+                            self.browser = self.playwright.chromium.connect_over_cdp(ws_url)
+                    except Exception as e:
+                        error(f"无法连接到 Chrome: {e}")
+                        return False
             
             if not self.browser:
                 error("无法连接到 Chrome DevTools，请确认端口浏览器已启动")
@@ -151,8 +958,20 @@ class BrowserManager:
                 return False
             
             self.page.set_default_timeout(5000)
+            if self.viewport:
+                self.page.set_viewport_size({"width": self.viewport[0], "height": self.viewport[1]})
             self._connected = True
             success(f"已连接到页面: {self.page.url[:50]}...")
+            
+            # 安装选择器注册表和验证器观察器（刷新/跳转后由 init script 自动重新安装）
+            if self.xpaths:
+                self.install_selector_registry()
+            self.install_mfa_watch()
+            self.install_layout_watch()
+            if routing:
+                self.router = RequestRouter(self.page, routing)
+                if not self.router.attach():
+                    self.router = None
             return True
             
         except Exception as e:
@@ -161,50 +980,14 @@ class BrowserManager:
     
     def _find_page(self, target_url: Optional[str] = None) -> Optional[Page]:
         """查找目标页面"""
-        target_page = None
-        best_candidate = None
-        
-        for context in self.browser.contexts:
-            for pg in context.pages:
-                url = pg.url
-                # 跳过 devtools 页面
-                if url.startswith("devtools://"):
-                    continue
-                
-                # 如果指定了 URL，严格匹配
-                if target_url and target_url in url:
-                    return pg
-                
-                # 如果未指定 target_url，则智能查找
-                if not target_url:
-                    # 优先找现货交易页面
-                    if "binance.com" in url and ("spot" in url or "trade" in url):
-                        target_page = pg
-                        break
-                    
-                    # 避开账号安全页面，作为备选
-                    if "accounts.binance.com" not in url:
-                        best_candidate = pg
-            
-            if target_page:
-                break
-        
-        if target_page:
-            return target_page
-        if best_candidate:
-            return best_candidate
-            
-        # 如果都没找到，且没有指定 target_url，返回任意一个非 devtools 页面
-        if not target_url:
-             for context in self.browser.contexts:
-                for pg in context.pages:
-                    if not pg.url.startswith("devtools://"):
-                        return pg
-
-        return None
+        pages = [pg for context in self.browser.contexts for pg in context.pages]
+        return select_page(pages, target_url)
     
     def disconnect(self) -> None:
         """断开连接"""
+        self.capture.close()
+        if self.router:
+            info(f"请求路由统计: 拦截 {self.router.blocked_requests} 次 ({self.router.summary() or '无'})")
         if self.playwright:
             self.playwright.stop()
         self._connected = False
@@ -263,131 +1046,643 @@ class BrowserManager:
     
     def screenshot_on_error(self, operation_name: str = "error") -> Optional[str]:
         """
-        错误时截图（用于调试）
+        错误时采集现场（用于调试）
+        
+        热路径上只抓取一帧视口 JPEG（或序列化 DOM），写盘在后台线程完成；
+        同一操作按 CaptureService 的最小间隔限频，重复画面不落盘
         
         Args:
-            operation_name: 操作名称，用于文件命名
+            operation_name: 操作名称，用于文件命名和限频分类
         
         Returns:
-            截图文件路径或 None
+            计划写入的文件路径或 None（被限频/采集失败）
         """
-        return self.take_screenshot(f"error_{operation_name}", full_page=True)
+        if not self.page:
+            return None
+        return self.capture.capture(f"error_{operation_name}", self._grab_frame)
+    
+    def _grab_frame(self) -> Frame:
+        """抓取一帧：CDP 视口 JPEG（base64，解码在后台），dom 模式为页面 HTML"""
+        if self.capture_mode == "dom":
+            return Frame("html", self.page.content())
+        try:
+            data = self._cdp().send("Page.captureScreenshot", {
+                "format": "jpeg", "quality": CAPTURE_JPEG_QUALITY, "optimizeForSpeed": True
+            })["data"]
+            return Frame("jpg", data, is_base64=True)
+        except Exception:
+            return Frame("jpg", self.page.screenshot(type="jpeg", quality=CAPTURE_JPEG_QUALITY, timeout=2000))
     
     # ============================================
     # 验证器处理
     # ============================================
     
-    def check_verification(self, check_interval: float = 5) -> None:
+    def check_verification(self, check_interval: float = 5) -> None:
+        """
+        检查并处理验证器弹窗
+        
+        Args:
+            check_interval: 检查间隔（秒）
+        """
+        if not self.secret:
+            return
+            
+        try:
+            self.mfa_stats["checks"] += 1
+            found = self._detect_verification_popup()
+            
+            if found:
+                warning("检测到币安身份验证器弹窗 → 等待消失...")
+                
+                while found:
+                    time.sleep(check_interval)
+                    code = self._generate_totp()
+                    self._input_verification_code(code)
+                    found = self._detect_verification_popup()
+                    
+                    if found:
+                        info("验证器仍存在，继续等待...")
+                
+                success("验证器已消失，继续执行程序")
+            
+            self._set_mfa_flag(False)
+                
+        except Exception as e:
+            warning(f"验证器检测异常: {e}")
+    
+    def install_mfa_watch(self) -> bool:
+        """
+        在页面内安装验证器观察器，之后的 evaluate 调用顺带带回弹窗状态
+        
+        Returns:
+            是否安装成功
+        """
+        try:
+            script = f"({_MFA_WATCH_JS})({json.dumps(MFA_POPUP_SELECTOR)})"
+            self.page.add_init_script(script=script)
+            self._set_mfa_flag(self.page.evaluate(_MFA_WATCH_JS, MFA_POPUP_SELECTOR))
+            return True
+        except Exception as e:
+            warning(f"安装验证器观察器失败: {e}")
+            return False
+    
+    def install_layout_watch(self) -> bool:
+        """
+        在页面内安装布局观察器，布局变化时清空缓存的点击坐标
+        
+        Returns:
+            是否安装成功
+        """
+        self._cdp_session = None
+        self._click_points.clear()
+        self._layout_watched = False
+        try:
+            self.page.expose_binding("__alphaLayoutChanged", self._on_layout_changed)
+            self.page.add_init_script(script=f"({_LAYOUT_WATCH_JS})()")
+            self.page.evaluate(_LAYOUT_WATCH_JS)
+            self._layout_watched = True
+            return True
+        except Exception as e:
+            warning(f"安装布局观察器失败: {e}")
+            return False
+    
+    def _on_layout_changed(self, source, epoch) -> None:
+        """__alphaLayoutChanged binding 回调"""
+        self._click_points.clear()
+    
+    def needs_verification_check(self) -> bool:
+        """
+        操作前是否需要实际检测验证器弹窗
+        
+        标志为可见/未知时需要检测；DOM 推送启用时标志实时更新，
+        否则标志超过 MFA_FLAG_MAX_AGE 秒未刷新也需要检测
+        """
+        if not self.secret:
+            return False
+        if self._mfa_visible is None or self._mfa_visible:
+            return True
+        if not (self.feed and self.feed.installed) and time.time() - self._mfa_updated_at > MFA_FLAG_MAX_AGE:
+            return True
+        self.mfa_stats["skipped"] += 1
+        return False
+    
+    def _set_mfa_flag(self, visible: Optional[bool]) -> None:
+        """更新验证器标志"""
+        if visible is None:
+            return
+        self._mfa_visible = bool(visible)
+        self._mfa_updated_at = time.time()
+    
+    def _evaluate(self, js: str, arg: Any = None) -> Any:
+        """
+        执行 page.evaluate，并顺带带回页面内验证器标志
+        
+        Args:
+            js: 函数形式的 JS 源码
+            arg: 传给函数的参数
+        
+        Returns:
+            函数返回值
+        """
+        wrapped = (
+            f"async (arg) => [await ({js})(arg), "
+            f"window.__alphaMfa ? window.__alphaMfa.visible : null]"
+        )
+        result, mfa_visible = self.page.evaluate(wrapped, arg)
+        self._set_mfa_flag(mfa_visible)
+        return result
+    
+    def _detect_verification_popup(self) -> bool:
+        """检测验证器弹窗是否存在"""
+        return self.page.evaluate("""
+            (selector) => {
+                try {
+                    const shadowHost = document.querySelector("#mfa-shadow-host");
+                    if (!shadowHost || !shadowHost.shadowRoot) return false;
+                    
+                    const target = shadowHost.shadowRoot.querySelector(selector);
+                    return target !== null;
+                } catch (err) {
+                    return false;
+                }
+            }
+        """, MFA_POPUP_SELECTOR)
+    
+    def _generate_totp(self) -> str:
+        """生成 TOTP 验证码"""
+        return generate_totp(self.secret)
+    
+    def _input_verification_code(self, code: str) -> bool:
+        """
+        输入验证码
+        
+        Args:
+            code: 6位验证码
+            
+        Returns:
+            是否输入成功
+        """
+        try:
+            # 聚焦输入框并清空已有内容
+            self.page.evaluate("""
+                () => {
+                    const shadowHost = document.querySelector("#mfa-shadow-host");
+                    const inputEl = shadowHost.shadowRoot.querySelector(
+                        'input[data-e2e="input-mfa"]'
+                    );
+                    if (inputEl) {
+                        inputEl.focus();
+                        inputEl.value = '';  // 清空已有内容
+                    }
+                }
+            """)
+            time.sleep(0.3)
+            
+            # 先全选并删除已有内容（双保险）
+            self.page.keyboard.press("Control+A")
+            time.sleep(0.05)
+            self.page.keyboard.press("Backspace")
+            time.sleep(0.1)
+            
+            # 输入验证码
+            self.page.keyboard.type(code, delay=0.08)
+            info(f"已输入验证码: {code[:2]}****")  # 脱敏显示
+            return True
+            
+        except Exception as e:
+            warning(f"输入验证码失败: {e}")
+            return False
+    
+    # ============================================
+    # 页面状态快照
+    # ============================================
+    
+    def snapshot(self, handle_verification: bool = True) -> Optional[PageSnapshot]:
+        """
+        一次 page.evaluate 读取价格、余额、Tab、复选框、挂单数和验证器状态
+        
+        替代交易循环中 get_text / _get_pending_order_count / check_verification
+        的多次往返。验证器状态随快照一并返回，弹窗出现时才处理验证并重新读取。
+        
+        Args:
+            handle_verification: 检测到验证器弹窗时是否自动处理
+        
+        Returns:
+            PageSnapshot 或 None（读取失败）
+        """
+        try:
+            raw = self.page.evaluate(_SNAPSHOT_JS, snapshot_args(self.xpaths, self.css))
+        except Exception as e:
+            warning(f"读取页面快照失败: {e}")
+            return None
+        
+        self._set_mfa_flag(raw["mfaVisible"])
+        if raw["mfaVisible"] and handle_verification and self.secret:
+            self.check_verification()
+            return self.snapshot(handle_verification=False)
+        
+        return self._build_snapshot(raw)
+    
+    def open_order_rows(self) -> Optional[List[OpenOrder]]:
+        """
+        逐行读取当前委托表（方向、价格、数量、订单号）
+        
+        Returns:
+            OpenOrder 列表，委托表不存在或读取失败时返回 None
+        """
+        try:
+            raw = self.page.evaluate(_OPEN_ORDERS_JS)
+        except Exception as e:
+            warning(f"读取当前委托失败: {e}")
+            return None
+        return parse_order_rows(raw) if raw is not None else None
+    
+    def cancel_order_row(self, side: str, order_id: str = "", price: float = 0.0) -> bool:
+        """
+        点击当前委托表中指定订单的取消链接（不处理确认弹窗）
+        
+        Args:
+            side: BUY / SELL
+            order_id: 订单号（页面行带订单号时精确定位）
+            price: 委托价（无订单号时用于区分同方向的多笔订单，0 表示取第一行）
+        
+        Returns:
+            是否点击了取消链接
+        """
+        try:
+            return bool(self.page.evaluate(
+                _CANCEL_ORDER_ROW_JS, {"side": side, "id": order_id, "price": price}
+            ))
+        except Exception as e:
+            warning(f"取消 {side} 订单失败: {e}")
+            return False
+    
+    def _build_snapshot(self, raw: Dict[str, Any]) -> PageSnapshot:
+        """将 evaluate 返回的原始数据解析为 PageSnapshot，并更新余额缓存和选中 Tab"""
+        snap = build_snapshot(raw, self._balance_cache)
+        for tab in snap.fresh_tabs:
+            self._balance_seen_at[tab] = snap.timestamp
+        if snap.selected_tab in (0, 1):
+            self._set_tab(snap.selected_tab)
+        return snap
+    
+    # ============================================
+    # Tab 状态
+    # ============================================
+    
+    def _set_tab(self, index: Optional[int]) -> None:
+        """记录当前选中 Tab（-1/None 表示未知）"""
+        self._tab = index if index in (0, 1) else None
+        self._tab_updated_at = time.time()
+    
+    def current_tab(self) -> Optional[int]:
+        """
+        当前选中 Tab（不访问页面）
+        
+        DOM 推送已启用时切换会实时推送，记录值始终可信；
+        否则只信任 TAB_STATE_MAX_AGE 秒内由 click_tab/快照记录的值
+        
+        Returns:
+            0=买入，1=卖出，None=未知
+        """
+        if self._tab is None:
+            return None
+        if self.feed and self.feed.installed:
+            return self._tab
+        if time.time() - self._tab_updated_at <= TAB_STATE_MAX_AGE:
+            return self._tab
+        return None
+    
+    def balances(
+        self,
+        max_age: float = 10.0,
+        snap: Optional[PageSnapshot] = None
+    ) -> Tuple[Optional[float], Optional[float]]:
+        """
+        读取 USDT 可用余额和代币持仓，不切换 Tab
+        
+        优先使用账户状态缓存（REST 响应）；否则取快照：快照实际读到的 Tab 为实时值，
+        另一个 Tab 使用 max_age 秒内读到（快照或 DOM 推送）的值，更早的视为未知
+        
+        Args:
+            max_age: 非实时 Tab 余额的最大年龄（秒）
+            snap: 刚取得的快照（不传时重新读取一次）
+        
+        Returns:
+            (USDT 余额, 持仓)，未知的一项为 None
+        """
+        self.tab_stats["balance_reads"] += 1
+        usdt = holding = None
+        if self.account:
+            usdt = self.account.quote_balance()
+            holding = self.account.holding()
+            if usdt is not None and holding is not None:
+                return usdt, holding
+        
+        if snap is None:
+            snap = self.snapshot()
+        now = time.time()
+        fresh = {
+            tab: self._balance_cache[tab] for tab in (0, 1)
+            if tab in self._balance_cache and now - self._balance_seen_at.get(tab, 0) <= max_age
+        }
+        if snap:
+            fresh.update({tab: snap.balance(tab) for tab in snap.fresh_tabs if snap.balance(tab) is not None})
+        if usdt is None:
+            usdt = fresh.get(0)
+        if holding is None:
+            holding = fresh.get(1)
+        return usdt, holding
+
+    
+    # ============================================
+    # 选择器注册表
+    # ============================================
+    
+    def install_selector_registry(self) -> bool:
+        """
+        在页面内安装命名选择器注册表（预编译 XPath + 节点缓存）
+        
+        通过 add_init_script 注册，刷新或跳转后自动重新安装
+        
+        Returns:
+            是否安装成功
+        """
+        try:
+            script = f"({_SELECTOR_REGISTRY_JS})({json.dumps(self.xpaths)})"
+            self.page.add_init_script(script=script)
+            count = self.page.evaluate(_SELECTOR_REGISTRY_JS, self.xpaths)
+            self._registry_installed = True
+            info(f"选择器注册表已安装 ({count} 个)")
+            return True
+        except Exception as e:
+            warning(f"安装选择器注册表失败: {e}")
+            return False
+    
+    @with_verification
+    def text(self, key: str) -> Optional[str]:
+        """
+        按注册表键获取元素文本
+        
+        Args:
+            key: 选择器名称（如 "available_balance"）
+        """
+        return self._registry_read("text", key)
+    
+    @with_verification
+    def input_value(self, key: str) -> Optional[str]:
+        """
+        按注册表键获取输入框的值
+        
+        Args:
+            key: 选择器名称（如 "limit_price"）
+        """
+        return self._registry_read("value", key)
+    
+    def _registry_read(self, method: str, key: str) -> Optional[str]:
+        """通过注册表读取元素，注册表缺失时回退到直接解析 XPath"""
+        xpath = self.xpaths.get(key)
+        try:
+            return self._evaluate("""({method, key, xpath}) => {
+                const R = window.__alphaSelectors;
+                if (R && R.has(key)) return R[method](key);
+                if (!xpath) return null;
+                const el = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+                if (!el) return null;
+                return method === "value" ? el.value : (el.innerText || el.textContent);
+            }""", {"method": method, "key": key, "xpath": xpath})
+        except Exception as e:
+            warning(f"读取 {key} 失败: {e}")
+            return None
+    
+    def selector_stats(self) -> Dict[str, Any]:
+        """
+        获取注册表命中统计
+        
+        Returns:
+            {"hits": int, "misses": int, "hit_rate": float, "keys": {key: {"hits", "misses"}}}
+        """
+        try:
+            counters = self.page.evaluate(
+                "() => window.__alphaSelectors ? window.__alphaSelectors.stats() : {}"
+            ) or {}
+        except Exception as e:
+            warning(f"获取选择器统计失败: {e}")
+            counters = {}
+        
+        hits = sum(c.get("hits", 0) for c in counters.values())
+        misses = sum(c.get("misses", 0) for c in counters.values())
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total * 100 if total else 0.0,
+            "keys": counters,
+        }
+    
+    # ============================================
+    # DOM 变更推送
+    # ============================================
+    
+    def enable_dom_feed(self) -> bool:
+        """
+        启用页面内 MutationObserver 推送（价格、余额、委托行、验证器弹窗）
+        
+        Returns:
+            是否启用成功
+        """
+        if self.feed and self.feed.installed:
+            return True
+        
+        self.feed = DomChangeFeed(self.page, self.xpaths, MFA_POPUP_SELECTOR)
+        self.feed.add_listener(self._on_dom_event)
+        if not self.feed.install():
+            self.feed = None
+            return False
+        return True
+    
+    def _on_dom_event(self, event: DomEvent) -> None:
+        """推送的验证器事件实时更新标志；委托行增删、弹窗变化时缓存的点击坐标失效"""
+        if event.kind == DomEventKind.MFA:
+            self._set_mfa_flag(event.value)
+        elif event.kind == DomEventKind.TAB:
+            self._set_tab(event.value)
+        elif event.kind == DomEventKind.BALANCE:
+            # 推送带全部余额节点，按快照同样的规则更新每个面板的缓存
+            texts = event.detail.get("texts") or [event.value]
+            fresh = panel_balances(texts, event.detail.get("selectedTab", event.detail.get("tab")))
+            self._balance_cache.update(fresh)
+            for tab in fresh:
+                self._balance_seen_at[tab] = event.timestamp
+        if event.kind in (DomEventKind.MFA, DomEventKind.ORDERS):
+            self._click_points.clear()
+    
+    def wait_for_dom_event(
+        self,
+        kinds: Optional[Iterable[str]] = None,
+        timeout: float = 3,
+        predicate: Optional[Callable[[DomEvent], bool]] = None
+    ) -> Optional[DomEvent]:
+        """
+        等待 DOM 变更事件，事件到达立即返回；未启用推送时退化为 sleep
+        
+        Args:
+            kinds: 关心的事件类型（DomEventKind，None 表示全部）
+            timeout: 最长等待时间（秒）
+            predicate: 额外的事件判断函数
+        
+        Returns:
+            触发返回的事件，超时或未启用推送时返回 None
+        """
+        if not self.feed:
+            time.sleep(timeout)
+            return None
+        
+        def matches(event: DomEvent) -> bool:
+            if event.kind == DomEventKind.MFA:
+                return bool(event.value)
+            return predicate is None or predicate(event)
+        
+        watch = set(kinds) | {DomEventKind.MFA} if kinds else None
+        event = self.feed.wait_for(matches, timeout=timeout, kinds=watch)
+        
+        # 验证器弹窗优先处理
+        if event and event.kind == DomEventKind.MFA and event.value:
+            self.check_verification()
+        return event
+    
+    # ============================================
+    # 等待引擎
+    # ============================================
+    
+    def wait_until(
+        self,
+        name: str,
+        predicate: Any,
+        timeout: float = 3,
+        arg: Optional[Dict[str, Any]] = None,
+        baseline: float = 0.0,
+        poll_ms: int = 50
+    ) -> bool:
+        """
+        等待条件满足，替代固定 sleep
+        
+        实际超时由该名称历史耗时的 p99 推导（样本不足时使用 timeout），
+        每次等待的耗时、是否超时、相对 baseline 节省的时间记入 self.latency
+        
+        Args:
+            name: 等待名称（用于统计和超时推导）
+            predicate: WAIT_PREDICATES 中的名称、函数形式的 JS 源码（页面内 wait_for_function），
+                       或 Python 可调用对象（结合 DOM 推送事件判断）
+            timeout: 超时上限（秒）
+            arg: 传给 JS 条件的参数；含 xpath 时自动补充注册表键
+            baseline: 原固定 sleep 时长（秒）
+            poll_ms: 页面内轮询间隔（毫秒）
+        
+        Returns:
+            条件是否在超时前满足
+        """
+        limit = self.latency.timeout_for(name, timeout)
+        start = time.time()
+        satisfied = False
+        
+        try:
+            if callable(predicate):
+                deadline = start + limit
+                while True:
+                    if predicate():
+                        satisfied = True
+                        break
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        break
+                    self.wait_for_dom_event(timeout=min(remaining, 0.25))
+            else:
+                js = WAIT_PREDICATES.get(predicate, predicate)
+                arg = dict(arg or {})
+                if "xpath" in arg and "key" not in arg:
+                    arg["key"] = self._xpath_keys.get(arg["xpath"])
+                self.page.wait_for_function(js, arg=arg, timeout=limit * 1000, polling=poll_ms)
+                satisfied = True
+        except PlaywrightTimeout:
+            pass
+        except Exception as e:
+            warning(f"等待 {name} 异常: {e}")
+        
+        self.latency.record(
+            name, (time.time() - start) * 1000,
+            timed_out=not satisfied, baseline_ms=baseline * 1000
+        )
+        return satisfied
+    
+    # ============================================
+    # WebSocket 行情推送
+    # ============================================
+    
+    def enable_market_feed(self, symbol: Optional[str] = None, record_path: Optional[str] = None) -> bool:
+        """
+        订阅页面自身的 WebSocket 成交/行情/订单推送
+        
+        Args:
+            symbol: 交易对（None 则自动锁定页面成交流的交易对）
+            record_path: 原始帧录制文件（用于离线回放，None 不录制）
+        
+        Returns:
+            是否启用成功
+        """
+        if self.market and self.market.attached:
+            return True
+        
+        self.market = MarketFeed(self.page, symbol=symbol, record_path=record_path)
+        if not self.market.attach():
+            self.market = None
+            return False
+        return True
+    
+    def market_price(self, max_age: Optional[float] = None) -> Optional[float]:
         """
-        检查并处理验证器弹窗
+        WebSocket 推送的最新成交价（未启用、无推送或已过期返回 None）
         
         Args:
-            check_interval: 检查间隔（秒）
+            max_age: 最大允许的价格年龄（秒）
         """
-        if not self.secret:
-            return
-            
-        try:
-            found = self._detect_verification_popup()
-            
-            if found:
-                warning("检测到币安身份验证器弹窗 → 等待消失...")
-                
-                while found:
-                    time.sleep(check_interval)
-                    code = self._generate_totp()
-                    self._input_verification_code(code)
-                    found = self._detect_verification_popup()
-                    
-                    if found:
-                        info("验证器仍存在，继续等待...")
-                
-                success("验证器已消失，继续执行程序")
-                
-        except Exception as e:
-            warning(f"验证器检测异常: {e}")
-    
-    def _detect_verification_popup(self) -> bool:
-        """检测验证器弹窗是否存在"""
-        return self.page.evaluate("""
-            () => {
-                try {
-                    const shadowHost = document.querySelector("#mfa-shadow-host");
-                    if (!shadowHost || !shadowHost.shadowRoot) return false;
-                    
-                    const target = shadowHost.shadowRoot.querySelector(
-                        "div > div > div > div > div > div.height-container > div > div > div.mfa-verify-page > div.bn-formItem.web > div"
-                    );
-                    return target !== null;
-                } catch (err) {
-                    return false;
-                }
-            }
-        """)
+        if not self.market:
+            return None
+        return self.market.latest_price(max_age)
     
-    def _generate_totp(self) -> str:
-        """生成 TOTP 验证码"""
-        import base64
-        import hmac
-        import hashlib
-        import struct
-        
-        t = int(time.time())
-        secret_padded = self.secret.strip().replace(" ", "").upper()
-        secret_padded += "=" * ((8 - len(secret_padded) % 8) % 8)
-        key = base64.b32decode(secret_padded)
-        counter = struct.pack(">Q", int(t // 30))
-        hmac_hash = hmac.new(key, counter, hashlib.sha1).digest()
-        offset = hmac_hash[-1] & 0x0F
-        code = (
-            ((hmac_hash[offset] & 0x7F) << 24)
-            | ((hmac_hash[offset + 1] & 0xFF) << 16)
-            | ((hmac_hash[offset + 2] & 0xFF) << 8)
-            | (hmac_hash[offset + 3] & 0xFF)
-        )
-        otp = code % (10 ** 6)
-        return str(otp).zfill(6)
+    # ============================================
+    # 账户状态缓存（REST 响应拦截）
+    # ============================================
     
-    def _input_verification_code(self, code: str) -> bool:
+    def enable_account_state(self, quote_asset: str = "USDT") -> bool:
         """
-        输入验证码
+        拦截页面资产/当前委托接口响应，维护账户状态缓存
+        （先启用行情推送时，当前委托按推送锁定的交易对过滤）
         
         Args:
-            code: 6位验证码
-            
+            quote_asset: 计价资产
+        
         Returns:
-            是否输入成功
+            是否启用成功
         """
-        try:
-            # 聚焦输入框并清空已有内容
-            self.page.evaluate("""
-                () => {
-                    const shadowHost = document.querySelector("#mfa-shadow-host");
-                    const inputEl = shadowHost.shadowRoot.querySelector(
-                        'input[data-e2e="input-mfa"]'
-                    );
-                    if (inputEl) {
-                        inputEl.focus();
-                        inputEl.value = '';  // 清空已有内容
-                    }
-                }
-            """)
-            time.sleep(0.3)
-            
-            # 先全选并删除已有内容（双保险）
-            self.page.keyboard.press("Control+A")
-            time.sleep(0.05)
-            self.page.keyboard.press("Backspace")
-            time.sleep(0.1)
-            
-            # 输入验证码
-            self.page.keyboard.type(code, delay=0.08)
-            info(f"已输入验证码: {code[:2]}****")  # 脱敏显示
+        if self.account and self.account.attached:
             return True
-            
-        except Exception as e:
-            warning(f"输入验证码失败: {e}")
+        
+        self.account = AccountStateCache(
+            self.page, quote_asset=quote_asset, symbol=self.market.symbol if self.market else None
+        )
+        if not self.account.attach():
+            self.account = None
             return False
+        if self.market:
+            # 行情推送锁定交易对后，当前委托只保留该交易对的挂单
+            self.market.add_listener(self._sync_account_symbol)
+        return True
+    
+    def _sync_account_symbol(self, event) -> None:
+        """行情推送锁定的交易对同步给账户状态缓存"""
+        if self.account and self.market and self.market.symbol:
+            self.account.set_symbol(self.market.symbol)
     
     # ============================================
     # 滚动操作
@@ -406,7 +1701,7 @@ class BrowserManager:
         Args:
             direction: 方向 (top/bottom/left/right)
             xpath: 元素 XPath（None 表示整个页面）
-            mode: 模式 (fast/human)
+            mode: 模式 (fast/human/wheel)，wheel 为旧版 30 次鼠标滚轮
         """
         target = "元素" if xpath else "页面"
         info(f"滚动{target}到 {direction}")
@@ -414,35 +1709,62 @@ class BrowserManager:
         try:
             if mode == "fast":
                 self._fast_scroll(direction, xpath)
+            elif mode == "wheel":
+                self._wheel_scroll(direction, xpath)
             else:
                 self._human_scroll(direction, xpath)
         except Exception as e:
             warning(f"滚动失败: {e}")
     
-    def _fast_scroll(self, direction: str, xpath: Optional[str] = None) -> None:
-        """快速滚动"""
+    def _fast_scroll(self, direction: str, xpath: Optional[str] = None) -> Optional[bool]:
+        """
+        快速滚动：一次 evaluate 滚动到边缘
+        
+        Returns:
+            是否实际发生滚动（元素不存在返回 None）
+        """
+        start = time.time()
+        moved = self._evaluate(_SCROLL_JS, {
+            "xpath": xpath, "key": self._xpath_keys.get(xpath), "direction": direction
+        })
+        self.scroll_stats["calls"] += 1
+        self.scroll_stats["total_ms"] += (time.time() - start) * 1000
+        if moved is False:
+            self.scroll_stats["noop"] += 1
+        return moved
+    
+    def _wheel_scroll(self, direction: str, xpath: Optional[str] = None) -> None:
+        """旧版快速滚动（30 次鼠标滚轮，保留用于对比基准）"""
         if xpath:
-            # 滚动元素
-            js_map = {
-                "top": "el.scrollTop = 0;",
-                "bottom": "el.scrollTop = el.scrollHeight;",
-                "left": "el.scrollLeft = 0;",
-                "right": "el.scrollLeft = el.scrollWidth;"
-            }
-            js = f"""(xpath) => {{
-                const el = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
-                if (el) {{ {js_map.get(direction, js_map['bottom'])} }}
-            }}"""
-            self.page.evaluate(js, xpath)
-        else:
-            # 滚动页面
-            wheel_delta = 1000 if direction in ["down", "bottom", "right"] else -1000
-            for _ in range(30):
-                if direction in ["left", "right"]:
-                    self.page.mouse.wheel(wheel_delta, 0)
-                else:
-                    self.page.mouse.wheel(0, wheel_delta)
-                time.sleep(0.02)
+            self._fast_scroll(direction, xpath)
+            return
+        wheel_delta = 1000 if direction in ["down", "bottom", "right"] else -1000
+        for _ in range(30):
+            if direction in ["left", "right"]:
+                self.page.mouse.wheel(wheel_delta, 0)
+            else:
+                self.page.mouse.wheel(0, wheel_delta)
+            time.sleep(0.02)
+    
+    @with_verification
+    def scroll_into_view(self, xpath: str) -> Optional[bool]:
+        """
+        将元素滚动到视口内（已可见时不做任何操作）
+        
+        Args:
+            xpath: 元素 XPath
+        
+        Returns:
+            是否实际发生滚动（元素不存在返回 None）
+        """
+        try:
+            moved = self._evaluate(_SCROLL_INTO_VIEW_JS, {"xpath": xpath, "key": self._xpath_keys.get(xpath)})
+        except Exception as e:
+            warning(f"滚动到元素失败: {e}")
+            return None
+        if moved:
+            self._click_points.clear()
+        return moved
     
     def _human_scroll(self, direction: str, xpath: Optional[str] = None) -> None:
         """人性化滚动"""
@@ -576,8 +1898,10 @@ class BrowserManager:
     @with_verification
     def get_text(self, xpath: str) -> Optional[str]:
         """获取元素文本"""
+        if self._registry_installed and xpath in self._xpath_keys:
+            return self._registry_read("text", self._xpath_keys[xpath])
         try:
-            return self.page.evaluate("""(xpath) => {
+            return self._evaluate("""(xpath) => {
                 const el = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
                 return el ? (el.innerText || el.textContent) : null;
             }""", xpath)
@@ -588,8 +1912,10 @@ class BrowserManager:
     @with_verification
     def get_input_value(self, xpath: str) -> Optional[str]:
         """获取输入框的值"""
+        if self._registry_installed and xpath in self._xpath_keys:
+            return self._registry_read("value", self._xpath_keys[xpath])
         try:
-            return self.page.evaluate("""(xpath) => {
+            return self._evaluate("""(xpath) => {
                 const el = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
                 return el ? el.value : null;
             }""", xpath)
@@ -646,26 +1972,182 @@ class BrowserManager:
             self.screenshot_on_error("fill_input")
             return False
     
+    @with_verification
+    def fill_form(self, fields: Dict[str, Any], tolerance: float = FILL_TOLERANCE) -> bool:
+        """
+        一次 evaluate 填写多个输入框，并在同一次调用中回读校验
+        
+        回读不一致（或批量填写出错）的字段逐个回退到 fill_input
+        
+        Args:
+            fields: {输入框 XPath: 值}，按顺序填写（后填的字段可能由页面联动计算）
+            tolerance: 数值回读允许的相对偏差
+        
+        Returns:
+            是否全部填写成功
+        """
+        items = [
+            {"xpath": xpath, "key": self._xpath_keys.get(xpath), "value": str(value)}
+            for xpath, value in fields.items()
+        ]
+        
+        start = time.time()
+        try:
+            values = self._evaluate(_FILL_FORM_JS, items)
+        except Exception as e:
+            warning(f"批量填写失败，逐个填写: {e}")
+            values = [None] * len(items)
+        self.latency.record("fill_form", (time.time() - start) * 1000)
+        
+        ok = True
+        for (xpath, value), actual in zip(fields.items(), values):
+            if _fill_matches(value, actual, tolerance):
+                continue
+            warning(f"回读不一致（期望 {value}，实际 {actual}），逐个填写")
+            if not self.fill_input(xpath, value):
+                ok = False
+        
+        if ok:
+            info(f"已填写: {', '.join(str(value) for value in fields.values())}")
+        return ok
+    
     @with_verification
     def click(
         self,
         xpath: str,
         timeout: float = 3,
         interval: float = 0.3,
-        screenshot_on_fail: bool = True
+        screenshot_on_fail: bool = True,
+        mode: Optional[str] = None
     ) -> bool:
         """
         点击元素（优化版）
         
+        默认走快速路径（一次 evaluate 取坐标 + CDP 鼠标事件，坐标已缓存时只做一次命中检测），
+        快速路径失败时回退到 Playwright locator；快速路径超时仍找不到元素时直接返回失败
+        
         Args:
             xpath: 元素 XPath
             timeout: 超时时间（秒）
-            interval: 检查间隔（秒）
+            interval: 检查间隔（秒，locator 路径使用）
             screenshot_on_fail: 失败时是否截图
+            mode: 点击方式（ClickMode，None 使用 self.click_mode）
         
         Returns:
             是否点击成功
         """
+        mode = mode or self.click_mode
+        start = time.time()
+        
+        if mode != ClickMode.LOCATOR:
+            clicked = self._fast_click(xpath, mode, timeout)
+            if clicked:
+                self.latency.record(f"click_{mode}", (time.time() - start) * 1000)
+                info("已点击按钮")
+                return True
+            if clicked is None:
+                # 整个超时内元素都不存在，locator 也找不到，不再回退
+                return self._click_failed(None, screenshot_on_fail)
+            # 回退路径至少保留 1 秒
+            timeout = max(1.0, timeout - (time.time() - start))
+        
+        return self._locator_click(xpath, timeout, interval, screenshot_on_fail)
+    
+    def _fast_click(self, xpath: str, mode: str, timeout: float) -> Optional[bool]:
+        """
+        快速点击：缓存坐标或一次 evaluate 定位，随后通过 CDP 或 el.click() 点击
+        
+        Returns:
+            True 已点击；None 超时仍不存在或不可见（无需回退）；
+            False 元素存在但被遮挡，或 CDP 调用失败（回退 locator）
+        """
+        deadline = time.time() + timeout
+        present = False
+        while True:
+            try:
+                if mode == ClickMode.JS:
+                    point = self._evaluate(_CLICK_POINT_JS, {
+                        "xpath": xpath, "key": self._xpath_keys.get(xpath), "click": True
+                    })
+                    if point and not point["covered"]:
+                        return True
+                    present = present or bool(point)
+                else:
+                    point = self._click_point(xpath)
+                    if point and not point[2]:
+                        self._dispatch_click(point[0], point[1])
+                        return True
+                    present = present or bool(point)
+            except Exception as e:
+                warning(f"快速点击失败，回退 locator: {e}")
+                self._click_points.pop(xpath, None)
+                return False
+            
+            if time.time() >= deadline:
+                return False if present else None
+            self.page.wait_for_timeout(50)
+    
+    def _click_point(self, xpath: str) -> Optional[Tuple[float, float, bool]]:
+        """
+        获取元素中心坐标（缓存坐标先做命中检测，元素已移除或被遮挡时重新定位）
+        
+        Returns:
+            (x, y, 是否被遮挡)，元素不存在或不可见时返回 None
+        """
+        cached = self._click_points.get(xpath)
+        if cached and time.time() - cached[2] < CLICK_CACHE_TTL:
+            if self._evaluate(_CLICK_HIT_JS, {"xpath": xpath, "x": cached[0], "y": cached[1]}):
+                self.click_cache_stats["hits"] += 1
+                return cached[0], cached[1], False
+            self._click_points.pop(xpath, None)
+        
+        self.click_cache_stats["misses"] += 1
+        point = self._evaluate(_CLICK_POINT_JS, {
+            "xpath": xpath, "key": self._xpath_keys.get(xpath), "click": False
+        })
+        if not point or point["covered"]:
+            self._click_points.pop(xpath, None)
+            return (point["x"], point["y"], True) if point else None
+        # 刚滚动过的坐标等下次定位再缓存；没有布局观察器时不缓存
+        if not point["scrolled"] and self._layout_watched:
+            self._click_points[xpath] = (point["x"], point["y"], time.time())
+        return point["x"], point["y"], False
+    
+    def _dispatch_click(self, x: float, y: float) -> None:
+        """通过 CDP Input.dispatchMouseEvent 发送一次左键点击"""
+        session = self._cdp()
+        for event_type in ("mousePressed", "mouseReleased"):
+            session.send("Input.dispatchMouseEvent", {
+                "type": event_type, "x": x, "y": y, "button": "left", "clickCount": 1
+            })
+    
+    def _cdp(self):
+        """当前页面的 CDP 会话（懒创建，重新连接时重建）"""
+        if self._cdp_session is None:
+            self._cdp_session = self.page.context.new_cdp_session(self.page)
+        return self._cdp_session
+    
+    def performance_metrics(self) -> Optional[Dict[str, float]]:
+        """
+        渲染进程性能指标（CDP Performance.getMetrics，一次往返）
+        
+        Returns:
+            {指标名: 值}（JSHeapUsedSize、Nodes、JSEventListeners 等），获取失败返回 None
+        """
+        try:
+            session = self._cdp()
+            if self._perf_session is not session:
+                session.send("Performance.enable")
+                self._perf_session = session
+            return {m["name"]: m["value"] for m in session.send("Performance.getMetrics")["metrics"]}
+        except Exception as e:
+            warning(f"获取页面性能指标失败: {e}")
+            # 会话可能已失效，下次重建
+            self._cdp_session = self._perf_session = None
+            return None
+
+    def _locator_click(self, xpath: str, timeout: float, interval: float, screenshot_on_fail: bool) -> bool:
+        """Playwright locator 点击（原实现）"""
         start = time.time()
         last_error = None
         
@@ -688,14 +2170,18 @@ class BrowserManager:
                 # 滚动到可见区域并点击
                 locator.scroll_into_view_if_needed()
                 locator.click(force=True)
+                self.latency.record(f"click_{ClickMode.LOCATOR}", (time.time() - start) * 1000)
                 info("已点击按钮")
                 return True
-                
+            
             except Exception as e:
                 last_error = e
                 time.sleep(interval)
         
-        # 超时处理
+        return self._click_failed(last_error, screenshot_on_fail)
+    
+    def _click_failed(self, last_error: Optional[Exception], screenshot_on_fail: bool) -> bool:
+        """点击超时处理：记录原因，按需截图，返回 False"""
         warning(f"点击超时: {last_error or '未找到按钮'}")
         
         # 失败截图
@@ -704,11 +2190,38 @@ class BrowserManager:
         
         return False
     
+    def click_stats(self) -> Dict[str, Any]:
+        """
+        各点击路径的耗时分布
+        
+        Returns:
+            {路径: {"count", "p50_ms", "p90_ms", "p99_ms"}}，"cache" 为坐标缓存命中/未命中次数
+        """
+        stats: Dict[str, Any] = {}
+        for mode in (ClickMode.CDP, ClickMode.JS, ClickMode.LOCATOR):
+            name = f"click_{mode}"
+            samples = self.latency.samples.get(name)
+            if samples:
+                stats[mode] = {
+                    "count": len(samples),
+                    "p50_ms": self.latency.percentile(name, 50),
+                    "p90_ms": self.latency.percentile(name, 90),
+                    "p99_ms": self.latency.percentile(name, 99),
+                }
+        stats["cache"] = dict(self.click_cache_stats)
+        return stats
+    
     @with_verification
     def click_tab(self, index: int, timeout: int = 3000) -> bool:
-        """点击 Tab 按钮"""
+        """点击 Tab 按钮（已在该 Tab 时直接返回）"""
+        if self.current_tab() == index:
+            self.tab_stats["skipped"] += 1
+            return True
+        
+        self._click_points.clear()
+        self.tab_stats["switches"] += 1
         try:
-            result = self.page.evaluate("""
+            result = self._evaluate("""
                 async ({index, timeout}) => {
                     let tabs = document.querySelectorAll(".bn-tab.bn-tab__buySell");
                     if (!tabs.length || index < 0 || index >= tabs.length) return false;
@@ -728,9 +2241,11 @@ class BrowserManager:
             """, {"index": index, "timeout": timeout})
             
             info(f"切换到 Tab {index}: {'成功' if result else '失败'}")
+            self._set_tab(index if result else None)
             return result
         except Exception as e:
             warning(f"切换 Tab 失败: {e}")
+            self._set_tab(None)
             return False
     
     @with_verification
@@ -742,6 +2257,7 @@ class BrowserManager:
     ) -> bool:
         """切换复选框状态"""
         start = time.time()
+        self._click_points.clear()
         
         while time.time() - start < timeout:
             try:
@@ -750,7 +2266,7 @@ class BrowserManager:
                     time.sleep(0.5)
                     continue
                 
-                is_checked = self.page.evaluate(
+                is_checked = self._evaluate(
                     "(el) => el.classList.contains('checked')",
                     checkbox
                 )
@@ -779,12 +2295,32 @@ class BrowserManager:
         target_url: str,
         xpath: str,
         delay: float = 3,
-        timeout: float = 60
+        timeout: float = 60,
+        ready_timeout: float = 20
     ) -> bool:
-        """刷新页面直到元素出现"""
+        """
+        刷新页面直到可交易
+        
+        domcontentloaded 之后继续等待加载标记可见、价格可解析、买入/卖出 Tab 渲染完成，
+        每次刷新到可交易的耗时记入 self.latency（page_ready）
+        
+        Args:
+            target_url: 目标页面 URL（当前 URL 不同时跳转，否则刷新）
+            xpath: 页面加载标记的 XPath
+            delay: 未就绪时再次刷新前的等待（秒）
+            timeout: 总超时（秒）
+            ready_timeout: 单次刷新后等待可交易的超时（秒）
+        
+        Returns:
+            页面是否可交易
+        """
         start = time.time()
+        self._click_points.clear()
+        self._set_tab(None)
+        ready_arg = page_ready_args(self.xpaths, xpath)
         
         while time.time() - start < timeout:
+            attempt_start = time.time()
             try:
                 if self.page.url != target_url:
                     info(f"跳转到: {target_url[:50]}...")
@@ -793,18 +2329,30 @@ class BrowserManager:
                     info("刷新页面...")
                     self.page.reload(wait_until="domcontentloaded", timeout=60000)
                 
-                element = self.page.locator(f"xpath={xpath}")
-                if element:
-                    success("页面加载完成，目标元素已出现")
-                    return True
-                    
+                remaining = max(1.0, min(ready_timeout, timeout - (time.time() - start)))
+                self.page.wait_for_function(_PAGE_READY_JS, arg=ready_arg, timeout=remaining * 1000, polling=100)
+                ready_ms = (time.time() - attempt_start) * 1000
+                self.latency.record("page_ready", ready_ms)
+                success(f"页面可交易 (刷新到就绪 {ready_ms:.0f}ms)")
+                return True
+                
+            except PlaywrightTimeout:
+                self.latency.record("page_ready", (time.time() - attempt_start) * 1000, timed_out=True)
+                warning(f"页面未就绪，缺少: {', '.join(self._page_not_ready(ready_arg)) or '未知'}")
             except Exception as e:
                 warning(f"刷新失败: {e}")
             
-            time.sleep(delay)
+            time.sleep(min(delay, max(0.0, timeout - (time.time() - start))))
         
         error("刷新超时")
         return False
+    
+    def _page_not_ready(self, ready_arg: Dict[str, Any]) -> List[str]:
+        """可交易条件中尚未满足的项"""
+        try:
+            return self.page.evaluate(_PAGE_READY_JS, {**ready_arg, "explain": True})
+        except Exception:
+            return []
 
 
 # ============================================
@@ -812,55 +2360,9 @@ class BrowserManager:
 # ============================================
 
 def get_current_page_url(port: int = 9222) -> Optional[str]:
-    """快速获取当前页面 URL (智能识别交易页)"""
-    with sync_playwright() as p:
-        browser = None
-        try:
-            browser = p.chromium.connect_over_cdp(f"http://127.0.0.1:{port}")
-        except Exception:
-            try:
-                info = requests.get(f"http://127.0.0.1:{port}/json/version", timeout=3).json()
-                ws_url = info.get("webSocketDebuggerUrl")
-                if ws_url:
-                    browser = p.chromium.connect_over_cdp(ws_url)
-            except Exception:
-                pass
-        
-        if not browser:
-            return None
-        
-        target_url = None
-        best_candidate = None
-        
-        for context in browser.contexts:
-            for page in context.pages:
-                url = page.url
-                if url.startswith("devtools://"):
-                    continue
-                
-                # 优先找现货交易页面
-                if "binance.com" in url and ("spot" in url or "trade" in url):
-                    target_url = url
-                    break
-                
-                # 避开账号安全页面
-                if "accounts.binance.com" not in url:
-                    best_candidate = url
-            
-            if target_url:
-                break
-        
-        if target_url:
-            return target_url
-        if best_candidate:
-            return best_candidate
-            
-        # 如果没有更好的选择，返回最后一个页面
-        for context in browser.contexts:
-            if context.pages:
-                return context.pages[-1].url
-        
-        return None
+    """快速获取当前页面 URL (智能识别交易页，只走 /json/list，不启动 Playwright)"""
+    target = get_devtools_client(port).pick_page()
+    return target.url if target else None
 
 
 def random_sleep(min_seconds: float = 1, max_seconds: float = 5) -> float:
@@ -884,6 +2386,94 @@ def elapsed_time(start_time: float, text: str = "用时") -> None:
 # Chrome 自动启动
 # ============================================
 
+# 精简配置：关闭扩展、后台联网、组件更新、同步等与交易无关的后台服务
+_LEAN_FLAGS = (
+    "--disable-extensions",
+    "--disable-component-extensions-with-background-pages",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-sync",
+    "--disable-default-apps",
+    "--disable-domain-reliability",
+    "--disable-client-side-phishing-detection",
+    "--disable-breakpad",
+    "--no-pings",
+    "--metrics-recording-only",
+    "--disable-features=Translate,MediaRouter,OptimizationHints,AutofillServerCommunication",
+    # 后台/被遮挡标签页的定时器节流会推迟页面自身的行情与委托更新
+    "--disable-background-timer-throttling",
+    "--disable-renderer-backgrounding",
+    "--disable-backgrounding-occluded-windows",
+    # 不使用硬件加速，省去 GPU 进程的显存与驱动开销（合成改走软件）
+    "--disable-gpu",
+)
+
+# 启动配置：名称 -> 额外启动参数（在基础参数之后追加）
+LAUNCH_PROFILES: Dict[str, Tuple[str, ...]] = {
+    "default": (),
+    "lean": _LEAN_FLAGS,
+    "headless": _LEAN_FLAGS + ("--headless=new",),
+}
+
+# 无头模式的窗口尺寸：XPATH 依赖桌面版交易布局（窄窗口会切换为移动端布局）
+HEADLESS_WINDOW_SIZE = "1920,1080"
+
+
+def parse_window_size(window_size: str) -> Optional[Tuple[int, int]]:
+    """
+    解析窗口尺寸
+
+    Args:
+        window_size: "宽,高"（也接受 "宽x高"）
+
+    Returns:
+        (宽, 高)，格式错误时返回 None
+    """
+    try:
+        width, height = window_size.lower().replace("x", ",").split(",")
+        return int(width), int(height)
+    except (ValueError, AttributeError):
+        return None
+
+
+def chrome_launch_args(
+    port: int,
+    chrome_path: str,
+    user_data_dir: str,
+    profile: str = "default",
+    window_size: str = HEADLESS_WINDOW_SIZE,
+    start_url: str = ""
+) -> List[str]:
+    """
+    构建 Chrome 启动命令
+    
+    Args:
+        port: 调试端口
+        chrome_path: Chrome 可执行文件路径
+        user_data_dir: 用户数据目录
+        profile: 启动配置名（LAUNCH_PROFILES，未知名称按 default 处理）
+        window_size: 无头模式的窗口尺寸（"宽,高"，有窗口时保留用户自己的窗口大小）
+        start_url: 启动后直接打开的页面（可选）
+        
+    Returns:
+        命令行参数列表
+    """
+    if profile not in LAUNCH_PROFILES:
+        warning(f"未知启动配置 {profile}，使用 default")
+    args = [
+        chrome_path,
+        f"--remote-debugging-port={port}",
+        f"--user-data-dir={user_data_dir}",
+        "--no-first-run",
+        "--no-default-browser-check",
+        *LAUNCH_PROFILES.get(profile, ()),
+    ]
+    if profile == "headless":
+        args.append(f"--window-size={window_size}")
+    if start_url:
+        args.append(start_url)
+    return args
+
 def is_chrome_running(port: int = 9222) -> bool:
     """
     检查 Chrome 是否已在指定端口运行
@@ -894,27 +2484,29 @@ def is_chrome_running(port: int = 9222) -> bool:
     Returns:
         是否运行中
     """
-    try:
-        resp = requests.get(f"http://127.0.0.1:{port}/json/version", timeout=3)
-        return resp.status_code == 200
-    except Exception:
-        return False
+    return get_devtools_client(port).is_alive()
 
 
 def start_chrome(
     port: int = 9222,
     chrome_path: str = "C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe",
     user_data_dir: str = "",
-    wait_seconds: int = 5
+    timeout: float = 30,
+    profile: str = "default",
+    window_size: str = HEADLESS_WINDOW_SIZE,
+    start_url: str = ""
 ) -> bool:
     """
-    启动带远程调试端口的 Chrome 浏览器
+    启动带远程调试端口的 Chrome 浏览器，就绪后立即返回
     
     Args:
         port: 调试端口
         chrome_path: Chrome 可执行文件路径
         user_data_dir: 用户数据目录（用于保持登录状态）
-        wait_seconds: 启动后等待秒数
+        timeout: 等待就绪的最长时间（秒）
+        profile: 启动配置名（default / lean / headless，仅在新启动时生效）
+        window_size: 无头模式的窗口尺寸
+        start_url: 启动后直接打开的页面（无头模式下无法手动打开交易页面）
         
     Returns:
         是否启动成功
@@ -929,28 +2521,21 @@ def start_chrome(
     
     # 自动生成 user_data_dir（如果未指定）
     if not user_data_dir:
-        if platform.system() == "Windows":
-            user_data_dir = f"D:\\tmp\\cdp{port}"
-        else:
-            user_data_dir = f"/tmp/cdp{port}"
+        user_data_dir = default_user_data_dir(port)
     
     # 确保用户数据目录存在
     os.makedirs(user_data_dir, exist_ok=True)
     
     # 构建启动命令
-    args = [
-        chrome_path,
-        f"--remote-debugging-port={port}",
-        f"--user-data-dir={user_data_dir}",
-        "--no-first-run",
-        "--no-default-browser-check",
-    ]
+    args = chrome_launch_args(port, chrome_path, user_data_dir, profile, window_size, start_url)
     
-    info(f"🚀 启动 Chrome (端口: {port})...")
+    info(f"🚀 启动 Chrome (端口: {port}, 配置: {profile})...")
     info(f"   路径: {chrome_path}")
     info(f"   数据目录: {user_data_dir}")
     
     try:
+        launch_time = time.time()
+        
         # Windows 使用 subprocess.Popen 启动，不阻塞
         if platform.system() == "Windows":
             subprocess.Popen(
@@ -967,24 +2552,15 @@ def start_chrome(
                 start_new_session=True
             )
         
-        # 等待 Chrome 启动
-        info(f"⏳ 等待 Chrome 启动 ({wait_seconds}s)...")
-        time.sleep(wait_seconds)
-        
-        # 验证是否启动成功
-        if is_chrome_running(port):
-            success(f"✅ Chrome 启动成功 (端口: {port})")
+        # 观察 DevToolsActivePort + /json/version，就绪即返回
+        info(f"⏳ 等待 Chrome 就绪 (最长 {timeout:.0f}s)...")
+        ready_after = wait_until_ready(port, user_data_dir, timeout=timeout, since=launch_time)
+        if ready_after is not None:
+            success(f"✅ Chrome 启动成功 (端口: {port}, 启动到就绪 {ready_after * 1000:.0f}ms)")
             return True
-        else:
-            # 再等待几秒重试
-            info("Chrome 还在启动中，再等待 5s...")
-            time.sleep(5)
-            if is_chrome_running(port):
-                success(f"✅ Chrome 启动成功 (端口: {port})")
-                return True
-            else:
-                error(f"❌ Chrome 启动失败 (端口: {port})")
-                return False
+        
+        error(f"❌ Chrome 启动失败 (端口: {port}, {timeout:.0f}s 内未就绪)")
+        return False
                 
     except FileNotFoundError:
         error(f"❌ Chrome 路径无效: {chrome_path}")
@@ -998,7 +2574,10 @@ def start_chrome(
 def ensure_chrome_running(
     port: int = 9222,
     chrome_path: str = "C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe",
-    user_data_dir: str = ""
+    user_data_dir: str = "",
+    profile: str = "default",
+    window_size: str = HEADLESS_WINDOW_SIZE,
+    start_url: str = ""
 ) -> bool:
     """
     确保 Chrome 在指定端口运行（如果没运行则启动）
@@ -1007,12 +2586,19 @@ def ensure_chrome_running(
         port: 调试端口
         chrome_path: Chrome 可执行文件路径
         user_data_dir: 用户数据目录
+        profile: 启动配置名（已在运行的 Chrome 不受影响）
+        window_size: 无头模式的窗口尺寸
+        start_url: 启动后直接打开的页面
         
     Returns:
         Chrome 是否可用
     """
-    if is_chrome_running(port):
+    version = get_devtools_client(port).version()
+    if version:
         info(f"✅ Chrome 已在端口 {port} 运行")
+        # 同一 user_data_dir 只能被一个 Chrome 使用，已有窗口实例时无头配置不会生效
+        if profile == "headless" and "Headless" not in version.get("User-Agent", ""):
+            warning("端口上运行的是带窗口的 Chrome，无头模式未生效（关闭该窗口后重新运行即可）")
         return True
     
-    return start_chrome(port, chrome_path, user_data_dir)
+    return start_chrome(port, chrome_path, user_data_dir, profile=profile, window_size=window_size, start_url=start_url)
@@ -0,0 +1,187 @@
+"""
+失败现场采集模块 - 异步、限频的截图/DOM 快照
+交易热路径上只抓取一帧视口 JPEG（或序列化 DOM），解码、去重和写盘交给后台线程；
+同一错误类别按最小间隔限频，相同画面按哈希去重，目录总大小超过配额时删除最旧文件
+"""
+import base64
+import hashlib
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Callable, Dict, Union, List, Tuple
+
+from logger import info, warning
+
+
+# 同一错误类别两次采集的最小间隔（秒）
+CAPTURE_MIN_INTERVAL = 30.0
+# 采集目录的磁盘配额（字节）
+CAPTURE_MAX_BYTES = 50 * 1024 * 1024
+# 去重时记住的最近画面哈希数
+CAPTURE_HASH_MEMORY = 64
+
+
+@dataclass
+class Frame:
+    """一帧待写入的采集数据"""
+    ext: str                       # 文件扩展名（jpg / html）
+    data: Union[bytes, str]
+    is_base64: bool = False        # data 是否为 base64 文本（CDP 截图返回值）
+
+    def to_bytes(self) -> bytes:
+        if self.is_base64:
+            return base64.b64decode(self.data)
+        if isinstance(self.data, str):
+            return self.data.encode("utf-8")
+        return self.data
+
+
+class CaptureService:
+    """
+    后台写盘的失败现场采集器
+
+    capture() 在调用线程（Playwright 所在线程）抓取一帧后立即返回，
+    后台守护线程负责解码、哈希去重、写文件和配额清理。
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        min_interval: float = CAPTURE_MIN_INTERVAL,
+        max_bytes: int = CAPTURE_MAX_BYTES,
+        queue_size: int = 8
+    ):
+        """
+        Args:
+            directory: 采集目录
+            min_interval: 同一错误类别的最小采集间隔（秒）
+            max_bytes: 目录磁盘配额（字节）
+            queue_size: 待写入队列长度（写盘跟不上时丢弃新帧）
+        """
+        self.directory = directory
+        self.min_interval = min_interval
+        self.max_bytes = max_bytes
+        self._queue: "queue.Queue[Optional[Tuple[str, Frame]]]" = queue.Queue(maxsize=queue_size)
+        self._last_capture: Dict[str, float] = {}
+        self._hashes: "OrderedDict[str, None]" = OrderedDict()
+        self._files: List[Tuple[float, str, int]] = []    # (mtime, 路径, 大小)，按时间排序
+        self._total_bytes: int = 0
+        self._worker: Optional[threading.Thread] = None
+        self.stats: Dict[str, float] = {
+            "captured": 0, "rate_limited": 0, "duplicates": 0, "dropped": 0,
+            "evicted": 0, "failed": 0, "grab_ms": 0.0,
+        }
+
+    def _ensure_worker(self) -> None:
+        """首次采集时扫描已有文件并启动后台线程"""
+        if self._worker and self._worker.is_alive():
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self._files = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if os.path.isfile(path):
+                stat = os.stat(path)
+                self._files.append((stat.st_mtime, path, stat.st_size))
+        self._files.sort()
+        self._total_bytes = sum(size for _, _, size in self._files)
+        self._worker = threading.Thread(target=self._run, name="capture-writer", daemon=True)
+        self._worker.start()
+
+    def capture(self, error_class: str, grab: Callable[[], Frame]) -> Optional[str]:
+        """
+        采集一帧（限频，非阻塞写盘）
+
+        Args:
+            error_class: 错误类别（同时作为文件名前缀）
+            grab: 在调用线程抓取一帧的函数
+
+        Returns:
+            计划写入的文件路径；被限频、抓取失败或队列已满时返回 None
+            （画面与最近采集重复时后台不会生成该文件）
+        """
+        now = time.time()
+        if now - self._last_capture.get(error_class, 0) < self.min_interval:
+            self.stats["rate_limited"] += 1
+            return None
+        self._last_capture[error_class] = now
+
+        start = time.time()
+        try:
+            frame = grab()
+        except Exception as e:
+            self.stats["failed"] += 1
+            warning(f"采集失败: {e}")
+            return None
+        self.stats["grab_ms"] += (time.time() - start) * 1000
+
+        self._ensure_worker()
+        # 毫秒时间戳：限频间隔很短时文件名也不会相互覆盖
+        filename = f"{error_class}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')[:-3]}.{frame.ext}"
+        path = os.path.join(self.directory, filename)
+        try:
+            self._queue.put_nowait((path, frame))
+        except queue.Full:
+            self.stats["dropped"] += 1
+            return None
+        self.stats["captured"] += 1
+        return path
+
+    def _run(self) -> None:
+        """后台线程：解码 → 去重 → 写盘 → 配额清理"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+            path, frame = item
+            try:
+                self._write(path, frame)
+            except Exception as e:
+                self.stats["failed"] += 1
+                warning(f"写入采集文件失败: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, path: str, frame: Frame) -> None:
+        data = frame.to_bytes()
+        digest = hashlib.sha1(data).hexdigest()
+        if digest in self._hashes:
+            self._hashes.move_to_end(digest)
+            self.stats["duplicates"] += 1
+            return
+        self._hashes[digest] = None
+        if len(self._hashes) > CAPTURE_HASH_MEMORY:
+            self._hashes.popitem(last=False)
+
+        with open(path, "wb") as f:
+            f.write(data)
+        self._files.append((time.time(), path, len(data)))
+        self._total_bytes += len(data)
+        info(f"失败现场已保存: {path}")
+        self._enforce_quota()
+
+    def _enforce_quota(self) -> None:
+        """删除最旧的文件，直到目录总大小不超过配额（至少保留最新一个）"""
+        while self._total_bytes > self.max_bytes and len(self._files) > 1:
+            _, path, size = self._files.pop(0)
+            self._total_bytes -= size
+            try:
+                os.remove(path)
+                self.stats["evicted"] += 1
+            except OSError:
+                pass
+
+    def close(self, timeout: float = 5.0) -> None:
+        """等待队列写完并停止后台线程"""
+        if not self._worker or not self._worker.is_alive():
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._worker.join(timeout)
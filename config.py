@@ -4,6 +4,8 @@
 支持从 accounts.yaml 加载多账号配置
 """
 import os
+import platform
+import tempfile
 from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Any
 from pathlib import Path
@@ -30,6 +32,19 @@ CONFIG_DIR = Path(__file__).parent
 ACCOUNTS_FILE = CONFIG_DIR / "accounts.yaml"
 
 
+def default_user_data_dir(port: int, base: str = "") -> str:
+    """
+    未指定 user_data_dir 时自动生成的 Chrome 用户数据目录：{base}/cdp{port}
+    
+    Args:
+        port: 调试端口
+        base: 基础目录，为空时 Windows 用 D:\\tmp，其他系统用临时目录
+    """
+    if not base:
+        base = "D:\\tmp" if platform.system() == "Windows" else tempfile.gettempdir()
+    return os.path.join(base, f"cdp{port}")
+
+
 def get_env(key: str, default: str = "", type_cast: type = str):
     """从环境变量获取配置，支持类型转换"""
     value = os.getenv(key, default)
@@ -51,6 +66,12 @@ class TradeConfig:
     total_runs: int = field(default_factory=lambda: get_env("TOTAL_RUNS", "36", int))
     reserved_amount: float = field(default_factory=lambda: get_env("RESERVED_AMOUNT", "0", float))
     min_sell_amount: float = field(default_factory=lambda: get_env("MIN_SELL_AMOUNT", "1", float))
+    # 流水线：最多同时在途的反向卖单笔数（1 为逐笔交易），在途占用资金上限（0 表示 cost * max_inflight）
+    max_inflight: int = field(default_factory=lambda: get_env("MAX_INFLIGHT", "1", int))
+    capital_budget: float = field(default_factory=lambda: get_env("CAPITAL_BUDGET", "0", float))
+    # 目标成交量（USDT，>0 时取代 total_runs，按成交量规划每笔金额）与截止时间（"HH:MM" 或 "YYYY-MM-DD HH:MM"）
+    volume_target: float = field(default_factory=lambda: get_env("VOLUME_TARGET", "0", float))
+    volume_deadline: str = field(default_factory=lambda: get_env("VOLUME_DEADLINE", ""))
 
 
 @dataclass
@@ -65,6 +86,25 @@ class BrowserConfig:
         "C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe"
     ))
     user_data_dir: str = field(default_factory=lambda: get_env("USER_DATA_DIR", ""))  # 留空则自动生成
+    # 启动配置：default / lean（关闭扩展、后台服务、定时器节流、GPU）/ headless（lean + 无头）
+    launch_profile: str = field(default_factory=lambda: get_env("LAUNCH_PROFILE", "default"))
+    # 无头模式：复用同一 user_data_dir 的登录态，无需显示器（开启时启动配置固定为 headless）
+    headless: bool = field(default_factory=lambda: get_env("HEADLESS", "false", bool))
+    # 无头模式窗口/视口尺寸（宽,高）
+    window_size: str = field(default_factory=lambda: get_env("WINDOW_SIZE", "1920,1080"))
+    # 拦截页面资产/委托接口响应作为账户状态来源（可选，默认关闭）
+    intercept_responses: bool = field(default_factory=lambda: get_env("INTERCEPT_RESPONSES", "false", bool))
+    # 点击方式：cdp（坐标 + CDP 鼠标事件）/ js（el.click()）/ locator（Playwright 原实现）
+    click_mode: str = field(default_factory=lambda: get_env("CLICK_MODE", "cdp"))
+    # 页面内一次完成 勾选/填写/下单/确认（失败时自动回退逐步操作）
+    in_page_submit: bool = field(default_factory=lambda: get_env("IN_PAGE_SUBMIT", "true", bool))
+    # 请求路由：off（不拦截）/ lite（图片、字体、媒体、埋点）/ strict（另加营销组件）
+    routing_profile: str = field(default_factory=lambda: get_env("ROUTING_PROFILE", "off"))
+
+    @property
+    def effective_launch_profile(self) -> str:
+        """实际使用的启动配置"""
+        return "headless" if self.headless else self.launch_profile
 
 
 @dataclass 
@@ -76,6 +116,15 @@ class IntervalConfig:
     # 反向订单等待超时时间（秒）- 买入后等待反向卖单成交的最长时间
     # 缩短为30秒，超时后立即市价卖出，避免长时间卡住
     reverse_order_timeout: int = field(default_factory=lambda: get_env("REVERSE_ORDER_TIMEOUT", "30", int))
+    # 目标完成时间（"HH:MM" 或 "YYYY-MM-DD HH:MM"）：设置后按进度计算两轮间隔，取代 min/max_interval 随机休眠；
+    # 为空时取 volume_deadline，两者都为空时保持随机休眠
+    finish_by: str = field(default_factory=lambda: get_env("FINISH_BY", ""))
+    # 刷新策略：health（按 JS 堆/DOM 增长刷新）/ interval（每 refresh_interval 轮刷新）
+    refresh_mode: str = field(default_factory=lambda: get_env("REFRESH_MODE", "health"))
+    # health 模式阈值：JS 堆上限（MB）、DOM 节点上限、页面最长存活时间（秒，兜底）
+    max_heap_mb: float = field(default_factory=lambda: get_env("MAX_HEAP_MB", "400", float))
+    max_dom_nodes: int = field(default_factory=lambda: get_env("MAX_DOM_NODES", "100000", int))
+    max_page_age: int = field(default_factory=lambda: get_env("MAX_PAGE_AGE", "1800", int))
 
 
 @dataclass
@@ -140,17 +189,39 @@ class Config:
         print(f"  用户名: {self.trade.username}")
         print(f"  端口: {self.browser.port}")
         print(f"  单次交易额: {self.trade.cost}")
-        print(f"  执行次数: {self.trade.total_runs}")
+        if self.trade.volume_target > 0:
+            deadline = f"，截止 {self.trade.volume_deadline}" if self.trade.volume_deadline else ""
+            print(f"  目标成交量: {self.trade.volume_target}{deadline}")
+        else:
+            print(f"  执行次数: {self.trade.total_runs}")
         print(f"  保留币数: {self.trade.reserved_amount}")
         print(f"  最小卖出: {self.trade.min_sell_amount}")
-        print(f"  刷新间隔: {self.interval.refresh_interval}")
-        print(f"  休息间隔: {self.interval.min_interval}-{self.interval.max_interval}s")
+        if self.trade.max_inflight > 1:
+            budget = self.trade.capital_budget or self.trade.cost * self.trade.max_inflight
+            print(f"  流水线: 最多在途 {self.trade.max_inflight} 笔，资金预算 {budget:.2f}")
+        if self.interval.refresh_mode == "interval":
+            print(f"  刷新间隔: {self.interval.refresh_interval}")
+        else:
+            print(f"  刷新策略: 页面健康 (JS 堆 {self.interval.max_heap_mb:.0f}MB / DOM {self.interval.max_dom_nodes} "
+                  f"/ 最长 {self.interval.max_page_age}s)")
+        finish_by = self.interval.finish_by or self.trade.volume_deadline
+        if finish_by:
+            print(f"  目标完成时间: {finish_by}（按进度调整间隔）")
+        else:
+            print(f"  休息间隔: {self.interval.min_interval}-{self.interval.max_interval}s")
         print(f"  反向订单超时: {self.interval.reverse_order_timeout}s")
         print(f"  买价上浮: {(self.price.buy_price_percent - 1) * 100:.2f}%")
         print(f"  买价差值: {self.price.buy_price_diff}")
         print(f"  卖价百分比: {self.price.sell_price_percent}")
         if self.browser.target_url:
             print(f"  目标页面: {self.browser.target_url}")
+        print(f"  响应拦截: {'开启' if self.browser.intercept_responses else '关闭'}")
+        print(f"  点击方式: {self.browser.click_mode}")
+        print(f"  页面内下单: {'开启' if self.browser.in_page_submit else '关闭'}")
+        print(f"  请求路由: {self.browser.routing_profile}")
+        print(f"  启动配置: {self.browser.effective_launch_profile}")
+        if self.browser.headless:
+            print(f"  无头窗口: {self.browser.window_size}")
         print(f"  验证器: {'已配置' if self.security.secret else '未配置'}")
         print()
 
@@ -172,12 +243,21 @@ class AccountConfig:
     total_runs: Optional[int] = None
     reserved_amount: Optional[float] = None
     min_sell_amount: Optional[float] = None
+    max_inflight: Optional[int] = None
+    capital_budget: Optional[float] = None
+    volume_target: Optional[float] = None
+    volume_deadline: Optional[str] = None
     
     # 间隔配置
     refresh_interval: Optional[int] = None
     min_interval: Optional[int] = None
     max_interval: Optional[int] = None
     reverse_order_timeout: Optional[int] = None
+    finish_by: Optional[str] = None
+    refresh_mode: Optional[str] = None     # 刷新策略 health/interval
+    max_heap_mb: Optional[float] = None
+    max_dom_nodes: Optional[int] = None
+    max_page_age: Optional[int] = None
     
     # 价格配置
     buy_price_percent: Optional[float] = None
@@ -189,6 +269,13 @@ class AccountConfig:
     target_url: Optional[str] = None
     chrome_path: Optional[str] = None      # Chrome 可执行文件路径
     user_data_dir: Optional[str] = None    # 用户数据目录
+    launch_profile: Optional[str] = None   # 启动配置 default/lean/headless
+    headless: Optional[bool] = None        # 无头模式
+    window_size: Optional[str] = None      # 无头模式窗口尺寸（宽,高）
+    intercept_responses: Optional[bool] = None  # 拦截 REST 响应作为账户状态来源
+    click_mode: Optional[str] = None       # 点击方式 cdp/js/locator
+    in_page_submit: Optional[bool] = None  # 页面内一次完成下单
+    routing_profile: Optional[str] = None  # 请求路由 off/lite/strict
 
 
 def _load_yaml_file(filepath: Path) -> Optional[Dict[str, Any]]:
@@ -239,8 +326,7 @@ def load_accounts(filepath: Path = ACCOUNTS_FILE) -> List[AccountConfig]:
         try:
             # 自动生成 user_data_dir（如果未指定）
             port = merged.get('port', 9222)
-            user_data_base = merged.get('user_data_base', 'D:\\tmp')
-            user_data_dir = merged.get('user_data_dir') or f"{user_data_base}\\cdp{port}"
+            user_data_dir = merged.get('user_data_dir') or default_user_data_dir(port, merged.get('user_data_base') or "")
             
             account = AccountConfig(
                 name=merged.get('name'),
@@ -251,10 +337,19 @@ def load_accounts(filepath: Path = ACCOUNTS_FILE) -> List[AccountConfig]:
                 total_runs=merged.get('total_runs'),
                 reserved_amount=merged.get('reserved_amount'),
                 min_sell_amount=merged.get('min_sell_amount'),
+                max_inflight=merged.get('max_inflight'),
+                capital_budget=merged.get('capital_budget'),
+                volume_target=merged.get('volume_target'),
+                volume_deadline=merged.get('volume_deadline'),
                 refresh_interval=merged.get('refresh_interval'),
                 min_interval=merged.get('min_interval'),
                 max_interval=merged.get('max_interval'),
                 reverse_order_timeout=merged.get('reverse_order_timeout'),
+                finish_by=merged.get('finish_by'),
+                refresh_mode=merged.get('refresh_mode'),
+                max_heap_mb=merged.get('max_heap_mb'),
+                max_dom_nodes=merged.get('max_dom_nodes'),
+                max_page_age=merged.get('max_page_age'),
                 buy_price_percent=merged.get('buy_price_percent'),
                 buy_price_diff=merged.get('buy_price_diff'),
                 sell_price_percent=merged.get('sell_price_percent'),
@@ -262,6 +357,13 @@ def load_accounts(filepath: Path = ACCOUNTS_FILE) -> List[AccountConfig]:
                 target_url=merged.get('target_url'),
                 chrome_path=merged.get('chrome_path'),
                 user_data_dir=user_data_dir,
+                launch_profile=merged.get('launch_profile'),
+                headless=merged.get('headless'),
+                window_size=merged.get('window_size'),
+                intercept_responses=merged.get('intercept_responses'),
+                click_mode=merged.get('click_mode'),
+                in_page_submit=merged.get('in_page_submit'),
+                routing_profile=merged.get('routing_profile'),
             )
             accounts.append(account)
         except Exception as e:
@@ -314,6 +416,10 @@ def build_config_from_account(account: AccountConfig) -> Config:
         total_runs=account.total_runs if account.total_runs is not None else get_env("TOTAL_RUNS", "36", int),
         reserved_amount=account.reserved_amount if account.reserved_amount is not None else get_env("RESERVED_AMOUNT", "0", float),
         min_sell_amount=account.min_sell_amount if account.min_sell_amount is not None else get_env("MIN_SELL_AMOUNT", "1", float),
+        max_inflight=account.max_inflight if account.max_inflight is not None else get_env("MAX_INFLIGHT", "1", int),
+        capital_budget=account.capital_budget if account.capital_budget is not None else get_env("CAPITAL_BUDGET", "0", float),
+        volume_target=account.volume_target if account.volume_target is not None else get_env("VOLUME_TARGET", "0", float),
+        volume_deadline=str(account.volume_deadline) if account.volume_deadline is not None else get_env("VOLUME_DEADLINE", ""),
     )
     
     # 创建 BrowserConfig
@@ -324,6 +430,13 @@ def build_config_from_account(account: AccountConfig) -> Config:
         target_url=account.target_url if account.target_url is not None else get_env("TARGET_URL", ""),
         chrome_path=account.chrome_path if account.chrome_path is not None else get_env("CHROME_PATH", default_chrome_path),
         user_data_dir=account.user_data_dir if account.user_data_dir is not None else "",
+        launch_profile=account.launch_profile if account.launch_profile is not None else get_env("LAUNCH_PROFILE", "default"),
+        headless=account.headless if account.headless is not None else get_env("HEADLESS", "false", bool),
+        window_size=account.window_size if account.window_size is not None else get_env("WINDOW_SIZE", "1920,1080"),
+        intercept_responses=account.intercept_responses if account.intercept_responses is not None else get_env("INTERCEPT_RESPONSES", "false", bool),
+        click_mode=account.click_mode if account.click_mode is not None else get_env("CLICK_MODE", "cdp"),
+        in_page_submit=account.in_page_submit if account.in_page_submit is not None else get_env("IN_PAGE_SUBMIT", "true", bool),
+        routing_profile=account.routing_profile if account.routing_profile is not None else get_env("ROUTING_PROFILE", "off"),
     )
     
     # 创建 IntervalConfig
@@ -332,6 +445,11 @@ def build_config_from_account(account: AccountConfig) -> Config:
         min_interval=account.min_interval if account.min_interval is not None else get_env("MIN_INTERVAL", "5", int),
         max_interval=account.max_interval if account.max_interval is not None else get_env("MAX_INTERVAL", "10", int),
         reverse_order_timeout=account.reverse_order_timeout if account.reverse_order_timeout is not None else get_env("REVERSE_ORDER_TIMEOUT", "30", int),
+        finish_by=str(account.finish_by) if account.finish_by is not None else get_env("FINISH_BY", ""),
+        refresh_mode=account.refresh_mode if account.refresh_mode is not None else get_env("REFRESH_MODE", "health"),
+        max_heap_mb=account.max_heap_mb if account.max_heap_mb is not None else get_env("MAX_HEAP_MB", "400", float),
+        max_dom_nodes=account.max_dom_nodes if account.max_dom_nodes is not None else get_env("MAX_DOM_NODES", "100000", int),
+        max_page_age=account.max_page_age if account.max_page_age is not None else get_env("MAX_PAGE_AGE", "1800", int),
     )
     
     # 创建 PriceConfig
@@ -0,0 +1,215 @@
+"""
+DevTools HTTP 客户端 - 基于 /json/version 与 /json/list 的轻量目标发现
+复用 keep-alive 连接探测 Chrome 状态、列出页面并挑选交易页面，
+结果直接交给 BrowserManager.connect，无需为了读取 URL 额外启动 Playwright 驱动
+"""
+import os
+import time
+from dataclasses import dataclass
+from typing import Optional, List, Dict, Any, Tuple
+
+import requests
+
+
+@dataclass
+class DevToolsTarget:
+    """/json/list 中的单个调试目标"""
+    id: str
+    type: str
+    url: str
+    title: str = ""
+    ws_url: str = ""
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "DevToolsTarget":
+        return cls(
+            id=data.get("id", ""),
+            type=data.get("type", ""),
+            url=data.get("url", ""),
+            title=data.get("title", ""),
+            ws_url=data.get("webSocketDebuggerUrl", ""),
+        )
+
+
+@dataclass
+class Discovery:
+    """目标发现结果（交给 BrowserManager.connect）"""
+    browser_ws_url: str
+    page: DevToolsTarget
+    elapsed_ms: float = 0.0
+
+
+class DevToolsClient:
+    """
+    DevTools HTTP 客户端
+
+    同一端口复用一个 requests.Session（HTTP keep-alive），
+    反复探测时不再每次新建 TCP 连接。
+    """
+
+    def __init__(self, port: int = 9222, host: str = "127.0.0.1", timeout: float = 3):
+        """
+        Args:
+            port: Chrome 调试端口
+            host: 调试地址
+            timeout: 单次请求超时（秒）
+        """
+        self.port = port
+        self.base_url = f"http://{host}:{port}"
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def _get(self, path: str, timeout: Optional[float] = None) -> Optional[Any]:
+        """GET 并解析 JSON，失败返回 None"""
+        try:
+            resp = self.session.get(f"{self.base_url}{path}", timeout=timeout or self.timeout)
+            if resp.status_code != 200:
+                return None
+            return resp.json()
+        except (requests.RequestException, ValueError):
+            return None
+
+    def version(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """/json/version（含浏览器级 webSocketDebuggerUrl）"""
+        return self._get("/json/version", timeout)
+
+    def is_alive(self, timeout: Optional[float] = None) -> bool:
+        """Chrome 调试端口是否可用"""
+        return self.version(timeout) is not None
+
+    def targets(self) -> List[DevToolsTarget]:
+        """/json/list 中的全部目标"""
+        data = self._get("/json/list") or []
+        return [DevToolsTarget.from_json(item) for item in data if isinstance(item, dict)]
+
+    def pages(self) -> List[DevToolsTarget]:
+        """普通页面目标（排除扩展、Service Worker 和 devtools 页面）"""
+        return [
+            target for target in self.targets()
+            if target.type == "page" and not target.url.startswith("devtools://")
+        ]
+
+    def pick_page(self, target_url: Optional[str] = None) -> Optional[DevToolsTarget]:
+        """
+        挑选交易页面（规则同 browser_manager.select_page）
+
+        Args:
+            target_url: 目标页面 URL（指定时严格匹配）
+        """
+        from browser_manager import select_page
+        return select_page(self.pages(), target_url)
+
+    def discover(self, target_url: Optional[str] = None) -> Optional[Discovery]:
+        """
+        一次完成浏览器 WebSocket 地址获取和页面挑选
+
+        Args:
+            target_url: 目标页面 URL（可选）
+
+        Returns:
+            Discovery，Chrome 不可用或没有合适页面时返回 None
+        """
+        start = time.time()
+        info = self.version()
+        if not info or not info.get("webSocketDebuggerUrl"):
+            return None
+        page = self.pick_page(target_url)
+        if not page:
+            return None
+        return Discovery(
+            browser_ws_url=info["webSocketDebuggerUrl"],
+            page=page,
+            elapsed_ms=(time.time() - start) * 1000,
+        )
+
+    def close(self) -> None:
+        """关闭连接池"""
+        self.session.close()
+
+
+# 每个端口一个持久客户端
+_clients: Dict[int, DevToolsClient] = {}
+
+
+def get_devtools_client(port: int = 9222) -> DevToolsClient:
+    """获取指定端口的共享客户端"""
+    client = _clients.get(port)
+    if client is None:
+        client = _clients[port] = DevToolsClient(port)
+    return client
+
+
+# ============================================
+# 启动就绪检测
+# ============================================
+
+# Chrome 监听调试端口后写入用户数据目录的文件（第一行端口，第二行浏览器 WebSocket 路径）
+DEVTOOLS_ACTIVE_PORT = "DevToolsActivePort"
+
+
+def read_devtools_active_port(user_data_dir: str, since: float = 0) -> Optional[Tuple[int, str]]:
+    """
+    读取用户数据目录中的 DevToolsActivePort
+
+    Args:
+        user_data_dir: 用户数据目录
+        since: 只接受该时间之后写入的文件（排除上次运行残留）
+
+    Returns:
+        (端口, WebSocket 路径)，文件不存在、过旧或不完整时返回 None
+    """
+    path = os.path.join(user_data_dir, DEVTOOLS_ACTIVE_PORT)
+    try:
+        if os.path.getmtime(path) < since:
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.read().split()
+        if len(lines) < 2:
+            return None
+        return int(lines[0]), lines[1]
+    except (OSError, ValueError):
+        return None
+
+
+def wait_until_ready(
+    port: int,
+    user_data_dir: Optional[str] = None,
+    timeout: float = 30,
+    since: Optional[float] = None,
+    initial_delay: float = 0.05,
+    max_delay: float = 0.25,
+    file_grace: float = 2.0
+) -> Optional[float]:
+    """
+    以指数退避等待 Chrome 调试端口就绪
+
+    优先观察 DevToolsActivePort 文件，文件出现后立即探测 /json/version；
+    超过 file_grace 秒仍未出现文件（如复用了已运行的实例）则直接探测 HTTP
+
+    Args:
+        port: 调试端口
+        user_data_dir: 用户数据目录（None 则只探测 HTTP）
+        timeout: 最长等待时间（秒）
+        since: 计时起点（默认当前时间，通常传入启动 Chrome 的时间）
+        initial_delay: 首次退避间隔（秒）
+        max_delay: 最大退避间隔（秒）
+        file_grace: 等待文件出现的宽限时间（秒）
+
+    Returns:
+        从 since 到就绪的耗时（秒），超时返回 None
+    """
+    start = time.time() if since is None else since
+    client = get_devtools_client(port)
+    delay = initial_delay
+
+    while time.time() - start < timeout:
+        file_ready = (
+            not user_data_dir
+            or read_devtools_active_port(user_data_dir, since=start - 1) is not None
+            or time.time() - start > file_grace
+        )
+        if file_ready and client.is_alive(timeout=0.5):
+            return time.time() - start
+        time.sleep(delay)
+        delay = min(delay * 2, max_delay)
+    return None
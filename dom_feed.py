@@ -0,0 +1,318 @@
+"""
+DOM 变更推送模块 - MutationObserver + page.expose_binding
+页面内监听价格跳动、余额变化、委托表行增删和验证器弹窗，主动推送回 Python，
+交易逻辑按条件阻塞等待，变化发生后毫秒级返回，而不是 sleep 后重新抓取 DOM
+"""
+import json
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional, Callable, Dict, Any, Deque, Iterable
+
+from logger import info, warning
+
+
+class DomEventKind:
+    """推送事件类型"""
+    PRICE = "price"        # 最新成交价文本变化
+    BALANCE = "balance"    # 某个面板的可用余额变化（detail.tab 为面板下标，detail.texts 为全部余额节点文本）
+    ORDERS = "orders"      # 委托表行增删
+    MFA = "mfa"            # 验证器弹窗出现/消失
+    TAB = "tab"            # 买入/卖出 Tab 切换（value 为选中 Tab 下标，-1 表示未找到）
+
+
+@dataclass
+class DomEvent:
+    """单条 DOM 变更事件"""
+    kind: str
+    value: Any
+    previous: Any = None
+    detail: Dict[str, Any] = field(default_factory=dict)
+    seq: int = 0
+    timestamp: float = field(default_factory=time.time)
+
+
+# 页面内观察器：合并突变后按节流间隔比较关键状态，变化时批量回调 Python
+_DOM_FEED_JS = """
+(config) => {
+    if (window.__alphaFeed) return false;
+    const state = { price: undefined, balances: {}, orderKeys: null, mfa: undefined, tab: undefined };
+    const feed = window.__alphaFeed = { state, pending: false };
+
+    // 选择器注册表已安装时按键取缓存节点，否则直接解析 XPath
+    const first = (key, xpath) => {
+        const R = window.__alphaSelectors;
+        if (R && R.has(key)) return R.node(key);
+        return xpath ? document.evaluate(
+            xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+        ).singleNodeValue : null;
+    };
+    const all = (key, xpath) => {
+        const R = window.__alphaSelectors;
+        if (R && R.has(key)) return R.nodes(key);
+        if (!xpath) return [];
+        const result = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        const list = [];
+        for (let i = 0; i < result.snapshotLength; i++) list.push(result.snapshotItem(i));
+        return list;
+    };
+    const textOf = (el) => el ? (el.innerText || el.textContent || '').trim() : null;
+
+    const selectedTab = (tabs) => {
+        for (let i = 0; i < tabs.length; i++) {
+            if (tabs[i].getAttribute("aria-selected") === "true") return i;
+        }
+        return -1;
+    };
+
+    // 只观察价格、余额、Tab 和委托表所在的子树（整页观察时行情/K 线的每次重绘都会触发检查）；
+    // 节点被 React 替换或尚未挂载时，下一次检查（含兜底定时检查）重新绑定
+    const TEXT = { childList: true, subtree: true, characterData: true };
+    const TABS = { childList: true, subtree: true, attributes: true, attributeFilter: ["aria-selected", "class"] };
+    const ROWS = { childList: true, subtree: true };
+    const observer = new MutationObserver(schedule);
+    let watched = [];
+    const watch = (targets) => {
+        targets = targets.filter(([node]) => node);
+        if (targets.length === watched.length && targets.every(([node], i) => node === watched[i])) return;
+        observer.disconnect();
+        for (const [node, options] of targets) observer.observe(node, options);
+        watched = targets.map(([node]) => node);
+    };
+    const parentOf = (el) => el ? (el.parentElement || el) : null;
+
+    const mfaVisible = () => {
+        try {
+            const host = document.querySelector("#mfa-shadow-host");
+            if (!host || !host.shadowRoot) return false;
+            if (!host.__alphaObserved) {
+                // Shadow DOM 内部的变化不会冒泡到 document 观察器，单独监听
+                host.__alphaObserved = true;
+                new MutationObserver(schedule).observe(host.shadowRoot, { childList: true, subtree: true });
+            }
+            return host.shadowRoot.querySelector(config.mfaSelector) !== null;
+        } catch (err) {
+            return false;
+        }
+    };
+
+    const check = () => {
+        feed.pending = false;
+        const events = [];
+        const now = Date.now();
+
+        const priceEl = first("current_price", config.priceXpath);
+        const priceText = textOf(priceEl);
+        if (priceText && priceText !== state.price) {
+            events.push({ kind: "price", value: priceText, previous: state.price ?? null, ts: now });
+            state.price = priceText;
+        }
+
+        const tabs = document.querySelectorAll(".bn-tab.bn-tab__buySell");
+        const tab = selectedTab(tabs);
+        if (tab !== state.tab) {
+            events.push({ kind: "tab", value: tab, previous: state.tab ?? null, ts: now });
+            state.tab = tab;
+        }
+        // 余额按面板比较（与快照一致）：两个节点依次为买入、卖出面板，只有一个节点时属于当前选中 Tab，
+        // 切换 Tab 不算余额变化
+        const balanceEls = all("available_balance", config.balanceXpath);
+        const texts = balanceEls.map(textOf);
+        const panels = texts.length >= 2 ? [[0, texts[0]], [1, texts[1]]]
+            : (texts.length === 1 && tab >= 0 ? [[tab, texts[0]]] : []);
+        for (const [panel, text] of panels) {
+            if (!text) continue;
+            const last = state.balances[panel];
+            if (last !== undefined && last !== text) {
+                events.push({
+                    kind: "balance", value: text, previous: last,
+                    detail: { tab: panel, texts, selectedTab: tab }, ts: now
+                });
+            }
+            state.balances[panel] = text;
+        }
+
+        // 行按订单号（data-row-key）比较，缺少时才退回行文本（textContent 不触发布局）
+        const pane = document.querySelector('#bn-tab-pane-orderOrder');
+        const rows = (pane || document).querySelectorAll('tbody.bn-web-table-tbody > tr[aria-rowindex]');
+        const keys = Array.from(rows, (row) =>
+            row.getAttribute('data-row-key') || (row.textContent || '').replace(/\\s+/g, ' ').trim());
+        if (state.orderKeys === null || keys.join('|') !== state.orderKeys.join('|')) {
+            const before = state.orderKeys || [];
+            const added = keys.filter((k) => !before.includes(k));
+            const removed = before.filter((k) => !keys.includes(k));
+            events.push({
+                kind: "orders", value: keys.length,
+                previous: state.orderKeys === null ? null : before.length,
+                detail: { added, removed }, ts: now
+            });
+            state.orderKeys = keys;
+        }
+
+        const mfa = mfaVisible();
+        if (mfa !== state.mfa) {
+            events.push({ kind: "mfa", value: mfa, previous: state.mfa ?? null, ts: now });
+            state.mfa = mfa;
+        }
+
+        watch([
+            [parentOf(priceEl), TEXT],
+            ...balanceEls.map((el) => [parentOf(el), TEXT]),
+            [tabs.length ? parentOf(tabs[0]) : null, TABS],
+            [pane, ROWS],
+        ]);
+
+        if (events.length && window.__alphaBotEmit) {
+            window.__alphaBotEmit(events);
+        }
+    };
+
+    function schedule() {
+        if (feed.pending) return;
+        feed.pending = true;
+        setTimeout(check, config.throttleMs);
+    }
+
+    const start = () => {
+        // body 直接子节点增删（弹窗、验证器宿主挂载）不在上面的子树内，单独监听（不含子树）
+        new MutationObserver(schedule).observe(document.body || document.documentElement, { childList: true });
+        // 兜底：观察器漏掉的变化（关键节点延迟挂载或被整体替换、Shadow DOM 宿主延迟挂载）
+        setInterval(schedule, config.fallbackMs);
+        check();
+    };
+
+    if (document.readyState === "loading") {
+        document.addEventListener("DOMContentLoaded", start, { once: true });
+    } else {
+        start();
+    }
+    return true;
+}
+"""
+
+
+class DomChangeFeed:
+    """
+    DOM 变更推送订阅器
+
+    通过 page.expose_binding 接收页面内 MutationObserver 推送的事件。
+    同步版 Playwright 只在调用 API 时分发回调，因此等待时用
+    page.wait_for_timeout 小步驱动事件循环，事件到达即返回。
+    """
+
+    BINDING_NAME = "__alphaBotEmit"
+
+    def __init__(
+        self,
+        page,
+        xpaths: Dict[str, str],
+        mfa_selector: str,
+        throttle_ms: int = 50,
+        fallback_ms: int = 1000,
+        pump_ms: int = 50,
+        history: int = 200
+    ):
+        """
+        Args:
+            page: Playwright Page
+            xpaths: 命名 XPath 表（使用 current_price / available_balance 键）
+            mfa_selector: 验证器弹窗在 Shadow DOM 内的选择器
+            throttle_ms: 页面内合并突变的节流间隔（毫秒）
+            fallback_ms: 页面内兜底检查间隔（毫秒）
+            pump_ms: Python 侧等待时驱动事件分发的步长（毫秒）
+            history: 保留的最近事件条数
+        """
+        self.page = page
+        self.pump_ms = pump_ms
+        self.config = {
+            "priceXpath": xpaths.get("current_price"),
+            "balanceXpath": xpaths.get("available_balance"),
+            "mfaSelector": mfa_selector,
+            "throttleMs": throttle_ms,
+            "fallbackMs": fallback_ms,
+        }
+        self.events: Deque[DomEvent] = deque(maxlen=history)
+        self.latest: Dict[str, DomEvent] = {}
+        self.seq: int = 0
+        self.installed: bool = False
+        self._listeners: list = []
+
+    def install(self) -> bool:
+        """注册回调并在当前页面和后续导航中安装观察器"""
+        try:
+            self.page.expose_binding(self.BINDING_NAME, self._on_emit)
+        except Exception as e:
+            # 同一页面重复注册会报错，已注册则直接复用
+            if "already registered" not in str(e):
+                warning(f"注册 DOM 推送回调失败: {e}")
+                return False
+
+        try:
+            script = f"({_DOM_FEED_JS})({json.dumps(self.config)})"
+            self.page.add_init_script(script=script)
+            self.page.evaluate(_DOM_FEED_JS, self.config)
+            self.installed = True
+            info("DOM 变更推送已启用")
+            return True
+        except Exception as e:
+            warning(f"安装 DOM 观察器失败: {e}")
+            return False
+
+    def add_listener(self, callback: Callable[[DomEvent], None]) -> None:
+        """注册事件监听（在事件分发时同步调用）"""
+        self._listeners.append(callback)
+
+    def _on_emit(self, source, batch) -> None:
+        """expose_binding 回调：记录页面推送的一批事件"""
+        for raw in batch or []:
+            self.seq += 1
+            event = DomEvent(
+                kind=raw.get("kind"),
+                value=raw.get("value"),
+                previous=raw.get("previous"),
+                detail=raw.get("detail") or {},
+                seq=self.seq,
+            )
+            self.events.append(event)
+            self.latest[event.kind] = event
+            for callback in self._listeners:
+                try:
+                    callback(event)
+                except Exception as e:
+                    warning(f"DOM 事件监听异常: {e}")
+
+    def wait_for(
+        self,
+        predicate: Optional[Callable[[DomEvent], bool]] = None,
+        timeout: float = 5,
+        kinds: Optional[Iterable[str]] = None
+    ) -> Optional[DomEvent]:
+        """
+        阻塞等待满足条件的新事件
+
+        Args:
+            predicate: 事件判断函数（None 表示任意事件）
+            timeout: 超时时间（秒）
+            kinds: 只关心的事件类型（None 表示全部）
+
+        Returns:
+            第一个满足条件的事件，超时返回 None
+        """
+        kinds = set(kinds) if kinds else None
+        start_seq = self.seq
+        deadline = time.time() + timeout
+
+        while True:
+            for event in list(self.events):
+                if event.seq <= start_seq:
+                    continue
+                if kinds and event.kind not in kinds:
+                    continue
+                if predicate is None or predicate(event):
+                    return event
+
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return None
+            # 小步等待，期间 Playwright 分发 binding 回调
+            self.page.wait_for_timeout(min(self.pump_ms, remaining * 1000))
@@ -7,6 +7,7 @@
 import logging
 import os
 import re
+from contextvars import ContextVar
 from datetime import datetime
 from typing import Optional, Union, Dict
 
@@ -281,6 +282,10 @@ def setup_account_logger(
 # 多账号日志管理器
 # ============================================
 
+# 协程级当前账号（asyncio 单进程多账号时，每个 Task 独立设置）
+_account_context: ContextVar[Optional[str]] = ContextVar("alpha_bot_account", default=None)
+
+
 class AccountLoggerManager:
     """
     多账号日志管理器
@@ -323,14 +328,15 @@ class AccountLoggerManager:
         获取当前账号的日志记录器
         如果未设置当前账号，返回默认 logger
         """
-        if cls._current_account:
-            return cls.get_logger(cls._current_account)
+        current = cls.get_current_account()
+        if current:
+            return cls.get_logger(current)
         return log
     
     @classmethod
     def get_current_account(cls) -> Optional[str]:
-        """获取当前账号名称"""
-        return cls._current_account
+        """获取当前账号名称（协程级设置优先于进程级设置）"""
+        return _account_context.get() or cls._current_account
 
 
 # 创建默认日志记录器
@@ -403,9 +409,26 @@ def use_account_logger(account_name: str) -> None:
     AccountLoggerManager.set_current_account(account_name)
 
 
+def use_account_context(account_name: str) -> None:
+    """
+    在当前协程上下文中切换账号日志（不影响同进程的其他 Task）
+    
+    Args:
+        account_name: 账号名称
+    
+    Example:
+        >>> async def run():
+        ...     use_account_context("账号A")
+        ...     info("这条日志只在本 Task 中写入账号A的日志文件")
+    """
+    AccountLoggerManager.get_logger(account_name)
+    _account_context.set(account_name)
+
+
 def reset_logger() -> None:
     """重置为默认日志记录器"""
     AccountLoggerManager._current_account = None
+    _account_context.set(None)
 
 
 # 导出脱敏函数
@@ -414,7 +437,7 @@ __all__ = [
     'log', 'setup_logger', 'setup_account_logger',
     'debug', 'info', 'warning', 'error', 'critical', 'success', 'step',
     # 多账号支持
-    'AccountLoggerManager', 'use_account_logger', 'reset_logger',
+    'AccountLoggerManager', 'use_account_logger', 'use_account_context', 'reset_logger',
     # 脱敏函数
     'mask_sensitive', 'mask_verification_code', 'mask_balance', 'mask_secret', 'mask_url',
     'SensitiveFilter'
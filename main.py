@@ -13,13 +13,21 @@ import time
 import os
 import datetime
 import argparse
-from typing import Optional
+from typing import Optional, List, Set
 
 import pandas as pd
 
 # 导入优化后的模块
 from config import get_config, get_account_config, Config
-from browser_manager import BrowserManager, random_sleep, elapsed_time
+from browser_manager import BrowserManager, PageSnapshot, elapsed_time
+from dom_feed import DomEventKind
+from account_state import OpenOrder
+from order_submitter import OrderSubmitter, SubmitOutcome
+from page_health import PageHealthMonitor, HealthThresholds, RefreshMode
+from trade_cycle import TradeCycle, CycleState
+from pipeline import InflightBook, order_keys, new_orders, split_new_orders
+from volume_planner import VolumePlanner, parse_deadline
+from pacing import PacingController, PacingDecision
 from logger import (
     log, info, warning, error, success, step, mask_balance,
     use_account_logger, reset_logger
@@ -83,6 +91,21 @@ class AlphaTrader:
         "checkbox": ".bn-checkbox.bn-checkbox__square.data-size-md"
     }
     
+    # 命名等待：名称 -> (页面内条件, XPATH 键, 原固定 sleep 秒数, 超时上限秒数)
+    WAITS = {
+        "price_rendered": ("has_number", "current_price", 1, 3),
+        "tab_balance_ready": ("has_number", "available_balance", 0.3, 1.5),
+        "confirm_dialog": ("visible", "confirm_button", 0.3, 1.5),
+        "submit_dialog_closed": ("hidden", "confirm_button", 0.8, 3),
+        "cancel_buttons": ("visible", "cancel_order_link", 0.5, 1.5),
+        "cancel_dialog": ("visible", "cancel_confirm", 0.5, 2),
+        "orders_cancelled": ("orders_cleared", None, 1, 3),
+        "final_settle": ("orders_cleared", None, 10, 10),
+        "final_cancel": ("orders_cleared", None, 3, 3),
+        "final_sell": ("orders_cleared", None, 5, 5),
+        "balance_stable": ("text_stable", "available_balance", 5, 5),
+    }
+    
     def __init__(self, config: Config):
         """
         初始化交易机器人
@@ -93,7 +116,9 @@ class AlphaTrader:
         self.config = config
         self.browser = BrowserManager(
             port=config.browser.port,
-            secret=config.security.secret
+            secret=config.security.secret,
+            xpaths=self.XPATH,
+            css=self.CSS
         )
         
         # 交易状态
@@ -105,8 +130,48 @@ class AlphaTrader:
         self.refresh_set: set = set()
         self.start_time: float = 0
         
-        # 交易统计
+        # 交易统计（等待耗时一并汇总）
         self.stats = TradeStats()
+        self.browser.latency = self.stats.latency
+        self.browser.click_mode = config.browser.click_mode
+        self.submitter = OrderSubmitter(
+            self.browser, self.XPATH, self.CSS, enabled=config.browser.in_page_submit
+        )
+        
+        # 页面健康监控（refresh_mode=health 时决定何时刷新）
+        self.health = PageHealthMonitor(HealthThresholds(
+            max_heap_mb=config.interval.max_heap_mb,
+            max_nodes=config.interval.max_dom_nodes,
+            max_page_age=config.interval.max_page_age,
+        ))
+        # 上次刷新未能让页面可交易时记下原因，下一轮 IDLE 先重试刷新
+        self.refresh_pending: Optional[str] = None
+        
+        # 当前单笔成交额（设置目标成交量时由规划器每轮调整）
+        self.trade_cost: float = config.trade.cost
+        self.last_balance: Optional[float] = None  # 最近一次读到的 USDT 可用余额
+        
+        # 成交量规划（volume_target > 0 时取代 total_runs）
+        self.planner: Optional[VolumePlanner] = None
+        if config.trade.volume_target > 0:
+            self.planner = VolumePlanner(
+                config.trade.volume_target,
+                config.trade.cost,
+                deadline=parse_deadline(config.trade.volume_deadline),
+                capital_budget=config.trade.capital_budget if config.trade.max_inflight > 1 else 0,
+            )
+        
+        # 交易节奏（目标完成时间：finish_by，未设置时取目标成交量截止时间）
+        self.pacer = PacingController(
+            parse_deadline(config.interval.finish_by or config.trade.volume_deadline),
+            config.interval.min_interval,
+            config.interval.max_interval,
+        )
+        
+        # 流水线在途交易（max_inflight > 1 时启用）
+        self.inflight = InflightBook(
+            config.trade.max_inflight, config.trade.cost, config.trade.capital_budget
+        )
         
         # 余额不足连续失败计数
         self.insufficient_balance_count: int = 0
@@ -115,6 +180,10 @@ class AlphaTrader:
         # 买单等待时间配置（优化：快速响应）
         self.buy_order_timeout: int = 5  # 买单挂单超时时间（秒）- 价格变化快，不宜等太久
         self.buy_order_check_interval: int = 1  # 检查买单成交的间隔（秒）- 快速检测
+        
+        # 价格加载重试（超时后本轮中止，下一轮先刷新页面）
+        self.price_load_timeout: int = 30  # 读取价格的最长时间（秒）
+        self.price_load_interval: int = 5  # 两次读取之间的间隔（秒）
     
     def run(self) -> None:
         """运行交易机器人"""
@@ -145,14 +214,10 @@ class AlphaTrader:
             # 尝试获取当前余额作为结束余额
             self.browser.click_tab(0)
             time.sleep(0.5)
-            balance_text = self.browser.get_text(self.XPATH["available_balance"])
-            if balance_text:
-                try:
-                    end_balance = float(balance_text.split(" ")[0])
-                    self.stats.set_end_balance(end_balance)
-                    info(f"当前余额: {end_balance:.4f}")
-                except (ValueError, IndexError):
-                    pass
+            end_balance = self._get_usdt_balance_fast()
+            if end_balance is not None:
+                self.stats.set_end_balance(end_balance)
+                info(f"当前余额: {end_balance:.4f}")
         except Exception:
             pass
         
@@ -164,29 +229,38 @@ class AlphaTrader:
     
     def _connect(self) -> bool:
         """连接到浏览器"""
-        from browser_manager import get_current_page_url, ensure_chrome_running
+        from browser_manager import ensure_chrome_running, parse_window_size
+        from devtools_client import get_devtools_client
         
         # ========== 1. 确保 Chrome 运行 ==========
         port = self.config.browser.port
         chrome_path = self.config.browser.chrome_path
+        # 未指定时由 start_chrome 按系统生成默认目录
         user_data_dir = self.config.browser.user_data_dir
         
-        # 自动生成 user_data_dir（如果未指定）
-        if not user_data_dir:
-            user_data_dir = f"D:\\tmp\\cdp{port}"
-        
-        if not ensure_chrome_running(port, chrome_path, user_data_dir):
+        browser_config = self.config.browser
+        if browser_config.headless:
+            # 无头模式下无法手动打开交易页面，启动时直接打开目标页面
+            if not browser_config.target_url:
+                warning("无头模式未配置 target_url，需要已登录的数据目录中恢复出交易页面")
+            self.browser.viewport = parse_window_size(browser_config.window_size)
+        
+        if not ensure_chrome_running(
+            port, chrome_path, user_data_dir,
+            browser_config.effective_launch_profile,
+            browser_config.window_size,
+            browser_config.target_url if browser_config.headless else ""
+        ):
             error("无法启动 Chrome，请检查配置")
             return False
         
-        # ========== 2. 获取当前页面 URL ==========
-        current_url = None
+        # ========== 2. 通过 /json/list 发现目标页面（不启动 Playwright） ==========
+        client = get_devtools_client(port)
+        discovery = None
         for attempt in range(10):
-            url = get_current_page_url(port)
-            
-            if url and "devtools" not in url:
-                current_url = url
-                success(f"获取到目标页面: {url[:60]}...")
+            discovery = client.discover()
+            if discovery:
+                success(f"获取到目标页面: {discovery.page.url[:60]}... ({discovery.elapsed_ms:.0f}ms)")
                 break
             
             warning(f"尝试获取页面 ({attempt + 1}/10)...")
@@ -194,9 +268,10 @@ class AlphaTrader:
         else:
             error("无法获取有效页面，程序退出")
             return False
+        current_url = discovery.page.url
         
-        # 连接浏览器
-        if not self.browser.connect(current_url):
+        # 连接浏览器（直接使用发现结果中的 WebSocket 地址）
+        if not self.browser.connect(current_url, discovery=discovery, routing=self.config.browser.routing_profile):
             return False
             
         if current_url and "accounts.binance.com" in current_url:
@@ -225,319 +300,365 @@ class AlphaTrader:
         else:
             self.target_url = current_url or self.browser.get_current_url()
         
+        # 启用 DOM 变更推送（失败时等待逻辑自动退化为轮询）
+        self.browser.enable_dom_feed()
+        
+        # 订阅页面 WebSocket 成交/订单推送（无推送时价格和成交判断退回 DOM）
+        self.browser.enable_market_feed()
+        
+        # 可选：拦截页面资产/委托接口响应作为账户状态来源
+        if self.config.browser.intercept_responses:
+            self.browser.enable_account_state()
+        
         return True
     
     def _main_loop(self) -> None:
         """
         主交易循环 - 纯反向订单模式
         
-        流程：买入+挂反向卖单 → 等待反向卖单成交 → 完成1次交易 → 继续买入...
+        每次循环驱动一个 TradeCycle 走完：
+        IDLE → PRICED → SUBMITTED → BUY_FILLED → REVERSE_PENDING → SETTLED，
+        反向卖单超时或连续余额不足时经 FORCE_EXIT 市价卖出，买入失败进入 ABORTED；
+        max_inflight > 1 时改为流水线循环
         """
+        if self.planner:
+            self.planner.start()
+        if self.pacer.enabled:
+            finish_at = datetime.datetime.fromtimestamp(self.pacer.finish_at)
+            info(f"⏳ 目标完成时间: {finish_at.strftime('%Y-%m-%d %H:%M')}，按进度自动调整间隔")
+        if self.inflight.enabled:
+            self._pipelined_loop()
+            return
+        
         while True:
             loop_start = time.time()
+            saved_mark = self.stats.latency.total_saved_ms
             self.loop_count += 1
             
-            step(f"循环 {self.loop_count} - 已完成 {self.complete_trades}/{self.config.trade.total_runs} 笔交易")
-            
-            # 定期刷新
-            if self.loop_count % self.config.interval.refresh_interval == 0:
-                self._refresh_page("定期刷新页面")
-            
-            # 加载页面数据（获取当前价格）
-            if not self._load_page_data():
-                continue
+            step(f"循环 {self.loop_count} - {self._progress()}")
+            self._plan_next()
             
-            # ========== 步骤1：执行买入 + 挂反向卖单 ==========
-            buy_result = self._execute_buy_with_reverse()
+            cycle = TradeCycle(cycle_id=self.loop_count, latency=self.stats.latency)
+            self._run_cycle(cycle)
+            info(f"🔁 交易周期: {cycle.summary()} ({cycle.elapsed:.1f}s)")
             
-            if not buy_result["success"]:
+            if cycle.state == CycleState.ABORTED:
                 # 买入失败，短暂等待后重试
-                time.sleep(2)
+                self.pacer.observe(cycle.elapsed, filled=False)
+                time.sleep(cycle.data.get("retry_after", 2))
                 continue
             
-            # ========== 步骤2：检查是否已完成完整交易 ==========
-            if buy_result.get("complete_trade", False):
-                # 买卖都已成交，直接计数！
-                self.complete_trades += 1
-                success(f"🎉 完成第 {self.complete_trades} 笔完整交易！（买卖快速成交）")
-            else:
-                # ========== 步骤2b：等待反向卖单成交 ==========
-                info("等待反向卖单成交...")
-                reverse_filled = self._wait_for_reverse_order_filled(
-                    initial_holding=buy_result["holding"],
-                    max_wait=self.config.interval.reverse_order_timeout
-                )
-                
-                if reverse_filled:
-                    # 反向卖单成交 = 完成1次完整交易！
-                    self.complete_trades += 1
-                    success(f"🎉 完成第 {self.complete_trades} 笔完整交易！（反向卖单自动成交）")
-                else:
-                    # 超时未成交，主动市价卖出（_market_sell 内部会先取消挂单）
-                    warning("反向卖单超时，主动市价卖出")
-                    
-                    # 主动市价卖出（确保不卡住，最多重试3次）
-                    sell_success = False
-                    for retry in range(3):
-                        if self._market_sell():
-                            sell_success = True
-                            break
-                        else:
-                            warning(f"市价卖出失败，重试 ({retry+1}/3)...")
-                            time.sleep(2)
-                    
-                    self.complete_trades += 1
-                    if sell_success:
-                        success(f"🎉 完成第 {self.complete_trades} 笔完整交易！（主动卖出成交）")
-                    else:
-                        warning(f"⚠️ 第 {self.complete_trades} 笔交易：卖出可能未完成，请手动检查！")
+            self._count_trade(cycle)
+            self.pacer.observe(cycle.elapsed, filled=True)
             
-            # ========== 步骤3：检查是否达标 ==========
-            if self.complete_trades >= self.config.trade.total_runs:
+            # ========== 检查是否达标 ==========
+            if self._goal_reached():
                 self._finalize()
                 break
             
             # 统计与休眠
+            saved_ms = self.stats.latency.total_saved_ms - saved_mark
+            info(f"⏱️ 本轮等待节省: {saved_ms / 1000:+.2f}s（累计 {self.stats.latency.total_saved_ms / 1000:.1f}s）")
             elapsed_time(loop_start, "本次耗时")
             elapsed_time(self.start_time, "总耗时")
-            info(f"📊 进度: {self.complete_trades}/{self.config.trade.total_runs}")
-            random_sleep(
-                self.config.interval.min_interval,
-                self.config.interval.max_interval
-            )
+            info(f"📊 进度: {self._progress()}")
+            self.pacer.wait(self._pace(), sleep=self._pace_sleep)
     
-    def _load_page_data(self) -> bool:
-        """加载页面数据"""
-        info("页面加载中...")
+    def _goal_reached(self, inflight: int = 0) -> bool:
+        """
+        是否已达标
         
-        # 多个价格选择器，按优先级尝试
-        price_xpaths = [
-            ("主选择器", self.XPATH["current_price"]),
-            ("备用选择器", self.XPATH["current_price_alt"]),
-        ]
+        Args:
+            inflight: 尚未结算的在途笔数（其买入成交量已计入统计）
+        
+        Returns:
+            设置目标成交量时按成交量判断，否则按完成笔数 + 在途笔数 >= total_runs 判断
+        """
+        if self.planner:
+            return self.planner.reached(self.stats)
+        return self.complete_trades + inflight >= self.config.trade.total_runs
+    
+    def _progress(self) -> str:
+        """进度描述（笔数或成交量）"""
+        if self.planner:
+            traded = self.planner.traded(self.stats)
+            return f"已完成 {self.complete_trades} 笔，成交量 {traded:.2f}/{self.planner.target:.2f}"
+        return f"已完成 {self.complete_trades}/{self.config.trade.total_runs} 笔交易"
+    
+    def _plan_next(self) -> None:
+        """按已成交量、实测每笔耗时和磨损重新规划，确定本轮成交额"""
+        if not self.planner:
+            return
+        plan = self.planner.plan(
+            self.stats, self.complete_trades,
+            balance=self.last_balance, locked=self.inflight.committed
+        )
+        self.trade_cost = plan.next_cost
+        info(f"🎯 {plan.describe()}")
+    
+    def _trades_left(self, inflight: int = 0) -> int:
+        """剩余笔数（目标成交量模式取规划结果，在途交易的成交量已计入）"""
+        if self.planner:
+            return self.planner.plan(
+                self.stats, self.complete_trades,
+                balance=self.last_balance, locked=self.inflight.committed
+            ).trades_left
+        return max(0, self.config.trade.total_runs - self.complete_trades - inflight)
+    
+    def _pace(self, inflight: int = 0) -> PacingDecision:
+        """
+        按目标完成时间、实测单轮耗时和成交率计算本轮之后的休眠时间，并输出预计完成时间
+        
+        Args:
+            inflight: 在途笔数（流水线模式）
+        
+        Returns:
+            PacingDecision（落后于目标时 delay 为 0），由 pacer.wait() 执行休眠
+        """
+        decision = self.pacer.next_delay(self._trades_left(inflight))
+        info(f"⏳ {decision.describe()}")
+        return decision
+    
+    @staticmethod
+    def _pace_sleep(seconds: float) -> None:
+        """逐笔模式的休眠"""
+        info(f"休眠 {seconds:.1f}s...")
+        time.sleep(seconds)
+    
+    def _count_trade(self, cycle: TradeCycle) -> None:
+        """记录一笔已结算（SETTLED）的完整交易"""
+        self.complete_trades += 1
+        if cycle.data.get("sell_failed"):
+            warning(f"⚠️ 第 {self.complete_trades} 笔交易：卖出可能未完成，请手动检查！")
+        else:
+            success(f"🎉 完成第 {self.complete_trades} 笔完整交易！（{cycle.outcome}）")
+    
+    # ============================================
+    # 流水线交易（多笔在途反向卖单）
+    # ============================================
+    
+    def _pipelined_loop(self) -> None:
+        """
+        流水线交易循环
+        
+        每笔交易推进到 REVERSE_PENDING 后登记为在途，不等反向卖单成交就开始下一笔；
+        在途笔数达到 max_inflight 或资金预算用尽时只跟踪在途订单。
+        本笔买单按提交前后委托表的差异（订单号或价格）判断结果，不看余额变化（余额被在途订单占用）；
+        在途订单按当前委托表逐单判断成交，超时的那一笔单独撤销反向卖单并市价卖出自己的持仓，
+        其余在途交易不受影响
+        """
+        book = self.inflight
+        info(f"🚀 流水线模式: 最多在途 {book.max_inflight} 笔，资金预算 {book.capital_budget:.2f}")
         
-        retry_count = 0
         while True:
-            self.browser.check_verification()
+            self._poll_inflight()
+            if self._goal_reached() and not book:
+                self._finalize()
+                break
             
-            # 滚动到顶部
-            self.browser.scroll_to("top")
+            # 在途已满、资金预算用尽或剩余笔数都已在途：只等待委托/余额变化
+            if not book.can_open() or self._goal_reached(len(book)):
+                self.browser.wait_for_dom_event(
+                    [DomEventKind.ORDERS, DomEventKind.BALANCE],
+                    timeout=book.remaining(3)
+                )
+                continue
             
-            # 滚动成交记录到顶部
-            self.browser.scroll_to("top", xpath=self.XPATH["grid_scroll"])
+            loop_start = time.time()
+            self.loop_count += 1
+            step(f"循环 {self.loop_count} - {self._progress()}，在途 {len(book)} 笔")
+            self._plan_next()
             
-            # 等待一下让页面渲染
-            time.sleep(1)
+            cycle = TradeCycle(cycle_id=self.loop_count, latency=self.stats.latency)
+            cycle.data["inflight"] = len(book)
+            self._run_cycle(cycle, until=CycleState.REVERSE_PENDING)
+            info(f"🔁 交易周期: {cycle.summary()} ({cycle.elapsed:.1f}s)")
             
-            # 尝试多个选择器获取价格
-            for selector_name, xpath in price_xpaths:
-                try:
-                    price_text = self.browser.get_text(xpath)
-                    
-                    # 调试输出原始获取内容
-                    if retry_count % 3 == 0:
-                        info(f"[{selector_name}] 获取到的原始价格文本: '{price_text}'")
-                    
-                    if price_text:
-                        # 清理价格文本：去除空格、换行、逗号等
-                        cleaned_price = price_text.strip().replace(',', '').replace('\n', '').replace(' ', '')
-                        
-                        # 尝试提取数字部分（处理可能包含其他字符的情况）
-                        price_match = re.search(r'[\d.]+', cleaned_price)
-                        if price_match:
-                            price_value = float(price_match.group())
-                            if price_value > 0:
-                                self.buy_price = price_value
-                                success(f"价格数据加载完成 [{selector_name}]: {self.buy_price}")
-                                return True
-                            
-                except (ValueError, TypeError) as e:
-                    if retry_count % 3 == 0:
-                        warning(f"[{selector_name}] 价格解析异常: {e}")
-                except Exception as e:
-                    if retry_count % 3 == 0:
-                        warning(f"[{selector_name}] 获取价格出错: {e}")
+            if cycle.state == CycleState.ABORTED:
+                self.pacer.observe(cycle.elapsed, filled=False)
+                self._pipeline_pause(cycle.data.get("retry_after", 2))
+                continue
             
-            retry_count += 1
-            warning(f"获取价格失败 (第{retry_count}次)，继续尝试...")
-            time.sleep(10)
+            self.pacer.observe(cycle.elapsed, filled=True)
+            if cycle.state == CycleState.REVERSE_PENDING:
+                book.add(cycle)
+                info(f"📌 反向卖单已挂出，在途 {len(book)}/{book.max_inflight} 笔（占用 {book.committed:.2f}）")
+            else:
+                self._count_trade(cycle)
+            
+            elapsed_time(loop_start, "本次耗时")
+            elapsed_time(self.start_time, "总耗时")
+            info(f"📊 进度: {self._progress()}，在途 {len(book)} 笔")
+            self.pacer.wait(self._pace(len(book)), sleep=self._pipeline_pause)
     
-    def _market_sell(self) -> bool:
+    def _pipeline_pause(self, seconds: float) -> None:
+        """休眠期间持续跟踪在途订单（委托或余额变化时立即检查）"""
+        if seconds <= 0:
+            return
+        info(f"休眠 {seconds:.1f}s（跟踪 {len(self.inflight)} 笔在途订单）...")
+        deadline = time.time() + seconds
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            if self.inflight:
+                self.browser.wait_for_dom_event(
+                    [DomEventKind.ORDERS, DomEventKind.BALANCE],
+                    timeout=min(remaining, 3)
+                )
+                self._poll_inflight()
+            else:
+                time.sleep(remaining)
+    
+    def _poll_inflight(self) -> None:
+        """检查一次在途反向卖单：结算已成交的，超时的逐笔市价清仓"""
+        book = self.inflight
+        if not book:
+            return
+        
+        self._flush_inflight()
+        if not book:
+            return
+        
+        orders = self._open_orders()
+        if orders is None:
+            return
+        for cycle in book.match(orders, self._sell_fill_ids()):
+            success(f"✅ 反向卖单已成交！（第 {cycle.cycle_id} 轮，{cycle.dwell:.0f}s）")
+            cycle.to(CycleState.SETTLED, "反向卖单自动成交")
+            self._count_trade(cycle)
+        if book.untracked:
+            info(f"委托表中有 {book.untracked} 个卖单不属于在途交易")
+    
+    def _flush_inflight(self) -> None:
+        """超时的在途交易逐笔撤销自己的反向卖单并市价卖出自己的持仓（与逐笔模式一样计为完成）"""
+        for cycle in self.inflight.take_expired():
+            warning(f"⚠️ 第 {cycle.cycle_id} 轮反向卖单超时，撤单并市价卖出本笔持仓（其余 {len(self.inflight)} 笔在途保留）")
+            cycle.data["own_exit"] = True
+            cycle.to(CycleState.FORCE_EXIT, "反向卖单超时")
+            self._run_cycle(cycle)
+            self._count_trade(cycle)
+    
+    def _exit_own_position(self, cycle: TradeCycle) -> bool:
         """
-        市价卖出当前持仓（反向卖单超时时使用）
-        优化：先取消挂单释放锁定的资产，再获取实际持仓进行卖出
+        撤销本笔的反向卖单并按市价卖出本笔持仓（流水线超时清仓，不动其他在途订单）
         
         Returns:
-            是否卖出成功
+            是否卖出成功（反向卖单已不在委托表中时视为已成交）
         """
-        info("执行市价卖出...")
-        
-        # ===== 关键修复：先取消所有挂单，释放被锁定的资产 =====
-        pending_count = self._get_pending_order_count()
-        if pending_count > 0:
-            warning(f"发现 {pending_count} 个挂单锁定资产，先取消...")
-            self.browser.scroll_to("bottom")
-            self._cancel_orders()
-            time.sleep(1)  # 等待取消生效
-            
-            # 验证取消结果
-            remaining = self._get_pending_order_count()
-            if remaining > 0:
-                warning(f"仍有 {remaining} 个挂单，再次尝试取消...")
-                self._cancel_orders()
-                time.sleep(1)
+        data = cycle.data
+        if not data.get("reverse_cancelled"):
+            self.browser.scroll_to("right", xpath=self.XPATH["order_table"])
+            if not self.browser.cancel_order_row(
+                "SELL", order_id=data.get("reverse_order_id", ""), price=data.get("reverse_price", 0)
+            ):
+                info("本笔反向卖单已不在委托表中，视为已成交")
+                return True
+            self._wait("cancel_dialog")
+            if not (self.browser.click(self.XPATH["cancel_confirm"], timeout=2) or
+                    self.browser.click(self.XPATH["cancel_confirm_alt"], timeout=2)):
+                warning("未找到确认取消按钮")
+                return False
+            success("✅ 已取消本笔反向卖单")
+            self.stats.record_cancel(True)
+            data["reverse_cancelled"] = True
+            self._wait("orders_cancelled")
         
-        # 切换到卖出 Tab
+        # 只卖本笔的数量，不超过撤单后的可用持仓
         self.browser.click_tab(1)
-        time.sleep(0.5)
-        
-        # 获取持仓数量（取消挂单后再获取，这样才能拿到真实可用数量）
-        holding = self._get_current_holding()
-        info(f"当前可卖持仓: {holding}")
-        
-        min_sell = self.config.trade.min_sell_amount
-        if holding <= min_sell:
-            info(f"持仓 {holding} <= 最小卖出量 {min_sell}，无需卖出")
-            return True  # 没有持仓也算成功
-        
-        # 优化：尝试获取当前最新价格，而不是使用买入时的旧价格
-        current_price = self.buy_price # 默认回退值
-        try:
-            # 尝试从盘口/输入框获取最新价格
-            price_text = self.browser.get_text(self.XPATH["current_price"])
-            if not price_text:
-                price_text = self.browser.get_text(self.XPATH["current_price_alt"])
-            
-            if price_text:
-                cleaned = price_text.strip().replace(',', '').replace('\n', '').replace(' ', '')
-                match = re.search(r'[\d.]+', cleaned)
-                if match:
-                    current_price = float(match.group())
-                    info(f"获取到最新市价: {current_price}")
-        except Exception as e:
-            warning(f"获取最新市价失败，使用旧价格: {e}")
-
-        # 填写卖出价格（略低于当前市价，确保快速成交）
-        # 这里使用 0.9995 (万5滑点) 确保一定要卖出去，防止卡单
-        sell_price = current_price * 0.9995
-        info(f"市价卖出价: {sell_price:.6f}")
-        self.browser.fill_input(self.XPATH["limit_price"], sell_price)
-        
-        # 填写卖出数量
-        sell_amount = holding - self.config.trade.reserved_amount
-        info(f"卖出数量: {sell_amount:.4f}")
-        self.browser.fill_input(self.XPATH["limit_amount"], sell_amount)
-        
-        # 不勾选反向订单
-        self.browser.scroll_to("bottom", xpath=self.XPATH["trade_scroll"])
-        self.browser.toggle_checkbox(self.CSS["checkbox"], should_check=False)
-        self.browser.scroll_to("bottom")
-        
-        # 提交卖出
-        info("点击卖出")
-        if not self.browser.click(self.XPATH["sell_button"]):
-            warning("点击卖出按钮失败")
-            return False
-        
-        time.sleep(0.3)
-        
-        # 确认
-        if self.browser.click(self.XPATH["confirm_button"], timeout=1):
-            success("✅ 市价卖出已成交")
-            self.browser.click(self.XPATH["continue_button"], timeout=1)
-            return True
-        elif self.browser.click(self.XPATH["confirm_slippage"], timeout=0.5):
-            success("✅ 市价卖出已成交")
+        self._wait("tab_balance_ready", baseline=0.5)
+        snap = self.browser.snapshot()
+        amount = data.get("holding") or data.get("expected_amount", 0)
+        available = self._holding_from(snap)
+        if available > 0:
+            amount = min(amount, available - self.config.trade.reserved_amount)
+        if amount <= self.config.trade.min_sell_amount:
+            info(f"本笔可卖数量 {amount:.4f} <= 最小卖出量，无需卖出")
             return True
         
-        warning("卖出确认失败")
-        return False
+        current_price = snap.price if snap and snap.price else self.buy_price
+        sell_price = current_price * 0.9995
+        info(f"市价卖出本笔持仓: {amount:.4f} @ {sell_price:.6f}")
+        return self._submit_sell(sell_price, amount)
     
-    def _force_sell_all(self) -> None:
-        """
-        强制清仓卖出（仅用于结束时清仓）
-        """
-        info("执行清仓卖出...")
-        self._market_sell()
+    def _open_orders(self) -> Optional[List[OpenOrder]]:
+        """当前委托：优先取接口缓存（带订单号），否则逐行读取页面委托表"""
+        account = self.browser.account
+        orders = account.open_orders() if account else None
+        if orders is not None:
+            return orders
+        return self.browser.open_order_rows()
     
-    def _cancel_orders(self) -> None:
-        """取消未成交订单"""
-        # 检查是否有挂单
-        initial_count = self._get_pending_order_count()
-        if initial_count == 0:
-            info("无挂单需要取消")
-            return
-
-        info(f"检查未成交挂单 (共 {initial_count} 个)...")
-        
-        # 向右滚动订单表格（确保取消按钮可见）
+    def _sell_fill_ids(self) -> Set[str]:
+        """上次检查以来订单推送中完全成交的卖单订单号"""
+        market = self.browser.market
+        if not market:
+            return set()
+        fills = market.fills_since(self.inflight.fill_seq, side="SELL")
+        self.inflight.fill_seq = market.seq
+        return {event.order_id for event in fills if event.order_id}
+    
+    def _cancel_buy_order(self) -> None:
+        """只取消未成交的买单（流水线模式下保留其他在途反向卖单）"""
         self.browser.scroll_to("right", xpath=self.XPATH["order_table"])
-        time.sleep(0.5)
-        
-        # 尝试多次取消，直到没有挂单
-        max_retries = 3
-        for i in range(max_retries):
-            cancelled = False
-            
-            # 方法1: 尝试点击表头的取消全部按钮 (最优先)
-            if not cancelled:
-                if self.browser.click(self.XPATH["cancel_all_btn"], timeout=2):
-                    info("点击了取消全部按钮")
-                    cancelled = True
-            
-            # 方法2: 尝试点击订单行的取消链接
-            if not cancelled:
-                if self.browser.click(self.XPATH["cancel_order_link"], timeout=1):
-                    info("点击了取消链接")
-                    cancelled = True
-            
-            # 方法3: 尝试点击单个订单取消按钮
-            if not cancelled:
-                if self.browser.click(self.XPATH["cancel_single_btn"], timeout=1):
-                    info("点击了单个取消按钮")
-                    cancelled = True
-            
-            if cancelled:
-                # 确认取消弹窗
-                time.sleep(0.5)
-                confirm_clicked = self.browser.click(self.XPATH["cancel_confirm"], timeout=2)
-                if not confirm_clicked:
-                    confirm_clicked = self.browser.click(self.XPATH["cancel_confirm_alt"], timeout=2)
-                
-                if confirm_clicked:
-                    success("✅ 点击确认取消")
-                    self.stats.record_cancel(True)
-                    time.sleep(1) # 等待取消生效
-                else:
-                    warning("未找到确认取消按钮")
-            
-            # 检查是否还有挂单
-            current_count = self._get_pending_order_count()
-            if current_count == 0:
-                success("✅ 所有挂单已取消")
-                break
-            else:
-                if i < max_retries - 1:
-                    warning(f"仍有 {current_count} 个挂单，重试取消 ({i+1}/{max_retries})...")
-                    # 重新滚动一下
-                    self.browser.scroll_to("bottom") 
-                    self.browser.scroll_to("right", xpath=self.XPATH["order_table"])
-                    time.sleep(1)
+        if not self.browser.cancel_order_row("BUY"):
+            warning("未找到买单的取消链接")
+            return
+        self._wait("cancel_dialog")
+        if self.browser.click(self.XPATH["cancel_confirm"], timeout=2) or \
+                self.browser.click(self.XPATH["cancel_confirm_alt"], timeout=2):
+            success("✅ 已取消买单")
+            self.stats.record_cancel(True)
+        else:
+            warning("未找到确认取消按钮")
     
-    def _execute_buy_with_reverse(self) -> dict:
+    # ============================================
+    # 交易周期状态机
+    # ============================================
+    
+    def _run_cycle(self, cycle: TradeCycle, until: Optional[str] = None) -> None:
         """
-        执行买入操作（带反向卖单）
+        推进交易周期直到终态（或到达 until 状态）
         
-        Returns:
-            dict: {
-                "success": bool,  # 买入是否成功
-                "holding": float,  # 买入后的持仓数量（用于后续检测反向卖单成交）
-                "buy_price": float,  # 买入价格
-                "complete_trade": bool,  # 是否已完成完整交易（买卖都成交）
-            }
+        每个状态处理函数只做一步（等待类状态最多阻塞一个检查间隔）；
+        单周期模式下两步之间没有其他工作，直接等到 resume_at
+        
+        Args:
+            cycle: 交易周期
+            until: 到达该状态即返回（流水线模式在 REVERSE_PENDING 交给在途簿跟踪）
         """
-        result = {"success": False, "holding": 0, "buy_price": 0, "complete_trade": False}
+        handlers = {
+            CycleState.IDLE: self._cycle_idle,
+            CycleState.PRICED: self._cycle_priced,
+            CycleState.SUBMITTED: self._cycle_submitted,
+            CycleState.BUY_FILLED: self._cycle_buy_filled,
+            CycleState.REVERSE_PENDING: self._cycle_reverse_pending,
+            CycleState.FORCE_EXIT: self._cycle_force_exit,
+        }
+        while not cycle.done and cycle.state != until:
+            wait = cycle.until_resume()
+            if wait > 0:
+                time.sleep(wait)
+            handlers[cycle.state](cycle)
+    
+    def _cycle_idle(self, cycle: TradeCycle) -> None:
+        """IDLE：按页面健康（或固定间隔）刷新，读取价格"""
+        refresh_reason = self._refresh_reason()
+        if refresh_reason and not self._refresh_page(refresh_reason):
+            cycle.data["retry_after"] = 10
+            cycle.to(CycleState.ABORTED, "页面刷新失败")
+            return
+        
+        if not self._load_page_data():
+            cycle.data["retry_after"] = 0
+            cycle.to(CycleState.ABORTED, "价格加载失败")
+            return
+        cycle.to(CycleState.PRICED)
+    
+    def _cycle_priced(self, cycle: TradeCycle) -> None:
+        """PRICED：读取价格和余额，余额充足时计算价格并提交买单"""
         buy_start = time.time()
+        cycle.data["buy_start"] = buy_start
         
         # 滚动到顶部
         self.browser.scroll_to("top")
@@ -547,74 +668,57 @@ class AlphaTrader:
         info("切换买入")
         self.browser.click_tab(0)
         
-        # 获取最新价格
-        price_text = self.browser.get_text(self.XPATH["current_price"])
-        if price_text:
-            self.buy_price = float(price_text)
+        # 一次快照获取最新价格和余额（重要：记录买入前余额用于后续判断）
+        snap = self.browser.snapshot()
+        feed_price = self.browser.market_price()
+        if feed_price:
+            self.buy_price = feed_price
+        elif snap and snap.price:
+            self.buy_price = snap.price
         info(f"当前成交价: {self.buy_price}")
         
-        # 获取余额（重要：记录买入前余额用于后续判断）
-        balance_text = self.browser.get_text(self.XPATH["available_balance"])
         balance_before = 0
-        if balance_text:
-            try:
-                balance_before = float(balance_text.split(" ")[0])
-            except (ValueError, IndexError):
-                balance_before = 0
+        usdt_balance = self._usdt_balance_from(snap)
+        if usdt_balance is not None:
+            balance_before = usdt_balance
+            self.last_balance = usdt_balance
             info(f"可用余额: {balance_before:.2f}")
             
             # 第一次记录余额
             if self.loop_count == 1:
                 self._save_balance(balance_before)
                 self.stats.set_start_balance(balance_before)
+        cycle.data["balance_before"] = balance_before
         
         # ========== 余额检查 ==========
-        required_balance = self.config.trade.cost * 1.01
+        required_balance = self.trade_cost * 1.01
+        if balance_before < required_balance and cycle.data.get("inflight"):
+            # 流水线：资金被在途反向卖单占用，等待成交回款，不计入余额不足
+            info(f"余额 {balance_before:.2f} 被 {cycle.data['inflight']} 笔在途订单占用，等待成交回款")
+            cycle.data["retry_after"] = 1
+            cycle.to(CycleState.ABORTED, "资金占用中")
+            return
+        
         if balance_before < required_balance:
             warning(f"⚠️ 余额不足！需要: {required_balance:.2f}, 当前: {balance_before:.2f}")
             self.insufficient_balance_count += 1
             
             # 检查是否有待成交的反向卖单
-            pending_count = self._get_pending_order_count()
+            pending_count = snap.open_orders if snap else self._get_pending_order_count()
+            retry_after = 2
             if pending_count > 0:
                 info(f"有 {pending_count} 个挂单等待成交")
                 
                 # 如果连续2次余额不足且有挂单，主动市价卖出（会自动先取消挂单）
                 if self.insufficient_balance_count >= 2:
                     warning(f"⚠️ 连续 {self.insufficient_balance_count} 次余额不足，主动市价卖出")
-                    
-                    # 市价卖出持仓（内部会先取消挂单释放资产）
-                    sell_success = False
-                    for retry in range(3):
-                        if self._market_sell():
-                            sell_success = True
-                            break
-                        warning(f"市价卖出失败，重试 ({retry+1}/3)...")
-                        time.sleep(2)
-                    
-                    if sell_success:
-                        self.complete_trades += 1
-                        success(f"🎉 完成第 {self.complete_trades} 笔交易！（主动市价卖出）")
-                        self.insufficient_balance_count = 0
-                        
-                        # 标记为已完成完整交易，主循环不需要再处理
-                        result["success"] = True
-                        result["complete_trade"] = True
-                        duration_ms = (time.time() - buy_start) * 1000
-                        self.stats.record_buy(self.buy_price, 0, True, duration_ms, "主动市价卖出")
-                        return result
-                    else:
-                        # 卖出失败，强制计为完成避免卡住
-                        warning("⚠️ 市价卖出失败，强制跳过避免卡住")
-                        self.complete_trades += 1
-                        self.insufficient_balance_count = 0
-                        result["success"] = True
-                        result["complete_trade"] = True
-                        return result
-                else:
-                    # 第一次余额不足，等待一小段时间
-                    info(f"等待挂单成交... ({self.insufficient_balance_count}/2)")
-                    time.sleep(5)
+                    cycle.data["insufficient"] = True
+                    cycle.to(CycleState.FORCE_EXIT, "余额不足")
+                    return
+                
+                # 第一次余额不足，多等一会让挂单成交
+                info(f"等待挂单成交... ({self.insufficient_balance_count}/2)")
+                retry_after += 5
             
             if self.insufficient_balance_count >= 5:
                 self._refresh_page("余额不足，刷新页面")
@@ -622,316 +726,841 @@ class AlphaTrader:
             
             duration_ms = (time.time() - buy_start) * 1000
             self.stats.record_buy(self.buy_price, 0, False, duration_ms, f"余额不足: {balance_before:.2f}")
-            return result
+            cycle.data["retry_after"] = retry_after
+            cycle.to(CycleState.ABORTED, "余额不足")
+            return
         
         self.insufficient_balance_count = 0
         
-        # ========== 勾选反向订单 ==========
-        info("勾选反向订单")
-        if not self.browser.toggle_checkbox(self.CSS["checkbox"], should_check=True):
-            self._refresh_page("复选框失败，刷新页面")
-            duration_ms = (time.time() - buy_start) * 1000
-            self.stats.record_buy(self.buy_price, 0, False, duration_ms, "复选框操作失败")
-            return result
-        
-        # ========== 填写买入信息 ==========
+        # ========== 计算买入信息 ==========
         buy_price = self.buy_price * self.config.price.buy_price_percent + self.config.price.buy_price_diff
         info(f"输入买价: {buy_price:.6f}")
-        self.browser.fill_input(self.XPATH["limit_price"], buy_price)
+        info(f"输入成交额: {self.trade_cost}")
         
-        info(f"输入成交额: {self.config.trade.cost}")
-        self.browser.fill_input(self.XPATH["limit_total_buy"], self.config.trade.cost)
-        
-        # 填写反向卖单价格
+        # 反向卖单价格
         reverse_sell_price = buy_price * self.config.price.sell_price_percent
         info(f"输入反向卖价: {reverse_sell_price:.6f}")
-        self.browser.fill_input(self.XPATH["limit_total_sell"], reverse_sell_price)
-        
-        # ========== 提交订单 ==========
-        self.browser.scroll_to("bottom", xpath=self.XPATH["trade_scroll"])
-        self.browser.scroll_to("bottom")
         
-        info("点击购买")
-        if not self.browser.click(self.XPATH["buy_button"], timeout=5):
-            warning("点击购买按钮失败")
-            duration_ms = (time.time() - buy_start) * 1000
-            self.stats.record_buy(buy_price, 0, False, duration_ms, "点击购买按钮失败")
-            return result
+        # ========== 勾选反向订单、填写并提交 ==========
+        cycle.data["submit_version"] = self._state_version()
+        account = self.browser.account
+        if account:
+            # 记录提交前接口中的当前委托，之后按订单号认出本笔买单和反向卖单
+            known = account.open_orders()
+            cycle.data["known_account_orders"] = order_keys(known) if known is not None else None
+        if "inflight" in cycle.data:
+            # 流水线：记录提交前的委托，之后按新出现的委托认出本笔买单和反向卖单
+            cycle.data["known_orders"] = order_keys(self._open_orders() or [])
+            cycle.data["submit_seq"] = self._market_seq()
+        if not self._submit_buy(buy_price, reverse_sell_price, buy_start):
+            cycle.to(CycleState.ABORTED, "下单失败")
+            return
+        cycle.data["buy_price"] = buy_price
+        cycle.data["cost"] = self.trade_cost
+        cycle.data["reverse_price"] = reverse_sell_price
+        cycle.data["expected_amount"] = self.trade_cost / buy_price if buy_price > 0 else 0
+        cycle.to(CycleState.SUBMITTED)
+    
+    def _cycle_submitted(self, cycle: TradeCycle) -> None:
+        """
+        SUBMITTED：判断买单结果
         
-        # 快速确认
-        time.sleep(0.3)
-        confirm_clicked = self.browser.click(self.XPATH["confirm_button"], timeout=1)
+        第一步优先按接口响应中本笔订单的状态判断，其次按余额变化判断；仍无结论时设置 buy_order_timeout 截止时间，
+        之后每步等待一次余额/委托变化再判断，截止时间到仍未成交则取消买单。
+        流水线模式下余额被在途订单占用，改为按委托表中本笔订单的身份判断
+        """
+        data = cycle.data
+        buy_price = data["buy_price"]
+        pipelined = "inflight" in data
         
-        if not confirm_clicked:
-            if self.browser.click(self.XPATH["cancel_slippage"], timeout=0.5):
-                warning("滑点过大，取消交易")
-                duration_ms = (time.time() - buy_start) * 1000
-                self.stats.record_buy(buy_price, 0, False, duration_ms, "滑点过大")
-                return result
+        if not data.get("checked"):
+            data["checked"] = True
             
-            confirm_clicked = self.browser.click(self.XPATH["confirm_button"], timeout=1)
-            if not confirm_clicked:
-                warning("未能点击确认按钮")
-                duration_ms = (time.time() - buy_start) * 1000
-                self.stats.record_buy(buy_price, 0, False, duration_ms, "未能点击确认按钮")
-                return result
+            if pipelined:
+                if self._classify_buy_orders(cycle):
+                    return
+                info("买单可能在挂单中，等待成交...")
+                cycle.set_deadline(self.buy_order_timeout)
+                return
+            
+            # ========== 优先按接口响应判断（无需切换 Tab，也没有余额启发式误判） ==========
+            verdict = self._classify_buy_account(cycle, wait=2)
+            if verdict:
+                return
+            if verdict is False:
+                info("接口显示买单仍在委托中，等待成交...")
+                cycle.set_deadline(self.buy_order_timeout)
+                return
+            
+            # ========== 验证交易结果（核心修复：检测余额变化） ==========
+            info("验证交易结果...")
+            
+            # 切换回买入Tab获取最新余额
+            self.browser.click_tab(0)
+            self._wait("tab_balance_ready")
+            
+            balance_after = self._get_usdt_balance_fast() or 0
+            balance_change = balance_after - data["balance_before"]
+            info(f"余额变化: {data['balance_before']:.2f} -> {balance_after:.2f} (变化: {balance_change:+.2f})")
+            if self._classify_buy(cycle, balance_after):
+                return
+            
+            # 余额未明显变化，可能订单还在挂单中
+            info(f"订单可能在挂单中，等待成交...")
+            data["balance"] = balance_after
+            cycle.set_deadline(self.buy_order_timeout)
+            return
         
-        # 等待订单提交完成
-        time.sleep(0.8)
+        if cycle.expired:
+            # 超时未成交，取消买单
+            reason = "买单超时未成交"
+            if pipelined and not data.get("buy_seen"):
+                # 委托表中始终没出现本笔买单也没有成交推送：可能根本没提交成功，不能算作成交
+                reason = "买单状态未知"
+                warning("委托表中始终未出现本笔买单，也没有成交推送，按未成交处理")
+            warning(f"{reason}，取消买单")
+            if data.get("inflight"):
+                self._cancel_buy_order()
+            else:
+                self._cancel_orders()
+            duration_ms = (time.time() - data["buy_start"]) * 1000
+            self.stats.record_buy(buy_price, 0, False, duration_ms, reason)
+            cycle.to(CycleState.ABORTED, reason)
+            return
+        
+        # 余额或委托表变化时立即检查
+        self.browser.wait_for_dom_event(
+            [DomEventKind.BALANCE, DomEventKind.ORDERS],
+            timeout=cycle.remaining(self.buy_order_check_interval)
+        )
+        
+        if pipelined:
+            if not self._classify_buy_orders(cycle, waited=cycle.dwell):
+                info(f"等待中... {cycle.dwell:.1f}s，在途 {data['inflight']} 笔")
+            return
         
-        # ========== 验证交易结果（核心修复：检测余额变化） ==========
-        info("验证交易结果...")
+        verdict = self._classify_buy_account(cycle, waited=cycle.dwell)
+        if verdict is not None:
+            if not verdict:
+                info(f"等待中... {cycle.dwell:.1f}s，接口显示买单仍在委托中")
+            return
         
-        # 切换回买入Tab获取最新余额
+        # 获取最新余额（快照内已包含验证器检测和挂单数量）
         self.browser.click_tab(0)
-        time.sleep(0.3)
+        snap = self.browser.snapshot()
+        usdt_balance = self._usdt_balance_from(snap)
+        if usdt_balance is not None:
+            data["balance"] = usdt_balance
+            if self._classify_buy(cycle, usdt_balance, waited=cycle.dwell):
+                return
         
-        balance_text = self.browser.get_text(self.XPATH["available_balance"])
-        balance_after = 0
-        if balance_text:
-            try:
-                balance_after = float(balance_text.split(" ")[0])
-            except (ValueError, IndexError):
-                pass
+        pending_count = snap.open_orders if snap else 0
+        info(f"等待中... {cycle.dwell:.1f}s, 余额: {data['balance']:.2f}, 挂单: {pending_count}")
+    
+    def _classify_buy(self, cycle: TradeCycle, balance: float, waited: Optional[float] = None) -> bool:
+        """
+        按余额变化判断买单结果并迁移状态
         
-        balance_change = balance_after - balance_before
-        expected_amount = self.config.trade.cost / buy_price if buy_price > 0 else 0
+        Args:
+            cycle: 当前交易周期
+            balance: 最新 USDT 余额
+            waited: 已等待秒数（None 表示提交后的首次判断）
         
-        info(f"余额变化: {balance_before:.2f} -> {balance_after:.2f} (变化: {balance_change:+.2f})")
+        Returns:
+            是否已得出结论（已迁移到 SETTLED / BUY_FILLED）
+        """
+        balance_change = balance - cycle.data["balance_before"]
         
-        # ========== 判断交易状态 ==========
-        # 情况1：余额几乎不变（变化小于成本的5%），说明买卖都快速成交了！
-        if abs(balance_change) < self.config.trade.cost * 0.05:
-            duration_ms = (time.time() - buy_start) * 1000
-            self.stats.record_buy(buy_price, expected_amount, True, duration_ms)
-            success(f"🎉 完整交易已成交！买入+卖出都已完成（余额变化: {balance_change:+.2f}）")
-            
-            result["success"] = True
-            result["holding"] = 0  # 买卖都成交了，持仓回到原来
-            result["buy_price"] = buy_price
-            result["complete_trade"] = True  # 标记为完整交易已完成
-            return result
-        
-        # 情况2：余额大幅减少（约等于成本），说明买单成交，等待反向卖单
-        if balance_change < -self.config.trade.cost * 0.5:
+        # 余额几乎不变（变化小于成本的5%），说明买卖都快速成交了
+        if abs(balance_change) < self.trade_cost * 0.05:
+            self._record_buy_filled(cycle)
+            if waited is None:
+                success(f"🎉 完整交易已成交！买入+卖出都已完成（余额变化: {balance_change:+.2f}）")
+            else:
+                success(f"🎉 等待后完整交易成交！（{waited:.1f}s，余额变化: {balance_change:+.2f}）")
+            cycle.to(CycleState.SETTLED, "买卖快速成交")
+            return True
+        
+        # 余额大幅减少（约等于成本），说明买单成交，等待反向卖单
+        if balance_change < -self.trade_cost * 0.5:
             # 切换到卖出Tab查看持仓
             self.browser.click_tab(1)
-            time.sleep(0.3)
-            holding = self._get_current_holding()
-            
-            duration_ms = (time.time() - buy_start) * 1000
-            self.stats.record_buy(buy_price, expected_amount, True, duration_ms)
-            success(f"✅ 买入成交！持仓: {holding:.4f}，等待反向卖单...")
-            
-            result["success"] = True
-            result["holding"] = holding
-            result["buy_price"] = buy_price
-            return result
+            self._wait("tab_balance_ready")
+            cycle.data["holding"] = self._get_current_holding()
+            self._record_buy_filled(cycle)
+            if waited is None:
+                success(f"✅ 买入成交！持仓: {cycle.data['holding']:.4f}，等待反向卖单...")
+            else:
+                success(f"✅ 等待后买入成交！持仓: {cycle.data['holding']:.4f}")
+            cycle.to(CycleState.BUY_FILLED)
+            return True
         
-        # 情况3：余额未明显变化，可能订单还在挂单中
-        info(f"订单可能在挂单中，等待成交...")
+        return False
+    
+    def _classify_buy_account(
+        self,
+        cycle: TradeCycle,
+        waited: Optional[float] = None,
+        wait: float = 0
+    ) -> Optional[bool]:
+        """
+        按接口响应中本笔订单的状态判断买单结果并迁移状态
         
-        # 等待并检查成交状态
-        for wait_sec in range(1, self.buy_order_timeout + 1):
-            time.sleep(1)
-            
-            # 检查验证弹窗
-            self.browser.check_verification()
-            
-            # 获取最新余额
-            self.browser.click_tab(0)
-            balance_text = self.browser.get_text(self.XPATH["available_balance"])
-            if balance_text:
-                try:
-                    current_balance = float(balance_text.split(" ")[0])
-                    balance_change = current_balance - balance_before
-                    
-                    # 如果余额几乎恢复，说明买卖都成交了
-                    if abs(balance_change) < self.config.trade.cost * 0.05:
-                        duration_ms = (time.time() - buy_start) * 1000
-                        self.stats.record_buy(buy_price, expected_amount, True, duration_ms)
-                        success(f"🎉 等待后完整交易成交！（{wait_sec}s，余额变化: {balance_change:+.2f}）")
-                        
-                        result["success"] = True
-                        result["holding"] = 0
-                        result["buy_price"] = buy_price
-                        result["complete_trade"] = True
-                        return result
-                    
-                    # 如果余额大幅减少，说明买单成交了
-                    if balance_change < -self.config.trade.cost * 0.5:
-                        self.browser.click_tab(1)
-                        time.sleep(0.3)
-                        holding = self._get_current_holding()
-                        
-                        duration_ms = (time.time() - buy_start) * 1000
-                        self.stats.record_buy(buy_price, expected_amount, True, duration_ms)
-                        success(f"✅ 等待后买入成交！持仓: {holding:.4f}")
-                        
-                        result["success"] = True
-                        result["holding"] = holding
-                        result["buy_price"] = buy_price
-                        return result
-                        
-                except (ValueError, IndexError):
-                    pass
-            
-            pending_count = self._get_pending_order_count()
-            info(f"等待中... {wait_sec}s, 余额: {current_balance:.2f}, 挂单: {pending_count}")
+        与提交前接口中的当前委托相比，新出现的买单为本笔买单、价格与反向卖价一致的新卖单为本笔反向卖单
+        （只看当前交易对，其他挂单不影响判断）
         
-        # 超时未成交，取消买单
-        warning("买单超时未成交，取消买单")
-        self._cancel_orders()
-        duration_ms = (time.time() - buy_start) * 1000
-        self.stats.record_buy(buy_price, 0, False, duration_ms, "买单超时未成交")
+        Args:
+            cycle: 当前交易周期
+            waited: 已等待秒数（None 表示提交后的首次判断）
+            wait: 等待新接口数据的最长时间（秒）
+        
+        Returns:
+            True 已得出结论（已迁移到 SETTLED / BUY_FILLED），False 本笔买单仍在委托中，
+            None 提交前后接口数据不可用（调用方回退到余额判断）
+        """
+        data = cycle.data
+        known = data.get("known_account_orders")
+        if known is None:
+            return None
+        state = self._account_state(since_version=data["submit_version"], wait=wait)
+        if not state:
+            return None
+        
+        fresh = new_orders(state["orders"], known)
+        buys, reverses = split_new_orders(fresh, data["buy_price"], data["reverse_price"])
+        if buys:
+            return False
+        
+        self._record_buy_filled(cycle)
+        wait_text = "" if waited is None else f"（{waited:.1f}s）"
+        if not reverses:
+            success(f"🎉 完整交易已成交{wait_text}！买入+卖出都已完成（接口: 余额 {state['usdt']:.2f}）")
+            cycle.to(CycleState.SETTLED, "买卖快速成交")
+            return True
         
-        return result
+        # 反向卖单锁定的数量也算持仓
+        order = reverses[0]
+        data["reverse_order_id"] = order.order_id
+        data["holding"] = state["holding"] + order.quantity
+        success(f"✅ 买入成交{wait_text}！持仓: {data['holding']:.4f}，等待反向卖单 #{order.order_id}...")
+        cycle.to(CycleState.BUY_FILLED)
+        return True
     
-    def _get_current_holding(self) -> float:
-        """获取当前持仓数量"""
-        raw_value = self.browser.get_text(self.XPATH["available_balance"])
-        if not raw_value:
-            return 0
+    def _classify_buy_orders(self, cycle: TradeCycle, waited: Optional[float] = None) -> bool:
+        """
+        按委托表中本笔订单的身份判断买单结果并迁移状态（流水线模式）
         
-        match = re.search(r'[\d,]+(?:\.\d+)?', raw_value)
-        if not match:
-            return 0
+        与提交前的委托表相比新出现的买单为本笔买单，价格与反向卖价一致的新卖单为本笔反向卖单：
+        买单仍在 → 未成交；反向卖单已出现 → 买入成交，绑定该卖单交给在途簿跟踪；
+        两者都不在且买单出现过或收到买单成交推送 → 买卖都已成交；
+        始终没见到买单也没有成交推送时状态未知（可能根本没提交成功），不算成交，交给 buy_order_timeout 取消
         
-        return float(match.group(0).replace(',', ''))
+        Args:
+            cycle: 当前交易周期
+            waited: 已等待秒数（None 表示提交后的首次判断）
+        
+        Returns:
+            是否已得出结论（已迁移到 SETTLED / BUY_FILLED）
+        """
+        data = cycle.data
+        orders = self._open_orders()
+        if orders is None:
+            return False
+        fresh = new_orders(orders, data.get("known_orders", {}))
+        buys, reverses = split_new_orders(fresh, data["buy_price"], data["reverse_price"])
+        
+        if buys:
+            data["buy_seen"] = True
+            return False
+        
+        if reverses:
+            order = reverses[0]
+            data["reverse_order_id"] = order.order_id
+            data["reverse_seen"] = True
+            data["holding"] = order.quantity or data["expected_amount"]
+            self._record_buy_filled(cycle)
+            wait_text = "" if waited is None else f"（{waited:.1f}s）"
+            success(f"✅ 买入成交{wait_text}！反向卖单已挂出: {data['holding']:.4f} @ {order.price or data['reverse_price']:.6f}")
+            cycle.to(CycleState.BUY_FILLED)
+            return True
+        
+        market = self.browser.market
+        buy_filled = bool(market and market.fills_since(data.get("submit_seq", 0), side="BUY"))
+        if data.get("buy_seen") or buy_filled:
+            self._record_buy_filled(cycle)
+            success(f"🎉 完整交易已成交！委托表中已无本笔买单和反向卖单（{cycle.dwell:.1f}s）")
+            cycle.to(CycleState.SETTLED, "买卖快速成交")
+            return True
+        return False
+    
+    def _record_buy_filled(self, cycle: TradeCycle) -> None:
+        """记录买入成交统计"""
+        duration_ms = (time.time() - cycle.data["buy_start"]) * 1000
+        self.stats.record_buy(cycle.data["buy_price"], cycle.data["expected_amount"], True, duration_ms)
     
-    def _wait_for_reverse_order_filled(self, initial_holding: float, max_wait: int = 60) -> bool:
+    def _cycle_buy_filled(self, cycle: TradeCycle) -> None:
+        """BUY_FILLED：初始化反向卖单成交判断，进入 REVERSE_PENDING"""
+        max_wait = self.config.interval.reverse_order_timeout
+        holding = cycle.data.get("holding", 0)
+        info(f"等待反向卖单成交，初始持仓: {holding:.4f}，最长等待 {max_wait} 秒")
+        cycle.data.update({
+            "fill_seq": self._market_seq(),
+            "had_pending_orders": True,      # 假设刚下单时有挂单
+            "initial_pending_count": -1,     # 初始挂单数量（-1 表示未知）
+        })
+        cycle.to(CycleState.REVERSE_PENDING, timeout=max_wait)
+    
+    def _cycle_reverse_pending(self, cycle: TradeCycle) -> None:
         """
-        等待反向卖单成交
+        REVERSE_PENDING：检查一次反向卖单是否成交
         
         判断依据（任一满足即为成交）：
+        0. 订单推送确认卖单完全成交
         1. 挂单消失（从有变成无）
         2. 余额恢复（说明卖单成交回款）
         3. 持仓明显减少
         
-        Args:
-            initial_holding: 买入后的初始持仓
-            max_wait: 最大等待时间（秒）
+        截止时间（reverse_order_timeout）到仍未成交时进入 FORCE_EXIT
+        """
+        data = cycle.data
+        check_interval = 3  # 无 DOM 变更时每3秒检查一次
+        
+        if cycle.expired:
+            warning(f"等待 {self.config.interval.reverse_order_timeout} 秒后反向卖单仍未成交")
+            # 超时未成交，主动市价卖出（_market_sell 内部会先取消挂单）
+            warning("反向卖单超时，主动市价卖出")
+            cycle.to(CycleState.FORCE_EXIT, "反向卖单超时")
+            return
         
-        Returns:
-            是否成交
+        # 委托行增删或余额变化时立即检查，否则最多等待一个检查间隔
+        self.browser.wait_for_dom_event(
+            [DomEventKind.ORDERS, DomEventKind.BALANCE],
+            timeout=cycle.remaining(check_interval)
+        )
+        elapsed = int(cycle.dwell)
+        
+        # ========== 判断条件0：订单推送已确认卖单完全成交 ==========
+        if self._sell_filled_since(data["fill_seq"]):
+            success(f"✅ 反向卖单已成交！（订单推送，{elapsed}s）")
+            cycle.to(CycleState.SETTLED, "反向卖单自动成交")
+            return
+        
+        # 检查挂单数量（核心判断依据，快照内已包含验证器检测）
+        snap = self.browser.snapshot()
+        pending_count = snap.open_orders if snap else self._get_pending_order_count()
+        
+        # 记录第一次检测到的挂单数
+        if data["initial_pending_count"] == -1:
+            data["initial_pending_count"] = pending_count
+            data["had_pending_orders"] = pending_count > 0
+        
+        # ========== 判断条件1：挂单消失 ==========
+        # 如果之前有挂单，现在没有了 = 成交！
+        if data["had_pending_orders"] and pending_count == 0:
+            success(f"✅ 反向卖单已成交！（挂单已消失，{elapsed}s）")
+            cycle.to(CycleState.SETTLED, "反向卖单自动成交")
+            return
+        
+        # ========== 判断条件2/3：余额恢复或持仓减少 ==========
+        # 不切换 Tab：当前 Tab 为实时值，另一个 Tab 只用一个检查间隔内读到的值；
+        # 两者都未知时才切换到卖出 Tab，之后一直停留，每轮快照都能读到实时持仓
+        current_balance, current_holding = self.browser.balances(max_age=check_interval, snap=snap)
+        if current_balance is None and current_holding is None:
+            self.browser.click_tab(1)
+            self._wait("tab_balance_ready", baseline=0.2)
+            current_holding = self._get_current_holding()
+        
+        # 如果余额大于等于买入成本（说明卖单已成交回款）
+        if current_balance is not None and current_balance >= self.trade_cost * 0.9:
+            success(f"✅ 反向卖单已成交！（余额已恢复: {current_balance:.2f}，{elapsed}s）")
+            cycle.to(CycleState.SETTLED, "反向卖单自动成交")
+            return
+        
+        # 如果持仓明显减少
+        initial_holding = data.get("holding", 0)
+        if current_holding is not None and current_holding < initial_holding * 0.5:
+            success(f"✅ 反向卖单已成交！持仓: {initial_holding:.4f} → {current_holding:.4f}")
+            cycle.to(CycleState.SETTLED, "反向卖单自动成交")
+            return
+        
+        balance_text = f"{current_balance:.2f}" if current_balance is not None else "-"
+        holding_text = f"{current_holding:.4f}" if current_holding is not None else "-"
+        info(f"等待中... {elapsed}s, 余额: {balance_text}, 持仓: {holding_text}, 挂单: {pending_count}")
+    
+    def _cycle_force_exit(self, cycle: TradeCycle) -> None:
+        """
+        FORCE_EXIT：市价卖出（最多 3 次，间隔 2 秒），无论成败都结束本笔交易避免卡住
+        
+        流水线超时清仓（own_exit）只撤销本笔反向卖单、卖出本笔持仓，其余情况撤销全部挂单后卖出全部持仓
+        """
+        data = cycle.data
+        sold = self._exit_own_position(cycle) if data.get("own_exit") else self._market_sell()
+        if sold:
+            if data.get("insufficient"):
+                duration_ms = (time.time() - data["buy_start"]) * 1000
+                self.stats.record_buy(self.buy_price, 0, True, duration_ms, "主动市价卖出")
+                self.insufficient_balance_count = 0
+            cycle.to(CycleState.SETTLED, "主动卖出成交")
+            return
+        
+        attempts = data.get("sell_attempts", 0) + 1
+        data["sell_attempts"] = attempts
+        warning(f"市价卖出失败，重试 ({attempts}/3)...")
+        if attempts < 3:
+            cycle.hold(2)
+            return
+        
+        if data.get("insufficient"):
+            warning("⚠️ 市价卖出失败，强制跳过避免卡住")
+            self.insufficient_balance_count = 0
+        data["sell_failed"] = True
+        cycle.to(CycleState.SETTLED, "卖出可能未完成")
+    
+    def _load_page_data(self) -> bool:
         """
-        info(f"等待反向卖单成交，初始持仓: {initial_holding:.4f}，最长等待 {max_wait} 秒")
+        加载页面数据（读取当前价格）
         
-        start_time = time.time()
-        check_interval = 3  # 每3秒检查一次
+        Returns:
+            是否读到价格；price_load_timeout 内仍读不到时记下刷新原因，下一轮 IDLE 先刷新页面
+        """
+        info("页面加载中...")
         
-        # 记录初始状态
-        had_pending_orders = True  # 假设刚下单时有挂单
-        initial_pending_count = -1  # 初始挂单数量（-1 表示未知）
+        # WebSocket 推送的价格足够新鲜时直接使用，无需滚动和读取 DOM
+        feed_price = self.browser.market_price()
+        if feed_price:
+            self.buy_price = feed_price
+            success(f"价格数据加载完成(推送): {self.buy_price}")
+            return True
         
-        while time.time() - start_time < max_wait:
-            time.sleep(check_interval)
+        deadline = time.time() + self.price_load_timeout
+        retry_count = 0
+        while True:
+            # 滚动到顶部
+            self.browser.scroll_to("top")
             
-            # 检查验证弹窗
-            self.browser.check_verification()
+            # 滚动成交记录到顶部
+            self.browser.scroll_to("top", xpath=self.XPATH["grid_scroll"])
             
-            # 检查挂单数量（核心判断依据）
-            pending_count = self._get_pending_order_count()
+            # 等待价格渲染
+            self._wait("price_rendered")
             
-            # 记录第一次检测到的挂单数
-            if initial_pending_count == -1:
-                initial_pending_count = pending_count
-                had_pending_orders = pending_count > 0
+            # 快照内按优先级尝试主/备用价格选择器，并顺带处理验证器弹窗
+            snap = self.browser.snapshot()
+            if snap:
+                # 调试输出原始获取内容
+                if retry_count % 3 == 0:
+                    info(f"获取到的原始价格文本: '{snap.price_text}'")
+                
+                if snap.price and snap.price > 0:
+                    self.buy_price = snap.price
+                    success(f"价格数据加载完成: {self.buy_price}")
+                    return True
             
-            elapsed = int(time.time() - start_time)
+            retry_count += 1
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            warning(f"获取价格失败 (第{retry_count}次)，继续尝试...")
+            time.sleep(min(self.price_load_interval, remaining))
+        
+        error(f"❌ {self.price_load_timeout}s 内未能获取价格（共 {retry_count} 次），本轮中止")
+        self.refresh_pending = "价格加载失败，刷新页面"
+        return False
+    
+    def _market_sell(self) -> bool:
+        """
+        市价卖出当前持仓（反向卖单超时时使用）
+        优化：先取消挂单释放锁定的资产，再获取实际持仓进行卖出
+        
+        Returns:
+            是否卖出成功
+        """
+        info("执行市价卖出...")
+        
+        # ===== 关键修复：先取消所有挂单，释放被锁定的资产 =====
+        state = self._account_state()
+        pending_count = state["open_orders"] if state else self._get_pending_order_count()
+        cancel_version = self._state_version()
+        if pending_count > 0:
+            warning(f"发现 {pending_count} 个挂单锁定资产，先取消...")
+            self.browser.scroll_to("bottom")
+            self._cancel_orders()
+            self._wait("orders_cancelled")  # 等待取消生效
             
-            # ========== 判断条件1：挂单消失 ==========
-            # 如果之前有挂单，现在没有了 = 成交！
-            if had_pending_orders and pending_count == 0:
-                success(f"✅ 反向卖单已成交！（挂单已消失，{elapsed}s）")
+            # 验证取消结果
+            remaining = self._get_pending_order_count()
+            if remaining > 0:
+                warning(f"仍有 {remaining} 个挂单，再次尝试取消...")
+                self._cancel_orders()
+                self._wait("orders_cancelled")
+        
+        # 切换到卖出 Tab
+        self.browser.click_tab(1)
+        self._wait("tab_balance_ready", baseline=0.5)
+        
+        # 一次快照同时获取持仓（取消挂单后再获取，这样才能拿到真实可用数量）和最新价格
+        snap = self.browser.snapshot()
+        holding = self._holding_from(snap)
+        
+        # 接口响应中撤单后的持仓更权威（撤单后页面会重新拉取资产）
+        state = self._account_state(since_version=cancel_version, wait=2 if pending_count > 0 else 0)
+        if state:
+            holding = state["holding"]
+        info(f"当前可卖持仓: {holding}")
+        
+        min_sell = self.config.trade.min_sell_amount
+        if holding <= min_sell:
+            info(f"持仓 {holding} <= 最小卖出量 {min_sell}，无需卖出")
+            return True  # 没有持仓也算成功
+        
+        # 优化：使用当前最新价格，而不是使用买入时的旧价格
+        current_price = self.buy_price # 默认回退值
+        if snap and snap.price:
+            current_price = snap.price
+            info(f"获取到最新市价: {current_price}")
+        else:
+            warning("获取最新市价失败，使用旧价格")
+
+        # 填写卖出价格（略低于当前市价，确保快速成交）
+        # 这里使用 0.9995 (万5滑点) 确保一定要卖出去，防止卡单
+        sell_price = current_price * 0.9995
+        info(f"市价卖出价: {sell_price:.6f}")
+        
+        # 卖出数量
+        sell_amount = holding - self.config.trade.reserved_amount
+        info(f"卖出数量: {sell_amount:.4f}")
+        return self._submit_sell(sell_price, sell_amount)
+    
+    def _submit_buy(self, buy_price: float, reverse_sell_price: float, buy_start: float) -> bool:
+        """
+        勾选反向订单、填写并提交买单
+        
+        优先在页面内一次完成（OrderSubmitter），表单未就绪时完整回退逐步操作，
+        已点击下单但未出现确认框时从点击购买开始回退
+        
+        Args:
+            buy_price: 买入价
+            reverse_sell_price: 反向卖单价格
+            buy_start: 本次买入开始时间（用于统计耗时）
+        
+        Returns:
+            订单是否已提交（失败时已记录统计）
+        """
+        def fail(reason: str) -> bool:
+            duration_ms = (time.time() - buy_start) * 1000
+            self.stats.record_buy(buy_price, 0, False, duration_ms, reason)
+            return False
+        
+        prepared = False
+        if self.submitter.enabled:
+            submit = self.submitter.submit_buy(buy_price, self.trade_cost, reverse_sell_price)
+            if submit.ok:
                 return True
+            if submit.outcome == SubmitOutcome.SLIPPAGE_REJECTED:
+                warning("滑点过大，取消交易")
+                return fail("滑点过大")
+            if submit.outcome == SubmitOutcome.ERROR:
+                return fail(f"页面内下单异常: {submit.detail[:50]}")
+            prepared = submit.outcome == SubmitOutcome.DIALOG_MISSING
+        
+        if not prepared:
+            info("勾选反向订单")
+            if not self.browser.toggle_checkbox(self.CSS["checkbox"], should_check=True):
+                self._refresh_page("复选框失败，刷新页面")
+                return fail("复选框操作失败")
             
-            # ========== 判断条件2：检查余额恢复 ==========
-            # 切换到买入Tab检查余额
-            self.browser.click_tab(0)
-            time.sleep(0.2)
-            balance_text = self.browser.get_text(self.XPATH["available_balance"])
-            current_balance = 0
-            if balance_text:
-                try:
-                    current_balance = float(balance_text.split(" ")[0])
-                except (ValueError, IndexError):
-                    pass
+            self.browser.fill_form({
+                self.XPATH["limit_price"]: buy_price,
+                self.XPATH["limit_total_buy"]: self.trade_cost,
+                self.XPATH["limit_total_sell"]: reverse_sell_price,
+            })
+        
+        self.browser.scroll_into_view(self.XPATH["buy_button"])
+        
+        info("点击购买")
+        if not self.browser.click(self.XPATH["buy_button"], timeout=5):
+            warning("点击购买按钮失败")
+            return fail("点击购买按钮失败")
+        
+        # 快速确认
+        self._wait("confirm_dialog")
+        confirm_clicked = self.browser.click(self.XPATH["confirm_button"], timeout=1)
+        
+        if not confirm_clicked:
+            if self.browser.click(self.XPATH["cancel_slippage"], timeout=0.5):
+                warning("滑点过大，取消交易")
+                return fail("滑点过大")
             
-            # 如果余额大于等于买入成本（说明卖单已成交回款）
-            if current_balance >= self.config.trade.cost * 0.9:
-                success(f"✅ 反向卖单已成交！（余额已恢复: {current_balance:.2f}，{elapsed}s）")
+            confirm_clicked = self.browser.click(self.XPATH["confirm_button"], timeout=1)
+            if not confirm_clicked:
+                warning("未能点击确认按钮")
+                return fail("未能点击确认按钮")
+        
+        # 等待订单提交完成
+        self._wait("submit_dialog_closed")
+        return True
+    
+    def _submit_sell(self, sell_price: float, sell_amount: float) -> bool:
+        """
+        取消反向订单、填写并提交卖单（回退规则同 _submit_buy）
+        
+        Args:
+            sell_price: 卖出价
+            sell_amount: 卖出数量
+        
+        Returns:
+            是否已确认卖出
+        """
+        prepared = False
+        if self.submitter.enabled:
+            submit = self.submitter.submit_sell(sell_price, sell_amount)
+            if submit.ok:
+                success("✅ 市价卖出已成交")
                 return True
+            if submit.outcome == SubmitOutcome.ERROR:
+                warning("卖出确认失败")
+                return False
+            prepared = submit.outcome == SubmitOutcome.DIALOG_MISSING
+        
+        if not prepared:
+            self.browser.fill_form({
+                self.XPATH["limit_price"]: sell_price,
+                self.XPATH["limit_amount"]: sell_amount,
+            })
             
-            # ========== 判断条件3：检查持仓变化 ==========
-            self.browser.click_tab(1)
-            time.sleep(0.2)
-            current_holding = self._get_current_holding()
+            # 不勾选反向订单
+            self.browser.scroll_to("bottom", xpath=self.XPATH["trade_scroll"])
+            self.browser.toggle_checkbox(self.CSS["checkbox"], should_check=False)
+            self.browser.scroll_to("bottom")
+        
+        # 提交卖出
+        info("点击卖出")
+        if not self.browser.click(self.XPATH["sell_button"]):
+            warning("点击卖出按钮失败")
+            return False
+        
+        self._wait("confirm_dialog")
+        
+        # 确认
+        if self.browser.click(self.XPATH["confirm_button"], timeout=1):
+            success("✅ 市价卖出已成交")
+            self.browser.click(self.XPATH["continue_button"], timeout=1)
+            return True
+        elif self.browser.click(self.XPATH["confirm_slippage"], timeout=0.5):
+            success("✅ 市价卖出已成交")
+            return True
+        
+        warning("卖出确认失败")
+        return False
+    
+    def _force_sell_all(self) -> None:
+        """
+        强制清仓卖出（仅用于结束时清仓）
+        """
+        info("执行清仓卖出...")
+        self._market_sell()
+    
+    def _cancel_orders(self) -> None:
+        """取消未成交订单"""
+        # 检查是否有挂单
+        initial_count = self._get_pending_order_count()
+        if initial_count == 0:
+            info("无挂单需要取消")
+            return
+
+        info(f"检查未成交挂单 (共 {initial_count} 个)...")
+        
+        # 向右滚动订单表格（确保取消按钮可见）
+        self.browser.scroll_to("right", xpath=self.XPATH["order_table"])
+        self._wait("cancel_buttons")
+        
+        # 尝试多次取消，直到没有挂单
+        max_retries = 3
+        for i in range(max_retries):
+            cancelled = False
             
-            # 如果持仓明显减少
-            if current_holding < initial_holding * 0.5:
-                success(f"✅ 反向卖单已成交！持仓: {initial_holding:.4f} → {current_holding:.4f}")
-                return True
+            # 方法1: 尝试点击表头的取消全部按钮 (最优先)
+            if not cancelled:
+                if self.browser.click(self.XPATH["cancel_all_btn"], timeout=2):
+                    info("点击了取消全部按钮")
+                    cancelled = True
+            
+            # 方法2: 尝试点击订单行的取消链接
+            if not cancelled:
+                if self.browser.click(self.XPATH["cancel_order_link"], timeout=1):
+                    info("点击了取消链接")
+                    cancelled = True
             
-            info(f"等待中... {elapsed}s, 余额: {current_balance:.2f}, 挂单: {pending_count}")
+            # 方法3: 尝试点击单个订单取消按钮
+            if not cancelled:
+                if self.browser.click(self.XPATH["cancel_single_btn"], timeout=1):
+                    info("点击了单个取消按钮")
+                    cancelled = True
+            
+            if cancelled:
+                # 确认取消弹窗
+                self._wait("cancel_dialog")
+                confirm_clicked = self.browser.click(self.XPATH["cancel_confirm"], timeout=2)
+                if not confirm_clicked:
+                    confirm_clicked = self.browser.click(self.XPATH["cancel_confirm_alt"], timeout=2)
+                
+                if confirm_clicked:
+                    success("✅ 点击确认取消")
+                    self.stats.record_cancel(True)
+                    self._wait("orders_cancelled")  # 等待取消生效
+                else:
+                    warning("未找到确认取消按钮")
+            
+            # 检查是否还有挂单
+            current_count = self._get_pending_order_count()
+            if current_count == 0:
+                success("✅ 所有挂单已取消")
+                break
+            else:
+                if i < max_retries - 1:
+                    warning(f"仍有 {current_count} 个挂单，重试取消 ({i+1}/{max_retries})...")
+                    # 重新滚动一下
+                    self.browser.scroll_to("bottom") 
+                    self.browser.scroll_to("right", xpath=self.XPATH["order_table"])
+                    self._wait("cancel_buttons", baseline=1)
+    
+    def _get_current_holding(self) -> float:
+        """获取当前持仓数量（需已在卖出 Tab，或买卖面板同时渲染）"""
+        return self._holding_from(self.browser.snapshot())
+    
+    @staticmethod
+    def _holding_from(snap: Optional[PageSnapshot]) -> float:
+        """从快照中取卖出 Tab 的实时持仓（未实时读到时返回 0）"""
+        if not snap or 1 not in snap.fresh_tabs:
+            return 0
+        return snap.sell_balance or 0
+    
+    @staticmethod
+    def _usdt_balance_from(snap: Optional[PageSnapshot]) -> Optional[float]:
+        """从快照中取买入 Tab 的实时 USDT 余额（未实时读到时返回 None）"""
+        if not snap or 0 not in snap.fresh_tabs:
+            return None
+        return snap.buy_balance
+    
+    def _wait(self, name: str, baseline: Optional[float] = None) -> bool:
+        """
+        执行 WAITS 中的命名等待
         
-        warning(f"等待 {max_wait} 秒后反向卖单仍未成交")
-        return False
+        Args:
+            name: 等待名称
+            baseline: 覆盖原固定 sleep 秒数（同一等待在不同位置原时长不同时）
+        
+        Returns:
+            条件是否满足（超时也继续后续流程，与原 sleep 行为一致）
+        """
+        predicate, key, default_baseline, cap = self.WAITS[name]
+        arg = {"xpath": self.XPATH[key]} if key else None
+        return self.browser.wait_until(
+            name, predicate, timeout=cap, arg=arg,
+            baseline=default_baseline if baseline is None else baseline
+        )
+    
+    def _state_version(self) -> int:
+        """账户状态缓存的当前版本号（未启用时为 0）"""
+        return self.browser.account.version if self.browser.account else 0
+    
+    def _account_state(self, since_version: int = -1, wait: float = 0) -> Optional[dict]:
+        """
+        从拦截的接口响应读取账户状态
+        
+        Args:
+            since_version: 只接受晚于该版本的数据
+            wait: 等待新数据的最长时间（秒）
+        
+        Returns:
+            {"usdt", "holding", "open_orders", "orders"}（只含当前交易对的挂单），
+            未启用、数据过期或不够新时返回 None（调用方回退到 DOM 判断）
+        """
+        account = self.browser.account
+        if not account:
+            return None
+        if wait > 0:
+            account.wait_for_update(since_version, timeout=wait)
+        
+        usdt = account.quote_balance(since_version)
+        holding = account.holding(since_version)
+        orders = account.open_orders(since_version)
+        if usdt is None or holding is None or orders is None:
+            return None
+        
+        return {
+            "usdt": usdt,
+            "holding": holding,
+            "open_orders": len(orders),
+            "orders": orders,
+        }
+    
+    def _market_seq(self) -> int:
+        """WebSocket 推送的当前序号（用于之后查询新成交）"""
+        return self.browser.market.seq if self.browser.market else 0
+    
+    def _sell_filled_since(self, seq: int) -> bool:
+        """序号之后是否收到卖单完全成交的订单推送"""
+        if not self.browser.market:
+            return False
+        return bool(self.browser.market.fills_since(seq, side="SELL"))
     
     def _finalize(self) -> None:
         """完成交易后的清理和统计"""
         step("完成交易，执行最终状态检查")
         
         # ========== 1. 等待最后一笔交易结算 ==========
-        info("等待最后一笔交易结算 (10s)...")
-        time.sleep(10)
+        info("等待最后一笔交易结算 (最长 10s)...")
+        self._wait("final_settle")
         
         # ========== 2. 检查并取消未成交订单 ==========
         self.browser.scroll_to("bottom")
-        pending_count = self._get_pending_order_count()
+        state = self._account_state()
+        pending_count = state["open_orders"] if state else self._get_pending_order_count()
         if pending_count > 0:
             info(f"发现 {pending_count} 个未成交订单，执行取消...")
             self._cancel_orders()
-            time.sleep(3)
+            self._wait("final_cancel")
         
         # ========== 3. 检查并清仓 ==========
         self.browser.scroll_to("top")
         self.browser.click_tab(1)  # 切换到卖出Tab
-        time.sleep(0.5)
+        self._wait("tab_balance_ready", baseline=0.5)
         
         holding = self._get_current_holding()
         if holding and holding > self.config.trade.min_sell_amount:
             info(f"发现持仓 {holding:.4f}，执行清仓...")
             self._force_sell_all()
-            time.sleep(5)
+            self._wait("final_sell")
         else:
             info("无需清仓，持仓为空或低于最小卖出量")
         
         # ========== 4. 等待余额稳定 ==========
-        info("等待余额稳定 (5s)...")
-        time.sleep(5)
+        info("等待余额稳定 (最长 5s)...")
+        self._wait("balance_stable")
         
         # ========== 5. 获取最终余额（多次采样确保稳定）==========
         final_balance = None
         balance_samples = []
         
-        for retry in range(5):
+        # 接口响应中没有挂单时，余额即为最终值，无需多次采样
+        state = self._account_state()
+        if state and state["open_orders"] == 0:
+            final_balance = state["usdt"]
+            info(f"余额(接口): {final_balance:.4f}")
+        
+        for retry in range(5 if final_balance is None else 0):
             self.browser.click_tab(0)
-            time.sleep(1)
+            self._wait("tab_balance_ready", baseline=1)
             
-            balance_text = self.browser.get_text(self.XPATH["available_balance"])
-            if balance_text:
-                try:
-                    balance = float(balance_text.split(" ")[0])
-                    if balance > 0:
-                        balance_samples.append(balance)
-                        # 连续2次相同则认为稳定
-                        if len(balance_samples) >= 2 and balance_samples[-1] == balance_samples[-2]:
-                            final_balance = balance
-                            info(f"余额已稳定: {final_balance:.4f}")
-                            break
-                except (ValueError, IndexError):
-                    pass
+            balance = self._get_usdt_balance_fast()
+            if balance is not None and balance > 0:
+                balance_samples.append(balance)
+                # 连续2次相同则认为稳定
+                if len(balance_samples) >= 2 and balance_samples[-1] == balance_samples[-2]:
+                    final_balance = balance
+                    info(f"余额已稳定: {final_balance:.4f}")
+                    break
             
             if retry < 4:
                 info(f"确认余额中... ({retry+1}/5)")
@@ -952,21 +1581,92 @@ class AlphaTrader:
         
         elapsed_time(self.start_time, "总运行时间")
         
+        # 选择器注册表命中率
+        selector_stats = self.browser.selector_stats()
+        if selector_stats["hits"] + selector_stats["misses"]:
+            info(f"选择器缓存: 命中 {selector_stats['hits']} / 未命中 {selector_stats['misses']} "
+                 f"(命中率 {selector_stats['hit_rate']:.1f}%)")
+        
+        mfa_stats = self.browser.mfa_stats
+        if mfa_stats["checks"] + mfa_stats["skipped"]:
+            info(f"验证器检测: 实际 {mfa_stats['checks']} 次 / 标志跳过 {mfa_stats['skipped']} 次")
+        
+        scroll_stats = self.browser.scroll_stats
+        if scroll_stats["calls"]:
+            avg_ms = scroll_stats["total_ms"] / scroll_stats["calls"]
+            info(f"滚动: 执行 {scroll_stats['calls']} 次 (平均 {avg_ms:.1f}ms, 已在位置 {scroll_stats['noop']} 次)")
+        
+        if self.submitter.outcomes:
+            outcomes = ", ".join(f"{name} {count}" for name, count in self.submitter.outcomes.items())
+            info(f"页面内下单: {outcomes}")
+        
+        capture_stats = self.browser.capture.stats
+        if capture_stats["captured"] + capture_stats["rate_limited"]:
+            info(f"失败现场采集: {capture_stats['captured']:.0f} 次 (抓取共 {capture_stats['grab_ms']:.0f}ms) "
+                 f"/ 限频 {capture_stats['rate_limited']:.0f} / 重复 {capture_stats['duplicates']:.0f} "
+                 f"/ 超配额删除 {capture_stats['evicted']:.0f}")
+        
+        if self.config.interval.refresh_mode != RefreshMode.INTERVAL:
+            info(self.health.summary())
+        
+        if self.inflight.enabled:
+            info(self.inflight.summary())
+        info(self.pacer.summary())
+        
+        tab_stats = self.browser.tab_stats
+        info(f"Tab 切换: 实际 {tab_stats['switches']} 次 / 已在目标 Tab 跳过 {tab_stats['skipped']} 次 "
+             f"/ 免切换余额读取 {tab_stats['balance_reads']} 次")
+        
+        click_stats = self.browser.click_stats()
+        cache = click_stats.pop("cache")
+        for mode, row in click_stats.items():
+            info(f"点击[{mode}]: {row['count']} 次, p50 {row['p50_ms']:.0f}ms / p90 {row['p90_ms']:.0f}ms / p99 {row['p99_ms']:.0f}ms")
+        if cache["hits"] + cache["misses"]:
+            info(f"点击坐标缓存: 命中 {cache['hits']} / 未命中 {cache['misses']}")
+        
         # 打印交易统计摘要
         self.stats.print_summary()
         
         # 保存统计数据
         self.stats.save_to_file()
     
-    def _refresh_page(self, reason: str) -> None:
-        """刷新页面"""
+    def _refresh_reason(self) -> Optional[str]:
+        """
+        判断本轮是否需要刷新页面
+        
+        Returns:
+            刷新原因，不需要刷新返回 None
+        """
+        if self.refresh_pending:
+            return self.refresh_pending
+        if self.config.interval.refresh_mode == RefreshMode.INTERVAL:
+            if self.loop_count % self.config.interval.refresh_interval == 0:
+                return "定期刷新页面"
+            return None
+        reason = self.health.observe(self.browser.performance_metrics())
+        return f"页面健康: {reason}，刷新页面" if reason else None
+    
+    def _refresh_page(self, reason: str) -> bool:
+        """
+        刷新页面直到可交易（未就绪时间隔 3 秒再刷新，最长 60 秒）
+        
+        Returns:
+            页面是否可交易；失败时记下原因，下一轮 IDLE 先重试刷新
+        """
         info(reason)
         self.browser.scroll_to("top")
-        self.browser.refresh_until_element(
+        if not self.browser.refresh_until_element(
             self.target_url,
             self.XPATH["page_loaded"],
-            delay=60
-        )
+            delay=3,
+            timeout=60
+        ):
+            error(f"❌ 刷新后页面仍不可交易（{reason}），本轮中止，下一轮重试刷新")
+            self.refresh_pending = reason
+            return False
+        self.refresh_pending = None
+        self.health.reset()
+        return True
     
     def _get_pending_order_count(self) -> int:
         """
@@ -997,156 +1697,6 @@ class AlphaTrader:
             warning(f"获取挂单数量失败: {e}")
             return 0
     
-    def _wait_for_buy_order_filled(
-        self, 
-        initial_holding: float = 0, 
-        expected_amount: float = 0,
-        max_wait: int = 10, 
-        check_interval: int = 2
-    ) -> bool:
-        """
-        等待买单成交（通过持仓变化判断）
-        
-        Args:
-            initial_holding: 初始持仓
-            expected_amount: 预期买入数量
-            max_wait: 最大等待时间（秒）
-            check_interval: 检查间隔（秒）
-        
-        Returns:
-            是否成交
-        """
-        info(f"等待买单成交，初始持仓: {initial_holding:.4f}，最长 {max_wait} 秒...")
-        
-        start_time = time.time()
-        
-        while time.time() - start_time < max_wait:
-            time.sleep(check_interval)
-            
-            # 检查验证弹窗
-            self.browser.check_verification()
-            
-            # 检查持仓变化
-            current_holding = self._get_current_holding()
-            
-            # 如果持仓增加了（买入成交）
-            if current_holding >= initial_holding + expected_amount * 0.5:
-                success(f"✅ 买单已成交！持仓: {initial_holding:.4f} → {current_holding:.4f}")
-                return True
-            
-            elapsed = int(time.time() - start_time)
-            pending_count = self._get_pending_order_count()
-            info(f"等待买单... {elapsed}s, 持仓: {current_holding:.4f}, 挂单: {pending_count}")
-        
-        warning(f"等待 {max_wait} 秒后买单仍未成交")
-        return False
-    
-    def _verify_buy_success(self, buy_price: float) -> bool:
-        """
-        验证买入是否成功（通过检查持仓变化）
-        
-        Args:
-            buy_price: 买入价格
-        
-        Returns:
-            是否买入成功
-        """
-        # 切换到卖出 Tab 检查持仓
-        info("验证买入结果...")
-        self.browser.click_tab(1)
-        time.sleep(0.3)
-        
-        # 获取持仓数量
-        raw_value = self.browser.get_text(self.XPATH["available_balance"])
-        if not raw_value:
-            warning("无法获取持仓，无法验证买入结果")
-            return False
-        
-        match = re.search(r'[\d,]+(?:\.\d+)?', raw_value)
-        if not match:
-            warning("解析持仓失败")
-            return False
-        
-        current_holding = float(match.group(0).replace(',', ''))
-        
-        # 计算预期买入数量
-        expected_amount = self.config.trade.cost / buy_price if buy_price > 0 else 0
-        
-        # 如果持仓大于预期买入量的一半，认为买入成功
-        # （允许一定误差，因为可能有部分成交）
-        if current_holding >= expected_amount * 0.5:
-            info(f"✅ 验证通过！持仓: {current_holding:.4f}, 预期买入: {expected_amount:.4f}")
-            return True
-        else:
-            # 持仓不足，可能买单还在挂单中
-            pending_count = self._get_pending_order_count()
-            if pending_count > 0:
-                info(f"持仓: {current_holding:.4f}, 有 {pending_count} 个挂单等待成交")
-                # 等待一小段时间再检查
-                time.sleep(self.buy_order_timeout)
-                
-                # 再次检查持仓
-                raw_value = self.browser.get_text(self.XPATH["available_balance"])
-                if raw_value:
-                    match = re.search(r'[\d,]+(?:\.\d+)?', raw_value)
-                    if match:
-                        new_holding = float(match.group(0).replace(',', ''))
-                        if new_holding > current_holding:
-                            info(f"✅ 等待后成交！持仓: {current_holding:.4f} -> {new_holding:.4f}")
-                            return True
-                
-                # 仍未成交，取消挂单
-                warning(f"买单 {self.buy_order_timeout}s 未成交，取消挂单")
-                self.browser.scroll_to("bottom")
-                self._cancel_orders()
-                return False
-            else:
-                warning(f"持仓不足且无挂单: {current_holding:.4f}")
-                return False
-    
-    def _wait_for_sell_order_filled(self, max_wait: int = 30, check_interval: int = 3) -> bool:
-        """
-        等待卖单成交（优化版：减少Tab切换）
-        
-        Args:
-            max_wait: 最大等待时间（秒），优化为30秒
-            check_interval: 检查间隔（秒），优化为3秒
-        
-        Returns:
-            是否等待成功
-        """
-        info(f"等待卖单成交，最长 {max_wait} 秒...")
-        
-        # 获取初始余额（只获取一次）
-        initial_balance = self._get_usdt_balance_fast()
-        if initial_balance is None:
-            initial_balance = 0
-        
-        start_time = time.time()
-        while time.time() - start_time < max_wait:
-            time.sleep(check_interval)
-            
-            # 优先检查挂单数量（不需要切换Tab）
-            pending_count = self._get_pending_order_count()
-            
-            # 如果没有挂单了，说明已经成交
-            if pending_count == 0:
-                success("✅ 卖单已成交！（无挂单）")
-                return True
-            
-            # 检查余额变化（减少频率）
-            elapsed = int(time.time() - start_time)
-            if elapsed % 6 == 0:  # 每6秒检查一次余额
-                current_balance = self._get_usdt_balance_fast()
-                if current_balance and current_balance > initial_balance + 1:
-                    success(f"✅ 卖单已成交！余额: {initial_balance:.2f} -> {current_balance:.2f}")
-                    return True
-                balance_str = f"{current_balance:.2f}" if current_balance else "N/A"
-                info(f"等待中... {elapsed}s, 挂单: {pending_count}, 余额: {balance_str}")
-        
-        warning(f"等待 {max_wait} 秒后仍未成交")
-        return False
-    
     def _get_usdt_balance(self) -> Optional[float]:
         """
         获取 USDT 余额（会切换到买入Tab）
@@ -1156,7 +1706,7 @@ class AlphaTrader:
         """
         # 切换到买入 Tab 获取 USDT 余额
         self.browser.click_tab(0)
-        time.sleep(0.3)  # 缩短等待时间
+        self._wait("tab_balance_ready")
         
         return self._get_usdt_balance_fast()
     
@@ -1167,13 +1717,7 @@ class AlphaTrader:
         Returns:
             USDT 余额或 None
         """
-        balance_text = self.browser.get_text(self.XPATH["available_balance"])
-        if balance_text:
-            try:
-                return float(balance_text.split(" ")[0])
-            except (ValueError, IndexError):
-                pass
-        return None
+        return self._usdt_balance_from(self.browser.snapshot())
     
     def _save_balance(self, balance: float) -> None:
         """保存余额记录"""
@@ -0,0 +1,356 @@
+"""
+行情推送模块 - 监听交易页面自身的 WebSocket 帧
+页面已经订阅了成交、行情和用户订单推送，这里通过 page.on("websocket")
+旁路解码这些帧，交易逻辑直接读取最新成交价和订单成交，不再抓取 DOM
+
+录制与回放:
+    MarketFeed(page, record_path="logs/frames.jsonl")   # 录制原始帧
+    python market_feed.py replay logs/frames.jsonl       # 离线回放，检查解码结果
+"""
+import json
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional, Callable, Dict, Any, Deque, List, Iterable
+
+from logger import info, warning
+
+
+class MarketEventKind:
+    """行情事件类型"""
+    TRADE = "trade"        # 逐笔/归集成交
+    TICKER = "ticker"      # 24 小时行情
+    ORDER = "order"        # 用户订单更新（executionReport）
+
+
+class OrderStatus:
+    """订单状态（与交易所推送字段 X 一致）"""
+    NEW = "NEW"
+    PARTIALLY_FILLED = "PARTIALLY_FILLED"
+    FILLED = "FILLED"
+    CANCELED = "CANCELED"
+    EXPIRED = "EXPIRED"
+    REJECTED = "REJECTED"
+
+
+@dataclass
+class MarketEvent:
+    """单条解码后的推送事件"""
+    kind: str
+    symbol: str = ""
+    price: float = 0.0
+    quantity: float = 0.0
+    side: str = ""             # BUY / SELL（仅订单事件）
+    status: str = ""           # 订单状态（仅订单事件）
+    order_id: str = ""
+    filled_quantity: float = 0.0
+    seq: int = 0
+    timestamp: float = field(default_factory=time.time)
+
+
+def _to_float(value: Any) -> float:
+    """推送中的数字通常是字符串"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def decode_frame(payload: Any) -> List[MarketEvent]:
+    """
+    解码一帧 WebSocket 消息
+
+    支持单条消息、组合流 {"stream": ..., "data": {...}} 以及数组批量消息，
+    无法识别的帧（心跳、订阅回执、二进制帧）返回空列表
+
+    Args:
+        payload: 帧内容（str 或 bytes）
+
+    Returns:
+        解码出的事件列表
+    """
+    if isinstance(payload, (bytes, bytearray)):
+        try:
+            payload = payload.decode("utf-8")
+        except UnicodeDecodeError:
+            return []
+    try:
+        message = json.loads(payload)
+    except (TypeError, ValueError):
+        return []
+
+    messages = message if isinstance(message, list) else [message]
+    events = []
+    for msg in messages:
+        if isinstance(msg, dict) and isinstance(msg.get("data"), (dict, list)):
+            data = msg["data"]
+            items = data if isinstance(data, list) else [data]
+        else:
+            items = [msg]
+        for item in items:
+            event = _decode_item(item)
+            if event:
+                events.append(event)
+    return events
+
+
+def _decode_item(item: Any) -> Optional[MarketEvent]:
+    """按事件类型字段 e 解码单条消息"""
+    if not isinstance(item, dict):
+        return None
+    event_type = item.get("e")
+    symbol = str(item.get("s", ""))
+
+    if event_type in ("trade", "aggTrade"):
+        return MarketEvent(
+            kind=MarketEventKind.TRADE,
+            symbol=symbol,
+            price=_to_float(item.get("p")),
+            quantity=_to_float(item.get("q")),
+        )
+    if event_type in ("24hrTicker", "24hrMiniTicker"):
+        return MarketEvent(
+            kind=MarketEventKind.TICKER,
+            symbol=symbol,
+            price=_to_float(item.get("c")),
+        )
+    if event_type == "executionReport":
+        return MarketEvent(
+            kind=MarketEventKind.ORDER,
+            symbol=symbol,
+            # 有成交时取最新成交价 L，否则取委托价 p
+            price=_to_float(item.get("L")) or _to_float(item.get("p")),
+            quantity=_to_float(item.get("q")),
+            side=str(item.get("S", "")),
+            status=str(item.get("X", "")),
+            order_id=str(item.get("i", "")),
+            filled_quantity=_to_float(item.get("z")),
+        )
+    return None
+
+
+class MarketFeed:
+    """
+    页面 WebSocket 行情订阅器
+
+    注意：page.on("websocket") 只能捕获订阅之后新建立的连接，
+    连接前页面已打开的 WebSocket 要等页面刷新后才会被捕获，
+    在此之前 latest_price 返回 None，调用方应退回 DOM 读取。
+    """
+
+    def __init__(
+        self,
+        page,
+        symbol: Optional[str] = None,
+        stale_after: float = 5.0,
+        pump_ms: int = 50,
+        history: int = 500,
+        record_path: Optional[str] = None
+    ):
+        """
+        Args:
+            page: Playwright Page（回放时可为 None）
+            symbol: 只接收该交易对（None 则锁定第一条成交推送的交易对）
+            stale_after: 价格超过该秒数未更新视为过期
+            pump_ms: 等待时驱动事件分发的步长（毫秒）
+            history: 保留的最近事件条数
+            record_path: 原始帧录制文件（JSONL，None 不录制）
+        """
+        self.page = page
+        self.symbol = symbol.upper() if symbol else None
+        self.stale_after = stale_after
+        self.pump_ms = pump_ms
+        self.record_path = record_path
+        self.events: Deque[MarketEvent] = deque(maxlen=history)
+        self.orders: Dict[str, MarketEvent] = {}
+        self.seq: int = 0
+        self.frames: int = 0
+        self.last_price: Optional[float] = None
+        self.last_price_time: float = 0.0
+        self.attached: bool = False
+        self._listeners: list = []
+
+    def attach(self) -> bool:
+        """订阅页面的 WebSocket 连接"""
+        try:
+            self.page.on("websocket", self._on_websocket)
+            self.attached = True
+            info("WebSocket 行情订阅已启用（页面新建连接后生效）")
+            return True
+        except Exception as e:
+            warning(f"订阅 WebSocket 失败: {e}")
+            return False
+
+    def add_listener(self, callback: Callable[[MarketEvent], None]) -> None:
+        """注册事件监听（在事件分发时同步调用）"""
+        self._listeners.append(callback)
+
+    def _on_websocket(self, ws) -> None:
+        """页面新建 WebSocket 时挂载帧监听"""
+        ws.on("framereceived", lambda payload: self.ingest(payload))
+
+    def ingest(self, payload: Any) -> List[MarketEvent]:
+        """
+        处理一帧消息（WebSocket 回调与离线回放共用）
+
+        Returns:
+            本帧中被接收的事件
+        """
+        self.frames += 1
+        if self.record_path:
+            self._record(payload)
+
+        accepted = []
+        for event in decode_frame(payload):
+            if not self._accept(event):
+                continue
+            self.seq += 1
+            event.seq = self.seq
+            self.events.append(event)
+            accepted.append(event)
+
+            if event.kind in (MarketEventKind.TRADE, MarketEventKind.TICKER) and event.price > 0:
+                self.last_price = event.price
+                self.last_price_time = event.timestamp
+            elif event.kind == MarketEventKind.ORDER and event.order_id:
+                self.orders[event.order_id] = event
+
+            for callback in self._listeners:
+                try:
+                    callback(event)
+                except Exception as e:
+                    warning(f"行情事件监听异常: {e}")
+        return accepted
+
+    def _accept(self, event: MarketEvent) -> bool:
+        """
+        交易对过滤：未指定时锁定第一条成交推送的交易对
+
+        订单推送同样按锁定的交易对过滤（账户其他交易对的成交不能被当作本交易对的反向卖单成交），
+        锁定之前的订单推送无从判断，先接收
+        """
+        if event.kind == MarketEventKind.ORDER:
+            return self.symbol is None or event.symbol.upper() == self.symbol
+        if self.symbol is None:
+            if event.kind != MarketEventKind.TRADE or not event.symbol:
+                return False
+            self.symbol = event.symbol.upper()
+            info(f"行情推送锁定交易对: {self.symbol}")
+        return event.symbol.upper() == self.symbol
+
+    def _record(self, payload: Any) -> None:
+        """追加写入原始帧"""
+        if isinstance(payload, (bytes, bytearray)):
+            return
+        try:
+            with open(self.record_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"t": time.time(), "payload": payload}, ensure_ascii=False) + "\n")
+        except Exception as e:
+            warning(f"录制 WebSocket 帧失败: {e}")
+            self.record_path = None
+
+    def latest_price(self, max_age: Optional[float] = None) -> Optional[float]:
+        """
+        获取最新成交价
+
+        Args:
+            max_age: 最大允许的价格年龄（秒），默认 stale_after
+
+        Returns:
+            新鲜的最新价，无推送或已过期返回 None
+        """
+        if self.last_price is None:
+            return None
+        max_age = self.stale_after if max_age is None else max_age
+        if time.time() - self.last_price_time > max_age:
+            return None
+        return self.last_price
+
+    def fills_since(self, seq: int, side: Optional[str] = None) -> List[MarketEvent]:
+        """
+        获取某个序号之后的完全成交订单事件
+
+        Args:
+            seq: 起始序号（不含）
+            side: 只看 BUY 或 SELL（None 表示全部）
+        """
+        return [
+            event for event in self.events
+            if event.seq > seq
+            and event.kind == MarketEventKind.ORDER
+            and event.status == OrderStatus.FILLED
+            and (side is None or event.side == side)
+        ]
+
+    def wait_for(
+        self,
+        predicate: Optional[Callable[[MarketEvent], bool]] = None,
+        timeout: float = 5,
+        kinds: Optional[Iterable[str]] = None
+    ) -> Optional[MarketEvent]:
+        """
+        阻塞等待满足条件的新事件
+
+        Args:
+            predicate: 事件判断函数（None 表示任意事件）
+            timeout: 超时时间（秒）
+            kinds: 只关心的事件类型（None 表示全部）
+
+        Returns:
+            第一个满足条件的事件，超时返回 None
+        """
+        kinds = set(kinds) if kinds else None
+        start_seq = self.seq
+        deadline = time.time() + timeout
+
+        while True:
+            for event in list(self.events):
+                if event.seq <= start_seq:
+                    continue
+                if kinds and event.kind not in kinds:
+                    continue
+                if predicate is None or predicate(event):
+                    return event
+
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return None
+            self.page.wait_for_timeout(min(self.pump_ms, remaining * 1000))
+
+
+# ============================================
+# 离线回放
+# ============================================
+
+def replay(path: str, symbol: Optional[str] = None) -> MarketFeed:
+    """
+    将录制的帧文件回放进一个无页面的 MarketFeed
+
+    Args:
+        path: record_path 录制的 JSONL 文件
+        symbol: 交易对过滤（同 MarketFeed）
+
+    Returns:
+        回放后的 MarketFeed
+    """
+    feed = MarketFeed(page=None, symbol=symbol, stale_after=float("inf"))
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            for event in feed.ingest(record.get("payload")):
+                detail = f" {event.side} {event.status} #{event.order_id}" if event.kind == MarketEventKind.ORDER else ""
+                print(f"[{event.seq:>5}] {event.kind:<6} {event.symbol:<16} {event.price:<14g} {event.quantity:g}{detail}")
+    return feed
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] != "replay":
+        print("用法: python market_feed.py replay <frames.jsonl> [symbol]")
+        sys.exit(1)
+    result = replay(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None)
+    print(f"\n帧数: {result.frames}, 事件数: {result.seq}, 最新价: {result.last_price}, "
+          f"订单: {len(result.orders)}, 成交: {len(result.fills_since(0))}")
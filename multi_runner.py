@@ -2,7 +2,8 @@
 多账号运行器 - 使用多进程同时运行多个账号
 
 使用方式:
-    python multi_runner.py              # 启动所有启用的账号
+    python multi_runner.py              # 启动所有启用的账号（每账号一个进程）
+    python multi_runner.py --async      # 单进程模式（一个事件循环 + 一个 Playwright 驱动）
     python multi_runner.py --list       # 列出所有账号
     python multi_runner.py --dry-run    # 预览将要启动的账号（不实际启动）
 
@@ -15,6 +16,7 @@ import os
 import sys
 import time
 import signal
+import asyncio
 import multiprocessing
 from datetime import datetime
 from typing import List, Dict, Optional
@@ -25,6 +27,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from config import (
     get_enabled_accounts, 
     list_accounts, 
+    build_config_from_account,
     AccountConfig,
     ACCOUNTS_FILE
 )
@@ -225,13 +228,14 @@ class MultiAccountRunner:
         
         print()
     
-    def run_all(self, accounts: List[AccountConfig], monitor_interval: int = 60) -> None:
+    def run_all(self, accounts: List[AccountConfig], monitor_interval: int = 60, stagger: float = 0) -> None:
         """
         启动并监控所有账号
         
         Args:
             accounts: 要启动的账号列表
             monitor_interval: 状态监控间隔（秒）
+            stagger: 账号之间的启动间隔（秒），默认不间隔
         """
         if not accounts:
             print("❌ 没有启用的账号")
@@ -250,17 +254,16 @@ class MultiAccountRunner:
         signal.signal(signal.SIGINT, signal_handler)
         signal.signal(signal.SIGTERM, signal_handler)
         
-        # 启动所有账号（间隔启动，避免同时连接导致问题）
+        # 启动所有账号（各账号进程按 Chrome 实际就绪时间等待，无需固定间隔）
         for i, account in enumerate(accounts):
             if not account.enabled:
                 continue
             
             self.start_account(account)
             
-            # 间隔 3 秒启动下一个账号
-            if i < len(accounts) - 1:
-                print(f"   等待 3 秒后启动下一个账号...")
-                time.sleep(3)
+            if stagger > 0 and i < len(accounts) - 1:
+                print(f"   等待 {stagger:g} 秒后启动下一个账号...")
+                time.sleep(stagger)
         
         # 打印初始状态
         self.print_status()
@@ -294,6 +297,122 @@ class MultiAccountRunner:
             self.stop_all()
 
 
+class AsyncAccountRunner:
+    """
+    单进程多账号运行器
+
+    所有账号作为 asyncio Task 运行在同一个事件循环中，共用一个 Playwright
+    Node 驱动；每个账号仍持有独立的 CDP 连接和 Chrome 实例
+    """
+    
+    def __init__(self):
+        self.tasks: Dict[str, asyncio.Task] = {}
+        self.start_times: Dict[str, datetime] = {}
+    
+    def get_status(self) -> Dict[str, dict]:
+        """
+        获取所有账号 Task 状态
+        
+        Returns:
+            账号状态字典
+        """
+        result = {}
+        for name, task in self.tasks.items():
+            if not task.done():
+                status = ProcessStatus.RUNNING
+            elif task.cancelled():
+                status = ProcessStatus.STOPPED
+            elif task.exception():
+                status = ProcessStatus.FAILED
+            else:
+                status = ProcessStatus.COMPLETED
+            
+            running_time = ""
+            if not task.done():
+                delta = datetime.now() - self.start_times[name]
+                running_time = f"{int(delta.total_seconds() // 3600)}h {int((delta.total_seconds() % 3600) // 60)}m"
+            
+            result[name] = {"status": status, "running_time": running_time}
+        return result
+    
+    def print_status(self) -> None:
+        """打印所有账号状态"""
+        print("\n" + "=" * 60)
+        print(f"📊 账号运行状态 - 单进程模式 ({datetime.now().strftime('%H:%M:%S')})")
+        print("=" * 60)
+        
+        for name, info in self.get_status().items():
+            time_str = f" (运行:{info['running_time']})" if info["running_time"] else ""
+            print(f"  {name}: {info['status']}{time_str}")
+        print()
+    
+    async def _run(self, accounts: List[AccountConfig], monitor_interval: int) -> None:
+        """在一个 Playwright 驱动下调度所有账号"""
+        from playwright.async_api import async_playwright
+        from async_trader import run_account_async
+        
+        async with async_playwright() as playwright:
+            for account in accounts:
+                if not account.enabled:
+                    continue
+                print(f"🚀 启动账号: {account.name} (端口: {account.port})")
+                self.tasks[account.name] = asyncio.create_task(
+                    run_account_async(account.name, playwright),
+                    name=f"AlphaTrader-{account.name}"
+                )
+                self.start_times[account.name] = datetime.now()
+            
+            self.print_status()
+            print(f"📡 开始监控，每 {monitor_interval} 秒刷新状态 (Ctrl+C 停止)")
+            print("-" * 60)
+            
+            try:
+                while not all(task.done() for task in self.tasks.values()):
+                    await asyncio.wait(self.tasks.values(), timeout=monitor_interval)
+                    self.print_status()
+            finally:
+                # 被取消（Ctrl+C）时停止所有账号
+                for task in self.tasks.values():
+                    task.cancel()
+                await asyncio.gather(*self.tasks.values(), return_exceptions=True)
+            
+            print("\n✅ 所有账号已完成运行")
+    
+    def run_all(self, accounts: List[AccountConfig], monitor_interval: int = 60) -> None:
+        """
+        启动并监控所有账号
+        
+        Args:
+            accounts: 要启动的账号列表
+            monitor_interval: 状态监控间隔（秒）
+        """
+        if not accounts:
+            print("❌ 没有启用的账号")
+            return
+        
+        # 异步版只支持逐笔交易，有账号配置了成交量目标/完成时间/流水线时拒绝启动
+        from async_trader import unsupported_settings
+        refused = {}
+        for account in accounts:
+            unsupported = unsupported_settings(build_config_from_account(account))
+            if unsupported:
+                refused[account.name] = unsupported
+        if refused:
+            print("❌ 单进程模式不支持以下账号配置，请去掉 --async 使用进程模式:")
+            for name, unsupported in refused.items():
+                print(f"  {name}: {'、'.join(unsupported)}")
+            return
+        
+        print("\n" + "=" * 60)
+        print(f"🚀 多账号启动器（单进程模式）- 共 {len(accounts)} 个账号")
+        print("=" * 60)
+        
+        try:
+            asyncio.run(self._run(accounts, monitor_interval))
+        except KeyboardInterrupt:
+            print("\n\n📛 用户中断，所有账号已停止")
+
+
 def main():
     """主入口"""
     import argparse
@@ -304,6 +423,7 @@ def main():
         epilog="""
 示例:
   python multi_runner.py              # 启动所有启用的账号
+  python multi_runner.py --async      # 单进程模式运行所有账号
   python multi_runner.py --list       # 列出所有账号
   python multi_runner.py --dry-run    # 预览将要启动的账号
 
@@ -330,6 +450,13 @@ def main():
         help="预览将要启动的账号（不实际启动）"
     )
     
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="单进程模式：所有账号共用一个事件循环和 Playwright 驱动（仅支持逐笔交易）"
+    )
+    
     parser.add_argument(
         "--monitor", "-m",
         type=int,
@@ -337,6 +464,13 @@ def main():
         help="状态监控间隔（秒），默认 60"
     )
     
+    parser.add_argument(
+        "--stagger",
+        type=float,
+        default=0,
+        help="进程模式下账号之间的启动间隔（秒），默认 0"
+    )
+    
     args = parser.parse_args()
     
     # 列出账号
@@ -376,8 +510,10 @@ def main():
         return
     
     # 启动多账号运行器
-    runner = MultiAccountRunner()
-    runner.run_all(accounts, monitor_interval=args.monitor)
+    if args.use_async:
+        AsyncAccountRunner().run_all(accounts, monitor_interval=args.monitor)
+    else:
+        MultiAccountRunner().run_all(accounts, monitor_interval=args.monitor, stagger=args.stagger)
 
 
 if __name__ == "__main__":
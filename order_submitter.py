@@ -0,0 +1,313 @@
+"""
+下单提交模块 - 在页面内一次完成 勾选反向订单 → 填写 → 点击下单 → 确认
+整个流程作为一个页面内 async 例程执行，确认框/滑点框出现即处理，
+只需一次 evaluate 往返，返回结构化结果和各步骤耗时；
+表单未就绪或未出现确认框时由调用方回退到逐步操作
+"""
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List
+
+from browser_manager import _FILL_FORM_JS, FILL_TOLERANCE
+from logger import info, warning
+
+
+class SubmitOutcome:
+    """提交结果"""
+    SUBMITTED = "submitted"                    # 已确认下单，确认框已关闭
+    SLIPPAGE_ACCEPTED = "slippage_accepted"    # 出现滑点提示并已接受（卖出）
+    SLIPPAGE_REJECTED = "slippage_rejected"    # 出现滑点提示并已取消（买入）
+    DIALOG_MISSING = "dialog_missing"          # 已点击下单，但未出现确认框
+    FORM_FAILED = "form_failed"                # 复选框/输入框/按钮缺失或回读不一致，未点击下单
+    ERROR = "error"                            # evaluate 异常（页面跳转等），状态未知
+
+
+@dataclass
+class SubmitResult:
+    """一次提交的结果"""
+    outcome: str
+    step: str = ""                                          # 结束时所在步骤
+    detail: str = ""
+    timings: Dict[str, float] = field(default_factory=dict)  # 各步骤耗时（毫秒）
+    values: List[Optional[str]] = field(default_factory=list)  # 输入框回读值
+    mfa: bool = False                                       # 确认后出现验证器弹窗
+    elapsed_ms: float = 0.0                                 # 含往返的总耗时
+
+    @property
+    def ok(self) -> bool:
+        """订单是否已提交"""
+        return self.outcome in (SubmitOutcome.SUBMITTED, SubmitOutcome.SLIPPAGE_ACCEPTED)
+
+
+# 页面内下单例程：各步骤失败即返回，不会在表单未就绪时点击下单
+_SUBMIT_ORDER_JS = """
+async (args) => {
+    const fillForm = """ + _FILL_FORM_JS + """;
+    const R = window.__alphaSelectors;
+    const find = (target) => {
+        if (!target) return null;
+        const el = (target.key && R && R.has(target.key)) ? R.node(target.key) : document.evaluate(
+            target.xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+        ).singleNodeValue;
+        return el && el.getClientRects().length > 0 ? el : null;
+    };
+    const num = (text) => {
+        const match = String(text).replace(/[\\s,]/g, "").match(/\\d*\\.?\\d+/);
+        return match ? parseFloat(match[0]) : null;
+    };
+    // 条件满足即返回，DOM 变化时重新判断，超时返回 null
+    const waitFor = (check, timeout) => new Promise((resolve) => {
+        const first = check();
+        if (first) return resolve(first);
+        const observer = new MutationObserver(() => {
+            const found = check();
+            if (found) done(found);
+        });
+        const timer = setTimeout(() => done(null), timeout);
+        function done(found) {
+            observer.disconnect();
+            clearTimeout(timer);
+            resolve(found);
+        }
+        observer.observe(document.documentElement, { childList: true, subtree: true, attributes: true });
+    });
+
+    const timings = {};
+    let mark = performance.now();
+    const lap = (name) => {
+        const now = performance.now();
+        timings[name] = now - mark;
+        mark = now;
+    };
+    const result = (outcome, step, detail, extra) => Object.assign(
+        { outcome, step, detail: detail || "", timings, values: [], mfa: false }, extra || {}
+    );
+
+    // 1. 反向订单复选框
+    if (args.checkbox) {
+        const box = document.querySelector(args.checkbox.selector);
+        if (!box) return result("form_failed", "checkbox", "未找到复选框");
+        const isChecked = () => box.classList.contains("checked");
+        if (isChecked() !== args.checkbox.checked) {
+            box.click();
+            if (!await waitFor(() => isChecked() === args.checkbox.checked, 1000)) {
+                return result("form_failed", "checkbox", "复选框状态未改变");
+            }
+        }
+        lap("checkbox");
+    }
+
+    // 2. 填写并回读校验
+    const values = await fillForm(args.fields);
+    for (let i = 0; i < args.fields.length; i++) {
+        const expected = num(args.fields[i].value);
+        const actual = values[i] === null ? null : num(values[i]);
+        const matches = expected === null
+            ? values[i] === args.fields[i].value
+            : actual !== null && Math.abs(actual - expected) <= args.tolerance * Math.abs(expected);
+        if (!matches) {
+            return result("form_failed", "fill", `回读不一致: ${args.fields[i].xpath} = ${values[i]}`, { values });
+        }
+    }
+    lap("fill");
+
+    // 3. 点击下单
+    const button = find(args.submit);
+    if (!button) return result("form_failed", "submit", "未找到下单按钮", { values });
+    if (button.disabled) return result("form_failed", "submit", "下单按钮不可用", { values });
+    button.scrollIntoView({ block: "center", inline: "nearest" });
+    button.click();
+    lap("submit");
+
+    // 4. 等待确认框或滑点框（两者都存在时确认优先）
+    const dialog = await waitFor(() => {
+        const confirm = find(args.confirm);
+        if (confirm) return { kind: "confirm", el: confirm };
+        const slippage = find(args.slippage);
+        return slippage ? { kind: "slippage", el: slippage } : null;
+    }, args.dialogTimeout);
+    lap("dialog");
+    if (!dialog) return result("dialog_missing", "dialog", "未出现确认框", { values });
+
+    dialog.el.click();
+    lap("confirm");
+    if (dialog.kind === "slippage") {
+        return result(args.slippageAccept ? "slippage_accepted" : "slippage_rejected", "confirm", "", { values });
+    }
+
+    // 5. 等待确认框关闭或被替换（如卖出后同位置出现"继续"），出现验证器弹窗时交给 Python 处理
+    const mfa = () => !!(window.__alphaMfa && window.__alphaMfa.visible);
+    await waitFor(() => mfa() || find(args.confirm) !== dialog.el, args.closeTimeout);
+    lap("closed");
+
+    // 6. 成交后的"继续"按钮（可选）
+    if (args.after && !mfa()) {
+        const next = await waitFor(() => find(args.after), args.afterTimeout);
+        if (next) next.click();
+        lap("after");
+    }
+    return result("submitted", "closed", "", { values, mfa: mfa() });
+}
+"""
+
+
+class OrderSubmitter:
+    """
+    页面内下单提交器
+
+    复选框、输入框、按钮都按命名键传入（与 AlphaTrader.XPATH / CSS 同名），
+    选择器注册表已安装时直接命中缓存节点。
+    连续多次未出现确认框（例如页面不响应脚本点击）时自动停用，调用方回退逐步操作。
+    """
+
+    def __init__(
+        self,
+        browser,
+        xpaths: Dict[str, str],
+        css: Dict[str, str],
+        enabled: bool = True,
+        dialog_timeout: float = 1.5,
+        close_timeout: float = 3.0,
+        after_timeout: float = 1.0,
+        tolerance: float = FILL_TOLERANCE,
+        max_dialog_misses: int = 3
+    ):
+        """
+        Args:
+            browser: BrowserManager
+            xpaths: 命名 XPath 表
+            css: 命名 CSS 选择器表（checkbox 键为反向订单复选框）
+            enabled: 是否启用（False 时调用方直接走逐步操作）
+            dialog_timeout: 等待确认框/滑点框的超时（秒）
+            close_timeout: 等待确认框关闭的超时（秒）
+            after_timeout: 等待"继续"按钮的超时（秒）
+            tolerance: 输入框回读允许的相对偏差
+            max_dialog_misses: 连续未出现确认框多少次后停用
+        """
+        self.browser = browser
+        self.xpaths = xpaths
+        self.css = css
+        self.enabled = enabled
+        self.dialog_timeout = dialog_timeout
+        self.close_timeout = close_timeout
+        self.after_timeout = after_timeout
+        self.tolerance = tolerance
+        self.max_dialog_misses = max_dialog_misses
+        self.dialog_misses: int = 0
+        self.outcomes: Dict[str, int] = {}
+
+    def _target(self, key: Optional[str]) -> Optional[Dict[str, str]]:
+        return {"xpath": self.xpaths[key], "key": key} if key else None
+
+    def submit(
+        self,
+        fields: Dict[str, Any],
+        button: str,
+        reverse: Optional[bool],
+        slippage: str,
+        slippage_accept: bool,
+        after: Optional[str] = None
+    ) -> SubmitResult:
+        """
+        执行一次页面内下单
+
+        Args:
+            fields: {输入框键: 值}，按顺序填写
+            button: 下单按钮键
+            reverse: 反向订单复选框目标状态（None 不操作）
+            slippage: 滑点框中要点击的按钮键
+            slippage_accept: 点击该按钮是否表示接受滑点
+            after: 确认后要点击的"继续"按钮键（可选）
+
+        Returns:
+            SubmitResult
+        """
+        args = {
+            "checkbox": {"selector": self.css["checkbox"], "checked": reverse} if reverse is not None else None,
+            "fields": [
+                {"xpath": self.xpaths[key], "key": key, "value": str(value)}
+                for key, value in fields.items()
+            ],
+            "tolerance": self.tolerance,
+            "submit": self._target(button),
+            "confirm": self._target("confirm_button"),
+            "slippage": self._target(slippage),
+            "slippageAccept": slippage_accept,
+            "after": self._target(after),
+            "dialogTimeout": self.dialog_timeout * 1000,
+            "closeTimeout": self.close_timeout * 1000,
+            "afterTimeout": self.after_timeout * 1000,
+        }
+
+        start = time.time()
+        try:
+            raw = self.browser.page.evaluate(_SUBMIT_ORDER_JS, args)
+            result = SubmitResult(
+                outcome=raw["outcome"],
+                step=raw["step"],
+                detail=raw["detail"],
+                timings={name: round(ms, 1) for name, ms in raw["timings"].items()},
+                values=raw["values"],
+                mfa=raw["mfa"],
+            )
+        except Exception as e:
+            result = SubmitResult(outcome=SubmitOutcome.ERROR, detail=str(e))
+        result.elapsed_ms = (time.time() - start) * 1000
+
+        self._record(result)
+        if result.mfa:
+            self.browser.check_verification()
+        return result
+
+    def _record(self, result: SubmitResult) -> None:
+        """记录结果、耗时，并在连续未出现确认框时停用"""
+        self.outcomes[result.outcome] = self.outcomes.get(result.outcome, 0) + 1
+        self.browser.latency.record(f"submit_{result.outcome}", result.elapsed_ms)
+
+        steps = " / ".join(f"{name} {ms:.0f}ms" for name, ms in result.timings.items())
+        if result.ok:
+            info(f"页面内下单完成: {result.elapsed_ms:.0f}ms ({steps})")
+        else:
+            warning(f"页面内下单未完成 [{result.outcome}@{result.step}] {result.detail} ({steps})")
+
+        if result.outcome == SubmitOutcome.DIALOG_MISSING:
+            self.dialog_misses += 1
+            if self.dialog_misses >= self.max_dialog_misses:
+                self.enabled = False
+                warning(f"页面内下单连续 {self.dialog_misses} 次未出现确认框，改用逐步操作")
+        elif result.ok:
+            self.dialog_misses = 0
+
+    def submit_buy(self, price: float, total: float, reverse_sell_price: float) -> SubmitResult:
+        """
+        限价买入并挂反向卖单（滑点过大时取消）
+
+        Args:
+            price: 买入价
+            total: 成交额
+            reverse_sell_price: 反向卖单价格
+        """
+        return self.submit(
+            {"limit_price": price, "limit_total_buy": total, "limit_total_sell": reverse_sell_price},
+            button="buy_button",
+            reverse=True,
+            slippage="cancel_slippage",
+            slippage_accept=False,
+        )
+
+    def submit_sell(self, price: float, amount: float) -> SubmitResult:
+        """
+        限价卖出（不挂反向单，滑点提示直接接受）
+
+        Args:
+            price: 卖出价
+            amount: 卖出数量
+        """
+        return self.submit(
+            {"limit_price": price, "limit_amount": amount},
+            button="sell_button",
+            reverse=False,
+            slippage="confirm_slippage",
+            slippage_accept=True,
+            after="continue_button",
+        )
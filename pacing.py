@@ -0,0 +1,153 @@
+"""
+节奏控制模块 - 按目标完成时间计算两轮交易之间的间隔
+根据实测单轮耗时和成交率估算剩余工作量：落后于目标时间不休眠，
+领先时把剩余余量平摊到剩余各轮；未设置目标时间时保持 min_interval ~ max_interval 随机休眠
+"""
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional, Callable
+
+
+# 单次间隔上限（秒）：领先很多时也按此上限分段休眠，每轮重新计算
+PACING_MAX_DELAY = 600.0
+# 间隔随机抖动幅度（±20%），避免固定节奏
+PACING_JITTER = 0.2
+# 单轮耗时的指数平滑系数
+PACING_SMOOTHING = 0.3
+# 成交率下限，避免极少样本时剩余轮数被估算为无穷大
+MIN_FILL_RATE = 0.05
+
+
+def _clock(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp).strftime("%H:%M:%S")
+
+
+@dataclass
+class PacingDecision:
+    """一次间隔计算结果"""
+    delay: float                        # 本次休眠秒数
+    eta: Optional[float] = None         # 预计完成时间戳
+    slack: Optional[float] = None       # 不休眠时完成后距目标时间的余量（秒，负数为落后）
+    finish_at: Optional[float] = None   # 目标完成时间戳
+
+    def describe(self) -> str:
+        """单行描述，如 预计 18:20:05 完成（目标 18:30:00，余量 +612s），间隔 21.4s"""
+        parts = []
+        if self.eta:
+            parts.append(f"预计 {_clock(self.eta)} 完成")
+        if self.finish_at:
+            parts.append(f"（目标 {_clock(self.finish_at)}，余量 {self.slack:+.0f}s）")
+        text = "".join(parts) or "预计完成时间未知"
+        if self.slack is not None and self.slack <= 0:
+            return f"{text}，落后于目标，不休眠"
+        return f"{text}，间隔 {self.delay:.1f}s"
+
+
+class PacingController:
+    """
+    交易节奏控制器
+
+    每轮结束调用 observe() 记录本轮耗时（不含休眠）和是否成交，
+    再用 next_delay(剩余笔数) 取得休眠时间：
+        剩余轮数 = 剩余笔数 / 成交率
+        余量 = 目标时间 - 现在 - 剩余轮数 × 单轮耗时
+        间隔 = 余量 / 剩余轮数（余量 <= 0 时为 0，上限 PACING_MAX_DELAY）
+    """
+
+    def __init__(self, finish_at: Optional[float], min_interval: float = 5, max_interval: float = 10):
+        """
+        Args:
+            finish_at: 目标完成时间戳（None 时使用随机间隔）
+            min_interval: 随机间隔下限（秒）
+            max_interval: 随机间隔上限（秒）
+        """
+        self.finish_at = finish_at
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.cycle_seconds: Optional[float] = None
+        self.cycles: int = 0
+        self.fills: int = 0
+        self.slept: float = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.finish_at is not None
+
+    @property
+    def fill_rate(self) -> float:
+        """成交率（完成交易的轮数 / 总轮数）"""
+        if self.cycles == 0:
+            return 1.0
+        return max(MIN_FILL_RATE, self.fills / self.cycles)
+
+    def observe(self, duration: float, filled: bool) -> None:
+        """
+        记录一轮交易
+
+        Args:
+            duration: 本轮耗时（秒，不含休眠）
+            filled: 本轮是否完成交易（流水线模式下为反向卖单已挂出）
+        """
+        self.cycles += 1
+        self.fills += int(filled)
+        if self.cycle_seconds is None:
+            self.cycle_seconds = duration
+        else:
+            self.cycle_seconds += PACING_SMOOTHING * (duration - self.cycle_seconds)
+
+    def next_delay(self, trades_left: int, now: Optional[float] = None) -> PacingDecision:
+        """
+        计算下一次休眠时间并预计完成时间
+
+        Args:
+            trades_left: 剩余笔数
+            now: 当前时间戳
+
+        Returns:
+            PacingDecision
+        """
+        now = now or time.time()
+        if trades_left <= 0:
+            return PacingDecision(0.0, now, None, self.finish_at)
+
+        rounds = trades_left / self.fill_rate
+        active = rounds * (self.cycle_seconds or 0)
+        if not self.enabled:
+            delay = random.uniform(self.min_interval, self.max_interval)
+            mean_delay = (self.min_interval + self.max_interval) / 2
+            eta = now + active + delay + max(0.0, rounds - 1) * mean_delay if self.cycle_seconds else None
+            return PacingDecision(delay, eta)
+
+        slack = self.finish_at - now - active
+        if slack <= 0:
+            return PacingDecision(0.0, now + active if self.cycle_seconds else None, slack, self.finish_at)
+        base = min(PACING_MAX_DELAY, slack / rounds)
+        delay = base * random.uniform(1 - PACING_JITTER, 1 + PACING_JITTER)
+        eta = now + active + base * rounds if self.cycle_seconds else None
+        return PacingDecision(delay, eta, slack, self.finish_at)
+
+    def wait(self, decision: PacingDecision, sleep: Callable[[float], None] = time.sleep) -> float:
+        """
+        执行 next_delay() 给出的休眠并计入累计休眠时间
+
+        Args:
+            decision: next_delay() 的结果
+            sleep: 休眠函数（流水线模式传入休眠期间跟踪在途订单的函数）
+
+        Returns:
+            实际休眠秒数
+        """
+        if decision.delay <= 0:
+            return 0.0
+        start = time.time()
+        sleep(decision.delay)
+        slept = time.time() - start
+        self.slept += slept
+        return slept
+
+    def summary(self) -> str:
+        """节奏统计"""
+        cycle = f"{self.cycle_seconds:.1f}s" if self.cycle_seconds is not None else "-"
+        return f"节奏: 单轮耗时 {cycle}，成交率 {self.fill_rate * 100:.0f}%，累计休眠 {self.slept:.0f}s"
@@ -0,0 +1,138 @@
+"""
+页面健康监控模块 - 按渲染进程内存与 DOM 增长决定何时刷新页面
+每轮循环采样一次 CDP Performance.getMetrics（JS 堆、DOM 节点、事件监听器），
+超过绝对阈值或持续增长斜率过大时才刷新，取代固定每 N 轮刷新
+"""
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional, Dict, Deque, List, Tuple
+
+
+# 增长斜率：至少覆盖这么长时间、这么多样本才计算（秒 / 个）
+HEALTH_SLOPE_MIN_SPAN = 120.0
+HEALTH_SLOPE_MIN_SAMPLES = 8
+# 斜率计算使用的最近样本数
+HEALTH_WINDOW = 30
+
+
+class RefreshMode:
+    """页面刷新策略"""
+    HEALTH = "health"        # 按页面健康指标刷新
+    INTERVAL = "interval"    # 每 refresh_interval 轮刷新（原实现）
+
+
+@dataclass
+class HealthThresholds:
+    """触发刷新的阈值"""
+    max_heap_mb: float = 400.0             # JS 堆占用上限（MB）
+    max_nodes: int = 100000                # DOM 节点上限
+    max_listeners: int = 50000             # 事件监听器上限
+    max_heap_slope: float = 4.0            # JS 堆持续增长上限（MB/分钟）
+    max_nodes_slope: float = 2000.0        # DOM 节点持续增长上限（个/分钟）
+    min_refresh_gap: float = 120.0         # 两次健康刷新的最小间隔（秒），避免指标抖动时反复刷新
+    max_page_age: float = 1800.0           # 页面最长存活时间（秒，0 不限制），兜底刷新
+
+
+@dataclass
+class HealthSample:
+    """一次采样"""
+    at: float
+    heap_mb: float
+    nodes: int
+    listeners: int
+
+
+def _slope_per_minute(points: List[Tuple[float, float]]) -> float:
+    """最小二乘斜率（每分钟）"""
+    n = len(points)
+    mean_t = sum(t for t, _ in points) / n
+    mean_v = sum(v for _, v in points) / n
+    var = sum((t - mean_t) ** 2 for t, _ in points)
+    if var == 0:
+        return 0.0
+    cov = sum((t - mean_t) * (v - mean_v) for t, v in points)
+    return cov / var * 60
+
+
+class PageHealthMonitor:
+    """
+    页面健康监控
+
+    observe() 接收一次 Performance.getMetrics 结果并判断是否需要刷新，
+    指标获取由 BrowserManager / AsyncBrowserManager.performance_metrics() 负责，
+    同步与异步版本共用同一套判断。
+    """
+
+    def __init__(self, thresholds: Optional[HealthThresholds] = None):
+        """
+        Args:
+            thresholds: 刷新阈值（None 使用默认值）
+        """
+        self.thresholds = thresholds or HealthThresholds()
+        self.samples: Deque[HealthSample] = deque(maxlen=HEALTH_WINDOW)
+        self.page_loaded_at: float = time.time()
+        self.last_refresh_at: float = 0.0
+        self.refreshes: Dict[str, int] = {}
+        self.peak: Optional[HealthSample] = None
+
+    def observe(self, metrics: Optional[Dict[str, float]]) -> Optional[str]:
+        """
+        记录一次采样并判断是否需要刷新
+
+        Args:
+            metrics: {指标名: 值}（Performance.getMetrics），采样失败时为 None
+
+        Returns:
+            需要刷新时返回原因，否则返回 None
+        """
+        now = time.time()
+        limits = self.thresholds
+        if limits.max_page_age and now - self.page_loaded_at >= limits.max_page_age:
+            return self._trigger("age", f"页面已运行 {(now - self.page_loaded_at) / 60:.0f} 分钟")
+        if not metrics:
+            return None
+
+        sample = HealthSample(
+            at=now,
+            heap_mb=metrics.get("JSHeapUsedSize", 0) / 1024 / 1024,
+            nodes=int(metrics.get("Nodes", 0)),
+            listeners=int(metrics.get("JSEventListeners", 0)),
+        )
+        self.samples.append(sample)
+        if self.peak is None or sample.heap_mb > self.peak.heap_mb:
+            self.peak = sample
+
+        if now - self.last_refresh_at < limits.min_refresh_gap:
+            return None
+        if sample.heap_mb > limits.max_heap_mb:
+            return self._trigger("heap", f"JS 堆 {sample.heap_mb:.0f}MB > {limits.max_heap_mb:.0f}MB")
+        if sample.nodes > limits.max_nodes:
+            return self._trigger("nodes", f"DOM 节点 {sample.nodes} > {limits.max_nodes}")
+        if sample.listeners > limits.max_listeners:
+            return self._trigger("listeners", f"事件监听器 {sample.listeners} > {limits.max_listeners}")
+
+        span = self.samples[-1].at - self.samples[0].at
+        if len(self.samples) >= HEALTH_SLOPE_MIN_SAMPLES and span >= HEALTH_SLOPE_MIN_SPAN:
+            heap_slope = _slope_per_minute([(s.at, s.heap_mb) for s in self.samples])
+            if heap_slope > limits.max_heap_slope:
+                return self._trigger("heap_slope", f"JS 堆持续增长 {heap_slope:.1f}MB/分钟")
+            nodes_slope = _slope_per_minute([(s.at, s.nodes) for s in self.samples])
+            if nodes_slope > limits.max_nodes_slope:
+                return self._trigger("nodes_slope", f"DOM 节点持续增长 {nodes_slope:.0f}/分钟")
+        return None
+
+    def _trigger(self, kind: str, reason: str) -> str:
+        self.refreshes[kind] = self.refreshes.get(kind, 0) + 1
+        return reason
+
+    def reset(self) -> None:
+        """页面刷新后调用：清空样本，重新计时"""
+        self.samples.clear()
+        self.page_loaded_at = self.last_refresh_at = time.time()
+
+    def summary(self) -> str:
+        """刷新原因与峰值汇总"""
+        reasons = ", ".join(f"{kind} {count}" for kind, count in self.refreshes.items()) or "无"
+        peak = f"，JS 堆峰值 {self.peak.heap_mb:.0f}MB / DOM {self.peak.nodes}" if self.peak else ""
+        return f"健康刷新: {reasons}{peak}"
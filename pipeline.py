@@ -0,0 +1,206 @@
+"""
+流水线交易模块 - 同时保留多笔在途的反向卖单
+上一笔的反向卖单仍在挂单时就提交下一笔 买入+反向卖单，
+按当前委托表逐单跟踪每笔反向卖单是否成交；在途笔数和占用资金受 max_inflight / capital_budget 限制
+"""
+from collections import Counter
+from typing import List, Iterable, Tuple
+
+from account_state import OpenOrder
+from trade_cycle import TradeCycle
+
+
+# 委托价与计算的反向卖价允许的最大相对偏差（页面按最小价格单位取整）
+REVERSE_PRICE_TOLERANCE = 0.001
+# 进入在途后这么久仍未在委托表中出现，视为反向卖单已立即成交（秒）
+REVERSE_APPEAR_GRACE = 5.0
+
+
+def _price_matches(order_price: float, target: float) -> bool:
+    """委托价是否与反向卖价一致（任一方未知时视为一致）"""
+    if order_price <= 0 or target <= 0:
+        return True
+    return abs(order_price - target) <= REVERSE_PRICE_TOLERANCE * target
+
+
+def _order_key(order: OpenOrder) -> str:
+    """委托的身份标识：有订单号按订单号，否则按 方向@价格（部分成交后数量会变）"""
+    return order.order_id or f"{order.side}@{order.price}"
+
+
+def order_keys(orders: Iterable[OpenOrder]) -> Counter:
+    """委托表的身份标识计数（提交前记录，之后用 new_orders 认出新出现的委托）"""
+    return Counter(_order_key(order) for order in orders)
+
+
+def new_orders(orders: Iterable[OpenOrder], known: Counter) -> List[OpenOrder]:
+    """委托表中不在 known 内的委托（同价同向的多行按数量扣减）"""
+    left = Counter(known)
+    fresh = []
+    for order in orders:
+        key = _order_key(order)
+        if left[key] > 0:
+            left[key] -= 1
+        else:
+            fresh.append(order)
+    return fresh
+
+
+def split_new_orders(
+    fresh: Iterable[OpenOrder],
+    buy_price: float,
+    reverse_price: float
+) -> Tuple[List[OpenOrder], List[OpenOrder]]:
+    """
+    把提交后新出现的委托分为本笔的买单和反向卖单
+
+    方向未知的行按价格更接近的一方归类；价格与反向卖价不符的卖单不属于本笔
+
+    Returns:
+        (买单列表, 反向卖单列表)
+    """
+    buys, reverses = [], []
+    for order in fresh:
+        side = order.side
+        if not side and order.price > 0:
+            side = "BUY" if abs(order.price - buy_price) < abs(order.price - reverse_price) else "SELL"
+        if side == "BUY":
+            buys.append(order)
+        elif _price_matches(order.price, reverse_price):
+            reverses.append(order)
+    return buys, reverses
+
+
+class InflightBook:
+    """
+    在途反向卖单簿
+
+    每笔在途交易是一个停在 REVERSE_PENDING 的 TradeCycle，data 中:
+        reverse_price     计算的反向卖价
+        reverse_order_id  在委托表中认领到的订单号（委托表带订单号时）
+        reverse_seen      是否已在委托表中见到过
+    match() 用最新委托表认领订单：已绑定订单号的按订单号跟踪，
+    其余按价格最接近的原则一一认领，委托表中不再有对应订单的即为成交。
+    """
+
+    def __init__(self, max_inflight: int, cost: float, capital_budget: float = 0):
+        """
+        Args:
+            max_inflight: 最多在途笔数
+            cost: 每笔成交额
+            capital_budget: 在途占用资金上限（0 表示 cost * max_inflight）
+        """
+        self.max_inflight = max(1, max_inflight)
+        self.cost = cost
+        # 预算至少够一笔，否则流水线永远无法开仓
+        self.capital_budget = max(capital_budget or cost * self.max_inflight, cost)
+        self.cycles: List[TradeCycle] = []
+        self.fill_seq: int = 0          # 已处理到的订单推送序号
+        self.untracked: int = 0         # 最近一次委托表中无人认领的卖单数
+        self.peak: int = 0
+        self.settled: int = 0
+        self.flushed: int = 0
+
+    def __len__(self) -> int:
+        return len(self.cycles)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_inflight > 1
+
+    @property
+    def committed(self) -> float:
+        """在途占用资金"""
+        return sum(cycle.data.get("cost", self.cost) for cycle in self.cycles)
+
+    def can_open(self) -> bool:
+        """是否还能再开一笔（笔数和资金预算都有余量）"""
+        return len(self.cycles) < self.max_inflight and self.committed + self.cost <= self.capital_budget + 1e-9
+
+    def add(self, cycle: TradeCycle) -> None:
+        """登记一笔进入 REVERSE_PENDING 的交易"""
+        self.cycles.append(cycle)
+        self.peak = max(self.peak, len(self.cycles))
+
+    def expired(self) -> List[TradeCycle]:
+        """已超过 reverse_order_timeout 的在途交易"""
+        return [cycle for cycle in self.cycles if cycle.expired]
+
+    def remaining(self, cap: float) -> float:
+        """距最早一笔在途交易超时的秒数（不超过 cap）"""
+        return min((cycle.remaining(cap) for cycle in self.cycles), default=cap)
+
+    def take_expired(self) -> List[TradeCycle]:
+        """取出已超时的在途交易（逐笔清仓时使用，其余在途交易留在簿中）"""
+        expired = self.expired()
+        for cycle in expired:
+            self.cycles.remove(cycle)
+        self.flushed += len(expired)
+        return expired
+
+    def match(self, orders: List[OpenOrder], filled_ids: Iterable[str] = ()) -> List[TradeCycle]:
+        """
+        用最新委托表更新在途交易，取出反向卖单已成交的交易
+
+        Args:
+            orders: 当前委托（接口缓存或页面委托表，方向未知的行按卖单处理）
+            filled_ids: 订单推送中已完全成交的卖单订单号
+
+        Returns:
+            已成交的交易（已从簿中移除，仍停在 REVERSE_PENDING，由调用方迁移）
+        """
+        filled_ids = set(filled_ids)
+        sells = [order for order in orders if order.side in ("SELL", "")]
+        # 页面委托表可能不带订单号：此时不能按订单号判断"已消失"，全部按价格认领
+        by_id = {order.order_id: order for order in sells if order.order_id}
+        free = list(sells)
+        filled: List[TradeCycle] = []
+        unbound: List[TradeCycle] = []
+
+        for cycle in self.cycles:
+            order_id = cycle.data.get("reverse_order_id")
+            if order_id and order_id in filled_ids:
+                filled.append(cycle)
+            elif order_id and by_id:
+                if order_id in by_id:
+                    free.remove(by_id[order_id])
+                else:
+                    filled.append(cycle)
+            else:
+                unbound.append(cycle)
+
+        # 价格最接近的 (交易, 订单) 优先配对
+        pairs = sorted(
+            (abs(order.price - cycle.data.get("reverse_price", 0)), i, j)
+            for i, cycle in enumerate(unbound)
+            for j, order in enumerate(free)
+            if _price_matches(order.price, cycle.data.get("reverse_price", 0))
+        )
+        claimed_cycles, claimed_orders = set(), set()
+        for _, i, j in pairs:
+            if i in claimed_cycles or j in claimed_orders:
+                continue
+            claimed_cycles.add(i)
+            claimed_orders.add(j)
+            unbound[i].data["reverse_seen"] = True
+            if free[j].order_id:
+                unbound[i].data["reverse_order_id"] = free[j].order_id
+
+        for i, cycle in enumerate(unbound):
+            if i in claimed_cycles:
+                continue
+            if cycle.data.get("reverse_seen") or cycle.dwell >= REVERSE_APPEAR_GRACE:
+                filled.append(cycle)
+        self.untracked = len(free) - len(claimed_orders)
+
+        for cycle in filled:
+            self.cycles.remove(cycle)
+        self.settled += len(filled)
+        return filled
+
+    def summary(self) -> str:
+        """在途统计"""
+        return (
+            f"流水线: 最多在途 {self.peak}/{self.max_inflight} 笔，逐单成交 {self.settled} 笔，"
+            f"超时清仓 {self.flushed} 笔"
+        )
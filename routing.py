@@ -0,0 +1,235 @@
+"""
+请求路由模块 - 在交易页面内拦截与交易无关的重资源
+按资源类型（图片、字体、媒体）和 URL 通配拦截营销组件、统计埋点等请求，
+并按规则统计拦截的请求数（字节数只在 dry_run 统计模式下可得）
+
+两种拦截方式:
+    cdp   - Network.setBlockedURLs，由浏览器直接拦截，不经过 Python（默认）。
+            同步版 Playwright 只在 API 调用期间分发回调，交易循环 sleep 时
+            page.route 的处理函数得不到执行，页面请求会被挂起，因此默认不用 route
+    route - page.route 逐个请求判断，可精确按资源类型拦截，适合持续有 Playwright 调用的场景
+"""
+import fnmatch
+from dataclasses import dataclass
+from typing import Optional, Dict, List, Tuple, Union
+
+from logger import info, warning
+
+
+class RoutingEngine:
+    """拦截方式"""
+    CDP = "cdp"
+    ROUTE = "route"
+
+
+# CDP 模式无法按资源类型拦截，按扩展名近似
+TYPE_URL_PATTERNS: Dict[str, Tuple[str, ...]] = {
+    "image": ("*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*", "*.avif*"),
+    "font": ("*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*"),
+    "media": ("*.mp4*", "*.webm*", "*.mp3*", "*.m3u8*", "*.ogg*"),
+}
+
+# 统计埋点
+ANALYTICS_PATTERNS = (
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*connect.facebook.net*",
+    "*hotjar.com*",
+    "*sentry.io*",
+    "*/analytics/*",
+    "*/beacon*",
+)
+
+# 营销/客服组件
+MARKETING_PATTERNS = (
+    "*intercom*",
+    "*zendesk*",
+    "*livechat*",
+    "*/marketing/*",
+    "*/banner/*",
+)
+
+
+@dataclass
+class RoutingProfile:
+    """路由配置"""
+    name: str
+    block_types: Tuple[str, ...] = ()       # 拦截的资源类型（request.resource_type）
+    block_patterns: Tuple[str, ...] = ()    # 拦截的 URL 通配（* 匹配任意字符）
+    allow_patterns: Tuple[str, ...] = ()    # 始终放行的 URL 通配（仅 route 模式生效）
+    engine: str = RoutingEngine.CDP
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.block_types or self.block_patterns)
+
+    def url_patterns(self) -> List[str]:
+        """CDP 模式下的全部拦截通配（资源类型按扩展名展开）"""
+        patterns = [p for t in self.block_types for p in TYPE_URL_PATTERNS.get(t, ())]
+        return patterns + list(self.block_patterns)
+
+    def match(self, url: str, resource_type: str = "") -> Optional[str]:
+        """
+        判断请求是否应拦截
+
+        Args:
+            url: 请求 URL
+            resource_type: 资源类型（未知时按扩展名匹配）
+
+        Returns:
+            命中的规则名（"type:image" 或 URL 通配），不拦截返回 None
+        """
+        if any(fnmatch.fnmatchcase(url, p) for p in self.allow_patterns):
+            return None
+        for t in self.block_types:
+            if resource_type == t:
+                return f"type:{t}"
+            if not resource_type and any(fnmatch.fnmatchcase(url, p) for p in TYPE_URL_PATTERNS.get(t, ())):
+                return f"type:{t}"
+        for pattern in self.block_patterns:
+            if fnmatch.fnmatchcase(url, pattern):
+                return pattern
+        return None
+
+
+# 预置配置
+PROFILES: Dict[str, RoutingProfile] = {
+    "off": RoutingProfile("off"),
+    "lite": RoutingProfile(
+        "lite",
+        block_types=("image", "media", "font"),
+        block_patterns=ANALYTICS_PATTERNS,
+    ),
+    "strict": RoutingProfile(
+        "strict",
+        block_types=("image", "media", "font"),
+        block_patterns=ANALYTICS_PATTERNS + MARKETING_PATTERNS,
+    ),
+}
+
+
+def get_profile(profile: Union[str, RoutingProfile, None]) -> RoutingProfile:
+    """
+    按名称获取预置配置
+
+    Args:
+        profile: 配置名（off/lite/strict）、RoutingProfile 或 None
+
+    Returns:
+        RoutingProfile（未知名称返回 off）
+    """
+    if isinstance(profile, RoutingProfile):
+        return profile
+    if profile and profile not in PROFILES:
+        warning(f"未知路由配置 {profile}，不拦截任何请求")
+    return PROFILES.get(profile or "off", PROFILES["off"])
+
+
+class RequestRouter:
+    """
+    页面请求拦截器
+
+    stats 按规则记录 {"requests": 请求数, "bytes": 字节数}。
+    被拦截的请求在发出前就失败，既没有响应也没有 Content-Length，拦截模式下无法得知省下的字节数，
+    因此只统计请求数（bytes 恒为 0，summary 不显示）；
+    要评估拦截能省下多少流量，用 dry_run 模式：不做拦截，统计"将被拦截"的请求和其真实响应大小。
+    """
+
+    def __init__(self, page, profile: Union[str, RoutingProfile], dry_run: bool = False):
+        """
+        Args:
+            page: Playwright Page
+            profile: 路由配置或预置名称
+            dry_run: 只统计不拦截
+        """
+        self.page = page
+        self.profile = get_profile(profile)
+        self.dry_run = dry_run
+        self.stats: Dict[str, Dict[str, int]] = {}
+        self.attached: bool = False
+        self._session = None
+
+    def attach(self) -> bool:
+        """安装拦截规则"""
+        if not self.profile.enabled:
+            return False
+        try:
+            if self.dry_run:
+                self.page.on("request", self._on_request)
+                self.page.on("response", self._on_response)
+            elif self.profile.engine == RoutingEngine.ROUTE:
+                self.page.route("**/*", self._handle)
+            else:
+                self._session = self.page.context.new_cdp_session(self.page)
+                self._session.send("Network.enable")
+                self._session.send("Network.setBlockedURLs", {"urls": self.profile.url_patterns()})
+                self.page.on("requestfailed", self._on_failed)
+            self.attached = True
+            mode = "统计" if self.dry_run else self.profile.engine
+            info(f"请求路由已启用: {self.profile.name} ({mode})")
+            return True
+        except Exception as e:
+            warning(f"安装请求路由失败: {e}")
+            return False
+
+    def _count(self, rule: str) -> None:
+        self.stats.setdefault(rule, {"requests": 0, "bytes": 0})["requests"] += 1
+
+    def _handle(self, route, request) -> None:
+        """page.route 回调"""
+        rule = self.profile.match(request.url, request.resource_type)
+        if rule is None:
+            route.fallback()
+            return
+        self._count(rule)
+        route.abort("blockedbyclient")
+
+    def _on_failed(self, request) -> None:
+        """CDP 模式：被浏览器拦截的请求以 ERR_BLOCKED_BY_CLIENT 失败"""
+        if "BLOCKED_BY_CLIENT" not in (request.failure or ""):
+            return
+        self._count(self.profile.match(request.url) or "other")
+
+    def _on_request(self, request) -> None:
+        """dry_run：记录将被拦截的请求"""
+        rule = self.profile.match(request.url, request.resource_type)
+        if rule:
+            self._count(rule)
+
+    def _on_response(self, response) -> None:
+        """dry_run：累计将被拦截的请求的真实响应大小（Content-Length）"""
+        try:
+            size = int(response.headers.get("content-length", 0))
+        except ValueError:
+            return
+        rule = self.profile.match(response.url, response.request.resource_type)
+        if rule and size:
+            self.stats.setdefault(rule, {"requests": 0, "bytes": 0})["bytes"] += size
+
+    @property
+    def blocked_requests(self) -> int:
+        return sum(row["requests"] for row in self.stats.values())
+
+    @property
+    def dry_run_bytes(self) -> int:
+        """dry_run 模式下将被拦截的响应字节数（拦截模式下无法得知，恒为 0）"""
+        return sum(row["bytes"] for row in self.stats.values())
+
+    def summary(self) -> str:
+        """按规则汇总（拦截数降序，dry_run 时附带真实字节数）"""
+        rows = sorted(self.stats.items(), key=lambda item: -item[1]["requests"])
+        if self.dry_run:
+            return ", ".join(f"{rule} {row['requests']} 次/{row['bytes'] / 1024:.0f}KB" for rule, row in rows)
+        return ", ".join(f"{rule} {row['requests']} 次" for rule, row in rows)
+
+    def detach(self) -> None:
+        """移除拦截规则"""
+        try:
+            if self._session:
+                self._session.send("Network.setBlockedURLs", {"urls": []})
+            elif self.attached and not self.dry_run and self.profile.engine == RoutingEngine.ROUTE:
+                self.page.unroute("**/*", self._handle)
+        except Exception:
+            pass
+        self.attached = False
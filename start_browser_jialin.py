@@ -33,7 +33,7 @@ def main():
             port=port,
             chrome_path=chrome_path,
             user_data_dir=user_data_dir,
-            wait_seconds=5
+            timeout=30
         )
         
         if result:
@@ -0,0 +1,129 @@
+"""
+account_state 测试 - 资产/当前委托接口响应解析和账户状态缓存的版本、交易对过滤
+
+运行: python -m pytest -q tests
+"""
+import pytest
+
+from account_state import AccountStateCache, OpenOrder, parse_balances, parse_open_orders
+
+
+BALANCES = {
+    "code": "000000",
+    "data": [
+        {"asset": "usdt", "free": "1,234.5", "locked": "0"},
+        {"asset": "ALPHA_175", "free": "12.5"},
+        {"asset": "BNB", "free": None},
+    ],
+}
+
+ORDERS = {
+    "code": "000000",
+    "data": {
+        "total": 3,
+        "rows": [
+            {"orderId": 11, "symbol": "ALPHA_175USDT", "side": "buy", "price": "0.0153", "origQty": "6500"},
+            {"id": "12", "symbol": "ALPHA_175USDT", "side": "SELL", "price": "0.0154", "quantity": "6500"},
+            {"orderId": 13, "symbol": "ALPHA_9USDT", "side": "SELL", "price": "1.2", "origQty": "10"},
+        ],
+    },
+}
+
+
+# ============================================
+# 响应解析
+# ============================================
+
+def test_parse_balances():
+    assert parse_balances(BALANCES) == {"USDT": pytest.approx(1234.5), "ALPHA_175": pytest.approx(12.5)}
+
+
+@pytest.mark.parametrize("payload, expected", [
+    ({"data": []}, {}),
+    ({"data": {"balances": [{"coin": "USDT", "available": 3}]}}, {"USDT": 3.0}),
+    ({"data": [{"name": "x"}]}, None),
+    ({"data": {"config": True}}, None),
+    ("not json", None),
+])
+def test_parse_balances_shapes(payload, expected):
+    assert parse_balances(payload) == expected
+
+
+def test_parse_open_orders():
+    orders = parse_open_orders(ORDERS)
+    assert [(o.order_id, o.symbol, o.side) for o in orders] == [
+        ("11", "ALPHA_175USDT", "BUY"),
+        ("12", "ALPHA_175USDT", "SELL"),
+        ("13", "ALPHA_9USDT", "SELL"),
+    ]
+    assert orders[0].price == pytest.approx(0.0153)
+    assert orders[1].quantity == pytest.approx(6500)
+
+
+@pytest.mark.parametrize("payload, expected", [
+    ({"data": []}, []),
+    ({"data": [{"symbol": "X", "price": 1}]}, None),
+    ({"data": None}, None),
+])
+def test_parse_open_orders_shapes(payload, expected):
+    assert parse_open_orders(payload) == expected
+
+
+# ============================================
+# AccountStateCache
+# ============================================
+
+def test_symbol_inferred_from_single_pair():
+    cache = AccountStateCache(page=None)
+    cache.ingest("/open-orders", {"data": ORDERS["data"]["rows"][:2]})
+    assert (cache.symbol, cache.base_asset) == ("ALPHA_175USDT", "ALPHA_175")
+
+    # 多个交易对时无法判断
+    other = AccountStateCache(page=None)
+    other.ingest("/open-orders", ORDERS)
+    assert other.symbol is None
+
+
+def test_open_orders_scoped_to_symbol():
+    cache = AccountStateCache(page=None, symbol="alpha_175usdt")
+    assert cache.ingest("/bapi/asset/v1/private/open-orders", ORDERS)
+    assert [order.order_id for order in cache.open_orders()] == ["11", "12"]
+
+
+def test_versions_and_holding():
+    cache = AccountStateCache(page=None, symbol="ALPHA_175USDT")
+    before = cache.version
+    assert cache.quote_balance(before) is None
+
+    cache.ingest("/bapi/asset/v3/private/asset-balance", BALANCES, is_orders=False)
+    assert cache.quote_balance(before) == pytest.approx(1234.5)
+    assert cache.holding(before) == pytest.approx(12.5)
+    # 只接受晚于 since_version 的数据
+    assert cache.holding(cache.version) is None
+    assert cache.open_orders(before) is None
+
+    # 部分资产响应合并而不是覆盖
+    cache.ingest("/balance", {"data": [{"asset": "USDT", "free": "99"}]}, is_orders=False)
+    assert cache.quote_balance() == pytest.approx(99)
+    assert cache.holding() == pytest.approx(12.5)
+
+
+def test_holding_unknown_when_asset_absent():
+    cache = AccountStateCache(page=None, symbol="ALPHA_9USDT")
+    cache.ingest("/balance", BALANCES, is_orders=False)
+    assert cache.quote_balance() == pytest.approx(1234.5)
+    assert cache.holding() is None
+
+
+def test_stale_data_ignored():
+    cache = AccountStateCache(page=None, symbol="ALPHA_175USDT", max_age=10)
+    cache.ingest("/balance", BALANCES, is_orders=False)
+    cache.state.balances_at -= 11
+    assert cache.quote_balance() is None
+
+
+def test_orders_by_side():
+    cache = AccountStateCache(page=None)
+    cache.ingest("/open-orders", ORDERS)
+    assert [o.order_id for o in cache.state.orders_by_side("SELL")] == ["12", "13"]
+    assert isinstance(cache.state.open_orders[0], OpenOrder)
@@ -0,0 +1,304 @@
+"""
+market_feed 测试 - 用录制的页面 WebSocket 帧（tests/frames.jsonl）检查解码、交易对锁定和订单成交查询
+
+帧通过本地 WebSocket 服务端推送：
+    - 标准库客户端接收后按 page.on("websocket") 的回调方式交给 MarketFeed
+    - 安装了 Playwright Chromium 时，再由真实页面连接，经 MarketFeed.attach() 捕获
+
+运行: python -m pytest -q tests
+"""
+import base64
+import hashlib
+import json
+import os
+import socket
+import struct
+import threading
+import time
+from typing import List
+
+import pytest
+
+from market_feed import MarketFeed, MarketEventKind, OrderStatus, decode_frame, replay
+
+
+FRAMES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frames.jsonl")
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+SYMBOL = "ALPHA_175USDT"
+
+
+def load_frames() -> List[str]:
+    """录制文件中的原始帧"""
+    with open(FRAMES_PATH, "r", encoding="utf-8") as f:
+        return [json.loads(line)["payload"] for line in f if line.strip()]
+
+
+# ============================================
+# 本地 WebSocket 服务端 / 客户端（标准库实现，只支持未分片的文本帧）
+# ============================================
+
+def _read_http_head(sock: socket.socket) -> str:
+    """逐字节读到空行为止，不吞掉紧随其后的第一帧"""
+    data = b""
+    while not data.endswith(b"\r\n\r\n"):
+        chunk = sock.recv(1)
+        if not chunk:
+            break
+        data += chunk
+    return data.decode("latin-1")
+
+
+def _header(head: str, name: str) -> str:
+    for line in head.split("\r\n")[1:]:
+        key, _, value = line.partition(":")
+        if key.strip().lower() == name.lower():
+            return value.strip()
+    return ""
+
+
+def _encode_frame(text: str, mask: bool = False) -> bytes:
+    payload = text.encode("utf-8")
+    head = bytes([0x81])
+    length = len(payload)
+    mask_bit = 0x80 if mask else 0
+    if length < 126:
+        head += bytes([mask_bit | length])
+    elif length < 65536:
+        head += bytes([mask_bit | 126]) + struct.pack(">H", length)
+    else:
+        head += bytes([mask_bit | 127]) + struct.pack(">Q", length)
+    if not mask:
+        return head + payload
+    key = os.urandom(4)
+    return head + key + bytes(b ^ key[i % 4] for i, b in enumerate(payload))
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("连接已关闭")
+        data += chunk
+    return data
+
+
+def _read_frame(sock: socket.socket):
+    """读取一帧，返回 (opcode, 文本)"""
+    first, second = _recv_exact(sock, 2)
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack(">H", _recv_exact(sock, 2))[0]
+    elif length == 127:
+        length = struct.unpack(">Q", _recv_exact(sock, 8))[0]
+    key = _recv_exact(sock, 4) if second & 0x80 else None
+    payload = _recv_exact(sock, length)
+    if key:
+        payload = bytes(b ^ key[i % 4] for i, b in enumerate(payload))
+    return first & 0x0F, payload.decode("utf-8", errors="replace")
+
+
+class FrameServer:
+    """本地 WebSocket 服务端：握手后依次推送录制的帧，再等待客户端关闭"""
+
+    def __init__(self, frames: List[str]):
+        self.frames = frames
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen(1)
+        self.url = f"ws://127.0.0.1:{self.sock.getsockname()[1]}/ws"
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+
+    def __enter__(self) -> "FrameServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.sock.close()
+        self.thread.join(timeout=5)
+
+    def _serve(self) -> None:
+        try:
+            conn, _ = self.sock.accept()
+        except OSError:
+            return
+        with conn:
+            head = _read_http_head(conn)
+            accept = base64.b64encode(
+                hashlib.sha1((_header(head, "Sec-WebSocket-Key") + WS_GUID).encode()).digest()
+            ).decode()
+            conn.sendall((
+                "HTTP/1.1 101 Switching Protocols\r\n"
+                "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+                f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+            ).encode())
+            for frame in self.frames:
+                conn.sendall(_encode_frame(frame))
+            conn.settimeout(10)
+            try:
+                while _read_frame(conn)[0] != 0x8:
+                    pass
+            except (OSError, ConnectionError):
+                pass
+
+
+class SocketWebSocket:
+    """标准库 WebSocket 客户端，接口与 Playwright WebSocket 的 on("framereceived") 一致"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self._handlers = []
+
+    def on(self, event: str, handler) -> None:
+        if event == "framereceived":
+            self._handlers.append(handler)
+
+    def run(self, count: int) -> None:
+        """连接服务端并分发 count 帧后关闭"""
+        host, port = self.url[len("ws://"):].split("/")[0].split(":")
+        with socket.create_connection((host, int(port)), timeout=10) as sock:
+            key = base64.b64encode(os.urandom(16)).decode()
+            sock.sendall((
+                f"GET /ws HTTP/1.1\r\nHost: {host}:{port}\r\n"
+                "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+                f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n"
+            ).encode())
+            assert " 101 " in _read_http_head(sock).split("\r\n")[0]
+            for _ in range(count):
+                opcode, text = _read_frame(sock)
+                if opcode == 0x1:
+                    for handler in self._handlers:
+                        handler(text)
+            sock.sendall(bytes([0x88, 0x80]) + os.urandom(4))
+
+
+def stream_frames(feed: MarketFeed, frames: List[str]) -> None:
+    """经本地 WebSocket 服务端把帧推送给 feed（模拟页面新建连接）"""
+    with FrameServer(frames) as server:
+        ws = SocketWebSocket(server.url)
+        feed._on_websocket(ws)
+        ws.run(len(frames))
+
+
+# ============================================
+# decode_frame
+# ============================================
+
+def test_decode_combined_stream_trade():
+    events = decode_frame(load_frames()[1])
+    assert len(events) == 1
+    event = events[0]
+    assert event.kind == MarketEventKind.TRADE
+    assert event.symbol == SYMBOL
+    assert event.price == pytest.approx(0.015321)
+    assert event.quantity == pytest.approx(1200)
+
+
+def test_decode_agg_trade_and_batch_ticker():
+    frames = load_frames()
+    agg = decode_frame(frames[3])
+    assert [(e.kind, e.symbol, e.price) for e in agg] == [(MarketEventKind.TRADE, SYMBOL, pytest.approx(0.015325))]
+    tickers = decode_frame(frames[4])
+    assert [(e.kind, e.symbol) for e in tickers] == [
+        (MarketEventKind.TICKER, SYMBOL),
+        (MarketEventKind.TICKER, "BTCUSDT"),
+    ]
+    assert tickers[0].price == pytest.approx(0.01533)
+
+
+def test_decode_execution_report():
+    frames = load_frames()
+    new = decode_frame(frames[5])[0]
+    assert (new.kind, new.side, new.status, new.order_id) == (MarketEventKind.ORDER, "BUY", OrderStatus.NEW, "1001")
+    # 未成交时 L 为 0，取委托价
+    assert new.price == pytest.approx(0.01533)
+    filled = decode_frame(frames[6])[0]
+    assert filled.status == OrderStatus.FILLED
+    assert filled.price == pytest.approx(0.015329)
+    assert filled.filled_quantity == pytest.approx(6523)
+
+
+@pytest.mark.parametrize("payload", ['{"result":null,"id":1}', "ping", b"\x00\xff", '{"e":"depthUpdate"}', None])
+def test_decode_ignores_unknown_frames(payload):
+    assert decode_frame(payload) == []
+
+
+# ============================================
+# 经本地 WebSocket 推送
+# ============================================
+
+def test_symbol_locks_to_first_trade():
+    feed = MarketFeed(page=None, stale_after=float("inf"))
+    stream_frames(feed, load_frames())
+
+    assert feed.frames == len(load_frames())
+    assert feed.symbol == SYMBOL
+    assert {event.symbol for event in feed.events} == {SYMBOL}
+    # 锁定后其他交易对的成交、行情和订单推送都被过滤
+    assert "9001" not in feed.orders
+    assert feed.last_price == pytest.approx(0.01533)
+    assert [event.seq for event in feed.events] == list(range(1, feed.seq + 1))
+
+
+def test_explicit_symbol_filters_orders():
+    feed = MarketFeed(page=None, symbol="btcusdt", stale_after=float("inf"))
+    stream_frames(feed, load_frames())
+
+    assert feed.symbol == "BTCUSDT"
+    assert set(feed.orders) == {"9001"}
+    assert feed.last_price == pytest.approx(67010)
+    assert [event.order_id for event in feed.fills_since(0, side="SELL")] == ["9001"]
+
+
+def test_fills_since():
+    feed = MarketFeed(page=None, stale_after=float("inf"))
+    frames = load_frames()
+    stream_frames(feed, frames[:7])
+    buy_fills = feed.fills_since(0, side="BUY")
+    assert [event.order_id for event in buy_fills] == ["1001"]
+    assert feed.fills_since(0, side="SELL") == []
+
+    # 反向卖单挂出后记录序号，之后只返回新的完全成交（部分成交不算）
+    seq = feed.seq
+    stream_frames(feed, frames[7:])
+    assert [event.order_id for event in feed.fills_since(seq, side="SELL")] == ["1002"]
+    assert feed.fills_since(seq, side="BUY") == []
+    assert [event.order_id for event in feed.fills_since(0)] == ["1001", "1002"]
+    assert feed.orders["1002"].status == OrderStatus.FILLED
+
+
+def test_replay_matches_stream(capsys):
+    streamed = MarketFeed(page=None, stale_after=float("inf"))
+    stream_frames(streamed, load_frames())
+    replayed = replay(FRAMES_PATH)
+    capsys.readouterr()
+    assert [(e.kind, e.symbol, e.order_id, e.status) for e in replayed.events] == \
+        [(e.kind, e.symbol, e.order_id, e.status) for e in streamed.events]
+
+
+def test_page_websocket_attach():
+    """真实页面连接本地服务端，MarketFeed.attach() 捕获帧（需要 Playwright Chromium）"""
+    sync_api = pytest.importorskip("playwright.sync_api")
+    frames = load_frames()
+    with sync_api.sync_playwright() as p:
+        try:
+            browser = p.chromium.launch()
+        except Exception as e:
+            pytest.skip(f"Chromium 不可用: {e}")
+        try:
+            page = browser.new_page()
+            feed = MarketFeed(page, stale_after=float("inf"))
+            assert feed.attach()
+            with FrameServer(frames) as server:
+                page.evaluate("url => { window.__ws = new WebSocket(url); }", server.url)
+                deadline = time.time() + 10
+                while feed.frames < len(frames) and time.time() < deadline:
+                    page.wait_for_timeout(50)
+                page.evaluate("() => window.__ws.close()")
+        finally:
+            browser.close()
+
+    assert feed.frames == len(frames)
+    assert feed.symbol == SYMBOL
+    assert [event.order_id for event in feed.fills_since(0, side="SELL")] == ["1002"]
@@ -0,0 +1,79 @@
+"""
+pacing 测试 - 按目标完成时间计算间隔、成交率和休眠计时
+
+运行: python -m pytest -q tests
+"""
+import pytest
+
+from pacing import MIN_FILL_RATE, PACING_JITTER, PACING_MAX_DELAY, PacingController
+
+
+NOW = 1_800_000_000.0
+
+
+def test_random_interval_without_target():
+    pacer = PacingController(finish_at=None, min_interval=5, max_interval=10)
+    decision = pacer.next_delay(trades_left=3, now=NOW)
+    assert not pacer.enabled
+    assert 5 <= decision.delay <= 10
+    # 还没有单轮耗时，无法预计完成时间
+    assert decision.eta is None
+
+
+def test_spreads_slack_over_remaining_rounds():
+    pacer = PacingController(finish_at=NOW + 1000)
+    pacer.observe(10, filled=True)
+    decision = pacer.next_delay(trades_left=9, now=NOW)
+    # 余量 = 1000 - 9 × 10，平摊到 9 轮
+    assert decision.slack == pytest.approx(910)
+    assert decision.delay == pytest.approx(910 / 9, rel=PACING_JITTER)
+    assert decision.eta == pytest.approx(NOW + 1000)
+
+
+def test_no_sleep_when_behind():
+    pacer = PacingController(finish_at=NOW + 50)
+    pacer.observe(10, filled=True)
+    decision = pacer.next_delay(trades_left=9, now=NOW)
+    assert decision.delay == 0
+    assert decision.slack == pytest.approx(-40)
+    assert "落后于目标" in decision.describe()
+
+
+def test_delay_capped():
+    pacer = PacingController(finish_at=NOW + 100000)
+    pacer.observe(1, filled=True)
+    decision = pacer.next_delay(trades_left=1, now=NOW)
+    assert decision.delay <= PACING_MAX_DELAY * (1 + PACING_JITTER)
+
+
+def test_fill_rate_scales_rounds():
+    pacer = PacingController(finish_at=NOW + 1000)
+    pacer.observe(10, filled=True)
+    pacer.observe(10, filled=False)
+    assert pacer.fill_rate == pytest.approx(0.5)
+    # 成交率 50%：剩余 5 笔需要 10 轮
+    assert pacer.next_delay(trades_left=5, now=NOW).slack == pytest.approx(900)
+
+    idle = PacingController(finish_at=None)
+    for _ in range(3):
+        idle.observe(1, filled=False)
+    assert idle.fill_rate == MIN_FILL_RATE
+
+
+def test_cycle_seconds_smoothed():
+    pacer = PacingController(finish_at=None)
+    pacer.observe(10, filled=True)
+    pacer.observe(20, filled=True)
+    assert pacer.cycle_seconds == pytest.approx(13)
+
+
+def test_done_and_wait():
+    pacer = PacingController(finish_at=NOW + 100)
+    assert pacer.next_delay(trades_left=0, now=NOW).delay == 0
+
+    slept = []
+    decision = PacingController(finish_at=None, min_interval=2, max_interval=2).next_delay(1, now=NOW)
+    assert pacer.wait(decision, sleep=slept.append) >= 0
+    assert slept == [2]
+    assert pacer.wait(pacer.next_delay(trades_left=0), sleep=slept.append) == 0
+    assert slept == [2]
@@ -0,0 +1,80 @@
+"""
+page_health 测试 - 绝对阈值、增长斜率、页面寿命和刷新间隔
+
+运行: python -m pytest -q tests
+"""
+import pytest
+
+import page_health
+from page_health import HEALTH_SLOPE_MIN_SAMPLES, HealthThresholds, PageHealthMonitor
+
+
+MB = 1024 * 1024
+
+
+def metrics(heap_mb: float = 100, nodes: int = 1000, listeners: int = 100) -> dict:
+    return {"JSHeapUsedSize": heap_mb * MB, "Nodes": nodes, "JSEventListeners": listeners}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """可手动推进的 time.time"""
+    now = [1_800_000_000.0]
+    monkeypatch.setattr(page_health.time, "time", lambda: now[0])
+    return now
+
+
+def monitor(**limits) -> PageHealthMonitor:
+    health = PageHealthMonitor(HealthThresholds(min_refresh_gap=0, max_page_age=0, **limits))
+    health.reset()
+    return health
+
+
+def test_healthy_page(clock):
+    health = monitor()
+    assert health.observe(metrics()) is None
+    assert health.observe(None) is None
+    assert health.refreshes == {}
+
+
+@pytest.mark.parametrize("sample, kind", [
+    (metrics(heap_mb=500), "heap"),
+    (metrics(nodes=200000), "nodes"),
+    (metrics(listeners=60000), "listeners"),
+])
+def test_absolute_thresholds(clock, sample, kind):
+    health = monitor()
+    assert health.observe(sample)
+    assert health.refreshes == {kind: 1}
+
+
+def test_heap_slope(clock):
+    health = monitor()
+    reasons = []
+    # 每 20 秒增长 5MB（15MB/分钟），覆盖 HEALTH_SLOPE_MIN_SPAN 后才判定
+    for i in range(HEALTH_SLOPE_MIN_SAMPLES):
+        reasons.append(health.observe(metrics(heap_mb=100 + 5 * i)))
+        clock[0] += 20
+    assert reasons[:-1] == [None] * (HEALTH_SLOPE_MIN_SAMPLES - 1)
+    assert "JS 堆持续增长" in reasons[-1]
+    assert health.refreshes == {"heap_slope": 1}
+
+
+def test_min_refresh_gap(clock):
+    health = PageHealthMonitor(HealthThresholds(min_refresh_gap=120, max_page_age=0))
+    health.reset()
+    assert health.observe(metrics(heap_mb=500)) is None
+    clock[0] += 121
+    assert health.observe(metrics(heap_mb=500))
+
+
+def test_page_age_and_reset(clock):
+    health = PageHealthMonitor(HealthThresholds(max_page_age=1800))
+    health.reset()
+    clock[0] += 1800
+    # 采样失败也按页面寿命刷新
+    assert "页面已运行 30 分钟" in health.observe(None)
+    health.reset()
+    assert health.observe(metrics()) is None
+    assert len(health.samples) == 1
+    assert "age 1" in health.summary()
@@ -0,0 +1,154 @@
+"""
+pipeline 测试 - 提交前后委托表的身份比对和在途簿逐单认领
+
+运行: python -m pytest -q tests
+"""
+import pytest
+
+from account_state import OpenOrder
+from pipeline import InflightBook, REVERSE_APPEAR_GRACE, new_orders, order_keys, split_new_orders
+from trade_cycle import CycleState, TradeCycle
+
+
+def sell(order_id: str = "", price: float = 1.0, quantity: float = 10) -> OpenOrder:
+    return OpenOrder(order_id=order_id, side="SELL", price=price, quantity=quantity)
+
+
+def buy(order_id: str = "", price: float = 1.0, quantity: float = 10) -> OpenOrder:
+    return OpenOrder(order_id=order_id, side="BUY", price=price, quantity=quantity)
+
+
+def pending(reverse_price: float, order_id: str = "", seen: bool = False, dwell: float = 0) -> TradeCycle:
+    """停在 REVERSE_PENDING 的在途交易"""
+    cycle = TradeCycle(state=CycleState.REVERSE_PENDING)
+    cycle.data.update(reverse_price=reverse_price, cost=100)
+    if order_id:
+        cycle.data["reverse_order_id"] = order_id
+    if seen:
+        cycle.data["reverse_seen"] = True
+    cycle.entered_at -= dwell
+    return cycle
+
+
+# ============================================
+# new_orders / split_new_orders
+# ============================================
+
+def test_new_orders_by_id():
+    known = order_keys([sell("1"), sell("2")])
+    fresh = new_orders([sell("1"), sell("2"), buy("3"), sell("4")], known)
+    assert [order.order_id for order in fresh] == ["3", "4"]
+
+
+def test_new_orders_without_ids_counts_duplicates():
+    # 页面委托表不带订单号时按 方向@价格 计数：已有一行同价卖单，新出现的第二行才是新委托
+    known = order_keys([sell(price=1.01)])
+    fresh = new_orders([sell(price=1.01), sell(price=1.01), buy(price=0.99)], known)
+    assert [(order.side, order.price) for order in fresh] == [("SELL", 1.01), ("BUY", 0.99)]
+
+
+def test_new_orders_ignores_vanished_known_orders():
+    known = order_keys([sell("1"), sell("2")])
+    assert new_orders([sell("2")], known) == []
+
+
+def test_split_new_orders():
+    fresh = [buy("b", 0.99), sell("r", 1.0005), sell("other", 1.2)]
+    buys, reverses = split_new_orders(fresh, buy_price=0.99, reverse_price=1.0)
+    assert [order.order_id for order in buys] == ["b"]
+    # 价格与反向卖价相差 0.1% 以内才属于本笔
+    assert [order.order_id for order in reverses] == ["r"]
+
+
+def test_split_new_orders_unknown_side_by_price():
+    fresh = [OpenOrder("x", price=0.991), OpenOrder("y", price=1.0)]
+    buys, reverses = split_new_orders(fresh, buy_price=0.99, reverse_price=1.0)
+    assert [order.order_id for order in buys] == ["x"]
+    assert [order.order_id for order in reverses] == ["y"]
+
+
+# ============================================
+# InflightBook
+# ============================================
+
+def test_can_open_respects_count_and_budget():
+    book = InflightBook(max_inflight=3, cost=100, capital_budget=250)
+    assert book.enabled
+    book.add(pending(1.0))
+    book.add(pending(1.1))
+    # 笔数还有余量，但资金预算只够两笔
+    assert book.committed == pytest.approx(200)
+    assert not book.can_open()
+
+
+def test_budget_covers_at_least_one_trade():
+    book = InflightBook(max_inflight=2, cost=100, capital_budget=50)
+    assert book.capital_budget == 100
+    assert book.can_open()
+
+
+def test_match_tracks_bound_orders_by_id():
+    book = InflightBook(max_inflight=3, cost=100)
+    first, second = pending(1.0, "1"), pending(1.1, "2")
+    book.add(first)
+    book.add(second)
+
+    assert book.match([sell("1", 1.0), sell("2", 1.1)]) == []
+    assert book.match([sell("2", 1.1)]) == [first]
+    assert book.cycles == [second]
+    assert book.settled == 1
+
+
+def test_match_uses_pushed_fills():
+    book = InflightBook(max_inflight=2, cost=100)
+    cycle = pending(1.0, "1")
+    book.add(cycle)
+    # 委托表还没刷新，但推送已报告完全成交
+    assert book.match([sell("1", 1.0)], filled_ids=["1"]) == [cycle]
+
+
+def test_match_claims_unbound_by_closest_price():
+    book = InflightBook(max_inflight=3, cost=100)
+    low, high = pending(1.0), pending(1.0008)
+    book.add(low)
+    book.add(high)
+
+    assert book.match([sell("a", 1.0007), sell("b", 1.0001)]) == []
+    assert low.data["reverse_order_id"] == "b"
+    assert high.data["reverse_order_id"] == "a"
+    assert low.data["reverse_seen"] and high.data["reverse_seen"]
+
+
+def test_match_without_ids_settles_seen_orders_that_vanish():
+    book = InflightBook(max_inflight=2, cost=100)
+    cycle = pending(1.0)
+    book.add(cycle)
+    assert book.match([sell(price=1.0)]) == []
+    assert cycle.data["reverse_seen"]
+    assert book.match([]) == [cycle]
+
+
+def test_match_waits_for_reverse_to_appear():
+    book = InflightBook(max_inflight=2, cost=100)
+    fresh, stale = pending(1.0), pending(1.1, dwell=REVERSE_APPEAR_GRACE + 1)
+    book.add(fresh)
+    book.add(stale)
+    # 刚进入在途、委托表中还没出现的不算成交；超过宽限期仍未出现视为已立即成交
+    assert book.match([sell("x", 2.0)]) == [stale]
+    assert book.cycles == [fresh]
+    assert book.untracked == 1
+
+
+def test_take_expired():
+    book = InflightBook(max_inflight=3, cost=100)
+    live, late = pending(1.0), pending(1.1)
+    live.set_deadline(60)
+    late.set_deadline(-1)
+    book.add(live)
+    book.add(late)
+
+    assert book.remaining(5) == 0
+    assert book.take_expired() == [late]
+    assert book.cycles == [live]
+    assert book.flushed == 1
+    assert 0 < book.remaining(5) <= 5
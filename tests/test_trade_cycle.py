@@ -0,0 +1,73 @@
+"""
+trade_cycle 测试 - 状态迁移、截止时间和停留耗时记录
+
+运行: python -m pytest -q tests
+"""
+import pytest
+
+from trade_cycle import CycleState, TradeCycle
+from trade_stats import LatencyStats
+
+
+def test_happy_path_records_dwell():
+    latency = LatencyStats()
+    cycle = TradeCycle(cycle_id=1, latency=latency)
+    for state in (CycleState.PRICED, CycleState.SUBMITTED, CycleState.BUY_FILLED, CycleState.REVERSE_PENDING):
+        cycle.to(state)
+    cycle.to(CycleState.SETTLED, "反向卖单自动成交")
+
+    assert cycle.done
+    assert cycle.outcome == "反向卖单自动成交"
+    assert [t.target for t in cycle.history] == [
+        CycleState.PRICED, CycleState.SUBMITTED, CycleState.BUY_FILLED,
+        CycleState.REVERSE_PENDING, CycleState.SETTLED,
+    ]
+    assert latency.percentile("cycle_idle", 50) is not None
+    assert cycle.summary().endswith("→ settled")
+
+
+@pytest.mark.parametrize("source, target", [
+    (CycleState.IDLE, CycleState.SUBMITTED),
+    (CycleState.SUBMITTED, CycleState.FORCE_EXIT),
+    (CycleState.REVERSE_PENDING, CycleState.ABORTED),
+    (CycleState.SETTLED, CycleState.IDLE),
+])
+def test_illegal_transition(source, target):
+    cycle = TradeCycle(state=source)
+    with pytest.raises(ValueError):
+        cycle.to(target)
+    assert cycle.state == source
+
+
+def test_non_terminal_reason_is_not_outcome():
+    cycle = TradeCycle()
+    cycle.to(CycleState.PRICED, "价格已加载")
+    assert cycle.outcome == ""
+    cycle.to(CycleState.ABORTED, "余额不足")
+    assert cycle.outcome == "余额不足"
+
+
+def test_deadline_and_remaining():
+    cycle = TradeCycle()
+    assert not cycle.expired
+    assert cycle.remaining(3) == 3
+
+    cycle.to(CycleState.PRICED, timeout=60)
+    assert not cycle.expired
+    assert 0 < cycle.remaining(1) <= 1
+
+    cycle.set_deadline(-1)
+    assert cycle.expired
+    assert cycle.remaining(1) == 0
+
+    # 迁移后截止时间按新状态重新设置
+    cycle.to(CycleState.SUBMITTED)
+    assert cycle.deadline is None
+
+
+def test_hold_and_resume():
+    cycle = TradeCycle()
+    cycle.hold(30)
+    assert 29 < cycle.until_resume() <= 30
+    cycle.to(CycleState.PRICED)
+    assert cycle.until_resume() == 0
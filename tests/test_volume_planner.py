@@ -0,0 +1,104 @@
+"""
+volume_planner 测试 - 剩余笔数、单笔金额、截止时间放大和最小下单额
+
+运行: python -m pytest -q tests
+"""
+from datetime import datetime
+
+import pytest
+
+from trade_stats import TradeStats
+from volume_planner import MIN_TRADE_COST, VolumePlanner, parse_deadline
+
+
+NOW = 1_800_000_000.0
+
+
+def traded(volume: float) -> TradeStats:
+    """已成交 volume USDT 的统计"""
+    stats = TradeStats()
+    if volume:
+        stats.record_buy(1.0, volume, True, 100)
+    return stats
+
+
+def test_even_split():
+    plan = VolumePlanner(target=1000, cost=100).plan(traded(0), completed=0, now=NOW)
+    assert (plan.trades_left, plan.next_cost, plan.behind) == (10, 100, False)
+    assert plan.seconds_per_trade is None and plan.eta is None
+
+
+def test_last_trade_tops_up_exactly():
+    plan = VolumePlanner(target=1000, cost=100).plan(traded(950), completed=9, now=NOW)
+    assert (plan.trades_left, plan.next_cost, plan.overshoot) == (1, 50, 0)
+
+
+def test_uneven_remainder_rounds_up_to_cents():
+    plan = VolumePlanner(target=100, cost=30).plan(traded(0), completed=0, now=NOW)
+    assert plan.trades_left == 4
+    assert plan.next_cost == pytest.approx(25)
+    plan = VolumePlanner(target=100, cost=45).plan(traded(0), completed=0, now=NOW)
+    assert plan.trades_left == 3
+    assert plan.next_cost == pytest.approx(33.34)
+
+
+def test_min_trade_cost_overshoot():
+    plan = VolumePlanner(target=1000, cost=100).plan(traded(997), completed=10, now=NOW)
+    assert (plan.trades_left, plan.next_cost) == (1, MIN_TRADE_COST)
+    assert plan.overshoot == pytest.approx(2)
+
+    # 剩余量够最小下单额时减少笔数而不是超额
+    plan = VolumePlanner(target=12, cost=5).plan(traded(0), completed=0, now=NOW)
+    assert plan.trades_left == 2
+    assert plan.next_cost == pytest.approx(6)
+    assert plan.overshoot == 0
+
+
+def test_reached_target():
+    planner = VolumePlanner(target=500, cost=100)
+    stats = traded(500)
+    plan = planner.plan(stats, completed=5, now=NOW)
+    assert planner.reached(stats)
+    assert plan.done and plan.next_cost == 0
+    assert plan.describe().endswith("已达标")
+
+
+def test_deadline_enlarges_trades_when_behind():
+    planner = VolumePlanner(target=1000, cost=100, deadline=NOW + 100)
+    planner.started_at = NOW - 100
+    # 已完成 2 笔、每笔 50s：截止前只够 2 笔，单笔最多放大到 2 倍
+    plan = planner.plan(traded(0), completed=2, now=NOW)
+    assert plan.seconds_per_trade == pytest.approx(50)
+    assert plan.behind
+    assert (plan.trades_left, plan.next_cost) == (5, 200)
+    assert plan.eta == pytest.approx(NOW + 250)
+
+
+def test_enlarged_trade_limited_by_balance_and_budget():
+    planner = VolumePlanner(target=1000, cost=100, deadline=NOW + 100)
+    planner.started_at = NOW - 100
+    plan = planner.plan(traded(0), completed=2, balance=151.5, now=NOW)
+    assert (plan.trades_left, plan.next_cost) == (7, pytest.approx(142.86))
+
+    planner = VolumePlanner(target=1000, cost=100, deadline=NOW + 100, capital_budget=250)
+    planner.started_at = NOW - 100
+    # 在途已占用 200，预算只剩 50：不放大，但也不低于常规单笔
+    plan = planner.plan(traded(0), completed=2, locked=200, now=NOW)
+    assert (plan.trades_left, plan.next_cost) == (10, 100)
+
+
+def test_wear_rate():
+    stats = traded(1000)
+    stats.set_start_balance(500)
+    assert VolumePlanner.wear_rate(stats, balance=398, locked=100) == pytest.approx(0.002)
+    assert VolumePlanner.wear_rate(stats, balance=None) is None
+
+
+def test_parse_deadline():
+    now = datetime(2026, 10, 17, 12, 0)
+    assert parse_deadline("18:30", now) == datetime(2026, 10, 17, 18, 30).timestamp()
+    # 今天已过的时刻取明天
+    assert parse_deadline("08:00", now) == datetime(2026, 10, 18, 8, 0).timestamp()
+    assert parse_deadline("2026-10-20 09:15", now) == datetime(2026, 10, 20, 9, 15).timestamp()
+    assert parse_deadline("", now) is None
+    assert parse_deadline("明天", now) is None
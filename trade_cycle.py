@@ -0,0 +1,131 @@
+"""
+交易周期状态机 - 一笔 买入 → 等待反向卖单 → 结算 的显式状态与带截止时间的迁移
+每次迁移记录上一状态的停留时间（LatencyStats 中的 cycle_<状态>）；
+驱动方每次只推进一步，等待类状态单步最多阻塞一个检查间隔，两步之间可以穿插其他工作
+"""
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List
+
+from trade_stats import LatencyStats
+
+
+class CycleState:
+    """交易周期状态"""
+    IDLE = "idle"                          # 未开始：按需刷新页面、读取价格
+    PRICED = "priced"                      # 已取得价格：检查余额、计算价格并下单
+    SUBMITTED = "submitted"                # 买单已提交：等待买单结果
+    BUY_FILLED = "buy_filled"              # 买单已成交，反向卖单挂出
+    REVERSE_PENDING = "reverse_pending"    # 等待反向卖单成交
+    FORCE_EXIT = "force_exit"              # 反向卖单超时或余额不足：市价卖出
+    SETTLED = "settled"                    # 完成一笔完整交易（终态）
+    ABORTED = "aborted"                    # 本轮未成交结束（终态）
+
+
+# 允许的迁移
+TRANSITIONS: Dict[str, tuple] = {
+    CycleState.IDLE: (CycleState.PRICED, CycleState.ABORTED),
+    CycleState.PRICED: (CycleState.SUBMITTED, CycleState.FORCE_EXIT, CycleState.ABORTED),
+    CycleState.SUBMITTED: (CycleState.BUY_FILLED, CycleState.SETTLED, CycleState.ABORTED),
+    CycleState.BUY_FILLED: (CycleState.REVERSE_PENDING, CycleState.SETTLED),
+    CycleState.REVERSE_PENDING: (CycleState.SETTLED, CycleState.FORCE_EXIT),
+    CycleState.FORCE_EXIT: (CycleState.SETTLED,),
+}
+
+TERMINAL_STATES = (CycleState.SETTLED, CycleState.ABORTED)
+
+
+@dataclass
+class Transition:
+    """一次状态迁移"""
+    source: str
+    target: str
+    dwell_ms: float        # 在 source 状态停留的时间
+    reason: str = ""
+
+
+@dataclass
+class TradeCycle:
+    """
+    一笔交易的状态机
+
+    data 保存各状态之间传递的数据（买入价、买入前余额、持仓等），
+    deadline 为当前状态的截止时间，resume_at 为下一步最早执行时间（替代内联 sleep）。
+    """
+    cycle_id: int = 0
+    latency: Optional[LatencyStats] = None
+    state: str = CycleState.IDLE
+    outcome: str = ""                                         # 进入终态的原因
+    data: Dict[str, Any] = field(default_factory=dict)
+    history: List[Transition] = field(default_factory=list)
+    started_at: float = field(default_factory=time.time)
+    entered_at: float = field(default_factory=time.time)
+    deadline: Optional[float] = None
+    resume_at: float = 0.0
+
+    def to(self, target: str, reason: str = "", timeout: Optional[float] = None) -> None:
+        """
+        迁移到新状态
+
+        Args:
+            target: 目标状态
+            reason: 迁移原因（进入终态时作为 outcome）
+            timeout: 新状态的截止时间（秒，None 不限）
+
+        Raises:
+            ValueError: 当前状态不允许迁移到 target
+        """
+        if target not in TRANSITIONS.get(self.state, ()):
+            raise ValueError(f"非法状态迁移: {self.state} -> {target}")
+        now = time.time()
+        dwell_ms = (now - self.entered_at) * 1000
+        if self.latency is not None:
+            self.latency.record(f"cycle_{self.state}", dwell_ms)
+        self.history.append(Transition(self.state, target, dwell_ms, reason))
+        self.state = target
+        self.entered_at = now
+        self.deadline = now + timeout if timeout is not None else None
+        self.resume_at = 0.0
+        if target in TERMINAL_STATES:
+            self.outcome = reason
+
+    def set_deadline(self, timeout: float) -> None:
+        """从现在起为当前状态设置截止时间（秒）"""
+        self.deadline = time.time() + timeout
+
+    def hold(self, seconds: float) -> None:
+        """推迟下一步的执行（驱动方在此期间可处理其他工作）"""
+        self.resume_at = time.time() + seconds
+
+    @property
+    def done(self) -> bool:
+        return self.state in TERMINAL_STATES
+
+    @property
+    def expired(self) -> bool:
+        """当前状态是否已过截止时间"""
+        return self.deadline is not None and time.time() >= self.deadline
+
+    def remaining(self, cap: float) -> float:
+        """距截止时间的秒数（不超过 cap，无截止时间时返回 cap）"""
+        if self.deadline is None:
+            return cap
+        return max(0.0, min(cap, self.deadline - time.time()))
+
+    def until_resume(self) -> float:
+        """距下一步可执行的秒数"""
+        return max(0.0, self.resume_at - time.time())
+
+    @property
+    def elapsed(self) -> float:
+        """周期已运行秒数"""
+        return time.time() - self.started_at
+
+    @property
+    def dwell(self) -> float:
+        """当前状态已停留秒数"""
+        return time.time() - self.entered_at
+
+    def summary(self) -> str:
+        """各状态停留时间，如 idle 1200ms → priced 850ms → ..."""
+        return " → ".join(f"{t.source} {t.dwell_ms:.0f}ms" for t in self.history) + f" → {self.state}"
@@ -4,7 +4,7 @@
 import time
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Dict
 import json
 import os
 
@@ -21,6 +21,95 @@ class TradeRecord:
     error_msg: Optional[str] = None
 
 
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """
+    计算百分位数（最近邻插值）
+    
+    Args:
+        values: 样本
+        pct: 百分位（0-100）
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+@dataclass
+class LatencyStats:
+    """命名等待/操作的耗时分布，以及相对原固定 sleep 节省的时间"""
+    
+    samples: Dict[str, List[float]] = field(default_factory=dict)   # 毫秒
+    timeouts: Dict[str, int] = field(default_factory=dict)
+    saved_ms: Dict[str, float] = field(default_factory=dict)
+    max_samples: int = 500
+    
+    def record(self, name: str, duration_ms: float, timed_out: bool = False, baseline_ms: float = 0.0):
+        """
+        记录一次等待
+        
+        Args:
+            name: 等待名称
+            duration_ms: 实际耗时（毫秒）
+            timed_out: 是否超时
+            baseline_ms: 原固定 sleep 时长（毫秒），用于计算节省
+        """
+        bucket = self.samples.setdefault(name, [])
+        bucket.append(duration_ms)
+        if len(bucket) > self.max_samples:
+            del bucket[0]
+        if timed_out:
+            self.timeouts[name] = self.timeouts.get(name, 0) + 1
+        if baseline_ms:
+            self.saved_ms[name] = self.saved_ms.get(name, 0.0) + baseline_ms - duration_ms
+    
+    def percentile(self, name: str, pct: float) -> Optional[float]:
+        """某个等待的耗时百分位（毫秒）"""
+        return percentile(self.samples.get(name, []), pct)
+    
+    def timeout_for(self, name: str, cap: float, min_samples: int = 20, floor: float = 0.2) -> float:
+        """
+        由历史 p99 推导超时时间（秒）
+        
+        样本不足或超时率超过 5% 时使用上限 cap，否则取 p99 × 1.5 + 100ms，限制在 [floor, cap]
+        """
+        bucket = self.samples.get(name, [])
+        if len(bucket) < min_samples or self.timeouts.get(name, 0) > len(bucket) * 0.05:
+            return cap
+        p99 = self.percentile(name, 99) / 1000
+        return max(floor, min(cap, p99 * 1.5 + 0.1))
+    
+    @property
+    def total_saved_ms(self) -> float:
+        """累计节省时间（毫秒）"""
+        return sum(self.saved_ms.values())
+    
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        """导出各等待的统计"""
+        return {
+            name: {
+                "count": len(bucket),
+                "p50_ms": self.percentile(name, 50),
+                "p99_ms": self.percentile(name, 99),
+                "timeouts": self.timeouts.get(name, 0),
+                "saved_ms": self.saved_ms.get(name, 0.0),
+            }
+            for name, bucket in self.samples.items()
+        }
+    
+    def print_summary(self):
+        """打印等待耗时统计"""
+        if not self.samples:
+            return
+        print("\n⏱️ 等待耗时统计:")
+        print(f"  {'名称':<22}{'次数':>6}{'p50(ms)':>10}{'p99(ms)':>10}{'超时':>6}{'节省(s)':>10}")
+        for name, row in self.to_dict().items():
+            print(f"  {name:<22}{row['count']:>6}{row['p50_ms']:>10.0f}{row['p99_ms']:>10.0f}"
+                  f"{row['timeouts']:>6}{row['saved_ms'] / 1000:>10.1f}")
+        print(f"  合计节省: {self.total_saved_ms / 1000:.1f}s")
+
+
 @dataclass
 class TradeStats:
     """交易统计摘要"""
@@ -50,6 +139,9 @@ class TradeStats:
     # 错误记录
     error_messages: List[str] = field(default_factory=list)
     
+    # 等待耗时统计
+    latency: LatencyStats = field(default_factory=LatencyStats)
+    
     def record_buy(self, price: float, amount: float, success: bool, duration_ms: float, error_msg: str = None):
         """记录买入操作"""
         self.total_attempts += 1
@@ -203,6 +295,8 @@ class TradeStats:
                 print(f"  {i}. {msg}")
             if len(self.error_messages) > 5:
                 print(f"  ... 还有 {len(self.error_messages) - 5} 条错误")
+        
+        self.latency.print_summary()
     
     def save_to_file(self, filename: str = None):
         """
@@ -248,7 +342,8 @@ class TradeStats:
                 }
                 for r in self.records
             ],
-            "errors": self.error_messages
+            "errors": self.error_messages,
+            "latency": self.latency.to_dict()
         }
         
         with open(filename, "w", encoding="utf-8") as f:
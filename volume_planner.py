@@ -0,0 +1,212 @@
+"""
+成交量规划模块 - 按目标成交量和截止时间规划剩余交易
+Alpha 积分按累计成交量计算：每轮根据已成交量、实测每笔耗时和磨损重新规划剩余笔数与下一笔金额，
+达到目标成交量即停止，取代固定的 cost × total_runs
+"""
+import math
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from trade_stats import TradeStats
+
+
+# 单笔最小成交额（交易所最小下单金额）：剩余量不足时最后一笔只能按此下单，超出目标的部分记入 overshoot
+MIN_TRADE_COST = 5.0
+# 按实测速度赶不上截止时间时，单笔最多放大到 cost 的倍数
+MAX_SIZE_FACTOR = 2.0
+# 剩余成交量小于该值视为已达标
+VOLUME_EPSILON = 0.01
+# 尚无完成交易时，用各状态停留耗时的 p50 之和估算每笔耗时
+CYCLE_STATES = ("idle", "priced", "submitted", "buy_filled", "reverse_pending")
+
+
+def parse_deadline(text: str, now: Optional[datetime] = None) -> Optional[float]:
+    """
+    解析截止时间
+
+    Args:
+        text: "HH:MM"（今天该时刻，已过则为明天）或 "YYYY-MM-DD HH:MM"，空字符串表示不限
+        now: 当前时间（None 取本地当前时间）
+
+    Returns:
+        截止时间戳，不限或格式错误时返回 None
+    """
+    text = (text or "").strip()
+    if not text:
+        return None
+    now = now or datetime.now()
+    try:
+        if len(text) <= 5:
+            clock = datetime.strptime(text, "%H:%M")
+            deadline = now.replace(hour=clock.hour, minute=clock.minute, second=0, microsecond=0)
+            if deadline <= now:
+                deadline += timedelta(days=1)
+        else:
+            deadline = datetime.strptime(text, "%Y-%m-%d %H:%M")
+    except ValueError:
+        return None
+    return deadline.timestamp()
+
+
+@dataclass
+class VolumePlan:
+    """一次规划结果"""
+    traded: float                               # 已成交量（USDT）
+    remaining: float                            # 剩余成交量
+    trades_left: int                            # 剩余笔数
+    next_cost: float                            # 下一笔成交额
+    seconds_per_trade: Optional[float] = None   # 实测每笔耗时（秒）
+    eta: Optional[float] = None                 # 预计完成时间戳
+    wear_rate: Optional[float] = None           # 每 1 USDT 成交量的磨损
+    behind: bool = False                        # 按 cost 下单赶不上截止时间（已尽量放大单笔）
+    overshoot: float = 0.0                      # 按计划下完后超出目标的成交量（最小下单额所致）
+
+    @property
+    def done(self) -> bool:
+        return self.trades_left == 0
+
+    @property
+    def projected_wear(self) -> Optional[float]:
+        """剩余成交量的预计磨损"""
+        return self.wear_rate * self.remaining if self.wear_rate is not None else None
+
+    def describe(self) -> str:
+        """单行描述，如 成交量 512.00/2000.00，剩余 6 笔 × 248.00 ..."""
+        parts = [f"成交量 {self.traded:.2f}/{self.traded + self.remaining:.2f}"]
+        if self.done:
+            return parts[0] + "，已达标"
+        parts.append(f"剩余 {self.trades_left} 笔 × {self.next_cost:.2f}")
+        if self.seconds_per_trade:
+            parts.append(f"每笔 {self.seconds_per_trade:.1f}s")
+        if self.eta:
+            parts.append(f"预计 {datetime.fromtimestamp(self.eta).strftime('%H:%M:%S')} 完成")
+        if self.projected_wear is not None:
+            parts.append(f"预计剩余磨损 {self.projected_wear:.4f}")
+        if self.behind:
+            parts.append("⚠️ 按常规单笔赶不上截止时间")
+        if self.overshoot >= VOLUME_EPSILON:
+            parts.append(f"受最小下单额 {MIN_TRADE_COST:.2f} 限制将超出目标 {self.overshoot:.2f}")
+        return "，".join(parts)
+
+
+class VolumePlanner:
+    """
+    成交量规划器
+
+    成交量按买入成交额累计（TradeStats.total_buy_volume）。
+    剩余量按 cost 拆成 ceil(剩余 / cost) 笔等额交易，最后一笔恰好补足目标；
+    设置截止时间且按实测每笔耗时来不及时，减少笔数、放大单笔
+    （不超过 cost × MAX_SIZE_FACTOR、可用余额和资金预算中尚未被在途订单占用的部分）。
+    每笔不低于交易所最小下单额：只有剩余量本身不足最小下单额时最后一笔才会超出目标，超出量记入 overshoot。
+    每轮调用 plan() 重新规划，快时不会超额，慢时不会欠额。
+    """
+
+    def __init__(self, target: float, cost: float, deadline: Optional[float] = None, capital_budget: float = 0):
+        """
+        Args:
+            target: 目标成交量（USDT）
+            cost: 常规单笔成交额
+            deadline: 截止时间戳（None 不限）
+            capital_budget: 在途占用资金上限（0 表示不额外限制单笔）
+        """
+        self.target = target
+        self.cost = cost
+        self.deadline = deadline
+        self.capital_budget = capital_budget
+        self.started_at: float = time.time()
+
+    def start(self) -> None:
+        """开始交易时调用（每笔耗时从此刻起算）"""
+        self.started_at = time.time()
+
+    @staticmethod
+    def traded(stats: TradeStats) -> float:
+        """已成交量"""
+        return stats.total_buy_volume
+
+    def reached(self, stats: TradeStats) -> bool:
+        """是否已达到目标成交量"""
+        return self.target - self.traded(stats) < VOLUME_EPSILON
+
+    def seconds_per_trade(self, stats: TradeStats, completed: int, now: Optional[float] = None) -> Optional[float]:
+        """
+        实测每笔耗时
+
+        有完成交易时取 运行时间 / 完成笔数（包含休眠、失败重试和流水线并发的影响），
+        否则取各状态停留耗时 p50 之和，都没有时返回 None
+        """
+        now = now or time.time()
+        if completed > 0:
+            return (now - self.started_at) / completed
+        p50s = [stats.latency.percentile(f"cycle_{state}", 50) for state in CYCLE_STATES]
+        known = [value for value in p50s if value is not None]
+        return sum(known) / 1000 if known else None
+
+    @staticmethod
+    def wear_rate(stats: TradeStats, balance: Optional[float], locked: float = 0.0) -> Optional[float]:
+        """
+        每 1 USDT 成交量的磨损
+
+        Args:
+            stats: 交易统计（需已设置初始余额）
+            balance: 当前 USDT 可用余额
+            locked: 在途订单占用的资金（流水线模式）
+        """
+        traded = stats.total_buy_volume
+        if balance is None or stats.start_balance <= 0 or traded <= 0:
+            return None
+        wear = stats.start_balance - balance - locked
+        return max(0.0, wear) / traded
+
+    def plan(
+        self,
+        stats: TradeStats,
+        completed: int,
+        balance: Optional[float] = None,
+        locked: float = 0.0,
+        now: Optional[float] = None
+    ) -> VolumePlan:
+        """
+        重新规划剩余交易
+
+        Args:
+            stats: 交易统计
+            completed: 已完成的完整交易笔数
+            balance: 最近一次读到的 USDT 可用余额（限制放大后的单笔）
+            locked: 在途订单占用的资金
+            now: 当前时间戳
+
+        Returns:
+            VolumePlan
+        """
+        now = now or time.time()
+        traded = self.traded(stats)
+        remaining = max(0.0, self.target - traded)
+        per_trade = self.seconds_per_trade(stats, completed, now)
+        wear_rate = self.wear_rate(stats, balance, locked)
+        if remaining < VOLUME_EPSILON:
+            return VolumePlan(traded, 0.0, 0, 0.0, per_trade, now, wear_rate)
+
+        trades_left = math.ceil(remaining / self.cost)
+        behind = False
+        if self.deadline and per_trade:
+            affordable = max(1, int((self.deadline - now) // per_trade))
+            if affordable < trades_left:
+                behind = True
+                max_cost = self.cost * MAX_SIZE_FACTOR
+                if balance is not None:
+                    max_cost = min(max_cost, balance / 1.01)
+                if self.capital_budget > 0:
+                    max_cost = min(max_cost, self.capital_budget - locked)
+                max_cost = max(self.cost, max_cost)
+                trades_left = max(affordable, math.ceil(remaining / max_cost))
+
+        # 等分后单笔不足最小下单额时减少笔数，只有剩余量本身不足最小下单额时才会超出目标
+        trades_left = max(1, min(trades_left, int(remaining // MIN_TRADE_COST)))
+        # 向上取整到分，页面成交额输入框只接受两位小数
+        next_cost = max(math.ceil(round(remaining / trades_left * 100, 6)) / 100, MIN_TRADE_COST)
+        overshoot = max(0.0, next_cost - remaining) if trades_left == 1 else 0.0
+        eta = now + trades_left * per_trade if per_trade else None
+        return VolumePlan(traded, remaining, trades_left, next_cost, per_trade, eta, wear_rate, behind, overshoot)